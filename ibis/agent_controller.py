@@ -9,7 +9,7 @@ import asyncio
 from typing import Any, Dict, List, Optional
 
 from ibis.orchestrator import IBIS
-from ibis.telemetry import get_events, clear_events
+from ibis.telemetry import Subscription, clear_events, get_events, subscribe_events
 
 from unified_trading_engine import UnifiedTradingEngine
 from unified_config import get_config
@@ -105,6 +105,9 @@ class AgentController:
     async def clear_events(self) -> None:
         await clear_events()
 
+    def subscribe_events(self, maxsize: int = 1000) -> Subscription:
+        return subscribe_events(maxsize)
+
     async def memory_stats(self) -> Dict[str, Any]:
         await self.init_ibis()
         return await self.ibis.memory.get_statistics()
@@ -235,23 +235,37 @@ async def events_ws(request: web.Request) -> web.WebSocketResponse:
         return denied
     ws = web.WebSocketResponse()
     await ws.prepare(request)
-    last_id = 0
+    # Subscribe before reading the backlog so nothing emitted in between is lost
+    subscription = controller.subscribe_events()
+    pump = asyncio.ensure_future(_push_events(ws, subscription))
     try:
-        while True:
-            items = await controller.get_events(limit=200, since_id=last_id)
-            if items:
-                last_id = items[-1]["id"]
-                await ws.send_json({"events": items})
-            await asyncio.sleep(0.5)
+        # Idle clients cost nothing: the pump sleeps on its queue and this
+        # loop only wakes for client frames / close
+        async for _msg in ws:
+            pass
     except asyncio.CancelledError:
         pass
     except Exception:
         pass
     finally:
+        pump.cancel()
+        subscription.close()
         await ws.close()
     return ws
 
 
+async def _push_events(ws: web.WebSocketResponse, subscription) -> None:
+    try:
+        # Backlog first, then pushes; a client that falls behind is backfilled
+        # from the ring in id order
+        async for items in subscription.batches(backlog=200, limit=200):
+            await ws.send_json({"events": items})
+    except asyncio.CancelledError:
+        pass
+    except Exception:
+        await ws.close()
+
+
 def create_app() -> web.Application:
     app = web.Application()
     app.add_routes(
@@ -12,6 +12,9 @@ from .backtester import (
     MomentumStrategy,
     CandleGenerator,
     PositionSide,
+    CandleHistory,
+    HistoryView,
+    replay_events,
 )
 
 __all__ = [
@@ -24,4 +27,7 @@ __all__ = [
     "MomentumStrategy",
     "CandleGenerator",
     "PositionSide",
+    "CandleHistory",
+    "HistoryView",
+    "replay_events",
 ]
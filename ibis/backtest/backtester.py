@@ -12,12 +12,21 @@ Features:
 """
 
 import asyncio
+import heapq
 import random
 import statistics
+import time
+from collections.abc import Sequence
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 
+import numpy as np
+
+from ibis.core.trading_constants import TRADING, IBISTradingConstants
+
 logger = get_logger(__name__)
 
 
@@ -101,8 +110,9 @@ class CandleGenerator:
 class Strategy:
     """Base strategy - works with any symbol."""
 
-    def __init__(self, config: BacktestConfig):
+    def __init__(self, config: BacktestConfig, constants: IBISTradingConstants = None):
         self.config = config
+        self.constants = constants or TRADING
 
     def analyze(self, candles: List[Dict], position: str) -> Dict:
         raise NotImplementedError
@@ -125,12 +135,14 @@ class RSI_MeanReversionStrategy(Strategy):
 
         rs = avg_gain / avg_loss if avg_loss > 0 else 0
         rsi = 100 - (100 / (1 + rs)) if rs > 0 else 50
+        oversold = self.constants.TECHNICAL.RSI_OVERSOLD
+        overbought = self.constants.TECHNICAL.RSI_OVERBOUGHT
 
         if position == PositionSide.NONE:
-            if rsi < 30:
-                return {"action": "BUY", "reason": f"RSI oversold ({rsi:.1f})", "strength": (30 - rsi) / 30}
-            elif rsi > 70:
-                return {"action": "SELL", "reason": f"RSI overbought ({rsi:.1f})", "strength": (rsi - 70) / 30}
+            if rsi < oversold:
+                return {"action": "BUY", "reason": f"RSI oversold ({rsi:.1f})", "strength": (oversold - rsi) / oversold}
+            elif rsi > overbought:
+                return {"action": "SELL", "reason": f"RSI overbought ({rsi:.1f})", "strength": (rsi - overbought) / (100 - overbought)}
             return {"action": "HOLD", "reason": f"RSI neutral ({rsi:.1f})"}
         else:
             if rsi > 50:
@@ -222,6 +234,101 @@ class BacktestResult:
     expectancy: float = 0.0
     equity_curve: List[Tuple[datetime, float]] = field(default_factory=list)
     trades: List[Trade] = field(default_factory=list)
+    bars_processed: int = 0
+    elapsed_seconds: float = 0.0
+    bars_per_second: float = 0.0
+
+
+class CandleHistory:
+    """
+    Array-backed candle history for one symbol.
+
+    view(end) returns a read-only window over the first `end` candles without
+    copying them; numeric columns are built once on first use and shared by
+    every view.
+    """
+
+    def __init__(self, candles: List[Dict]):
+        self.candles = candles
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def view(self, end: int) -> "HistoryView":
+        return HistoryView(self, end)
+
+    def column(self, name: str) -> np.ndarray:
+        values = self._columns.get(name)
+        if values is None:
+            values = np.fromiter((c[name] for c in self.candles), dtype=np.float64, count=len(self.candles))
+            values.setflags(write=False)
+            self._columns[name] = values
+        return values
+
+
+class HistoryView(Sequence):
+    """
+    Zero-copy prefix of a CandleHistory, handed to Strategy.analyze.
+
+    Behaves like the list slice candles[:end]: len(), indexing and slicing
+    work the same, but only the requested slice (e.g. candles[-20:]) is ever
+    materialised.
+    """
+
+    __slots__ = ("_history", "_end")
+
+    def __init__(self, history: CandleHistory, end: int):
+        self._history = history
+        self._end = end
+
+    def __len__(self) -> int:
+        return self._end
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            window = range(self._end)[key]
+            if window.step == 1:
+                return self._history.candles[window.start:window.stop]
+            return [self._history.candles[i] for i in window]
+        return self._history.candles[range(self._end)[key]]
+
+    def __iter__(self) -> Iterator[Dict]:
+        return islice(self._history.candles, self._end)
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only float64 view of one field (e.g. "close") up to the current bar."""
+        return self._history.column(name)[: self._end]
+
+
+def _symbol_stream(order: int, symbol: str, candles: List[Dict]) -> Iterator[Tuple[Any, int, str, int]]:
+    """
+    (timestamp, order, symbol, index) events for one symbol in time order.
+
+    Only the first candle of a repeated timestamp is replayed, and indexes
+    point into the caller's list, so histories are prefixes of the input as
+    given. Already-sorted input (the normal case) is streamed without sorting.
+    """
+    timestamps = [c["timestamp"] for c in candles]
+    if all(a <= b for a, b in zip(timestamps, timestamps[1:])):
+        indexes = range(len(candles))
+    else:
+        indexes = sorted(range(len(candles)), key=timestamps.__getitem__)
+    previous = object()
+    for index in indexes:
+        timestamp = timestamps[index]
+        if timestamp != previous:
+            previous = timestamp
+            yield timestamp, order, symbol, index
+
+
+def replay_events(candles: Dict[str, List[Dict]]) -> Iterator[Tuple[Any, List[Tuple[Any, int, str, int]]]]:
+    """
+    Heap-merge every symbol's stream into (timestamp, events) groups.
+
+    Events inside a group keep the symbol order of the input dict. The merge
+    is O(N log S) for N candles over S symbols.
+    """
+    streams = [_symbol_stream(order, symbol, series) for order, (symbol, series) in enumerate(candles.items())]
+    for timestamp, group in groupby(heapq.merge(*streams), key=itemgetter(0)):
+        yield timestamp, list(group)
 
 
 class BacktestEngine:
@@ -236,36 +343,49 @@ class BacktestEngine:
         self.daily_pnl: Dict[datetime, float] = {}
 
     async def run(self, strategy: Strategy, candles: Dict[str, List[Dict]]) -> BacktestResult:
-        """Run backtest with any symbols provided."""
+        """
+        Run backtest with any symbols provided.
+
+        Candles are replayed in timestamp order from a heap merge of the
+        per-symbol streams, and strategies see a CandleHistory view that ends
+        at the current bar instead of a fresh copy of every earlier candle.
+        """
         self.balance = self.config.initial_balance
         self.equity_curve = []
         self.trades = []
         self.positions = {}
         self.daily_pnl = {}
 
-        all_timestamps = sorted(set(
-            c["timestamp"] for symbol_candles in candles.values()
-            for c in symbol_candles
-        ))
+        histories = {symbol: CandleHistory(symbol_candles) for symbol, symbol_candles in candles.items()}
+        bars = 0
+        started = time.perf_counter()
+
+        for timestamp, events in replay_events(candles):
+            for _, _, symbol, index in events:
+                if symbol in self.positions:
+                    self._update_position(symbol, candles[symbol][index], self.positions[symbol])
 
-        for timestamp in all_timestamps:
-            for symbol, symbol_candles in candles.items():
-                candle = next((c for c in symbol_candles if c["timestamp"] == timestamp), None)
-                if candle and symbol in self.positions:
-                    self._update_position(symbol, candle, self.positions[symbol])
-
-            for symbol, symbol_candles in candles.items():
-                candle = next((c for c in symbol_candles if c["timestamp"] == timestamp), None)
-                if candle:
-                    analysis = strategy.analyze(symbol_candles[:symbol_candles.index(candle)+1], PositionSide.NONE)
-                    if analysis["action"] == "BUY" and symbol not in self.positions:
-                        self._open_position(symbol, candle, PositionSide.LONG, analysis.get("reason", ""))
-                    elif analysis["action"] == "SELL" and symbol not in self.positions:
-                        self._open_position(symbol, candle, PositionSide.SHORT, analysis.get("reason", ""))
+            for _, _, symbol, index in events:
+                candle = candles[symbol][index]
+                analysis = strategy.analyze(histories[symbol].view(index + 1), PositionSide.NONE)
+                if analysis["action"] == "BUY" and symbol not in self.positions:
+                    self._open_position(symbol, candle, PositionSide.LONG, analysis.get("reason", ""))
+                elif analysis["action"] == "SELL" and symbol not in self.positions:
+                    self._open_position(symbol, candle, PositionSide.SHORT, analysis.get("reason", ""))
 
+            bars += len(events)
             self.equity_curve.append((timestamp, self.balance))
 
-        return self._generate_report()
+        elapsed = time.perf_counter() - started
+        result = self._generate_report()
+        result.bars_processed = bars
+        result.elapsed_seconds = elapsed
+        result.bars_per_second = bars / elapsed if elapsed > 0 else 0.0
+        logger.info(
+            f"⏱️ Backtest replayed {bars} bars across {len(candles)} symbols "
+            f"in {elapsed:.2f}s ({result.bars_per_second:,.0f} bars/sec)"
+        )
+        return result
 
     def _open_position(self, symbol: str, candle: Dict, side: str, reason: str):
         if len(self.positions) >= self.config.max_open_positions:
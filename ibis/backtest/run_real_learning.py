@@ -14,29 +14,15 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from ibis.backtest.backtester import BacktestConfig, BacktestEngine, ConfluenceStrategy
 from ibis.exchange import get_kucoin_client
+from ibis.exchange.candle_archive import CandleArchive
 from ibis.backtest.learning import suggest_config_adjustments
 
 
-async def fetch_candles(client, symbol: str, tf: str = "1hour", days: int = 30):
-    # KuCoin returns candles in reverse; use existing method
-    candles = await client.get_candles(symbol, tf)
-    # Trim to days*24 candles if hourly
-    limit = days * 24 if tf == "1hour" else len(candles)
-    candles = candles[-limit:]
-
-    # Map to backtest format
-    return [
-        {
-            "symbol": symbol,
-            "timestamp": Path(__file__).stat().st_mtime,  # placeholder
-            "open": c.open,
-            "high": c.high,
-            "low": c.low,
-            "close": c.close,
-            "volume": c.volume,
-        }
-        for c in candles
-    ]
+async def fetch_candles(client, symbol: str, tf: str = "1hour", days: int = 30, archive=None):
+    # Only the bars missing from the local archive are downloaded
+    archive = archive or CandleArchive()
+    await archive.sync(client, symbol, tf, days)
+    return archive.backtest_candles([symbol], tf, days)[symbol]
 
 
 async def main():
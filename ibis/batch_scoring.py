@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""Vectorized batch scoring for the priority universe.
+
+Column-wise NumPy versions of the per-symbol maths in
+IBISTrueAgent.analyze_market_intelligence:
+
+1) Stack candles for all symbols into (symbols x bars) arrays per interval
+2) Momentum / volatility / trend / volume-momentum bundle (_analyze_candles)
+3) Technical, unified and funnel scores (UnifiedScorer)
+
+Rows are right-aligned: bar -1 of every symbol lives in the last column and
+shorter histories are NaN-padded on the left, so "n bars ago" is a single
+column gather for the whole universe.
+"""
+
+from dataclasses import dataclass
+from itertools import chain
+from operator import attrgetter
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+@dataclass
+class CandleBlock:
+    close: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    volume: np.ndarray
+    lengths: np.ndarray
+
+    @property
+    def bars(self) -> int:
+        return self.close.shape[1]
+
+    def at(self, bars_ago: int) -> np.ndarray:
+        """Value `bars_ago` bars before the last one (NaN where history is short)."""
+        col = self.bars - 1 - bars_ago
+        if col < 0:
+            return np.full(self.close.shape[0], np.nan)
+        return self.close[:, col]
+
+
+def stack_candles(series: Sequence[Sequence], bars: Optional[int] = None) -> CandleBlock:
+    """Right-align candle lists or CandleSeries (oldest -> newest) into a CandleBlock."""
+    n_sym = len(series)
+    lengths = np.array([len(s) if s else 0 for s in series], dtype=np.int64)
+    if bars is None:
+        bars = int(lengths.max()) if n_sym else 0
+    bars = max(bars, 1)
+
+    lengths = np.minimum(lengths, bars)
+    total = int(lengths.sum())
+    row_idx = np.repeat(np.arange(n_sym), lengths)
+    offsets = np.cumsum(lengths) - lengths
+    col_idx = np.arange(total) - np.repeat(offsets, lengths) + np.repeat(bars - lengths, lengths)
+
+    # Columnar series (CandleSeries) contribute column slices directly;
+    # candle lists go through one flat attribute gather over every bar
+    columnar = all(hasattr(s, "ohlcv") for s in series if s)
+    flat = [] if columnar else list(chain.from_iterable(s[-bars:] for s in series if s))
+
+    # One gather per field over every bar, then a single scatter into the padded block
+    fields = []
+    for name in ("close", "high", "low", "volume"):
+        field = np.full((n_sym, bars), np.nan)
+        if columnar:
+            if total:
+                field[row_idx, col_idx] = np.concatenate([s[name][-bars:] for s in series if s])
+        else:
+            field[row_idx, col_idx] = np.fromiter(map(attrgetter(name), flat), float, total)
+        fields.append(field)
+    close, high, low, volume = fields
+
+    return CandleBlock(close, high, low, volume, lengths)
+
+
+def _pct_change(last: np.ndarray, first: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    ok = valid & (first > 0)
+    out = np.zeros_like(last)
+    np.divide(last - first, first, out=out, where=ok)
+    return np.where(ok, out * 100.0, 0.0)
+
+
+def batch_volatility(block: CandleBlock) -> np.ndarray:
+    """Range volatility per row, as in IBISTrueAgent._calculate_volatility."""
+    counts = np.maximum(block.lengths, 1)
+    avg_price = np.nansum(block.close, axis=1) / counts
+    avg_range = np.nansum(block.high - block.low, axis=1) / counts
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vol = np.abs(avg_range / avg_price)
+    vol = np.clip(vol, 0.001, 0.20)
+    bad = (block.lengths == 0) | ~(avg_price > 0)
+    return np.where(bad, 0.02, vol)
+
+
+def batch_trend_strength(block: CandleBlock) -> np.ndarray:
+    """Regression-slope trend strength, as in IBISTrueAgent._calculate_trend_strength."""
+    n = block.lengths.astype(float)
+    x = np.arange(block.bars)[None, :] - (block.bars - block.lengths)[:, None]
+    mask = x >= 0
+    y = np.where(mask, block.close, 0.0)
+    xm = np.where(mask, x, 0).astype(float)
+
+    sum_x = xm.sum(axis=1)
+    sum_y = y.sum(axis=1)
+    sum_x_sq = (xm**2).sum(axis=1)
+    sum_xy = (xm * y).sum(axis=1)
+    denominator = n * sum_x_sq - sum_x**2
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = (n * sum_xy - sum_x * sum_y) / denominator
+        max_y = np.where(mask, block.close, -np.inf).max(axis=1)
+        strength = np.abs(slope) / max_y * 100
+
+    strength = np.minimum(strength, 100)
+    return np.where((block.lengths < 5) | (denominator == 0), 0.0, strength)
+
+
+def batch_momentum(block_1m: CandleBlock, block_5m: CandleBlock, block_15m: CandleBlock) -> Dict[str, np.ndarray]:
+    """Multi-timeframe momentum bundle from _analyze_candles, for every row at once."""
+    n1 = block_1m.lengths
+    rows = np.arange(len(n1))
+    has_1m = n1 >= 2
+
+    last = block_1m.at(0)
+    lookback = np.minimum(60, np.maximum(n1 - 1, 0))
+    first_col = np.clip(block_1m.bars - 1 - lookback, 0, None)
+    first = block_1m.close[rows, first_col]
+    momentum_1h_raw = _pct_change(last, first, has_1m)
+
+    momentum_15m = _pct_change(last, block_1m.at(15), has_1m & (n1 >= 16))
+    momentum_5m = _pct_change(last, block_1m.at(5), has_1m & (n1 >= 6))
+
+    volume_momentum = np.zeros(len(n1))
+    if block_1m.bars >= 20:
+        recent = np.nansum(block_1m.volume[:, -10:], axis=1)
+        prior = np.nansum(block_1m.volume[:, -20:-10], axis=1)
+        ok = has_1m & (n1 >= 20) & (prior > 0)
+        ratio = np.zeros_like(recent)
+        np.divide(recent, prior, out=ratio, where=ok)
+        volume_momentum = np.where(ok, (ratio - 1.0) * 100.0, 0.0)
+
+    confidence = (
+        np.minimum(1.0, n1 / 60.0) * 0.6
+        + np.minimum(1.0, block_5m.lengths / 12.0) * 0.25
+        + np.minimum(1.0, block_15m.lengths / 8.0) * 0.15
+    ) * 100.0
+    confidence = np.where(has_1m, confidence, 0.0)
+
+    # 5m candles override the 15m momentum when available
+    has_5m = block_5m.lengths >= 4
+    p15_5m = block_5m.at(3)
+    momentum_15m = np.where(
+        has_5m & (p15_5m > 0), _pct_change(block_5m.at(0), p15_5m, has_5m), momentum_15m
+    )
+
+    momentum_1h_raw = np.clip(momentum_1h_raw, -15.0, 15.0)
+    momentum_15m = np.clip(momentum_15m, -8.0, 8.0)
+    momentum_5m = np.clip(momentum_5m, -5.0, 5.0)
+    volume_momentum = np.clip(volume_momentum, -250.0, 250.0)
+
+    raw_composite = 0.45 * momentum_1h_raw + 0.35 * momentum_15m + 0.20 * momentum_5m
+    alpha = np.clip(confidence / 100.0, 0.25, 1.0)
+
+    return {
+        "momentum_1h_raw": momentum_1h_raw,
+        "momentum_15m": momentum_15m,
+        "momentum_5m": momentum_5m,
+        "volume_momentum": volume_momentum,
+        "momentum_confidence": confidence,
+        "momentum_composite": raw_composite * alpha,
+    }
+
+
+def batch_candle_features(
+    candles_1m: Sequence[Sequence],
+    candles_5m: Sequence[Sequence],
+    candles_15m: Sequence[Sequence],
+) -> Dict[str, np.ndarray]:
+    """Everything _analyze_candles derives numerically, one array per field."""
+    b1 = stack_candles(candles_1m)
+    b5 = stack_candles(candles_5m)
+    b15 = stack_candles(candles_15m)
+
+    features = batch_momentum(b1, b5, b15)
+    features["volatility_1m"] = batch_volatility(b1)
+    features["volatility_5m"] = batch_volatility(b5)
+    features["volatility_15m"] = batch_volatility(b15)
+    features["trend_strength"] = batch_trend_strength(b15)
+    return features
+
+
+# ----------------------------------------------------------------------
+# Scores
+# ----------------------------------------------------------------------
+
+
+def batch_technical_score(
+    momentum_1h: np.ndarray,
+    change_24h: np.ndarray,
+    volatility=0.05,
+    volume_24h=0.0,
+) -> np.ndarray:
+    """UnifiedScorer.calculate_technical_score over arrays."""
+    momentum_1h = np.asarray(momentum_1h, dtype=float)
+    volatility = np.broadcast_to(np.asarray(volatility, dtype=float), momentum_1h.shape)
+    volume_24h = np.broadcast_to(np.asarray(volume_24h, dtype=float), momentum_1h.shape)
+
+    momentum_score = np.clip(momentum_1h * 25, -25, 25)
+    change_score = np.clip(np.asarray(change_24h, dtype=float) * 6, -30, 30)
+    vol_score = np.select(
+        [(volatility >= 0.03) & (volatility <= 0.08), volatility < 0.03, volatility > 0.15],
+        [15.0, 10.0, -10.0],
+        default=5.0,
+    )
+    vol_ratio = np.minimum(volume_24h / 10000, 1000000 / 10000)
+    volume_score = np.where(volume_24h > 0, np.minimum(vol_ratio * 50, 100) * 0.2, 0.0)
+
+    return np.clip(50 + momentum_score + change_score + vol_score + volume_score, 0, 100)
+
+
+def batch_liquidity_score(volume_24h: np.ndarray) -> np.ndarray:
+    """IBISTrueAgent._calculate_liquidity_score over arrays."""
+    v = np.asarray(volume_24h, dtype=float)
+    return np.select(
+        [v > 5000000, v > 1000000, v > 500000, v > 100000], [95.0, 85.0, 75.0, 60.0], default=40.0
+    )
+
+
+def batch_unified_score(
+    technical: np.ndarray,
+    agi: np.ndarray,
+    mtf: np.ndarray,
+    volume: np.ndarray,
+    sentiment: np.ndarray,
+    symbols: Sequence[str],
+    regime_config,
+    altcoin_season_index: float = 50,
+    eth_gas_score: float = 50,
+) -> Dict[str, np.ndarray]:
+    """UnifiedScorer.calculate_unified_score over arrays (score and confidence)."""
+    n = len(symbols)
+    scores = np.vstack([np.broadcast_to(np.asarray(s, dtype=float), (n,)) for s in
+                        (technical, agi, mtf, volume, sentiment)])
+    weights = np.array(
+        [
+            regime_config.technical_weight,
+            regime_config.agi_weight,
+            regime_config.mtf_weight,
+            regime_config.volume_weight,
+            regime_config.sentiment_weight,
+        ]
+    )
+    unified = weights @ scores
+
+    lower = np.array([s.lower() for s in symbols])
+    if altcoin_season_index >= 70:
+        alt_bonus = 10
+    elif altcoin_season_index >= 60:
+        alt_bonus = 5
+    elif altcoin_season_index <= 35:
+        alt_bonus = -5
+    else:
+        alt_bonus = 0
+    if eth_gas_score >= 70:
+        eth_bonus = 5
+    elif eth_gas_score <= 35:
+        eth_bonus = -5
+    else:
+        eth_bonus = 0
+    bonus = np.where(lower == "eth", eth_bonus, np.where(lower == "btc", 0, alt_bonus))
+
+    final = np.clip(unified + bonus, 0, 100)
+    consistency = np.clip(100 - scores.std(axis=0) * 2, 0, 100)
+    weight_consistency = (weights[:, None] * scores / 100).sum(axis=0)
+    confidence = np.clip(consistency * 0.6 + weight_consistency * 40, 0, 100)
+
+    return {"score": np.round(final, 2), "confidence": np.round(confidence, 2)}
+
+
+def batch_funnel_score(
+    volume_24h: np.ndarray,
+    volatility: np.ndarray,
+    change_24h: np.ndarray,
+    momentum_1h: np.ndarray,
+    technical_score: np.ndarray,
+    agi_score: np.ndarray,
+    spread: np.ndarray,
+) -> np.ndarray:
+    """UnifiedScorer.calculate_funnel_score over arrays."""
+    volume_24h = np.asarray(volume_24h, dtype=float)
+    volatility = np.asarray(volatility, dtype=float)
+    abs_change = np.abs(np.asarray(change_24h, dtype=float))
+    abs_mom = np.abs(np.asarray(momentum_1h, dtype=float))
+    spread = np.asarray(spread, dtype=float)
+
+    score = np.full(volume_24h.shape, 50.0)
+    score += np.select([volume_24h > 1000000, volume_24h > 100000, volume_24h > 10000], [20, 15, 10], 0)
+    score += np.select(
+        [(volatility > 0.03) & (volatility < 0.15), (volatility > 0.02) & (volatility < 0.20)],
+        [10, 5],
+        0,
+    )
+    score += np.select([abs_change > 3, abs_change > 1], [15, 10], 0)
+    score += np.select([abs_mom > 0.5, abs_mom > 0.2], [10, 5], 0)
+    score += (np.asarray(technical_score, dtype=float) - 50) * 0.1
+    score += (np.asarray(agi_score, dtype=float) - 50) * 0.1
+    score += np.select([spread < 0.01, spread < 0.02], [10, 5], 0)
+    return np.clip(score, 0, 100)
+
+
+def row(features: Dict[str, np.ndarray], i: int) -> Dict[str, float]:
+    """Plain-float view of row i of a feature dict."""
+    return {k: float(v[i]) for k, v in features.items()}
@@ -0,0 +1,111 @@
+"""
+IBIS JSON Codec
+Pluggable JSON backend (orjson, msgspec or stdlib) for hot decode/encode paths
+"""
+
+import json
+import os
+from typing import Any, Union
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+
+def _select_backend() -> str:
+    """IBIS_JSON_BACKEND=orjson|msgspec|stdlib forces a backend; else fastest installed."""
+    forced = os.environ.get("IBIS_JSON_BACKEND", "").strip().lower()
+    available = {"orjson": ORJSON_AVAILABLE, "msgspec": MSGSPEC_AVAILABLE, "stdlib": True}
+    if available.get(forced):
+        return forced
+    if ORJSON_AVAILABLE:
+        return "orjson"
+    if MSGSPEC_AVAILABLE:
+        return "msgspec"
+    return "stdlib"
+
+
+BACKEND = _select_backend()
+
+if ORJSON_AVAILABLE:
+    # Match json.dumps(default=str): int keys become strings, datetimes and
+    # dataclasses go through str() instead of orjson's native formats
+    _ORJSON_OPTS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_SERIALIZE_NUMPY
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+
+def _enc_hook(obj: Any) -> Any:
+    # NumPy scalars encode as numbers (orjson's OPT_SERIALIZE_NUMPY) on every
+    # backend, anything else through str()
+    item = getattr(obj, "item", None)
+    if callable(item):
+        try:
+            return item()
+        except (TypeError, ValueError):
+            pass
+    return str(obj)
+
+
+if MSGSPEC_AVAILABLE:
+    _MSGSPEC_ENCODER = msgspec.json.Encoder(enc_hook=_enc_hook)
+    _MSGSPEC_DECODER = msgspec.json.Decoder()
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decode JSON from bytes or str.
+
+    Files written by json.dump may contain NaN/Infinity, which the fast
+    backends reject; those fall back to the stdlib so old state still loads.
+    Anything the stdlib also rejects raises ValueError as json.loads does.
+    """
+    if BACKEND == "orjson":
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            return json.loads(data)
+    if BACKEND == "msgspec":
+        try:
+            return _MSGSPEC_DECODER.decode(data)
+        except ValueError:
+            return json.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Encode to UTF-8 JSON bytes; compact by default, 2-space indent on request.
+
+    Values the backend cannot encode natively are passed through str(), as
+    with json.dumps(default=str).
+    """
+    if BACKEND == "orjson":
+        try:
+            return orjson.dumps(
+                obj, default=str, option=_ORJSON_OPTS | (orjson.OPT_INDENT_2 if indent else 0)
+            )
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits
+    elif BACKEND == "msgspec":
+        try:
+            encoded = _MSGSPEC_ENCODER.encode(obj)
+            return msgspec.json.format(encoded, indent=2) if indent else encoded
+        except (TypeError, ValueError, OverflowError):
+            pass
+    if indent:
+        return json.dumps(obj, indent=2, default=_enc_hook).encode()
+    return json.dumps(obj, separators=(",", ":"), default=_enc_hook).encode()
@@ -0,0 +1,240 @@
+"""
+IBIS Fee Model
+Rolling per-symbol maker/taker fee rates kept incrementally from fills
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from ibis.core.logging_config import get_logger
+from ibis.core.trading_constants import TRADING
+
+logger = get_logger(__name__)
+
+DEFAULT_HALF_LIFE_DAYS = 7.0
+
+_SUM_FIELDS = ("fee", "funds", "maker_fee", "maker_funds", "taker_fee", "taker_funds")
+
+
+def _base_symbol(symbol: str) -> str:
+    """SOL-USDT / SOL-USDC / SOL -> SOL (the key IbisDB and the agent use)"""
+    symbol = str(symbol or "").strip()
+    if symbol.endswith("-USDT") or symbol.endswith("-USDC"):
+        return symbol[:-5]
+    return symbol
+
+
+def _history_ts_ms(value) -> int:
+    """fee_history.timestamp (SQLite CURRENT_TIMESTAMP, UTC) -> epoch ms"""
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except (TypeError, ValueError):
+        return 0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+
+class _SymbolFees:
+    """Exponentially decayed fee and funds sums for one symbol, anchored at last_ts"""
+
+    __slots__ = _SUM_FIELDS + ("count", "last_ts")
+
+    def __init__(self):
+        for name in _SUM_FIELDS:
+            setattr(self, name, 0.0)
+        self.count = 0
+        self.last_ts = 0
+
+    def add(self, fee: float, funds: float, ts: int, liquidity: Optional[str], half_life_ms: float):
+        if ts >= self.last_ts:
+            decay = 0.5 ** ((ts - self.last_ts) / half_life_ms) if self.count else 1.0
+            for name in _SUM_FIELDS:
+                setattr(self, name, getattr(self, name) * decay)
+            weight = 1.0
+            self.last_ts = ts
+        else:
+            # A fill older than the anchor only adds its already-decayed weight
+            weight = 0.5 ** ((self.last_ts - ts) / half_life_ms)
+
+        fee, funds = fee * weight, funds * weight
+        self.fee += fee
+        self.funds += funds
+        # Fills without a liquidity flag count toward both sides
+        if liquidity != "taker":
+            self.maker_fee += fee
+            self.maker_funds += funds
+        if liquidity != "maker":
+            self.taker_fee += fee
+            self.taker_funds += funds
+        self.count += 1
+
+    def rates(self) -> Dict[str, float]:
+        rate = self.fee / self.funds if self.funds > 0 else 0.0
+        maker = self.maker_fee / self.maker_funds if self.maker_funds > 0 else rate
+        taker = self.taker_fee / self.taker_funds if self.taker_funds > 0 else rate
+        return {
+            "rate": rate,
+            "maker": maker,
+            "taker": taker,
+            "friction": (maker + taker) / 2 + TRADING.EXCHANGE.ESTIMATED_SLIPPAGE,
+            "count": self.count,
+        }
+
+    def row(self, symbol: str) -> Dict:
+        return {"symbol": symbol, "fill_count": self.count, "last_ts": self.last_ts,
+                **{name: getattr(self, name) for name in _SUM_FIELDS}}
+
+    @classmethod
+    def from_row(cls, row) -> "_SymbolFees":
+        fees = cls()
+        for name in _SUM_FIELDS:
+            setattr(fees, name, float(row[name] or 0.0))
+        fees.count = int(row["fill_count"] or 0)
+        fees.last_ts = int(row["last_ts"] or 0)
+        return fees
+
+
+class FeeModel:
+    """
+    One source of per-symbol fee rates for risk sizing, the agent's fee
+    blocklist and the PnL tracker.
+
+    Fills are folded in as they arrive (subscribe `record_fills` to the
+    FillIngestor): each symbol keeps value-weighted fee/funds sums, overall
+    and split by the fill's maker/taker liquidity, decayed with a half-life
+    so recent executions dominate. The derived rates are cached per symbol,
+    so `rates()` and `get_total_friction()` are dictionary lookups. With a
+    database the decayed sums are materialized in IbisDB's fee_stats table;
+    an empty table is seeded once from fee_history.
+    """
+
+    def __init__(self, db=None, half_life_days: float = DEFAULT_HALF_LIFE_DAYS):
+        self.db = db
+        self.half_life_ms = half_life_days * 24 * 3600 * 1000
+        self._symbols: Dict[str, _SymbolFees] = {}
+        self._rates: Dict[str, Dict[str, float]] = {}
+        self._profile: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+        self.stats = {"fills": 0, "skipped": 0, "rows_persisted": 0, "seeded_from_history": 0}
+        if db is not None:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            rows = self.db.load_fee_stats()
+            if rows:
+                for row in rows:
+                    self._symbols[row["symbol"]] = _SymbolFees.from_row(row)
+                    self._refresh(row["symbol"])
+                return
+            touched = set()
+            for row in self.db.get_fee_history_rows():
+                symbol = self._add(row["symbol"], row["fee_amount"], row["trade_value"],
+                                   _history_ts_ms(row["timestamp"]), None)
+                if symbol:
+                    touched.add(symbol)
+            self.stats["seeded_from_history"] = self.stats["fills"]
+            self._persist(touched)
+        except Exception as e:
+            logger.error(f"Failed to load fee statistics: {e}")
+
+    def _add(self, symbol, fee, funds, ts: int, liquidity: Optional[str]) -> Optional[str]:
+        symbol = _base_symbol(symbol)
+        try:
+            fee, funds = float(fee or 0), float(funds or 0)
+        except (TypeError, ValueError):
+            fee, funds = 0.0, 0.0
+        if not symbol or funds <= 0 or fee < 0:
+            self.stats["skipped"] += 1
+            return None
+        fees = self._symbols.get(symbol)
+        if fees is None:
+            fees = self._symbols[symbol] = _SymbolFees()
+        fees.add(fee, funds, ts, liquidity, self.half_life_ms)
+        self.stats["fills"] += 1
+        return symbol
+
+    def _refresh(self, symbol: str) -> None:
+        rates = self._rates[symbol] = self._symbols[symbol].rates()
+        self._profile[symbol] = rates["rate"]
+        self._counts[symbol] = rates["count"]
+
+    def _persist(self, symbols: Iterable[str]) -> None:
+        symbols = list(symbols)
+        for symbol in symbols:
+            self._refresh(symbol)
+        if self.db is None or not symbols:
+            return
+        try:
+            self.db.upsert_fee_stats([self._symbols[s].row(s) for s in symbols])
+            self.stats["rows_persisted"] += len(symbols)
+        except Exception as e:
+            logger.error(f"Failed to persist fee statistics: {e}")
+
+    def record_fills(self, fills: List[Dict]) -> None:
+        """FillIngestor consumer: fold KuCoin fills into the per-symbol statistics"""
+        touched = set()
+        for fill in fills:
+            symbol = self._add(
+                fill.get("symbol"),
+                fill.get("fee"),
+                fill.get("funds"),
+                int(fill.get("createdAt", 0) or 0),
+                str(fill.get("liquidity") or "").lower() or None,
+            )
+            if symbol:
+                touched.add(symbol)
+        self._persist(touched)
+
+    def record_trades(self, trades: Iterable) -> None:
+        """Fold PnL tracker Trades (no liquidity flag) into the statistics"""
+        touched = set()
+        for trade in trades:
+            symbol = self._add(trade.symbol, trade.fee, trade.funds, int(trade.timestamp), None)
+            if symbol:
+                touched.add(symbol)
+        self._persist(touched)
+
+    def rates(self, symbol: str) -> Optional[Dict[str, float]]:
+        """{rate, maker, taker, friction, count} for symbol, or None without fills"""
+        return self._rates.get(_base_symbol(symbol))
+
+    def get_total_friction(self, symbol: str = None) -> float:
+        """Average per-side fee plus slippage, as TRADING.EXCHANGE.get_total_friction"""
+        rates = self._rates.get(_base_symbol(symbol)) if symbol else None
+        if rates is None:
+            return TRADING.EXCHANGE.get_total_friction(symbol)
+        return rates["friction"]
+
+    def profile(self) -> Dict[str, float]:
+        """symbol -> value-weighted fee rate per side (live view, do not mutate)"""
+        return self._profile
+
+    def counts(self) -> Dict[str, int]:
+        """symbol -> number of fills behind its rate (live view, do not mutate)"""
+        return self._counts
+
+    def per_symbol(self) -> Dict[str, Dict[str, float]]:
+        """symbol -> {maker, taker, count}, the shape update_symbol_fees callers expect"""
+        return {
+            symbol: {"maker": r["maker"], "taker": r["taker"], "count": r["count"]}
+            for symbol, r in self._rates.items()
+        }
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, "symbols": len(self._symbols)}
+
+
+_FEE_MODELS: Dict[str, FeeModel] = {}
+
+
+def get_fee_model(db=None) -> FeeModel:
+    """Shared FeeModel per database file (IbisDB's default database without one)"""
+    from ibis.database.db import DB_PATH, IbisDB
+
+    path = db.db_path if db is not None else DB_PATH
+    model = _FEE_MODELS.get(path)
+    if model is None:
+        model = _FEE_MODELS[path] = FeeModel(db if db is not None else IbisDB())
+    return model
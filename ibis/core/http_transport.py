@@ -0,0 +1,175 @@
+"""
+IBIS HTTP Transport
+One tuned aiohttp connection pool shared by every REST client in ibis/
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+import aiohttp
+from aiohttp.abc import AbstractResolver
+
+from ibis.core import codec
+
+
+async def read_json(resp: aiohttp.ClientResponse) -> Any:
+    """resp.json() without the charset sniffing and str round trip."""
+    return codec.loads(await resp.read())
+
+
+class HttpTransport:
+    """
+    Shared TCP connector plus per-component sessions on top of it.
+
+    Every session handed out by `session()` borrows the same connector, so
+    KuCoin, the intel feeds and the notifiers reuse warm keep-alive
+    connections and one TTL DNS cache instead of each owning a pool.
+    Closing a borrowed session leaves the pool open; `close()` shuts it.
+
+    Connection reuse, DNS cache hits and time-to-first-byte (request start
+    to response headers) are counted through an aiohttp TraceConfig.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 64,
+        ttl_dns_cache: int = 300,
+        keepalive_timeout: float = 30.0,
+        resolver: Optional[AbstractResolver] = None,
+        family: int = 0,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.ttl_dns_cache = ttl_dns_cache
+        self.keepalive_timeout = keepalive_timeout
+        self.resolver = resolver
+        self.family = family
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sessions = []
+        self.stats = {
+            "requests": 0,
+            "errors": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "dns_cache_hits": 0,
+            "dns_cache_misses": 0,
+            "ttfb_total_s": 0.0,
+            "ttfb_max_s": 0.0,
+        }
+        self._trace = self._trace_config()
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+        stats = self.stats
+
+        async def on_request_start(session, ctx, params):
+            ctx.started = time.perf_counter()
+            stats["requests"] += 1
+
+        async def on_request_end(session, ctx, params):
+            ttfb = time.perf_counter() - ctx.started
+            stats["ttfb_total_s"] += ttfb
+            stats["ttfb_max_s"] = max(stats["ttfb_max_s"], ttfb)
+
+        async def on_request_exception(session, ctx, params):
+            stats["errors"] += 1
+
+        async def on_connection_create_end(session, ctx, params):
+            stats["connections_created"] += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            stats["connections_reused"] += 1
+
+        async def on_dns_cache_hit(session, ctx, params):
+            stats["dns_cache_hits"] += 1
+
+        async def on_dns_cache_miss(session, ctx, params):
+            stats["dns_cache_misses"] += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_end.append(on_request_end)
+        trace.on_request_exception.append(on_request_exception)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace
+
+    def _get_connector(self) -> aiohttp.TCPConnector:
+        loop = asyncio.get_running_loop()
+        if self._connector is None or self._connector.closed or self._loop is not loop:
+            kwargs = {}
+            if self.resolver is not None:
+                kwargs["resolver"] = self.resolver
+            self._connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=self.ttl_dns_cache,
+                keepalive_timeout=self.keepalive_timeout,
+                family=self.family,
+                **kwargs,
+            )
+            self._loop = loop
+        return self._connector
+
+    def session(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[aiohttp.ClientTimeout] = None,
+    ) -> aiohttp.ClientSession:
+        """New ClientSession on the shared pool; must be created inside the event loop."""
+        kwargs = {}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        session = aiohttp.ClientSession(
+            connector=self._get_connector(),
+            connector_owner=False,
+            headers=headers,
+            trace_configs=[self._trace],
+            **kwargs,
+        )
+        self._sessions = [s for s in self._sessions if not s.closed]
+        self._sessions.append(session)
+        return session
+
+    async def close(self) -> None:
+        for session in self._sessions:
+            if not session.closed:
+                await session.close()
+        self._sessions = []
+        if self._connector is not None and not self._connector.closed:
+            await self._connector.close()
+        self._connector = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        created = stats["connections_created"]
+        reused = stats["connections_reused"]
+        requests = stats["requests"]
+        stats["reuse_rate"] = round(reused / (created + reused), 4) if created + reused else 0.0
+        ttfb_total = stats.pop("ttfb_total_s")
+        stats["ttfb_avg_ms"] = round(ttfb_total / requests * 1000, 3) if requests else 0.0
+        stats["ttfb_max_ms"] = round(stats.pop("ttfb_max_s") * 1000, 3)
+        stats["json_backend"] = codec.BACKEND
+        return stats
+
+
+_HTTP_TRANSPORT: Optional[HttpTransport] = None
+
+
+def get_http_transport() -> HttpTransport:
+    global _HTTP_TRANSPORT
+    if _HTTP_TRANSPORT is None:
+        _HTTP_TRANSPORT = HttpTransport()
+    return _HTTP_TRANSPORT
+
+
+async def close_http_transport() -> None:
+    global _HTTP_TRANSPORT
+    if _HTTP_TRANSPORT is not None:
+        await _HTTP_TRANSPORT.close()
+        _HTTP_TRANSPORT = None
@@ -3,15 +3,25 @@ Centralized logging configuration for the IBIS project.
 
 This module provides a single function to configure logging with best practices,
 including log rotation, file/console handlers, and structured logging support.
+
+Records are handed to a QueueHandler on the calling thread and written by one
+QueueListener thread, which drains the queue in batches and flushes each
+destination once per batch, so the event loop never waits on file or terminal
+I/O.
 """
 
+import atexit
 import logging
 import logging.config
 import os
-from typing import Optional
+import queue
+import sys
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
 import json
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 
 class JSONFormatter(logging.Formatter):
@@ -30,6 +40,8 @@ class JSONFormatter(logging.Formatter):
 
         if record.exc_info:
             log_record["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:  # already rendered by the queue handler
+            log_record["exc_info"] = record.exc_text
 
         if record.stack_info:
             log_record["stack_info"] = self.formatStack(record.stack_info)
@@ -37,12 +49,265 @@ class JSONFormatter(logging.Formatter):
         return json.dumps(log_record)
 
 
+class CompactJSONFormatter(logging.Formatter):
+    """One short-keyed JSON object per line, plus any `fields` passed via extra."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        log_record = {
+            "t": round(record.created, 3),
+            "l": record.levelname[0],
+            "n": record.name,
+            "m": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            log_record.update(fields)
+        if record.exc_info:
+            log_record["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_record["exc"] = record.exc_text
+        return json.dumps(log_record, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class DebugRateLimitFilter(logging.Filter):
+    """Pass at most one DEBUG record per call site (file, line) per interval."""
+
+    def __init__(self, interval: float = 1.0):
+        super().__init__()
+        self.interval = interval
+        self._last: Dict[Tuple[str, int], float] = {}
+        self.suppressed = 0
+
+    def allow(self, site: Tuple[str, int], now: float) -> bool:
+        last = self._last.get(site)
+        if last is not None and now - last < self.interval:
+            self.suppressed += 1
+            return False
+        self._last[site] = now
+        return True
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.interval <= 0:
+            return True
+        return self.allow((record.pathname, record.lineno), record.created)
+
+
+class _BatchFlush:
+    """Handler mixin: emit() leaves the flush to the listener, once per batch."""
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        self.acquire()
+        try:
+            stream = getattr(self, "stream", None)
+            if stream and hasattr(stream, "flush"):
+                stream.flush()
+        finally:
+            self.release()
+
+
+class BatchRotatingFileHandler(_BatchFlush, RotatingFileHandler):
+    pass
+
+
+class BatchFileHandler(_BatchFlush, logging.FileHandler):
+    pass
+
+
+class BatchStreamHandler(_BatchFlush, logging.StreamHandler):
+    pass
+
+
+class _StdStreamHandler(BatchStreamHandler):
+    """Writes to whatever sys.stdout/sys.stderr is when the record is written, like print()."""
+
+    def __init__(self, name: str = "stderr"):
+        self.stream_name = name
+        super().__init__()
+
+    @property
+    def stream(self):
+        return getattr(sys, self.stream_name)
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class _RoutedQueueHandler(QueueHandler):
+    """Enqueues records tagged with the route whose handlers should write them."""
+
+    def __init__(self, log_queue, route: str):
+        super().__init__(log_queue)
+        self.route = route
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # The queue is thread-safe; skip the per-handler lock Handler.handle takes
+        if not self.filter(record):
+            return False
+        self.emit(record)
+        return True
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Unlike the base prepare(), neither copy nor format the record on the
+        # caller's thread: only merge the args, which may be mutated after the call
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        record.ibis_route = self.route
+        return record
+
+
+class BatchingQueueListener(QueueListener):
+    """QueueListener that drains up to batch_size records, then flushes once."""
+
+    def __init__(self, log_queue, batch_size: int = 512, linger: float = 0.05):
+        super().__init__(log_queue, respect_handler_level=True)
+        self.batch_size = batch_size
+        self.linger = linger
+        self.routes: Dict[str, Sequence[logging.Handler]] = {}
+        self.lock = threading.Lock()
+        self.stats = {"records": 0, "batches": 0, "max_batch": 0, "handler_errors": 0}
+
+    def handle(self, record: logging.LogRecord) -> None:
+        for handler in self.routes.get(getattr(record, "ibis_route", ""), ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def _collect(self) -> list:
+        """Block for one item, then keep taking items for up to `linger` seconds"""
+        batch = [self.dequeue(True)]
+        deadline = time.monotonic() + self.linger
+        while len(batch) < self.batch_size and isinstance(batch[-1], logging.LogRecord):
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self.queue.get(remaining > 0, max(remaining, 0)))
+            except queue.Empty:
+                break
+        return batch
+
+    def _monitor(self):
+        while True:
+            batch = self._collect()
+            records = [r for r in batch if isinstance(r, logging.LogRecord)]
+            with self.lock:
+                for record in records:
+                    try:
+                        self.handle(record)
+                    except Exception:
+                        self.stats["handler_errors"] += 1
+                for handlers in self.routes.values():
+                    for handler in handlers:
+                        try:
+                            if isinstance(handler, _BatchFlush):
+                                handler.flush_batch()
+                            else:
+                                handler.flush()
+                        except Exception:
+                            self.stats["handler_errors"] += 1
+            self.stats["records"] += len(records)
+            self.stats["batches"] += 1
+            self.stats["max_batch"] = max(self.stats["max_batch"], len(records))
+            for marker in batch:
+                if isinstance(marker, threading.Event):
+                    marker.set()
+            if any(r is self._sentinel for r in batch):
+                break
+
+
+class LogPipeline:
+    """
+    The process-wide queue, its listener thread and the routed destinations.
+
+    Loggers get a `queue_handler(route)`; `set_routes({route: handlers})` names
+    the handlers that write that route's records. DEBUG records pass a
+    per-call-site rate limit before they are even enqueued.
+    """
+
+    def __init__(self, batch_size: int = 512, linger: float = 0.05, debug_interval: float = 1.0):
+        self.queue = queue.SimpleQueue()
+        self.listener = BatchingQueueListener(self.queue, batch_size, linger)
+        self.rate_limit = DebugRateLimitFilter(debug_interval)
+        self.compact = False
+        self._queue_handlers: Dict[str, _RoutedQueueHandler] = {}
+        self._started = False
+
+    def start(self) -> None:
+        if not self._started:
+            self.listener.start()
+            self._started = True
+
+    def stop(self) -> None:
+        """Write everything queued so far and stop the listener thread."""
+        if self._started:
+            self.listener.stop()
+            self._started = False
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued before the call has been written."""
+        if not self._started:
+            return True
+        written = threading.Event()
+        self.queue.put(written)
+        return written.wait(timeout)
+
+    def queue_handler(self, route: str = "", rate_limited: bool = True) -> QueueHandler:
+        handler = self._queue_handlers.get(route)
+        if handler is None:
+            handler = self._queue_handlers[route] = _RoutedQueueHandler(self.queue, route)
+            if rate_limited:
+                handler.addFilter(self.rate_limit)
+        self.start()
+        return handler
+
+    def set_routes(self, routes: Dict[str, Sequence[logging.Handler]]) -> None:
+        """Swap the handlers of the given routes, closing ones no route uses any more"""
+        with self.listener.lock:
+            old = self.listener.routes
+            self.listener.routes = {**old, **{route: tuple(h) for route, h in routes.items()}}
+            in_use = {h for handlers in self.listener.routes.values() for h in handlers}
+            for handler in {h for handlers in old.values() for h in handlers} - in_use:
+                handler.close()
+
+    def get_route(self, route: str) -> Sequence[logging.Handler]:
+        return self.listener.routes.get(route, ())
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.listener.stats,
+            "queued": self.queue.qsize(),
+            "debug_suppressed": self.rate_limit.suppressed,
+            "running": self._started,
+        }
+
+
+_PIPELINE: Optional[LogPipeline] = None
+
+
+def get_log_pipeline() -> LogPipeline:
+    global _PIPELINE
+    if _PIPELINE is None:
+        _PIPELINE = LogPipeline()
+        # Registered after logging's own atexit hook, so it runs first
+        atexit.register(_PIPELINE.stop)
+    return _PIPELINE
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    return os.environ.get(name, str(default)).lower() == "true"
+
+
 def configure_logging(
     log_level: str = "INFO",
     log_dir: str = "logs",
     json_logging: bool = False,
     max_bytes: int = 10 * 1024 * 1024,  # 10MB
     backup_count: int = 5,
+    compact: bool = False,
+    queued: bool = True,
+    debug_interval: float = 1.0,
 ) -> None:
     """
     Configure logging with best practices.
@@ -53,16 +318,25 @@ def configure_logging(
         json_logging: Whether to use JSON structured logging
         max_bytes: Maximum size of each log file before rotation
         backup_count: Number of backup log files to keep
+        compact: Whether to write compact one-line JSON records (short keys)
+        queued: Whether to write through the background queue listener
+        debug_interval: Minimum seconds between DEBUG records from one call site
 
     Environment variables:
         IBIS_LOG_LEVEL: Overrides log_level parameter
         IBIS_LOG_DIR: Overrides log_dir parameter
         IBIS_JSON_LOGGING: Overrides json_logging parameter (true/false)
+        IBIS_LOG_COMPACT: Overrides compact parameter (true/false)
+        IBIS_LOG_QUEUED: Overrides queued parameter (true/false)
+        IBIS_LOG_DEBUG_INTERVAL: Overrides debug_interval parameter
     """
     # Read environment variables for configuration
     log_level = os.environ.get("IBIS_LOG_LEVEL", log_level).upper()
     log_dir = os.environ.get("IBIS_LOG_DIR", log_dir)
-    json_logging = os.environ.get("IBIS_JSON_LOGGING", str(json_logging)).lower() == "true"
+    json_logging = _env_flag("IBIS_JSON_LOGGING", json_logging)
+    compact = _env_flag("IBIS_LOG_COMPACT", compact)
+    queued = _env_flag("IBIS_LOG_QUEUED", queued)
+    debug_interval = float(os.environ.get("IBIS_LOG_DEBUG_INTERVAL", debug_interval))
 
     # Create log directory if it doesn't exist
     os.makedirs(log_dir, exist_ok=True)
@@ -77,7 +351,7 @@ def configure_logging(
 
     # File handler with rotation
     log_file = os.path.join(log_dir, "ibis.log")
-    file_handler = RotatingFileHandler(
+    file_handler = (BatchRotatingFileHandler if queued else RotatingFileHandler)(
         log_file,
         maxBytes=max_bytes,
         backupCount=backup_count,
@@ -85,10 +359,13 @@ def configure_logging(
     )
 
     # Console handler
-    console_handler = logging.StreamHandler()
+    console_handler = _StdStreamHandler() if queued else logging.StreamHandler()
 
     # Choose formatter based on logging type
-    if json_logging:
+    if compact:
+        file_formatter = CompactJSONFormatter()
+        console_formatter = CompactJSONFormatter()
+    elif json_logging:
         file_formatter = JSONFormatter()
         console_formatter = JSONFormatter()
     else:
@@ -100,9 +377,17 @@ def configure_logging(
     file_handler.setFormatter(file_formatter)
     console_handler.setFormatter(console_formatter)
 
-    # Add handlers to root logger
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    # Add handlers to root logger, behind the queue unless disabled
+    if queued:
+        pipeline = get_log_pipeline()
+        pipeline.rate_limit.interval = debug_interval
+        pipeline.compact = compact
+        pipeline.set_routes({"": (file_handler, console_handler)})
+        root_handlers = (pipeline.queue_handler(""),)
+    else:
+        root_handlers = (file_handler, console_handler)
+    for handler in root_handlers:
+        root_logger.addHandler(handler)
 
     # Configure log levels for external libraries
     external_loggers = {
@@ -118,19 +403,94 @@ def configure_logging(
         # Prevent external loggers from propagating to root logger
         logger.propagate = False
         # Add handlers to external loggers
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        for handler in logger.handlers[:]:
+            logger.removeHandler(handler)
+        for handler in root_handlers:
+            logger.addHandler(handler)
 
     # Log configuration details
     root_logger.info("Logging configured successfully")
     root_logger.debug(
-        "Logging configuration: log_level=%s, log_dir=%s, json_logging=%s",
+        "Logging configuration: log_level=%s, log_dir=%s, json_logging=%s, compact=%s, queued=%s",
         log_level,
         log_dir,
         json_logging,
+        compact,
+        queued,
     )
 
 
+class EventLog:
+    """
+    The agent's log_event(msg, level=INFO, **fields) as a callable.
+
+    Records carry the caller's file and line from one frame lookup instead
+    of Logger.findCaller's stack walk, and DEBUG lines over the call-site
+    rate limit are dropped before a record is built.
+    """
+
+    __slots__ = ("logger", "rate_limit")
+
+    def __init__(self, logger: logging.Logger, rate_limit: DebugRateLimitFilter):
+        self.logger = logger
+        self.rate_limit = rate_limit
+
+    def __call__(self, msg: str, level: int = logging.INFO, **fields) -> None:
+        frame = sys._getframe(1)
+        code = frame.f_code
+        if (
+            level <= logging.DEBUG
+            and self.rate_limit.interval > 0
+            and not self.rate_limit.allow((code.co_filename, frame.f_lineno), time.time())
+        ):
+            return
+        logger = self.logger
+        if logger.isEnabledFor(level):
+            logger.handle(
+                logger.makeRecord(
+                    logger.name, level, code.co_filename, frame.f_lineno, msg, None, None,
+                    code.co_name, {"fields": fields} if fields else None,
+                )
+            )
+
+
+def get_event_log(log_file: str, echo: bool = False) -> EventLog:
+    """
+    log_event for the agent's "[timestamp] message" event log (ibis_true.log).
+
+    Records go through the shared queue and are appended to log_file by the
+    listener thread; with echo the message is also written to stdout, as the
+    print() next to the old inline file appends did. The loggers stay at
+    DEBUG, so per-symbol debug lines are bounded by the call-site rate limit.
+    """
+    pipeline = get_log_pipeline()
+    route = "events.echo" if echo else "events"
+    logger = logging.getLogger("ibis." + route)
+
+    current = pipeline.get_route("events")
+    if not current or getattr(current[0], "baseFilename", None) != os.path.abspath(log_file):
+        directory = os.path.dirname(log_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        file_handler = BatchFileHandler(log_file, encoding="utf-8", delay=True)
+        if pipeline.compact:
+            file_handler.setFormatter(CompactJSONFormatter())
+        else:
+            file_handler.setFormatter(
+                logging.Formatter("[%(asctime)s] %(message)s", "%Y-%m-%d %H:%M:%S")
+            )
+        stdout_handler = _StdStreamHandler("stdout")
+        stdout_handler.setFormatter(logging.Formatter("%(message)s"))
+        pipeline.set_routes({"events": (file_handler,), "events.echo": (file_handler, stdout_handler)})
+
+    if not logger.handlers:
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        # Rate limited in EventLog, before the record exists
+        logger.addHandler(pipeline.queue_handler(route, rate_limited=False))
+    return EventLog(logger, pipeline.rate_limit)
+
+
 # Convenience function to get a logger
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """
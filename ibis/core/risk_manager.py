@@ -116,26 +116,28 @@ class RiskManager:
         self.db = db
 
     def update_fee_rates(self, days: int = 7):
-        """Update fee rates from database and trading constants (last N days)"""
+        """Push the fee model's per-symbol rates into the trading constants
+
+        The model decays fills with a half-life instead of a hard N-day window;
+        `days` is kept for callers.
+        """
         if self.db:
-            # This will ensure TRADING constants are updated with latest fees from DB
+            from ibis.core.fee_model import get_fee_model
             from ibis.core.trading_constants import TRADING
 
-            symbol_fees = self.db.get_average_fees_per_symbol(days)
+            symbol_fees = get_fee_model(self.db).per_symbol()
 
             for symbol, fees in symbol_fees.items():
                 TRADING.EXCHANGE.update_symbol_fees(symbol, fees["maker"], fees["taker"])
 
-            logger.info(
-                f"Updated dynamic fees for {len(symbol_fees)} symbols from database (last {days} days)"
-            )
+            logger.info(f"Updated dynamic fees for {len(symbol_fees)} symbols from the fee model")
 
     def _get_fee_rates(self, symbol: str, days: int = 7):
-        """Get fee rates for symbol, using database if available (last 7 days), fallback to TRADING constants
+        """Get fee rates for symbol from the fee model if a database is set, fallback to TRADING constants
 
         Args:
             symbol: Trading symbol
-            days: Number of days to look back for fee history
+            days: Kept for callers; the fee model weights fills by a half-life instead
 
         Returns:
             Dictionary with "maker", "taker", and "count" fields
@@ -154,8 +156,10 @@ class RiskManager:
 
         if self.db:
             try:
-                db_fees = self.db.get_average_fee_rate(symbol, days)
-                if db_fees["count"] > 0:
+                from ibis.core.fee_model import get_fee_model
+
+                db_fees = get_fee_model(self.db).rates(symbol)
+                if db_fees and db_fees["count"] > 0:
                     # Validate fee rates - clamp to realistic range (0.01% to 0.1%)
                     valid_maker = max(MIN_FEE_RATE, min(MAX_FEE_RATE, db_fees["maker"]))
                     valid_taker = max(MIN_FEE_RATE, min(MAX_FEE_RATE, db_fees["taker"]))
@@ -164,7 +168,7 @@ class RiskManager:
                             f"Invalid fee rates for {symbol}: maker={db_fees['maker']:.4f}, taker={db_fees['taker']:.4f} - clamped to valid range ({MIN_FEE_RATE:.4f} to {MAX_FEE_RATE:.4f})"
                         )
                     logger.debug(
-                        f"Using database fee rates for {symbol}: maker={valid_maker:.4f}, taker={valid_taker:.4f} (count={db_fees['count']})"
+                        f"Using fee model rates for {symbol}: maker={valid_maker:.4f}, taker={valid_taker:.4f} (count={db_fees['count']})"
                     )
                     return {
                         "maker": valid_maker,
@@ -172,7 +176,7 @@ class RiskManager:
                         "count": db_fees["count"],
                     }
             except Exception as e:
-                logger.error(f"Failed to get fee rates from database: {e}")
+                logger.error(f"Failed to get fee rates from fee model: {e}")
 
         # Fall back to TRADING constants (which may have dynamic rates)
         try:
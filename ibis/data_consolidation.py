@@ -7,7 +7,6 @@ SQLite DB is used for position_rotation.py and analytics
 This layer syncs data bidirectionally without losing information.
 """
 
-import json
 import os
 import fcntl
 from datetime import datetime
@@ -15,6 +14,7 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 from ibis.core.logging_config import get_logger
+from ibis.state_persistence import read_state, write_state
 
 logger = get_logger(__name__)
 
@@ -26,15 +26,14 @@ DB_LOCK_FILE = "/root/projects/Dont enter unless solicited/AGI Trader/data/ibis_
 
 
 def load_state() -> Dict:
-    """Load JSON state file."""
-    if not Path(STATE_FILE).exists():
+    """Load JSON state: the snapshot plus the agent's journal tail."""
+    if not Path(STATE_FILE).exists() and not Path(f"{STATE_FILE}.journal").exists():
         return {"positions": {}, "daily": {}, "capital_awareness": {}}
     try:
         os.makedirs(os.path.dirname(STATE_LOCK_FILE), exist_ok=True)
         with open(STATE_LOCK_FILE, "w") as lock_f:
             fcntl.flock(lock_f, fcntl.LOCK_SH)
-            with open(STATE_FILE, "r") as f:
-                state = json.load(f)
+            state = read_state(STATE_FILE)
             fcntl.flock(lock_f, fcntl.LOCK_UN)
             return state
     except:
@@ -42,18 +41,13 @@ def load_state() -> Dict:
 
 
 def save_state(state: Dict) -> bool:
-    """Save JSON state file."""
+    """Save JSON state as a new snapshot that supersedes the agent's journal."""
     try:
         os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
         os.makedirs(os.path.dirname(STATE_LOCK_FILE), exist_ok=True)
         with open(STATE_LOCK_FILE, "w") as lock_f:
             fcntl.flock(lock_f, fcntl.LOCK_EX)
-            tmp_path = f"{STATE_FILE}.tmp"
-            with open(tmp_path, "w") as f:
-                json.dump(state, f, indent=2, default=str)
-                f.flush()
-                os.fsync(f.fileno())
-            os.replace(tmp_path, STATE_FILE)
+            write_state(STATE_FILE, state)
             fcntl.flock(lock_f, fcntl.LOCK_UN)
         return True
     except Exception as e:
@@ -62,7 +56,7 @@ def save_state(state: Dict) -> bool:
 
 
 def load_memory() -> Dict:
-    """Load JSON memory file."""
+    """Load JSON memory: the snapshot plus the agent's journal tail."""
     default_memory = {
         "learned_regimes": {"avoid": "UNKNOWN", "best": "UNKNOWN"},
         "performance_by_symbol": {},
@@ -70,21 +64,19 @@ def load_memory() -> Dict:
         "adaptation_history": [],
         "total_cycles": 0,
     }
-    if not Path(MEMORY_FILE).exists():
+    if not Path(MEMORY_FILE).exists() and not Path(f"{MEMORY_FILE}.journal").exists():
         return default_memory
     try:
-        with open(MEMORY_FILE, "r") as f:
-            return json.load(f)
+        return read_state(MEMORY_FILE)
     except:
         return default_memory
 
 
 def save_memory(memory: Dict) -> bool:
-    """Save JSON memory file."""
+    """Save JSON memory as a new snapshot that supersedes the agent's journal."""
     try:
         os.makedirs(os.path.dirname(MEMORY_FILE), exist_ok=True)
-        with open(MEMORY_FILE, "w") as f:
-            json.dump(memory, f, indent=2, default=str)
+        write_state(MEMORY_FILE, memory)
         return True
     except Exception as e:
         logger.error(f"Error saving memory: {e}", exc_info=True)
@@ -103,6 +103,19 @@ class IbisDB:
                 timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             );
 
+            CREATE TABLE IF NOT EXISTS fee_stats (
+                symbol TEXT PRIMARY KEY,
+                fee REAL NOT NULL DEFAULT 0,
+                funds REAL NOT NULL DEFAULT 0,
+                maker_fee REAL NOT NULL DEFAULT 0,
+                maker_funds REAL NOT NULL DEFAULT 0,
+                taker_fee REAL NOT NULL DEFAULT 0,
+                taker_funds REAL NOT NULL DEFAULT 0,
+                fill_count INTEGER NOT NULL DEFAULT 0,
+                last_ts INTEGER NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+
             CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(symbol);
             CREATE INDEX IF NOT EXISTS idx_fee_history_symbol ON fee_history(symbol);
             CREATE INDEX IF NOT EXISTS idx_fee_history_timestamp ON fee_history(timestamp);
@@ -125,6 +138,22 @@ class IbisDB:
             except sqlite3.OperationalError:
                 pass  # Column already exists
 
+            # Fee history rows written per fill carry the KuCoin trade id.
+            try:
+                conn.execute("ALTER TABLE fee_history ADD COLUMN trade_id TEXT")
+            except sqlite3.OperationalError:
+                pass  # Column already exists
+            conn.execute(
+                """
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_fee_history_trade_id_unique
+                ON fee_history(trade_id)
+                WHERE trade_id IS NOT NULL
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_fee_history_order_id ON fee_history(order_id)"
+            )
+
             # Create order-id dedup index after migrations.
             try:
                 conn.execute(
@@ -823,3 +852,78 @@ class IbisDB:
                 f"Failed to update fee tracking: symbol={symbol}, order_id={order_id} - {e}"
             )
             raise
+
+    def record_fill_fees(self, fills: list) -> int:
+        """FillIngestor consumer: one fee_history row per new fill, in one transaction
+
+        Fills are deduped on trade_id, and skipped when their order already has
+        a whole-order fee row from update_fee_tracking.
+
+        Returns:
+            Number of rows inserted
+        """
+        rows = []
+        for fill in fills:
+            side = str(fill.get("side", "")).upper()
+            fees = float(fill.get("fee", 0) or 0)
+            trade_value = float(fill.get("funds", 0) or 0)
+            if side not in ("BUY", "SELL") or fees <= 0 or trade_value <= 0:
+                continue
+            # Same realistic-rate clamp as update_fee_tracking
+            fee_rate = max(0.0001, min(0.001, fees / trade_value))
+            order_id = str(fill.get("orderId", ""))
+            rows.append(
+                (
+                    self._normalize_symbol(fill.get("symbol", "")),
+                    side,
+                    order_id,
+                    fees,
+                    fee_rate,
+                    trade_value,
+                    str(fill.get("tradeId", "")),
+                    order_id,
+                )
+            )
+
+        if not rows:
+            return 0
+        with self.get_conn() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO fee_history
+                    (symbol, side, order_id, fee_amount, fee_rate, trade_value, trade_id)
+                SELECT ?, ?, ?, ?, ?, ?, ?
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM fee_history WHERE order_id = ? AND trade_id IS NULL
+                )
+                """,
+                rows,
+            )
+            return conn.total_changes - before
+
+    def get_fee_history_rows(self) -> list:
+        """Every fee_history row (symbol, fee_amount, trade_value, timestamp), oldest first"""
+        with self.get_conn() as conn:
+            return conn.execute(
+                "SELECT symbol, fee_amount, trade_value, timestamp FROM fee_history ORDER BY id"
+            ).fetchall()
+
+    def load_fee_stats(self) -> list:
+        """Materialized per-symbol FeeModel sums"""
+        with self.get_conn() as conn:
+            return conn.execute("SELECT * FROM fee_stats").fetchall()
+
+    def upsert_fee_stats(self, rows: list) -> None:
+        """Replace the fee_stats rows for the given symbols in one transaction"""
+        with self.get_conn() as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO fee_stats
+                    (symbol, fee, funds, maker_fee, maker_funds, taker_fee, taker_funds,
+                     fill_count, last_ts, updated_at)
+                VALUES (:symbol, :fee, :funds, :maker_fee, :maker_funds, :taker_fee,
+                        :taker_funds, :fill_count, :last_ts, CURRENT_TIMESTAMP)
+                """,
+                rows,
+            )
@@ -1,4 +1,5 @@
 from ibis.core.logging_config import get_logger
+from ibis.core.http_transport import get_http_transport
 """
 IBIS Enhanced Intelligence Integration
 ====================================
@@ -109,7 +110,9 @@ class EnhancedIntelStreams:
 
     async def get_session(self):
         if self.session is None:
-            self.session = aiohttp.ClientSession(headers={"User-Agent": "IBIS-Intelligence/1.0"})
+            self.session = get_http_transport().session(
+                headers={"User-Agent": "IBIS-Intelligence/1.0"}
+            )
         return self.session
 
     async def close(self):
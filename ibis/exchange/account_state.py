@@ -0,0 +1,344 @@
+"""
+IBIS Streaming Account State
+Own orders and balances pushed over KuCoin private WebSocket channels
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from .kucoin_client import KuCoinClient, TradeOrder
+from .kucoin_websocket import KuCoinWebSocket
+
+from ibis.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+TERMINAL_EVENTS = ("filled", "canceled")
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _to_ms(value) -> int:
+    """KuCoin private pushes stamp orderTime/ts in ns; REST uses ms."""
+    try:
+        ts = int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+    while ts > 10**13:
+        ts //= 1000
+    return ts
+
+
+def _f(value) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class AccountStateService:
+    """
+    Streaming view of our own orders and balances.
+
+    Subscribes to /spotMarket/tradeOrders and /account/balance (private
+    channels) and keeps REST-shaped order and account rows in memory, so the
+    client's get_order / get_open_orders / get_accounts calls are answered
+    locally while the stream is up (see KuCoinClient.account_state). REST is
+    only used to seed state, after a reconnect, on a slow resync timer, and
+    once per order that completes with fills (order pushes carry no fee, so
+    the final fee/dealFunds come from the order endpoint).
+    """
+
+    def __init__(
+        self,
+        client: KuCoinClient,
+        ws: Optional[KuCoinWebSocket] = None,
+        resync_seconds: float = 300.0,
+        done_order_limit: int = 500,
+    ):
+        self.client = client
+        self.ws = ws or KuCoinWebSocket(client, private=True)
+        self.resync_seconds = resync_seconds
+        self.done_order_limit = done_order_limit
+
+        # orderId -> row in the REST /api/v1/orders shape (string numbers)
+        self._orders: Dict[str, Dict] = {}
+        # Orders whose row is final and exact (REST detail, or no fills)
+        self._exact: Set[str] = set()
+        self._done: Deque[str] = deque()
+        self._trade_ids: Dict[str, Set[str]] = {}
+        self._order_seen_ms: Dict[str, int] = {}
+        # (currency, account type) -> row in the REST /api/v1/accounts shape
+        self._accounts: Dict[Tuple[str, str], Dict] = {}
+        self._balance_ts: Dict[Tuple[str, str], int] = {}
+        self._balance_seen_ms: Dict[Tuple[str, str], int] = {}
+        self._resync_task: Optional[asyncio.Task] = None
+        self.streaming = False
+        # Called as listener(order_row, event) after each order push is applied
+        self.order_listeners: List[Callable[[Dict, str], None]] = []
+
+        self.stats = {
+            "order_events": 0,
+            "balance_events": 0,
+            "order_hits": 0,
+            "rest_order_lookups": 0,
+            "rest_resyncs": 0,
+            "reconnects": 0,
+            "last_event_latency_ms": 0.0,
+        }
+
+        self.ws.add_channel_handler(KuCoinWebSocket.ORDERS_TOPIC, self._on_order)
+        self.ws.add_channel_handler(KuCoinWebSocket.BALANCE_TOPIC, self._on_balance)
+        self.ws.reconnect_callbacks.append(self._on_reconnect)
+
+    async def start(self) -> bool:
+        """Open the private streams, then seed from REST (pushes win over the seed)"""
+        self.streaming = await self.ws.subscribe_topic(KuCoinWebSocket.ORDERS_TOPIC)
+        if self.streaming:
+            await self.ws.subscribe_topic(KuCoinWebSocket.BALANCE_TOPIC)
+        await self.resync()
+        if self.streaming:
+            self._resync_task = asyncio.create_task(self._resync_loop())
+            logger.info(
+                f"✅ Account state streaming ({len(self.open_orders())} open orders, "
+                f"{len(self._accounts)} accounts)"
+            )
+        else:
+            logger.warning("⚠️ Private stream unavailable, orders/balances stay on REST")
+        return self.streaming
+
+    async def stop(self):
+        self.streaming = False
+        if self._resync_task is not None:
+            self._resync_task.cancel()
+            self._resync_task = None
+        await self.ws.close()
+
+    def is_live(self) -> bool:
+        """
+        Private channels are silent while nothing happens, so liveness is the
+        connection itself; the resync timer bounds any drift.
+        """
+        return self.streaming and self.ws.running
+
+    # ------------------------------------------------------------------
+    # Reads (REST shapes, so callers cannot tell the source apart)
+    # ------------------------------------------------------------------
+
+    def open_orders(self, symbol: str = "") -> List[Dict]:
+        return [
+            dict(row)
+            for row in self._orders.values()
+            if row["isActive"] and (not symbol or row["symbol"] == symbol)
+        ]
+
+    def accounts(self) -> List[Dict]:
+        return [dict(row) for row in self._accounts.values()]
+
+    async def get_order(self, order_id: str, symbol: str = "") -> Optional[TradeOrder]:
+        """
+        Active orders and exact terminal rows come from memory. An order that
+        just completed with fills (or one we never saw) is read over REST once
+        and kept.
+        """
+        row = self._orders.get(order_id)
+        if row is not None and (row["isActive"] or order_id in self._exact):
+            self.stats["order_hits"] += 1
+            return TradeOrder.from_response(row, symbol or row["symbol"])
+
+        self.stats["rest_order_lookups"] += 1
+        data = await self.client._request_with_retry("GET", f"/api/v1/orders/{order_id}")
+        if not data or not (data.get("id") or data.get("orderId")):
+            return None
+        row = self._store_rest_order(data)
+        return TradeOrder.from_response(row, symbol or row["symbol"])
+
+    # ------------------------------------------------------------------
+    # REST seed / resync
+    # ------------------------------------------------------------------
+
+    async def resync(self) -> None:
+        """
+        Reload active orders and accounts. Rows touched by a push after the
+        request started are newer than the snapshot and are kept. Uses the
+        raising _request: the retry wrapper's empty fallback would read as
+        "no orders, no balances" and wipe the state.
+        """
+        started = _now_ms()
+        try:
+            orders = await self.client._request("GET", "/api/v1/orders", "status=active&pageSize=500")
+            accounts = await self.client._request("GET", "/api/v1/accounts")
+        except Exception as e:
+            logger.warning(f"⚠️ Account state resync failed: {e}")
+            return
+        self.stats["rest_resyncs"] += 1
+
+        active = set()
+        for data in (orders or {}).get("items", []) or []:
+            order_id = str(data.get("id") or data.get("orderId") or "")
+            if not order_id:
+                continue
+            active.add(order_id)
+            if self._order_seen_ms.get(order_id, 0) < started:
+                self._store_rest_order(data)
+        # Active here but not on the exchange and not pushed since: unknown
+        # outcome, so drop it and let get_order ask REST
+        for order_id, row in list(self._orders.items()):
+            if (
+                row["isActive"]
+                and order_id not in active
+                and self._order_seen_ms.get(order_id, 0) < started
+            ):
+                self._forget(order_id)
+
+        fresh = {}
+        for data in accounts or []:
+            key = (str(data.get("currency", "")), str(data.get("type", "")))
+            if self._balance_seen_ms.get(key, 0) >= started and key in self._accounts:
+                fresh[key] = self._accounts[key]
+            else:
+                fresh[key] = dict(data)
+        self._accounts = fresh
+
+    async def _resync_loop(self):
+        while self.streaming:
+            await asyncio.sleep(self.resync_seconds)
+            await self.resync()
+
+    async def _on_reconnect(self) -> None:
+        """Pushes were missed while disconnected: reseed from REST."""
+        self.stats["reconnects"] += 1
+        await self.resync()
+
+    def _store_rest_order(self, data: Dict) -> Dict:
+        row = dict(data)
+        order_id = str(row.get("id") or row.get("orderId") or "")
+        row["id"] = row["orderId"] = order_id
+        row["isActive"] = bool(row.get("isActive", True))
+        prior = self._orders.get(order_id)
+        self._orders[order_id] = row
+        if row["isActive"]:
+            self._exact.discard(order_id)
+        else:
+            self._exact.add(order_id)
+            if prior is None or prior["isActive"]:
+                self._retire(order_id)
+        return row
+
+    # ------------------------------------------------------------------
+    # Push handlers
+    # ------------------------------------------------------------------
+
+    def _on_order(self, topic: str, subject: str, data: Dict) -> None:
+        order_id = str(data.get("orderId") or "")
+        if not order_id:
+            return
+        event = str(data.get("type", ""))
+        row = self._orders.get(order_id)
+        if row is None:
+            symbol = str(data.get("symbol", ""))
+            row = {
+                "id": order_id,
+                "orderId": order_id,
+                "clientOid": data.get("clientOid", ""),
+                "symbol": symbol,
+                "side": data.get("side", ""),
+                "type": data.get("orderType", ""),
+                "price": str(data.get("price") or "0"),
+                "size": str(data.get("size") or "0"),
+                "dealSize": "0",
+                "dealFunds": "0",
+                "fee": "0",
+                "feeCurrency": symbol.split("-")[-1] if "-" in symbol else "USDT",
+                "isActive": True,
+                "createdAt": _to_ms(data.get("orderTime")),
+            }
+            self._orders[order_id] = row
+
+        if data.get("price"):
+            row["price"] = str(data["price"])
+        if data.get("size"):
+            row["size"] = str(data["size"])
+        if data.get("filledSize") is not None:
+            row["dealSize"] = str(data["filledSize"])
+        if event == "match":
+            trade_id = str(data.get("tradeId") or "")
+            seen = self._trade_ids.setdefault(order_id, set())
+            if trade_id not in seen:
+                seen.add(trade_id)
+                funds = _f(data.get("matchPrice")) * _f(data.get("matchSize"))
+                row["dealFunds"] = str(_f(row.get("dealFunds")) + funds)
+
+        if row["isActive"] and (event in TERMINAL_EVENTS or data.get("status") == "done"):
+            row["isActive"] = False
+            # No fills means nothing left to learn from the order endpoint
+            if _f(row.get("dealSize")) <= 0:
+                self._exact.add(order_id)
+            else:
+                self._exact.discard(order_id)
+            self._retire(order_id)
+
+        now_ms = _now_ms()
+        self._order_seen_ms[order_id] = now_ms
+        pushed_ms = _to_ms(data.get("ts"))
+        if pushed_ms:
+            self.stats["last_event_latency_ms"] = float(max(0, now_ms - pushed_ms))
+        self.stats["order_events"] += 1
+
+        for listener in self.order_listeners:
+            try:
+                listener(dict(row), event)
+            except Exception as e:
+                logger.warning(f"⚠️ Order listener failed for {row['symbol']}: {e}")
+
+    def _on_balance(self, topic: str, subject: str, data: Dict) -> None:
+        currency = str(data.get("currency", ""))
+        if not currency:
+            return
+        relation = str(data.get("relationEvent", ""))
+        account_type = relation.split(".", 1)[0] if "." in relation else "trade"
+        key = (currency, account_type)
+        pushed = int(_f(data.get("time")))
+        if pushed and pushed < self._balance_ts.get(key, 0):
+            return  # out-of-order push
+        self._balance_ts[key] = pushed
+
+        row = self._accounts.get(key)
+        if row is None:
+            row = {"id": data.get("accountId", ""), "currency": currency, "type": account_type}
+            self._accounts[key] = row
+        row["balance"] = str(data.get("total", row.get("balance", "0")))
+        row["available"] = str(data.get("available", row.get("available", "0")))
+        row["holds"] = str(data.get("hold", row.get("holds", "0")))
+        self._balance_seen_ms[key] = _now_ms()
+        self.stats["balance_events"] += 1
+
+    # ------------------------------------------------------------------
+    # Bookkeeping
+    # ------------------------------------------------------------------
+
+    def _retire(self, order_id: str) -> None:
+        """Keep at most done_order_limit finished orders in memory."""
+        self._done.append(order_id)
+        while len(self._done) > self.done_order_limit:
+            old = self._done.popleft()
+            row = self._orders.get(old)
+            if row is not None and not row["isActive"]:
+                self._forget(old)
+
+    def _forget(self, order_id: str) -> None:
+        self._orders.pop(order_id, None)
+        self._exact.discard(order_id)
+        self._trade_ids.pop(order_id, None)
+        self._order_seen_ms.pop(order_id, None)
+
+    def get_stats(self) -> Dict:
+        stats = dict(self.stats)
+        stats["live"] = self.is_live()
+        stats["open_orders"] = sum(1 for row in self._orders.values() if row["isActive"])
+        stats["accounts"] = len(self._accounts)
+        return stats
@@ -0,0 +1,323 @@
+"""
+IBIS Candle Archive
+Persistent per-(symbol, interval) OHLCV columns on disk, read via numpy.memmap
+"""
+
+import asyncio
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ibis.core.logging_config import get_logger
+from ibis.exchange.candle_store import MAX_BARS_PER_REQUEST, interval_seconds
+
+logger = get_logger(__name__)
+
+# One fixed-width little-endian file per column
+COLUMNS: Dict[str, np.dtype] = {
+    "timestamp": np.dtype("<i8"),
+    "open": np.dtype("<f8"),
+    "high": np.dtype("<f8"),
+    "low": np.dtype("<f8"),
+    "close": np.dtype("<f8"),
+    "volume": np.dtype("<f8"),
+    "turnover": np.dtype("<f8"),
+}
+
+DEFAULT_ARCHIVE_DIR = Path(__file__).resolve().parents[2] / "data" / "candles"
+
+
+class ArchiveSeries:
+    """
+    Read-only columns for one (symbol, interval), oldest -> newest.
+
+    Columns are numpy.memmap views, so opening and slicing never copies bar
+    data. series["close"] works like a structured OHLCV array, which lets the
+    columnar indicator kernels run on the mapped pages directly.
+    """
+
+    def __init__(self, symbol: str, interval: str, columns: Dict[str, np.ndarray]):
+        self.symbol = symbol
+        self.interval = interval
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns["timestamp"])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def between(self, start: int = None, end: int = None) -> "ArchiveSeries":
+        """Bars with start <= timestamp < end (epoch seconds), still zero-copy."""
+        stamps = self.columns["timestamp"]
+        lo = 0 if start is None else int(np.searchsorted(stamps, start, "left"))
+        hi = len(stamps) if end is None else int(np.searchsorted(stamps, end, "left"))
+        return self._slice(lo, hi)
+
+    def tail(self, limit: int) -> "ArchiveSeries":
+        return self._slice(max(0, len(self) - limit), len(self))
+
+    def _slice(self, lo: int, hi: int) -> "ArchiveSeries":
+        return ArchiveSeries(
+            self.symbol, self.interval, {k: v[lo:hi] for k, v in self.columns.items()}
+        )
+
+    def ohlcv(self) -> np.ndarray:
+        """Copy into a columnar.OHLCV_DTYPE structured array."""
+        from ibis.indicators.columnar import OHLCV_DTYPE
+
+        out = np.empty(len(self), dtype=OHLCV_DTYPE)
+        for name in OHLCV_DTYPE.names:
+            out[name] = self.columns[name]
+        return out
+
+    def to_candles(self) -> List:
+        """KuCoinClient Candle objects, as get_candles returns them."""
+        from ibis.exchange.kucoin_client import Candle
+
+        rows = zip(*(self.columns[name].tolist() for name in COLUMNS))
+        return [Candle(self.symbol, int(ts), o, h, l, c, v, t) for ts, o, h, l, c, v, t in rows]
+
+    def to_backtest(self) -> List[Dict]:
+        """Backtester candle dicts (same shape as CandleGenerator) with real timestamps."""
+        rows = zip(*(self.columns[name].tolist() for name in COLUMNS))
+        return [
+            {
+                "symbol": self.symbol,
+                "timestamp": datetime.fromtimestamp(ts),
+                "open": o,
+                "high": h,
+                "low": l,
+                "close": c,
+                "volume": v,
+            }
+            for ts, o, h, l, c, v, _ in rows
+        ]
+
+
+class CandleArchive:
+    """
+    Append-only candle archive under data/candles/<interval>/<symbol>/.
+
+    Each column is a flat binary file, so appending a bar is one small write
+    per column and reading is a numpy.memmap of the whole file. Re-sent bars
+    (the forming bar, or an overlapping fetch) overwrite their stored row, and
+    older bars that are already stored are dropped; only a batch carrying bars
+    the series is missing (a backfill) triggers a merge rewrite that swaps the
+    series directory in place. Writes are serialized, so append can run in a
+    worker thread (asyncio.to_thread) off the event loop.
+    """
+
+    def __init__(self, root: str = None):
+        self.root = Path(root) if root else DEFAULT_ARCHIVE_DIR
+        self._write_lock = threading.Lock()
+        self.stats = {
+            "bars_appended": 0,
+            "bars_rewritten": 0,
+            "bars_skipped": 0,
+            "rewrites": 0,
+            "reads": 0,
+        }
+
+    def _dir(self, symbol: str, interval: str) -> Path:
+        return self.root / interval / symbol
+
+    def symbols(self, interval: str) -> List[str]:
+        base = self.root / interval
+        if not base.is_dir():
+            return []
+        return sorted(p.name for p in base.iterdir() if p.is_dir() and not p.name.startswith("."))
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def open(self, symbol: str, interval: str) -> ArchiveSeries:
+        """Memory-map a series; missing series come back empty."""
+        path = self._dir(symbol, interval)
+        self._recover(path)
+        self.stats["reads"] += 1
+        rows = self._rows(path)
+        columns = {}
+        for name, dtype in COLUMNS.items():
+            if rows:
+                columns[name] = np.memmap(path / f"{name}.col", dtype=dtype, mode="r", shape=(rows,))
+            else:
+                columns[name] = np.empty(0, dtype=dtype)
+        return ArchiveSeries(symbol, interval, columns)
+
+    def open_many(self, symbols: Iterable[str], interval: str) -> Dict[str, ArchiveSeries]:
+        return {symbol: self.open(symbol, interval) for symbol in symbols}
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[int]:
+        series = self.open(symbol, interval)
+        return int(series["timestamp"][-1]) if len(series) else None
+
+    def candles(self, symbol: str, interval: str, limit: int = None) -> List:
+        series = self.open(symbol, interval)
+        return (series.tail(limit) if limit else series).to_candles()
+
+    def backtest_candles(
+        self, symbols: Iterable[str], interval: str = "1hour", days: int = None
+    ) -> Dict[str, List[Dict]]:
+        """
+        Archived history in BacktestEngine.run's input format - the real-data
+        counterpart of CandleGenerator.generate_candles.
+        """
+        start = int(time.time()) - days * 86400 if days else None
+        return {
+            symbol: self.open(symbol, interval).between(start).to_backtest() for symbol in symbols
+        }
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, symbol: str, interval: str, candles: List) -> int:
+        """
+        Store Candle objects (anything with timestamp/open/.../turnover).
+
+        Returns the number of new bars. Bars at the last stored timestamp
+        replace that row and older bars that are already stored are dropped;
+        older bars the series is missing are merged by rewriting it.
+        """
+        if not candles:
+            return 0
+        with self._write_lock:
+            return self._append(symbol, interval, candles)
+
+    def _append(self, symbol: str, interval: str, candles: List) -> int:
+        path = self._dir(symbol, interval)
+        self._recover(path)
+        path.mkdir(parents=True, exist_ok=True)
+        rows = self._rows(path)
+        stamps = self._read_column(path, "timestamp", rows) if rows else None
+        last_ts = int(stamps[-1]) if rows else None
+
+        if last_ts is not None and min(c.timestamp for c in candles) < last_ts:
+            older = np.fromiter(
+                (c.timestamp for c in candles if c.timestamp < last_ts), dtype=COLUMNS["timestamp"]
+            )
+            # Binary search on the mapped column touches O(k log n) pages, not the file
+            at = np.searchsorted(stamps, older)
+            if np.any(stamps[np.minimum(at, rows - 1)] != older):
+                return self._rewrite(path, rows, candles)
+            self.stats["bars_skipped"] += len(older)
+            candles = [c for c in candles if c.timestamp >= last_ts]
+
+        # Newest copy of each timestamp wins
+        by_ts = {int(c.timestamp): c for c in candles}
+        if last_ts is not None and last_ts in by_ts:
+            self._write_rows(path, [by_ts.pop(last_ts)], offset=rows - 1)
+        fresh = [by_ts[ts] for ts in sorted(by_ts)]
+        self._write_rows(path, fresh, offset=rows)
+        self.stats["bars_appended"] += len(fresh)
+        return len(fresh)
+
+    async def sync(self, client, symbol: str, interval: str, days: int) -> int:
+        """
+        Fill the archive for the last `days` from KuCoin, fetching only the
+        ranges not already stored (paged MAX_BARS_PER_REQUEST at a time).
+        """
+        step = interval_seconds(interval)
+        now = int(time.time())
+        start = now - days * 86400
+        series = self.open(symbol, interval)
+        ranges = [(start, now)]
+        if len(series):
+            first, last = int(series["timestamp"][0]), int(series["timestamp"][-1])
+            ranges = [(last, now)]
+            if start < first:
+                ranges.append((start, first - step))
+
+        fetched = []
+        for range_start, range_end in ranges:
+            end = range_end
+            while end > range_start:
+                page_start = max(range_start, end - step * MAX_BARS_PER_REQUEST)
+                page = await client.get_candles(symbol, interval, start=page_start, end=end)
+                if not page:
+                    break
+                fetched.extend(page)
+                end = min(c.timestamp for c in page) - step
+        fetched.sort(key=lambda c: c.timestamp)
+        added = await asyncio.to_thread(self.append, symbol, interval, fetched)
+        logger.info(f"🗄️ Candle archive {symbol} {interval}: +{added} bars")
+        return added
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _rows(path: Path) -> int:
+        """Committed rows: the shortest column wins after an interrupted append."""
+        sizes = []
+        for name, dtype in COLUMNS.items():
+            column = path / f"{name}.col"
+            sizes.append(column.stat().st_size // dtype.itemsize if column.exists() else 0)
+        return min(sizes)
+
+    @staticmethod
+    def _read_column(path: Path, name: str, rows: int) -> np.ndarray:
+        return np.memmap(path / f"{name}.col", dtype=COLUMNS[name], mode="r", shape=(rows,))
+
+    @staticmethod
+    def _write_rows(path: Path, candles: List, offset: int):
+        if not candles:
+            return
+        for name, dtype in COLUMNS.items():
+            values = np.fromiter(
+                (getattr(c, name) for c in candles), dtype=dtype, count=len(candles)
+            )
+            column = path / f"{name}.col"
+            with open(column, "r+b" if column.exists() else "wb") as f:
+                f.seek(offset * dtype.itemsize)
+                f.write(values.tobytes())
+                f.truncate()
+
+    def _rewrite(self, path: Path, rows: int, candles: List) -> int:
+        existing = {name: np.array(self._read_column(path, name, rows)) for name in COLUMNS}
+        incoming = {
+            name: np.fromiter((getattr(c, name) for c in candles), dtype=dtype, count=len(candles))
+            for name, dtype in COLUMNS.items()
+        }
+        merged = {name: np.concatenate((existing[name], incoming[name])) for name in COLUMNS}
+        # Last occurrence of a timestamp (the incoming bar) wins
+        stamps = merged["timestamp"][::-1]
+        _, first = np.unique(stamps, return_index=True)
+        keep = len(stamps) - 1 - first
+
+        staging = path.with_name(f".{path.name}.new")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        for name in COLUMNS:
+            merged[name][keep].tofile(staging / f"{name}.col")
+
+        retired = path.with_name(f".{path.name}.old")
+        shutil.rmtree(retired, ignore_errors=True)
+        os.rename(path, retired)
+        os.rename(staging, path)
+        shutil.rmtree(retired, ignore_errors=True)
+
+        added = len(keep) - rows
+        self.stats["rewrites"] += 1
+        self.stats["bars_rewritten"] += len(keep)
+        self.stats["bars_appended"] += added
+        return added
+
+    @staticmethod
+    def _recover(path: Path):
+        """Finish a rewrite interrupted between its two directory renames."""
+        retired = path.with_name(f".{path.name}.old")
+        if not path.exists() and retired.exists():
+            os.rename(retired, path)
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
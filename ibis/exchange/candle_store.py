@@ -0,0 +1,219 @@
+"""
+IBIS Candle Store
+Interval-aware, incrementally updated candle cache for KuCoinClient.get_candles
+"""
+
+import time
+from collections import deque
+from itertools import islice
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+
+# KuCoin kline types -> bar length in seconds
+CANDLE_INTERVAL_SECONDS: Dict[str, int] = {
+    "1min": 60,
+    "3min": 180,
+    "5min": 300,
+    "15min": 900,
+    "30min": 1800,
+    "1hour": 3600,
+    "2hour": 7200,
+    "4hour": 14400,
+    "6hour": 21600,
+    "8hour": 28800,
+    "12hour": 43200,
+    "1day": 86400,
+    "1week": 604800,
+}
+
+# KuCoin returns at most this many bars per candles request
+MAX_BARS_PER_REQUEST = 1500
+
+# Rough size of one serialized kline row, refined from real payloads
+DEFAULT_BAR_BYTES = 110
+
+
+def interval_seconds(candle_type: str) -> int:
+    """Bar length in seconds for a KuCoin candle type (defaults to 1min)."""
+    return CANDLE_INTERVAL_SECONDS.get(candle_type, 60)
+
+
+@dataclass
+class CandleStoreStats:
+    hits: int = 0
+    misses: int = 0
+    full_fetches: int = 0
+    incremental_fetches: int = 0
+    bars_fetched: int = 0
+    bytes_saved: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "full_fetches": self.full_fetches,
+            "incremental_fetches": self.incremental_fetches,
+            "bars_fetched": self.bars_fetched,
+            "bytes_saved": self.bytes_saved,
+        }
+
+
+class CandleStore:
+    """
+    Ring buffer of candles per (symbol, interval).
+
+    Series are kept oldest -> newest. The last bar of a series is usually still
+    forming, so incremental merges replace any bar whose timestamp is already
+    stored instead of appending a duplicate.
+    """
+
+    def __init__(self, max_bars: int = MAX_BARS_PER_REQUEST, ttl: float = 5.0):
+        self.max_bars = max_bars
+        self.ttl = ttl
+        self._series: Dict[Tuple[str, str], Deque] = {}
+        self._updated_at: Dict[Tuple[str, str], float] = {}
+        # Series seeded by a full fetch already hold all the history the API has
+        self._complete: set = set()
+        self._bar_bytes = DEFAULT_BAR_BYTES
+        self.stats = CandleStoreStats()
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._series
+
+    def keys(self) -> List[Tuple[str, str]]:
+        return list(self._series.keys())
+
+    def size(self, symbol: str, interval: str) -> int:
+        series = self._series.get((symbol, interval))
+        return len(series) if series else 0
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[int]:
+        series = self._series.get((symbol, interval))
+        if not series:
+            return None
+        return series[-1].timestamp
+
+    def age(self, symbol: str, interval: str, now: Optional[float] = None) -> float:
+        updated = self._updated_at.get((symbol, interval))
+        if updated is None:
+            return float("inf")
+        return (now if now is not None else time.time()) - updated
+
+    def has_window(self, symbol: str, interval: str, limit: Optional[int] = None) -> bool:
+        """True when the series can serve `limit` bars without older history."""
+        if not limit or (symbol, interval) in self._complete:
+            return True
+        return self.size(symbol, interval) >= min(limit, self.max_bars)
+
+    def is_fresh(self, symbol: str, interval: str, limit: Optional[int] = None) -> bool:
+        """True when the series was refreshed within ttl and holds enough bars."""
+        if self.age(symbol, interval) >= self.ttl:
+            return False
+        return self.size(symbol, interval) > 0 and self.has_window(symbol, interval, limit)
+
+    def can_extend(self, symbol: str, interval: str, limit: Optional[int] = None) -> bool:
+        """
+        True when an incremental fetch from the last stored bar is enough.
+
+        Falls back to a full fetch when the series is too short for the
+        requested window, or the gap since the last bar exceeds one request.
+        """
+        last_ts = self.last_timestamp(symbol, interval)
+        if last_ts is None or not self.has_window(symbol, interval, limit):
+            return False
+        gap_bars = (time.time() - last_ts) / interval_seconds(interval)
+        return gap_bars < MAX_BARS_PER_REQUEST
+
+    def get(self, symbol: str, interval: str, limit: Optional[int] = None) -> List:
+        series = self._series.get((symbol, interval))
+        if not series:
+            return []
+        if limit and limit < len(series):
+            return list(islice(series, len(series) - limit, None))
+        return list(series)
+
+    def replace(self, symbol: str, interval: str, candles: List, complete: bool = True) -> None:
+        """Store a full history (oldest -> newest) for a series."""
+        key = (symbol, interval)
+        self._series[key] = deque(candles[-self.max_bars :], maxlen=self.max_bars)
+        self._updated_at[key] = time.time()
+        if complete:
+            self._complete.add(key)
+        else:
+            self._complete.discard(key)
+
+    def merge(self, symbol: str, interval: str, candles: List) -> int:
+        """
+        Merge newer candles (oldest -> newest) into a series.
+
+        Returns the number of bars that were appended (updates to the forming
+        bar are not counted).
+        """
+        key = (symbol, interval)
+        series = self._series.get(key)
+        if series is None:
+            self.replace(symbol, interval, candles, complete=False)
+            return len(candles)
+
+        appended = 0
+        for candle in candles:
+            if series and candle.timestamp < series[-1].timestamp:
+                continue
+            if series and candle.timestamp == series[-1].timestamp:
+                series[-1] = candle
+                continue
+            series.append(candle)
+            appended += 1
+        self._updated_at[key] = time.time()
+        return appended
+
+    def expire(self, symbol: Optional[str] = None) -> None:
+        """Mark series stale so the next read fills any gap from the API."""
+        for key in self._updated_at:
+            if symbol is None or key[0] == symbol:
+                self._updated_at[key] = 0.0
+
+    def touch(self, symbol: str, interval: str) -> None:
+        if (symbol, interval) in self._series:
+            self._updated_at[(symbol, interval)] = time.time()
+
+    def observe_payload(self, bars: int, payload_bytes: int) -> None:
+        """Refine the per-bar byte estimate from a full response."""
+        if bars > 0 and payload_bytes > 0:
+            self._bar_bytes = max(1, int(payload_bytes / bars))
+
+    def record_hit(self, bars_served: int) -> None:
+        self.stats.hits += 1
+        self.stats.bytes_saved += bars_served * self._bar_bytes
+
+    def record_full_fetch(self, bars: int) -> None:
+        self.stats.misses += 1
+        self.stats.full_fetches += 1
+        self.stats.bars_fetched += bars
+
+    def record_incremental_fetch(self, bars: int, bars_reused: int) -> None:
+        self.stats.misses += 1
+        self.stats.incremental_fetches += 1
+        self.stats.bars_fetched += bars
+        self.stats.bytes_saved += max(0, bars_reused) * self._bar_bytes
+
+    def clear(self, symbol: Optional[str] = None) -> None:
+        if symbol is None:
+            self._series.clear()
+            self._updated_at.clear()
+            self._complete.clear()
+            return
+        for key in [k for k in self._series if k[0] == symbol]:
+            self._series.pop(key, None)
+            self._updated_at.pop(key, None)
+            self._complete.discard(key)
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = self.stats.to_dict()
+        stats["series"] = len(self._series)
+        return stats
@@ -0,0 +1,339 @@
+"""
+IBIS Fill Ingest
+Paginated, checkpointed /api/v1/fills ingestion into SQLite, fanned out to consumers
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from ibis.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_DB_PATH = "data/fills.db"
+
+# KuCoin caps a /api/v1/fills query at 7 days and 500 rows per page
+MAX_WINDOW_MS = 7 * 24 * 3600 * 1000
+MAX_PAGE_SIZE = 500
+# Fills can surface a little after their createdAt; re-read this much
+# behind the last scanned window end (repeats are deduped on trade_id)
+SETTLE_MS = 60 * 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fills (
+    trade_id TEXT PRIMARY KEY,
+    order_id TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    side TEXT NOT NULL,
+    price REAL NOT NULL,
+    size REAL NOT NULL,
+    funds REAL NOT NULL,
+    fee REAL NOT NULL DEFAULT 0,
+    fee_currency TEXT,
+    liquidity TEXT,
+    created_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_fills_created_at ON fills(created_at);
+CREATE INDEX IF NOT EXISTS idx_fills_order_id ON fills(order_id);
+CREATE INDEX IF NOT EXISTS idx_fills_symbol ON fills(symbol, created_at);
+
+CREATE TABLE IF NOT EXISTS ingest_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+FillConsumer = Callable[[List[Dict]], Union[None, Awaitable[None]]]
+
+CURSOR_PREFIX = "cursor:"
+
+
+def _consumer_name(consumer: FillConsumer) -> str:
+    """Stable per-consumer key for its delivery cursor ("PnLTracker.apply_fills")"""
+    name = getattr(consumer, "__qualname__", None) or type(consumer).__qualname__
+    return str(name)
+
+
+def _fill_row(fill: Dict) -> Tuple:
+    return (
+        str(fill.get("tradeId", "")),
+        str(fill.get("orderId", "")),
+        str(fill.get("symbol", "")),
+        str(fill.get("side", "")).lower(),
+        float(fill.get("price", 0) or 0),
+        float(fill.get("size", 0) or 0),
+        float(fill.get("funds", 0) or 0),
+        float(fill.get("fee", 0) or 0),
+        fill.get("feeCurrency"),
+        fill.get("liquidity"),
+        int(fill.get("createdAt", 0) or 0),
+    )
+
+
+def _row_fill(row: sqlite3.Row) -> Dict:
+    """Stored row back in the KuCoin fill shape consumers parse"""
+    return {
+        "tradeId": row["trade_id"],
+        "orderId": row["order_id"],
+        "symbol": row["symbol"],
+        "side": row["side"],
+        "price": row["price"],
+        "size": row["size"],
+        "funds": row["funds"],
+        "fee": row["fee"],
+        "feeCurrency": row["fee_currency"],
+        "liquidity": row["liquidity"],
+        "createdAt": row["created_at"],
+    }
+
+
+class FillStore:
+    """
+    SQLite (WAL) table of every ingested fill, unique on trade_id.
+
+    The ingest state (high-water mark and how far the time range has been
+    scanned) lives in the same database and is committed in the same
+    transaction as the fills it covers, so a crash mid-sync never records
+    progress past rows that were not written. Rows keep their insertion
+    rowid, which the consumer delivery cursors count against.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if db_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def commit_window(self, fills: List[Dict], state: Dict[str, Any]) -> List[Dict]:
+        """Insert fills (ignoring known trade_ids) and save state atomically; returns the new ones"""
+        new = []
+        with self._lock, self._conn:
+            for fill in fills:
+                row = _fill_row(fill)
+                if not row[0]:
+                    continue
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO fills VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row
+                )
+                if cursor.rowcount == 1:
+                    new.append(fill)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO ingest_state (key, value) VALUES (?, ?)",
+                [(key, str(value)) for key, value in state.items()],
+            )
+        return new
+
+    def save_state(self, state: Dict[str, Any]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO ingest_state (key, value) VALUES (?, ?)",
+                [(key, str(value)) for key, value in state.items()],
+            )
+
+    def last_seq(self) -> int:
+        """rowid of the most recently inserted fill (0 when empty)"""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM fills").fetchone()[0]
+
+    def fills_after(self, seq: int) -> Tuple[List[Dict], int]:
+        """Fills inserted after rowid seq (oldest createdAt first) and the new last rowid"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT rowid AS seq, * FROM fills WHERE rowid > ? ORDER BY created_at, trade_id",
+                (seq,),
+            ).fetchall()
+        if not rows:
+            return [], seq
+        return [_row_fill(row) for row in rows], max(row["seq"] for row in rows)
+
+    def state(self) -> Dict[str, str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM ingest_state").fetchall()
+        return {row["key"]: row["value"] for row in rows}
+
+    def fills(self, since: int = 0, symbol: str = None) -> List[Dict]:
+        """Stored fills with created_at >= since, oldest first"""
+        query = "SELECT * FROM fills WHERE created_at >= ?"
+        params: List[Any] = [since]
+        if symbol:
+            query += " AND symbol = ?"
+            params.append(symbol)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY created_at, trade_id", params).fetchall()
+        return [_row_fill(row) for row in rows]
+
+    def orders(self) -> List[Dict]:
+        """Fills rolled up per order (size/funds/fee summed, price = funds / size)"""
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT order_id, symbol, side, SUM(size) AS size, SUM(funds) AS funds,
+                       SUM(fee) AS fee, MIN(created_at) AS created_at
+                FROM fills GROUP BY order_id ORDER BY created_at
+                """
+            ).fetchall()
+        return [
+            {**dict(row), "price": row["funds"] / row["size"] if row["size"] else 0.0}
+            for row in rows
+        ]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM fills").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class FillIngestor:
+    """
+    One pipeline from KuCoin's /api/v1/fills to every fill consumer.
+
+    Each ingest() resumes from the persisted high-water mark (time and
+    tradeId of the newest stored fill), walks forward in 7-day windows up to
+    now and pages through each window. A window is committed - fills and the
+    advanced checkpoint together - only once every page has been read. Cost
+    is proportional to fills since the last sync, not account age.
+
+    Each subscribed consumer (the PnL ledger, fee history, the fee model)
+    has its own persisted cursor into the store and is handed the stored
+    fills past it, oldest first; the cursor only advances once the consumer
+    returns. A consumer that raises, or a crash between the commit and the
+    consumer, gets the same fills again on the next ingest: delivery is
+    at-least-once, and the ledger and fee history dedupe on tradeId.
+    """
+
+    def __init__(
+        self,
+        client,
+        store: Optional[FillStore] = None,
+        page_size: int = MAX_PAGE_SIZE,
+        backfill_days: int = 30,
+    ):
+        self.client = client
+        self.store = store or FillStore()
+        self.page_size = min(page_size, MAX_PAGE_SIZE)
+        self.backfill_ms = backfill_days * 24 * 3600 * 1000
+        self._consumers: Dict[str, FillConsumer] = {}
+        self._running = asyncio.Lock()
+        self.stats = {
+            "syncs": 0,
+            "pages": 0,
+            "fills_seen": 0,
+            "fills_new": 0,
+            "fills_delivered": 0,
+            "consumer_errors": 0,
+        }
+
+    def subscribe(self, consumer: FillConsumer, name: Optional[str] = None) -> None:
+        """
+        Deliver fills to consumer from now on. A consumer seen before (same
+        name) resumes from its persisted cursor, so fills it missed are
+        replayed on the next ingest; a new one starts at the current tail.
+        """
+        name = name or _consumer_name(consumer)
+        if name in self._consumers:
+            return
+        key = CURSOR_PREFIX + name
+        if key not in self.store.state():
+            self.store.save_state({key: self.store.last_seq()})
+        self._consumers[name] = consumer
+
+    def high_water_mark(self) -> Tuple[int, str]:
+        state = self.store.state()
+        return int(state.get("hwm_time", 0)), state.get("hwm_trade_id", "")
+
+    def _start_at(self, now_ms: int) -> int:
+        state = self.store.state()
+        if "scanned_to" not in state:
+            return now_ms - self.backfill_ms
+        # Inclusive of the high-water fill's own millisecond: same-ms fills
+        # that were not visible yet are picked up, the known one is ignored
+        return max(int(state.get("hwm_time", 0)), int(state["scanned_to"]) - SETTLE_MS)
+
+    async def _read_window(self, start_at: int, end_at: int) -> List[Dict]:
+        fills, page = [], 1
+        while True:
+            data = await self.client.get_fills_page(start_at, end_at, page, self.page_size)
+            if not isinstance(data, dict) or "items" not in data:
+                # _request_with_retry hands back {} once retries run out
+                raise RuntimeError(f"fills page {page} for {start_at}-{end_at} unavailable")
+            self.stats["pages"] += 1
+            fills.extend(data["items"] or [])
+            if page >= int(data.get("totalPage", 1) or 1):
+                return fills
+            page += 1
+
+    async def ingest(self) -> List[Dict]:
+        """Fetch fills since the high-water mark, persist them and notify consumers"""
+        async with self._running:
+            self.stats["syncs"] += 1
+            now_ms = int(time.time() * 1000)
+            start_at = self._start_at(now_ms)
+            hwm_time, hwm_trade_id = self.high_water_mark()
+
+            new: List[Dict] = []
+            try:
+                while start_at < now_ms:
+                    end_at = min(start_at + MAX_WINDOW_MS, now_ms)
+                    fills = await self._read_window(start_at, end_at)
+                    self.stats["fills_seen"] += len(fills)
+                    for fill in fills:
+                        key = (int(fill.get("createdAt", 0) or 0), str(fill.get("tradeId", "")))
+                        if key > (hwm_time, hwm_trade_id):
+                            hwm_time, hwm_trade_id = key
+                    new.extend(
+                        self.store.commit_window(
+                            fills,
+                            {"hwm_time": hwm_time, "hwm_trade_id": hwm_trade_id, "scanned_to": end_at},
+                        )
+                    )
+                    start_at = end_at
+            except Exception as e:
+                logger.warning(f"Fill ingest stopped at {start_at}, resuming there next sync: {e}")
+
+            new.sort(key=lambda f: (int(f.get("createdAt", 0) or 0), str(f.get("tradeId", ""))))
+            self.stats["fills_new"] += len(new)
+            if new:
+                logger.info(f"Ingested {len(new)} new fills (high-water mark {hwm_time})")
+            await self._deliver()
+            return new
+
+    async def _deliver(self) -> None:
+        """Hand each consumer the stored fills past its cursor; advance it on success"""
+        state = self.store.state()
+        for name, consumer in self._consumers.items():
+            key = CURSOR_PREFIX + name
+            fills, seq = self.store.fills_after(int(state.get(key, 0)))
+            if not fills:
+                continue
+            try:
+                result = consumer(fills)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                self.stats["consumer_errors"] += 1
+                logger.error(
+                    f"Fill consumer {name} failed, {len(fills)} fills kept for the next sync: {e}",
+                    exc_info=True,
+                )
+                continue
+            self.store.save_state({key: seq})
+            self.stats["fills_delivered"] += len(fills)
+
+    def get_stats(self) -> Dict[str, Any]:
+        hwm_time, hwm_trade_id = self.high_water_mark()
+        return {**self.stats, "hwm_time": hwm_time, "hwm_trade_id": hwm_trade_id}
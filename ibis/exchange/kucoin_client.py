@@ -12,15 +12,21 @@ import websockets
 import os
 import base64
 from pathlib import Path
-from typing import Optional, Dict, List, Callable, Any
-from dataclasses import dataclass
+from typing import Optional, Dict, List, Callable, Any, Tuple
 from enum import Enum
 import aiohttp
 import socket
 from aiohttp.resolver import DefaultResolver
 from aiohttp.abc import AbstractResolver
 
+from ibis.core.codec import dumps, loads
+from ibis.core.http_transport import HttpTransport
 from ibis.core.logging_config import get_logger
+from ibis.exchange.candle_store import CandleStore
+from ibis.exchange.kucoin_codec import TYPED_DECODERS, UNTYPED
+from ibis.exchange.models import Candle, CandleSeries, OrderBook, Ticker, TradeOrder
+from ibis.exchange.rate_limiter import RateLimiter, is_rate_limited
+from ibis.exchange.request_cache import ACCOUNT_ENDPOINTS, RequestCache
 
 logger = get_logger(__name__)
 
@@ -103,152 +109,8 @@ INITIAL_RETRY_DELAY = 1.0
 MAX_RETRY_DELAY = 30.0
 
 
-@dataclass
-class Ticker:
-    symbol: str = ""
-    price: float = 0.0
-    change_24h: float = 0.0
-    change_percent_24h: float = 0.0
-    volume_24h: float = 0.0
-    high_24h: float = 0.0
-    low_24h: float = 0.0
-    buy: float = 0.0  # Bid
-    sell: float = 0.0  # Ask
-    timestamp: int = 0
-
-    @classmethod
-    def from_response(cls, data: Dict, symbol: str) -> "Ticker":
-        ticker = data.get("ticker", {})
-
-        def _f(val):
-            try:
-                return float(val)
-            except Exception:
-                return 0.0
-
-        price = _f(ticker.get("last", ticker.get("price", 0)))
-        return cls(
-            symbol=symbol,
-            price=price,
-            change_24h=_f(ticker.get("changeRate", 0)) * 100,
-            change_percent_24h=_f(ticker.get("changePrice", 0)),
-            volume_24h=_f(ticker.get("vol", 0)),
-            high_24h=_f(ticker.get("high", 0)),
-            low_24h=_f(ticker.get("low", 0)),
-            buy=_f(ticker.get("buy", ticker.get("bestBid", 0))),
-            sell=_f(ticker.get("sell", ticker.get("bestAsk", 0))),
-            timestamp=int(ticker.get("time", 0) or 0),
-        )
-
-
-@dataclass
-class Candle:
-    symbol: str
-    timestamp: int
-    open: float
-    high: float
-    low: float
-    close: float
-    volume: float
-    turnover: float
-
-    @classmethod
-    def from_kline(cls, kline: List, symbol: str) -> "Candle":
-        return cls(
-            symbol=symbol,
-            timestamp=int(kline[0]),
-            open=float(kline[1]),
-            high=float(kline[2]),
-            low=float(kline[3]),
-            close=float(kline[4]),
-            volume=float(kline[5]),
-            turnover=float(kline[7]) if len(kline) > 7 else 0,
-        )
-
-
-@dataclass
-class OrderBook:
-    symbol: str
-    bids: List[tuple]
-    asks: List[tuple]
-    timestamp: int
-
-    @classmethod
-    def from_response(cls, data: Dict, symbol: str) -> "OrderBook":
-        return cls(
-            symbol=symbol,
-            bids=[[float(b[0]), float(b[1])] for b in data.get("bids", [])],
-            asks=[[float(a[0]), float(a[1])] for a in data.get("asks", [])],
-            timestamp=int(data.get("time", 0)),
-        )
-
-
-@dataclass
-class TradeOrder:
-    order_id: str
-    symbol: str
-    side: str
-    type: str
-    price: float
-    size: float
-    status: str
-    filled_size: float
-    deal_funds: float
-    avg_price: float
-    created_at: int
-    fee: float = 0.0  # Actual fee from KuCoin (in quote currency)
-    fee_currency: str = "USDT"  # Fee currency (usually quote currency)
-
-    @classmethod
-    def from_response(cls, data: Dict, symbol: str) -> "TradeOrder":
-        raw_fee = data.get("fee", "0")
-        if isinstance(raw_fee, str):
-            try:
-                fee = abs(float(raw_fee))
-            except (ValueError, TypeError):
-                fee = 0.0
-        else:
-            fee = abs(float(raw_fee)) if raw_fee else 0.0
-
-        filled_size_str = data.get("dealSize", "0")
-        if isinstance(filled_size_str, str):
-            try:
-                filled_size = float(filled_size_str)
-            except (ValueError, TypeError):
-                filled_size = 0.0
-        else:
-            filled_size = float(filled_size_str) if filled_size_str else 0.0
-
-        deal_size_str = data.get("dealSize", "0")
-        if isinstance(deal_size_str, str):
-            try:
-                deal_size = float(deal_size_str)
-            except (ValueError, TypeError):
-                deal_size = 0.0
-        else:
-            deal_size = float(deal_size_str) if deal_size_str else 0.0
-
-        deal_funds = float(data.get("dealFunds", "0"))
-        avg_price = (
-            deal_funds / max(filled_size, 0.001) if filled_size > 0 and deal_funds > 0 else 0.0
-        )
-
-        status = "ACTIVE" if data.get("isActive", True) else "DONE"
-        return cls(
-            order_id=data.get("orderId", ""),
-            symbol=symbol,
-            side=data.get("side", ""),
-            type=data.get("type", ""),
-            price=float(data.get("price", 0)) if data.get("price") else 0.0,
-            size=float(data.get("size", 0)) if data.get("size") else 0.0,
-            status=status,
-            filled_size=filled_size,
-            deal_funds=deal_funds,
-            avg_price=avg_price,
-            created_at=int(data.get("createdAt", 0)),
-            fee=fee,
-            fee_currency=data.get("feeCurrency", "USDT"),
-        )
+def _copy_rows(rows: List[Dict]) -> List[Dict]:
+    return [dict(row) for row in rows] if isinstance(rows, list) else rows
 
 
 class KuCoinClient:
@@ -286,11 +148,22 @@ class KuCoinClient:
 
         self._tickers: Dict[str, Ticker] = {}
         self._orderbooks: Dict[str, OrderBook] = {}
-        self._candles: Dict[str, List[Candle]] = {}
         self._ticker_cache_time: Dict[str, int] = {}
         self._orderbook_cache_time: Dict[str, int] = {}
-        self._candle_cache_time: Dict[str, int] = {}
         self.CACHE_EXPIRY = 5  # seconds
+        self._candle_store = CandleStore(ttl=self.CACHE_EXPIRY)
+        # Optional CandleArchive: warms the store on first use, keeps fetched bars
+        self.candle_archive = None
+        # Optional AccountStateService: answers order/account reads from the
+        # private WebSocket streams while they are connected
+        self.account_state = None
+        # Cycle-scoped memo + single flight for repeated reads (balances,
+        # tickers, open orders); our own orders invalidate the account side
+        self.request_cache = RequestCache()
+        # KuCoin weight pools + AIMD concurrency; order entry has its own lane
+        self.rate_limiter = RateLimiter()
+        # Dedicated keep-alive pool (built on first request, inside the loop)
+        self.transport: Optional[HttpTransport] = None
 
         # Always initialize paper trading attributes
         self._paper_orders: Dict[str, TradeOrder] = {}
@@ -298,17 +171,22 @@ class KuCoinClient:
 
     async def _get_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
-            resolver = None
-            if self.api_ip:
-                resolver = StaticResolver({self.api_host: self.api_ip})
-            elif self.dns_servers:
-                # Prefer custom DNS via system resolver fallback if available
-                resolver = StaticResolver({})
-            if resolver:
-                connector = aiohttp.TCPConnector(resolver=resolver, family=socket.AF_INET)
-                self._session = aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT, connector=connector)
-            else:
-                self._session = aiohttp.ClientSession(timeout=DEFAULT_TIMEOUT)
+            if self.transport is None:
+                resolver = None
+                if self.api_ip:
+                    resolver = StaticResolver({self.api_host: self.api_ip})
+                elif self.dns_servers:
+                    # Prefer custom DNS via system resolver fallback if available
+                    resolver = StaticResolver({})
+                # Market calls are capped at the AIMD max; the headroom keeps
+                # trade/account lanes from ever waiting on a free connection
+                self.transport = HttpTransport(
+                    limit=0,
+                    limit_per_host=self.rate_limiter.concurrency.max_limit + 16,
+                    resolver=resolver,
+                    family=socket.AF_INET if resolver else 0,
+                )
+            self._session = self.transport.session(timeout=DEFAULT_TIMEOUT)
         return self._session
 
     async def close(self):
@@ -384,11 +262,10 @@ class KuCoinClient:
                     if "orders" in path:
                         return {"items": []}
                     return {}
-                # Handle rate limits specially
-                if "429" in error_str or "rate limit" in error_str.lower():
-                    wait_time = min(INITIAL_RETRY_DELAY * (2**attempt) * 2, MAX_RETRY_DELAY)
-                    logger.warning(f"Rate limit exceeded, retrying in {wait_time}s...")
-                    await asyncio.sleep(wait_time)
+                # Rate limits: the limiter already closed the pool's bucket,
+                # so the retry simply queues until it reopens
+                if is_rate_limited(e):
+                    logger.warning(f"Rate limit exceeded on {path}, retrying through limiter...")
                 elif attempt < MAX_RETRIES - 1:
                     wait_time = min(INITIAL_RETRY_DELAY * (2**attempt), MAX_RETRY_DELAY)
                     logger.warning(
@@ -408,31 +285,42 @@ class KuCoinClient:
 
     async def _request(self, method: str, path: str, query: str = "", body: str = "") -> Dict:
         session = await self._get_session()
-        headers = {}
 
-        if self.api_key and self.api_secret:
-            if "?" in path:
-                endpoint, path_query = path.split("?", 1)
-                if query:
-                    full_query = f"{path_query}&{query}"
-                else:
-                    full_query = path_query
-            else:
-                endpoint = path
-                full_query = query
-            headers = self._sign(method, endpoint, full_query, body)
+        # Sign only once the limiter lets us through: KuCoin rejects
+        # KC-API-TIMESTAMP values older than a few seconds
+        async with self.rate_limiter.slot(method, path):
+            headers = {}
 
-            # Debug log
-            logger.debug(f"DEBUG: Request headers:")
-            for k, v in headers.items():
-                logger.debug(f"  {k}: {v}")
+            if self.api_key and self.api_secret:
+                if "?" in path:
+                    endpoint, path_query = path.split("?", 1)
+                    if query:
+                        full_query = f"{path_query}&{query}"
+                    else:
+                        full_query = path_query
+                else:
+                    endpoint = path
+                    full_query = query
+                headers = self._sign(method, endpoint, full_query, body)
 
-        url = f"{self.base_url}{path}"
-        if query:
-            url += f"?{query}"
+                # Debug log
+                logger.debug(f"DEBUG: Request headers:")
+                for k, v in headers.items():
+                    logger.debug(f"  {k}: {v}")
 
-        async with session.request(method, url, headers=headers, data=body) as resp:
-            data = await resp.json()
+            url = f"{self.base_url}{path}"
+            if query:
+                url += f"?{query}"
+
+            async with session.request(method, url, headers=headers, data=body) as resp:
+                raw = await resp.read()
+            # Hot endpoints decode straight into typed rows/models
+            decode = TYPED_DECODERS.get((method, path.split("?", 1)[0]))
+            if decode is not None:
+                typed = decode(raw)
+                if typed is not UNTYPED:
+                    return typed
+            data = loads(raw)
             if data.get("code") != "200000":
                 logger.debug(f"DEBUG: API Response: {data}")
                 raise Exception(f"KuCoin API Error: {data}")
@@ -445,7 +333,14 @@ class KuCoinClient:
         return await self._request_with_retry("GET", f"/api/v2/symbols/{symbol}")
 
     async def get_accounts(self) -> List[Dict]:
-        return await self._request_with_retry("GET", "/api/v1/accounts")
+        if self.account_state is not None and self.account_state.is_live():
+            return self.account_state.accounts()
+        return await self.request_cache.get(
+            "accounts",
+            None,
+            lambda: self._request_with_retry("GET", "/api/v1/accounts"),
+            copy=_copy_rows,
+        )
 
     async def get_account(self, currency: str) -> Optional[Dict]:
         accounts = await self._request_with_retry("GET", f"/api/v1/accounts?currency={currency}")
@@ -515,6 +410,9 @@ class KuCoinClient:
 
     async def get_basic_orders(self, symbol: str = "", status: str = "active") -> List[Dict]:
         """Get basic spot orders (limit, market)"""
+        if status == "active" and self.account_state is not None and self.account_state.is_live():
+            return self.account_state.open_orders(symbol)
+
         params = []
         if symbol:
             params.append(f"symbol={symbol}")
@@ -524,14 +422,15 @@ class KuCoinClient:
         query = "&".join(params)
 
         try:
-            data = await self._request_with_retry("GET", "/api/v1/orders", query)
+            data = await self.request_cache.get(
+                "orders",
+                query,
+                lambda: self._request_with_retry("GET", "/api/v1/orders", query),
+            )
             orders = data.get("items", []) if data else []
 
             # For active status, we get only active orders from API
-            if status == "active":
-                return orders
-
-            return orders
+            return _copy_rows(orders)
 
         except Exception as e:
             logger.warning(f"Warning: Could not fetch basic orders: {e}")
@@ -540,8 +439,12 @@ class KuCoinClient:
     async def get_advanced_orders(self, symbol: str = "") -> List[Dict]:
         """Get advanced orders (stop limit, take profit, trailing stop)"""
         try:
-            data = await self._request_with_retry("GET", "/api/v1/stop-order")
-            return data.get("items", []) if data else []
+            data = await self.request_cache.get(
+                "stop_orders",
+                None,
+                lambda: self._request_with_retry("GET", "/api/v1/stop-order"),
+            )
+            return _copy_rows(data.get("items", [])) if data else []
         except Exception as e:
             logger.warning(f"Warning: Could not fetch advanced orders: {e}")
             return []
@@ -575,12 +478,34 @@ class KuCoinClient:
         """
         return await self.get_basic_orders(symbol, status)
 
+    async def get_fills_page(
+        self,
+        start_at: int = None,
+        end_at: int = None,
+        page: int = 1,
+        page_size: int = 500,
+        symbol: str = "",
+    ) -> Dict:
+        """One page of /api/v1/fills (newest first); start/end are ms and at most 7 days apart"""
+        params = ["tradeType=TRADE", f"currentPage={page}", f"pageSize={page_size}"]
+        if start_at is not None:
+            params.append(f"startAt={int(start_at)}")
+        if end_at is not None:
+            params.append(f"endAt={int(end_at)}")
+        if symbol:
+            params.append(f"symbol={symbol}")
+        return await self._request_with_retry("GET", "/api/v1/fills", "&".join(params))
+
     async def get_recent_fills(self, limit: int = 50) -> List[Dict]:
         try:
-            data = await self._request("GET", "/api/v1/orders")
+            # Newest page of fills only; full history goes through FillIngestor
+            data = await self.get_fills_page(page_size=max(1, min(limit, 500)))
             items = data.get("items", []) if data else []
+            # Keep the order-style keys callers of the old /orders version read
             filled_orders = [
-                o for o in items if o.get("isActive") == False and o.get("dealSize", "0") != "0"
+                {**f, "dealSize": f.get("size", "0"), "dealFunds": f.get("funds", "0")}
+                for f in items
+                if f.get("size", "0") not in ("", "0")
             ]
 
             # Enhanced order details with price and fee information
@@ -699,14 +624,24 @@ class KuCoinClient:
         return ticker
 
     async def get_tickers(self) -> List[Ticker]:
+        return await self.request_cache.get("tickers", None, self._fetch_tickers, copy=list)
+
+    async def _fetch_tickers(self) -> List[Ticker]:
         data = await self._request_with_retry("GET", "/api/v1/market/allTickers")
+        now = int(time.time())
         tickers = []
         for t in data.get("ticker", []):
-            symbol = t.get("symbol", "")
+            # Typed decoding yields Ticker objects; mocks and old paths yield rows
+            if not isinstance(t, Ticker):
+                t = Ticker.from_response({"ticker": t}, t.get("symbol", ""))
+            symbol = t.symbol
             if symbol.endswith("USDT"):
-                ticker = Ticker.from_response({"ticker": t}, symbol)
+                ticker = t
                 tickers.append(ticker)
                 self._tickers[symbol] = ticker
+                # The snapshot also serves get_ticker until it expires
+                if ticker.price > 0:
+                    self._ticker_cache_time[symbol] = now
         return tickers
 
     async def get_24h_stats(self, symbol: str) -> Dict:
@@ -721,18 +656,103 @@ class KuCoinClient:
         start: int = None,
         end: int = None,
     ) -> List[Candle]:
-        """Get candles with cache expiration"""
-        now = int(time.time())
+        """
+        Get candles from the (symbol, interval) candle store.
 
-        # Check cache validity for recent candle data
-        if (
-            symbol in self._candles
-            and (now - self._candle_cache_time.get(symbol, 0)) < self.CACHE_EXPIRY
-        ):
-            # If no time range specified, return cached data
-            if not start and not end:
-                return self._candles[symbol]
+        Fresh series are served from memory; stale series are extended with only
+        the bars after the last stored timestamp. Explicit time ranges bypass the
+        store and hit the API directly.
+        """
+        if start or end:
+            return await self._fetch_candles(symbol, candle_type, limit, start, end)
+
+        store = self._candle_store
+        if store.is_fresh(symbol, candle_type, limit):
+            candles = store.get(symbol, candle_type, limit)
+            store.record_hit(len(candles))
+            return candles
+
+        if (symbol, candle_type) not in store:
+            await self._warm_from_archive(symbol, candle_type)
+
+        if store.can_extend(symbol, candle_type, limit):
+            # Re-request the last (still forming) bar so it gets finalized.
+            last_ts = store.last_timestamp(symbol, candle_type)
+            fresh = await self._fetch_candles(symbol, candle_type, start=last_ts)
+            reused = store.size(symbol, candle_type) - (1 if fresh else 0)
+            store.merge(symbol, candle_type, fresh)
+            store.record_incremental_fetch(len(fresh), reused)
+        else:
+            fresh = await self._fetch_candles(symbol, candle_type)
+            store.replace(symbol, candle_type, fresh)
+            store.record_full_fetch(len(fresh))
+
+        await self._archive_candles(symbol, candle_type, fresh)
+        return store.get(symbol, candle_type, limit)
+
+    async def get_candle_series(
+        self, symbol: str, candle_type: str = "1min", limit: int = None
+    ) -> CandleSeries:
+        """get_candles as one columnar CandleSeries for indicator and scoring code."""
+        candles = await self.get_candles(symbol, candle_type, limit)
+        return CandleSeries.from_candles(candles, symbol)
+
+    async def _warm_from_archive(self, symbol: str, candle_type: str) -> None:
+        """Seed an empty store series from the on-disk archive, if one is attached."""
+        if self.candle_archive is None:
+            return
+        try:
+            # Archive I/O runs in a worker thread; the store is only touched on the loop
+            archived = await asyncio.to_thread(
+                self.candle_archive.candles, symbol, candle_type, self._candle_store.max_bars
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Candle archive read failed for {symbol} {candle_type}: {e}")
+            return
+        if archived:
+            self._candle_store.replace(symbol, candle_type, archived, complete=False)
+
+    async def _archive_candles(self, symbol: str, candle_type: str, candles: List[Candle]) -> None:
+        if self.candle_archive is None or not candles:
+            return
+        try:
+            await asyncio.to_thread(self.candle_archive.append, symbol, candle_type, candles)
+        except Exception as e:
+            logger.warning(f"⚠️ Candle archive write failed for {symbol} {candle_type}: {e}")
+
+    async def flush_candle_archive(self) -> int:
+        """
+        Write every stored series (including stream-fed bars) to the archive.
+
+        The series are copied here on the loop, where the stream appends to
+        them; only the copies go to the worker thread.
+        """
+        if self.candle_archive is None:
+            return 0
+        series = [
+            (symbol, candle_type, self._candle_store.get(symbol, candle_type))
+            for symbol, candle_type in self._candle_store.keys()
+        ]
+        return await asyncio.to_thread(self._write_candle_archive, series)
+
+    def _write_candle_archive(self, series: List[Tuple[str, str, List[Candle]]]) -> int:
+        added = 0
+        for symbol, candle_type, candles in series:
+            try:
+                added += self.candle_archive.append(symbol, candle_type, candles)
+            except Exception as e:
+                logger.warning(f"⚠️ Candle archive write failed for {symbol} {candle_type}: {e}")
+        return added
 
+    async def _fetch_candles(
+        self,
+        symbol: str,
+        candle_type: str,
+        limit: int = None,
+        start: int = None,
+        end: int = None,
+    ) -> List[Candle]:
+        """Fetch and validate candles from the API (oldest -> newest)."""
         params = f"symbol={symbol}&type={candle_type}"
         if start:
             params += f"&startAt={start}"
@@ -740,6 +760,11 @@ class KuCoinClient:
             params += f"&endAt={end}"
 
         data = await self._request_with_retry("GET", f"/api/v1/market/candles?{params}")
+        if not data:
+            return []
+        if not start:
+            sample = data[:50]
+            self._candle_store.observe_payload(len(sample), len(dumps(sample)))
         candles = [Candle.from_kline(k, symbol) for k in data]
         candles.reverse()
         if limit and len(candles) > limit:
@@ -762,10 +787,28 @@ class KuCoinClient:
                 f"Filtered out {len(candles) - len(valid_candles)} invalid candles for {symbol}"
             )
 
-        self._candles[symbol] = valid_candles
-        self._candle_cache_time[symbol] = now
         return valid_candles
 
+    def begin_cycle(self) -> None:
+        """Start memoizing reads until end_cycle (one agent scan cycle)."""
+        self.request_cache.begin_cycle()
+
+    def end_cycle(self) -> None:
+        self.request_cache.end_cycle()
+
+    def get_request_cache_stats(self) -> Dict:
+        return self.request_cache.get_stats()
+
+    def get_rate_limiter_stats(self) -> Dict:
+        return self.rate_limiter.get_stats()
+
+    def get_transport_stats(self) -> Dict:
+        return self.transport.get_stats() if self.transport is not None else {}
+
+    def get_candle_store_stats(self) -> Dict[str, int]:
+        """Hit/miss and bytes-saved counters for the candle store."""
+        return self._candle_store.get_stats()
+
     async def get_orderbook(self, symbol: str, limit: int = 20) -> OrderBook:
         """Get order book with cache expiration"""
         now = int(time.time())
@@ -828,10 +871,13 @@ class KuCoinClient:
             if type.lower() == "limit":
                 order_data["price"] = str(price)
 
-        if self.paper_trading:
-            return await self._paper_create_order(order_data)
-        else:
-            return await self._live_create_order(order_data)
+        try:
+            if self.paper_trading:
+                return await self._paper_create_order(order_data)
+            else:
+                return await self._live_create_order(order_data)
+        finally:
+            self.request_cache.invalidate(ACCOUNT_ENDPOINTS)
 
     async def create_market_order(self, symbol: str, side: str, size: float) -> TradeOrder:
         """Alias for engine compatibility."""
@@ -924,21 +970,35 @@ class KuCoinClient:
     async def _live_create_order(self, order_data: Dict) -> TradeOrder:
         body = json.dumps(order_data)
         data = await self._request("POST", "/api/v1/orders", body=body)
-        return TradeOrder.from_response(data, order_data["symbol"])
+        return self._order_from_post(data, order_data["symbol"])
+
+    @staticmethod
+    def _order_from_post(data, symbol: str) -> TradeOrder:
+        """POST /api/v1/orders result -> TradeOrder (typed decode or dict fallback)"""
+        if isinstance(data, TradeOrder):
+            data.symbol = symbol
+            return data
+        return TradeOrder.from_response(data, symbol)
 
     async def cancel_order(self, order_id: str) -> bool:
         if self.paper_trading:
             if order_id in self._paper_orders:
                 self._paper_orders[order_id].status = "CANCELLED"
+                self.request_cache.invalidate(ACCOUNT_ENDPOINTS)
                 return True
             return False
         else:
-            await self._request_with_retry("DELETE", f"/api/v1/orders/{order_id}")
+            try:
+                await self._request_with_retry("DELETE", f"/api/v1/orders/{order_id}")
+            finally:
+                self.request_cache.invalidate(ACCOUNT_ENDPOINTS)
             return True
 
     async def get_order(self, order_id: str, symbol: str = "") -> Optional[TradeOrder]:
         if self.paper_trading:
             return self._paper_orders.get(order_id)
+        elif self.account_state is not None and self.account_state.is_live():
+            return await self.account_state.get_order(order_id, symbol)
         else:
             data = await self._request_with_retry("GET", f"/api/v1/orders/{order_id}")
             return TradeOrder.from_response(data, symbol)
@@ -981,6 +1041,8 @@ class KuCoinClient:
     async def close(self):
         if self._session and not self._session.closed:
             await self._session.close()
+        if self.transport is not None:
+            await self.transport.close()
         if self._ws:
             await self._ws.close()
 
@@ -998,11 +1060,8 @@ class MarketData:
 
     async def get_order_flow(self, symbol: str) -> Dict:
         orderbook = await self.client.get_orderbook(symbol)
-        bids = orderbook.bids
-        asks = orderbook.asks
-
-        bid_volume = sum(b[1] for b in bids[:5])
-        ask_volume = sum(a[1] for a in asks[:5])
+        bid_volume = orderbook.bids.total_size(5)
+        ask_volume = orderbook.asks.total_size(5)
 
         return {
             "bid_volume": bid_volume,
@@ -1098,7 +1157,8 @@ class TradingClient:
         else:
             body = json.dumps(order_data)
             data = await self.client._request("POST", "/api/v1/orders", body=body)
-            return TradeOrder.from_response(data, symbol)
+            self.client.request_cache.invalidate(ACCOUNT_ENDPOINTS)
+            return self.client._order_from_post(data, symbol)
 
     async def get_open_orders(self, symbol: str = "") -> List[TradeOrder]:
         if self.client.paper_trading:
@@ -1123,6 +1183,7 @@ class TradingClient:
             await self.client._request_with_retry(
                 "DELETE", f"/api/v1/orders{'?symbol=' + symbol if symbol else ''}"
             )
+            self.client.request_cache.invalidate(ACCOUNT_ENDPOINTS)
 
 
 _KUCOIN_CLIENT_INSTANCE: Optional[KuCoinClient] = None
@@ -0,0 +1,179 @@
+"""
+IBIS KuCoin Codec
+Typed decoding of hot KuCoin REST payloads straight from response bytes
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+from ibis.core.codec import MSGSPEC_AVAILABLE, loads
+from ibis.exchange.models import Ticker, TradeOrder
+
+OK = "200000"
+
+# Returned by a decoder when the typed path does not apply (error envelope,
+# unexpected shape); _request then decodes generically and checks the code
+UNTYPED = object()
+
+if MSGSPEC_AVAILABLE:
+    import msgspec
+
+    # strict=False lets KuCoin's numeric strings ("0.1234") decode as floats
+
+    class TickerRow(msgspec.Struct):
+        symbol: str = ""
+        last: Optional[float] = None
+        buy: Optional[float] = None
+        sell: Optional[float] = None
+        changeRate: Optional[float] = None
+        changePrice: Optional[float] = None
+        vol: Optional[float] = None
+        high: Optional[float] = None
+        low: Optional[float] = None
+
+    class AllTickers(msgspec.Struct):
+        ticker: List[TickerRow] = msgspec.field(default_factory=list)
+        time: int = 0
+
+    class TickersEnvelope(msgspec.Struct):
+        code: str
+        data: Optional[AllTickers] = None
+
+    class CandlesEnvelope(msgspec.Struct):
+        code: str
+        data: Optional[List[List[float]]] = None
+
+    class OrderBookLevels(msgspec.Struct):
+        bids: List[List[float]] = msgspec.field(default_factory=list)
+        asks: List[List[float]] = msgspec.field(default_factory=list)
+        time: int = 0
+        sequence: Optional[str] = None
+
+    class OrderBookEnvelope(msgspec.Struct):
+        code: str
+        data: Optional[OrderBookLevels] = None
+
+    class OrderRow(msgspec.Struct):
+        orderId: str = ""
+        symbol: str = ""
+        side: str = ""
+        type: str = ""
+        price: Optional[float] = None
+        size: Optional[float] = None
+        dealSize: Optional[float] = None
+        dealFunds: Optional[float] = None
+        fee: Optional[float] = None
+        feeCurrency: str = "USDT"
+        isActive: bool = True
+        createdAt: int = 0
+
+    class OrderEnvelope(msgspec.Struct):
+        code: str
+        data: Optional[OrderRow] = None
+
+    _TICKERS = msgspec.json.Decoder(TickersEnvelope, strict=False)
+    _CANDLES = msgspec.json.Decoder(CandlesEnvelope, strict=False)
+    _ORDERBOOK = msgspec.json.Decoder(OrderBookEnvelope, strict=False)
+    _ORDER = msgspec.json.Decoder(OrderEnvelope, strict=False)
+
+    def _typed(decoder, body: bytes):
+        try:
+            envelope = decoder.decode(body)
+        except msgspec.DecodeError:
+            return None
+        if envelope.code != OK or envelope.data is None:
+            return None
+        return envelope.data
+
+
+def ticker_from_row(row: "TickerRow") -> Ticker:
+    """Same fields Ticker.from_response derives from an allTickers row."""
+    return Ticker(
+        symbol=row.symbol,
+        price=row.last or 0.0,
+        change_24h=(row.changeRate or 0.0) * 100,
+        change_percent_24h=row.changePrice or 0.0,
+        volume_24h=row.vol or 0.0,
+        high_24h=row.high or 0.0,
+        low_24h=row.low or 0.0,
+        buy=row.buy or 0.0,
+        sell=row.sell or 0.0,
+        timestamp=0,
+    )
+
+
+def order_from_row(row: "OrderRow", symbol: str) -> TradeOrder:
+    """Same fields TradeOrder.from_response derives from an order payload."""
+    filled_size = row.dealSize or 0.0
+    deal_funds = row.dealFunds or 0.0
+    return TradeOrder(
+        order_id=row.orderId,
+        symbol=symbol,
+        side=row.side,
+        type=row.type,
+        price=row.price or 0.0,
+        size=row.size or 0.0,
+        status="ACTIVE" if row.isActive else "DONE",
+        filled_size=filled_size,
+        deal_funds=deal_funds,
+        avg_price=(
+            deal_funds / max(filled_size, 0.001) if filled_size > 0 and deal_funds > 0 else 0.0
+        ),
+        created_at=row.createdAt,
+        fee=abs(row.fee or 0.0),
+        fee_currency=row.feeCurrency,
+    )
+
+
+def decode_all_tickers(body: bytes) -> Any:
+    """allTickers -> {"ticker": [Ticker, ...]} with either backend."""
+    if MSGSPEC_AVAILABLE:
+        data = _typed(_TICKERS, body)
+        if data is not None:
+            return {"time": data.time, "ticker": [ticker_from_row(row) for row in data.ticker]}
+    payload = loads(body)
+    if not isinstance(payload, dict) or payload.get("code") != OK:
+        return UNTYPED
+    data = payload.get("data") or {}
+    rows = data.get("ticker") or []
+    return {
+        "time": data.get("time", 0),
+        "ticker": [Ticker.from_response({"ticker": t}, t.get("symbol", "")) for t in rows],
+    }
+
+
+def decode_candles(body: bytes) -> Any:
+    """Klines as float rows (Candle.from_kline accepts strings or floats)."""
+    if MSGSPEC_AVAILABLE:
+        data = _typed(_CANDLES, body)
+        if data is not None:
+            return data
+    return UNTYPED
+
+
+def decode_orderbook(body: bytes) -> Any:
+    """Level-2 book with bid/ask levels already parsed to floats."""
+    if MSGSPEC_AVAILABLE:
+        data = _typed(_ORDERBOOK, body)
+        if data is not None:
+            return {"bids": data.bids, "asks": data.asks, "time": data.time, "sequence": data.sequence}
+    return UNTYPED
+
+
+def decode_order(body: bytes) -> Any:
+    """Order payload -> TradeOrder (symbol is filled in by the caller)."""
+    if MSGSPEC_AVAILABLE:
+        data = _typed(_ORDER, body)
+        if data is not None:
+            return order_from_row(data, data.symbol)
+    return UNTYPED
+
+
+# (method, endpoint) -> decoder used by KuCoinClient._request
+TYPED_DECODERS: Dict[tuple, Callable[[bytes], Any]] = {
+    ("GET", "/api/v1/market/allTickers"): decode_all_tickers,
+    ("GET", "/api/v1/market/candles"): decode_candles,
+    ("GET", "/api/v1/market/orderbook/level2_20"): decode_orderbook,
+    ("GET", "/api/v1/market/orderbook/level2_50"): decode_orderbook,
+    ("GET", "/api/v1/market/orderbook/level2_100"): decode_orderbook,
+    ("POST", "/api/v1/orders"): decode_order,
+}
@@ -20,22 +20,74 @@ class KuCoinWebSocket:
     """KuCoin WebSocket client for real-time market data streaming"""
 
     TICKER_CHANNEL = "/market/ticker:{}"
+    ALL_TICKERS_TOPIC = "/market/ticker:all"
     ORDERBOOK_CHANNEL = "/market/level2_20:{}"
+    DEPTH50_CHANNEL = "/spotMarket/level2Depth50:{}"
+    KLINE_CHANNEL = "/market/candles:{}_{}"
     TRADE_CHANNEL = "/market/match:{}"
+    ORDERS_TOPIC = "/spotMarket/tradeOrders"
+    BALANCE_TOPIC = "/account/balance"
+    DEFAULT_PING_INTERVAL = 18.0
 
-    def __init__(self, client: KuCoinClient):
+    def __init__(self, client: KuCoinClient, private: bool = False):
         self.client = client
+        # Private connections use a signed bullet-private token and
+        # privateChannel subscriptions (own orders, balances)
+        self.private = private
         self.running = False
         self.websocket: Optional[websockets.WebSocketClientProtocol] = None
         self.subscriptions: Dict[str, List[Callable]] = {}
         self.price_cache: Dict[str, float] = {}
         self.orderbook_cache: Dict[str, OrderBook] = {}
         self.trade_cache: Dict[str, List[dict]] = {}
+        # Raw handlers keyed by channel (topic without the ":symbol" part)
+        self.channel_handlers: Dict[str, List[Callable]] = {}
+        self.reconnect_callbacks: List[Callable] = []
+        self.messages_received = 0
+        self.last_message_ts = 0.0
+        self.ping_interval = self.DEFAULT_PING_INTERVAL
+        self.reconnect_delay = 5.0
+        self.reconnects = 0
+        # Seconds to wait for the ack/error reply to a subscribe
+        self.ack_timeout = 10.0
+        self._ack_seq = 0
+        self._pending_acks: Dict[str, asyncio.Future] = {}
+        self._ping_task: Optional[asyncio.Task] = None
+        self._listen_task: Optional[asyncio.Task] = None
         self._connect_lock = asyncio.Lock()
         self.PUBLIC_WS_URL = (
             self.client.WS_URL_SANDBOX if self.client.sandbox else self.client.WS_URL_PROD
         )
 
+    async def _get_endpoint(self) -> str:
+        """Negotiate a connect token (bullet-public/private) and build the WS URL."""
+        bullet = "/api/v1/bullet-private" if self.private else "/api/v1/bullet-public"
+        try:
+            data = await self.client._request("POST", bullet)
+            servers = data.get("instanceServers") or []
+            token = data.get("token", "")
+            if servers and token:
+                server = servers[0]
+                self.ping_interval = (
+                    float(server.get("pingInterval", 18000)) / 1000.0 or self.DEFAULT_PING_INTERVAL
+                )
+                connect_id = int(time.time() * 1000)
+                return f"{server.get('endpoint')}?token={token}&connectId={connect_id}"
+        except Exception as e:
+            logger.warning(f"⚠️ {bullet} token request failed: {e}")
+        return self.PUBLIC_WS_URL
+
+    async def _ping_loop(self):
+        """Keep the connection alive inside KuCoin's ping window"""
+        while self.running and self.websocket:
+            await asyncio.sleep(self.ping_interval)
+            try:
+                await self.websocket.send(
+                    json.dumps({"id": str(int(time.time() * 1000)), "type": "ping"})
+                )
+            except Exception:
+                return
+
     async def connect(self) -> bool:
         """Establish WebSocket connection with retry logic"""
         async with self._connect_lock:
@@ -48,12 +100,16 @@ class KuCoinWebSocket:
             for attempt in range(max_retries):
                 try:
                     logger.info("🔌 Establishing WebSocket connection...")
-                    self.websocket = await websockets.connect(self.PUBLIC_WS_URL)
+                    url = await self._get_endpoint()
+                    self.websocket = await websockets.connect(url)
                     self.running = True
                     logger.info("✅ WebSocket connection established")
 
-                    # Start listener task
-                    asyncio.create_task(self._listen_loop())
+                    # Start listener and keepalive tasks; one of each per connection
+                    if self._ping_task and not self._ping_task.done():
+                        self._ping_task.cancel()
+                    self._listen_task = asyncio.create_task(self._listen_loop())
+                    self._ping_task = asyncio.create_task(self._ping_loop())
                     return True
 
                 except Exception as e:
@@ -76,32 +132,42 @@ class KuCoinWebSocket:
             except websockets.exceptions.ConnectionClosed:
                 logger.warning("🔌 WebSocket connection closed")
                 self.running = False
+                self._fail_pending_acks()
+                # connect() starts a fresh listener for the new socket; this
+                # one must not recv() on it as well
                 await self._reconnect()
+                return
 
             except Exception as e:
-                 logger.error(f"❌ WebSocket listen error: {e}", exc_info=True)
+                logger.error(f"❌ WebSocket listen error: {e}", exc_info=True)
                 await asyncio.sleep(1)
 
     async def _reconnect(self):
         """Reconnect to WebSocket with backoff"""
         logger.info("🔄 Attempting to reconnect WebSocket...")
-        await asyncio.sleep(5)
+        await asyncio.sleep(self.reconnect_delay)
+        self.reconnects += 1
 
         success = await self.connect()
         if success:
             logger.info("✅ WebSocket reconnected successfully")
             # Re-subscribe to all channels
             await self._resubscribe()
+            for callback in self.reconnect_callbacks:
+                try:
+                    await callback()
+                except Exception as e:
+                    logger.error(f"❌ Reconnect callback error: {e}", exc_info=True)
         else:
-             logger.error("❌ WebSocket reconnection failed", exc_info=True)
+            logger.error("❌ WebSocket reconnection failed", exc_info=True)
 
     async def _resubscribe(self):
         """Re-subscribe to all previously subscribed channels"""
         for topic in list(self.subscriptions.keys()):
             try:
-                await self._send_subscription(topic, True)
+                await self._send_subscription(topic)
             except Exception as e:
-                 logger.error(f"❌ Failed to resubscribe to {topic}: {e}", exc_info=True)
+                logger.error(f"❌ Failed to resubscribe to {topic}: {e}", exc_info=True)
 
     async def subscribe(self, symbol: str, callback: Callable) -> bool:
         """Subscribe to ticker and orderbook channels for a symbol"""
@@ -131,6 +197,38 @@ class KuCoinWebSocket:
         logger.debug(f"✅ Subscribed to channels for {symbol}")
         return True
 
+    def add_channel_handler(self, channel: str, handler: Callable) -> None:
+        """
+        Register a raw handler for every message on a channel.
+
+        The handler is called as handler(topic, subject, data) for any topic that
+        starts with `channel`, e.g. "/market/candles" or "/market/ticker".
+        """
+        handlers = self.channel_handlers.setdefault(channel, [])
+        if handler not in handlers:
+            handlers.append(handler)
+
+    async def subscribe_topic(self, topic: str) -> bool:
+        """Subscribe to a raw topic (handlers are registered per channel)"""
+        if not self.running:
+            success = await self.connect()
+            if not success:
+                return False
+        new = topic not in self.subscriptions
+        if new:
+            self.subscriptions[topic] = []
+        if await self._send_subscription(topic, wait_ack=True):
+            return True
+        if new:
+            # Rejected or unconfirmed: don't replay it on reconnect either
+            del self.subscriptions[topic]
+        return False
+
+    async def unsubscribe_topic(self, topic: str) -> None:
+        if topic in self.subscriptions:
+            await self._send_subscription(topic, is_unsubscribe=True)
+            del self.subscriptions[topic]
+
     async def unsubscribe(self, symbol: str, callback: Callable = None) -> bool:
         """Unsubscribe from channels for a symbol"""
         ticker_topic = self.TICKER_CHANNEL.format(symbol)
@@ -150,35 +248,88 @@ class KuCoinWebSocket:
 
         return True
 
-    async def _send_subscription(self, topic: str, is_unsubscribe: bool = False):
-        """Send subscription/unsubscription message"""
+    async def _send_subscription(self, topic: str, is_unsubscribe: bool = False,
+                                 wait_ack: bool = False) -> bool:
+        """
+        Send subscription/unsubscription message. With wait_ack, only an ack
+        carrying this request's id counts as success; an error reply, a timeout
+        or a dropped connection returns False.
+        """
         if not self.running or not self.websocket:
-            return
+            return False
 
+        self._ack_seq += 1
+        request_id = f"{topic}_{int(time.time() * 1000)}_{self._ack_seq}"
+        if wait_ack:
+            self._pending_acks[request_id] = asyncio.get_running_loop().create_future()
+        action = "unsubscribe" if is_unsubscribe else "subscribe"
         try:
             message = {
-                "id": f"{topic}_{int(time.time() * 1000)}",
-                "type": "unsubscribe" if is_unsubscribe else "subscribe",
+                "id": request_id,
+                "type": action,
                 "topic": topic,
-                "privateChannel": False,
+                "privateChannel": self.private,
                 "response": True,
             }
 
             await self.websocket.send(json.dumps(message))
-            logger.debug(f"{'Un' if is_unsubscribe else ''}subscribed to {topic}")
-
+            if not wait_ack:
+                logger.debug(f"{'Un' if is_unsubscribe else ''}subscribed to {topic}")
+                return True
+            acked = await asyncio.wait_for(self._pending_acks[request_id], self.ack_timeout)
+            if acked:
+                logger.debug(f"{'Un' if is_unsubscribe else ''}subscribed to {topic}")
+            return acked
+
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ No ack for {action} to {topic} within {self.ack_timeout}s")
+            return False
         except Exception as e:
-             logger.error(f"❌ Failed to {'un' if is_unsubscribe else ''}subscribe to {topic}: {e}", exc_info=True)
+            logger.error(f"❌ Failed to {action} to {topic}: {e}", exc_info=True)
+            return False
+        finally:
+            self._pending_acks.pop(request_id, None)
+
+    def _resolve_ack(self, data: Dict) -> None:
+        """Settle the pending subscribe whose id an ack/error reply carries"""
+        future = self._pending_acks.get(data.get("id"))
+        if future is None or future.done():
+            return
+        if data.get("type") == "error":
+            logger.warning(f"❌ Subscription rejected: {data.get('code')} {data.get('data')}")
+        future.set_result(data.get("type") == "ack")
+
+    def _fail_pending_acks(self) -> None:
+        """The connection is gone, so no reply to an outstanding subscribe will come"""
+        for future in self._pending_acks.values():
+            if not future.done():
+                future.set_result(False)
 
     async def _process_message(self, raw_message: str):
         """Process incoming WebSocket messages"""
         try:
             data = json.loads(raw_message)
 
+            if data.get("type") in ("ack", "error"):
+                self._resolve_ack(data)
+                return
+
             if "topic" not in data:
                 return
 
             topic = data["topic"]
+            self.messages_received += 1
+            self.last_message_ts = time.time()
+
+            handlers = self.channel_handlers.get(topic.split(":", 1)[0])
+            if handlers:
+                subject = data.get("subject", "")
+                payload = data.get("data", {})
+                for handler in handlers:
+                    try:
+                        handler(topic, subject, payload)
+                    except Exception as e:
+                        logger.error(f"❌ Channel handler error for {topic}: {e}", exc_info=True)
 
             # Handle ticker updates
             if "/market/ticker" in topic:
@@ -193,12 +344,14 @@ class KuCoinWebSocket:
                 await self._process_trade_update(topic, data)
 
         except Exception as e:
-             logger.error(f"❌ Error processing WebSocket message: {e}", exc_info=True)
+            logger.error(f"❌ Error processing WebSocket message: {e}", exc_info=True)
 
     async def _process_ticker_update(self, topic: str, data: dict):
         """Process ticker channel updates"""
         try:
             symbol = topic.split(":")[-1]
+            if symbol == "all":
+                symbol = data.get("subject", "")
             ticker_data = data.get("data", {})
 
             # Update price cache
@@ -214,7 +367,7 @@ class KuCoinWebSocket:
                         logger.error(f"❌ Callback error for {topic}: {e}", exc_info=True)
 
         except Exception as e:
-             logger.error(f"❌ Error processing ticker update: {e}", exc_info=True)
+            logger.error(f"❌ Error processing ticker update: {e}", exc_info=True)
 
     async def _process_orderbook_update(self, topic: str, data: dict):
         """Process orderbook channel updates"""
@@ -225,8 +378,8 @@ class KuCoinWebSocket:
             # Create OrderBook object from WebSocket data
             orderbook = OrderBook(
                 symbol=symbol,
-                bids=[[float(b[0]), float(b[1])] for b in orderbook_data.get("bids", [])],
-                asks=[[float(a[0]), float(a[1])] for a in orderbook_data.get("asks", [])],
+                bids=orderbook_data.get("bids", []),
+                asks=orderbook_data.get("asks", []),
                 timestamp=int(time.time() * 1000),
             )
 
@@ -241,7 +394,7 @@ class KuCoinWebSocket:
                         logger.error(f"❌ Callback error for {topic}: {e}", exc_info=True)
 
         except Exception as e:
-             logger.error(f"❌ Error processing orderbook update: {e}", exc_info=True)
+            logger.error(f"❌ Error processing orderbook update: {e}", exc_info=True)
 
     async def _process_trade_update(self, topic: str, data: dict):
         """Process trade channel updates"""
@@ -274,7 +427,7 @@ class KuCoinWebSocket:
                         logger.error(f"❌ Callback error for {topic}: {e}", exc_info=True)
 
         except Exception as e:
-             logger.error(f"❌ Error processing trade update: {e}", exc_info=True)
+            logger.error(f"❌ Error processing trade update: {e}", exc_info=True)
 
     def get_latest_price(self, symbol: str) -> float:
         """Get latest price from cache"""
@@ -293,6 +446,12 @@ class KuCoinWebSocket:
     async def close(self):
         """Close WebSocket connection"""
         self.running = False
+        self._fail_pending_acks()
+        if self._ping_task:
+            self._ping_task.cancel()
+        # A listener left running would treat the close as a drop and reconnect
+        if self._listen_task and self._listen_task is not asyncio.current_task():
+            self._listen_task.cancel()
         if self.websocket:
             try:
                 await self.websocket.close()
@@ -350,7 +509,7 @@ class WebSocketDataFeed:
                     self.ws.orderbook_cache[symbol] = orderbook
 
                 except Exception as e:
-                     logger.error(f"❌ REST API fallback error for {symbol}: {e}", exc_info=True)
+                    logger.error(f"❌ REST API fallback error for {symbol}: {e}", exc_info=True)
 
             await asyncio.sleep(self.update_interval)
 
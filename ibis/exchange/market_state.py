@@ -0,0 +1,249 @@
+"""
+IBIS Streaming Market State
+WebSocket-fed tickers, candles and orderbooks served from memory
+"""
+
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from .kucoin_client import Candle, KuCoinClient, OrderBook, Ticker
+from .kucoin_websocket import KuCoinWebSocket
+
+from ibis.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_INTERVALS = ("1min", "5min", "15min")
+
+
+class MarketStateService:
+    """
+    Streaming market state for the agent's scan cycle.
+
+    Subscribes to /market/ticker:all plus per-symbol kline and depth topics and
+    writes every push straight into the KuCoinClient caches (tickers, candle
+    store, orderbooks), so the existing get_ticker/get_candles/get_orderbook
+    calls are answered from memory while the stream is healthy. REST is only
+    used to seed state, to refresh 24h ticker stats, and to fill gaps after a
+    reconnect or when the stream goes quiet.
+    """
+
+    def __init__(
+        self,
+        client: KuCoinClient,
+        ws: Optional[KuCoinWebSocket] = None,
+        intervals: Iterable[str] = DEFAULT_INTERVALS,
+        ticker_refresh_seconds: float = 60.0,
+        stale_after_seconds: float = 10.0,
+    ):
+        self.client = client
+        self.ws = ws or KuCoinWebSocket(client)
+        self.intervals = tuple(intervals)
+        self.ticker_refresh_seconds = ticker_refresh_seconds
+        self.stale_after_seconds = stale_after_seconds
+
+        self._tickers: Dict[str, Ticker] = {}
+        self._ticker_snapshot_ts = 0.0
+        self._tracked: Set[str] = set()
+        self.streaming = False
+        # Called as listener(symbol, interval, candle) after each kline push is stored
+        self.candle_listeners: List[Callable[[str, str, Candle], None]] = []
+        # Called as listener(symbol, price, exchange_ts_ms) after each ticker push
+        self.ticker_listeners: List[Callable[[str, float, int], None]] = []
+
+        self.stats = {
+            "ticker_updates": 0,
+            "candle_updates": 0,
+            "orderbook_updates": 0,
+            "rest_ticker_refreshes": 0,
+            "rest_fallbacks": 0,
+            "reconnects": 0,
+        }
+
+        self.ws.add_channel_handler("/market/ticker", self._on_ticker)
+        self.ws.add_channel_handler("/market/candles", self._on_candle)
+        self.ws.add_channel_handler("/spotMarket/level2Depth50", self._on_depth)
+        self.ws.reconnect_callbacks.append(self._on_reconnect)
+
+    async def start(self) -> bool:
+        """Seed tickers over REST and open the ticker:all stream"""
+        await self._refresh_ticker_snapshot()
+        self.streaming = await self.ws.subscribe_topic(KuCoinWebSocket.ALL_TICKERS_TOPIC)
+        if self.streaming:
+            logger.info("✅ Market state streaming (ticker:all)")
+        else:
+            logger.warning("⚠️ Market state stream unavailable, serving REST snapshots")
+        return self.streaming
+
+    async def stop(self):
+        self.streaming = False
+        await self.ws.close()
+
+    def is_live(self) -> bool:
+        """True while pushes keep arriving within the staleness bound"""
+        if not self.streaming or not self.ws.running:
+            return False
+        return (time.time() - self.ws.last_message_ts) < self.stale_after_seconds
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+
+    def _symbol_topics(self, symbol: str) -> List[str]:
+        topics = [KuCoinWebSocket.KLINE_CHANNEL.format(symbol, i) for i in self.intervals]
+        topics.append(KuCoinWebSocket.DEPTH50_CHANNEL.format(symbol))
+        return topics
+
+    async def track_symbols(self, symbols: Iterable[str]) -> None:
+        """
+        Keep kline/depth subscriptions in line with the priority universe.
+
+        Symbols are full pairs ("BTC-USDT"). Newly tracked symbols are seeded
+        by the first get_candles call; dropped ones are unsubscribed.
+        """
+        wanted = set(symbols)
+        if not self.streaming:
+            self._tracked = wanted
+            return
+
+        for symbol in sorted(wanted - self._tracked):
+            for topic in self._symbol_topics(symbol):
+                await self.ws.subscribe_topic(topic)
+        for symbol in sorted(self._tracked - wanted):
+            for topic in self._symbol_topics(symbol):
+                await self.ws.unsubscribe_topic(topic)
+        self._tracked = wanted
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def get_tickers(self) -> List[Ticker]:
+        """
+        All USDT tickers. Live prices come from the stream; 24h stats come from
+        a REST snapshot refreshed every ticker_refresh_seconds, or on every call
+        while the stream is down.
+        """
+        now = time.time()
+        if not self.is_live():
+            self.stats["rest_fallbacks"] += 1
+            await self._refresh_ticker_snapshot()
+        elif now - self._ticker_snapshot_ts >= self.ticker_refresh_seconds:
+            await self._refresh_ticker_snapshot()
+        return list(self._tickers.values())
+
+    def latest_tickers(self) -> Dict[str, Ticker]:
+        """Current ticker map keyed by full symbol (no I/O)"""
+        return dict(self._tickers)
+
+    def get_price(self, symbol: str) -> float:
+        ticker = self._tickers.get(symbol)
+        return ticker.price if ticker else 0.0
+
+    async def _refresh_ticker_snapshot(self) -> None:
+        try:
+            tickers = await self.client.get_tickers()
+        except Exception as e:
+            logger.warning(f"⚠️ Ticker snapshot refresh failed: {e}")
+            return
+        if not tickers:
+            return
+        for ticker in tickers:
+            live = self._tickers.get(ticker.symbol)
+            # Keep a pushed price that is newer than the snapshot row
+            if live and live.timestamp > ticker.timestamp:
+                ticker.price, ticker.buy, ticker.sell = live.price, live.buy, live.sell
+                ticker.timestamp = live.timestamp
+            self._tickers[ticker.symbol] = ticker
+        self._ticker_snapshot_ts = time.time()
+        self.stats["rest_ticker_refreshes"] += 1
+
+    # ------------------------------------------------------------------
+    # Push handlers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _f(val) -> float:
+        try:
+            return float(val)
+        except (TypeError, ValueError):
+            return 0.0
+
+    def _on_ticker(self, topic: str, subject: str, data: Dict) -> None:
+        symbol = subject if topic.endswith(":all") else topic.split(":", 1)[-1]
+        if not symbol or not symbol.endswith("USDT"):
+            return
+        price = self._f(data.get("price"))
+        if price <= 0:
+            return
+
+        ticker = self._tickers.get(symbol)
+        if ticker is None:
+            ticker = Ticker(symbol=symbol)
+            self._tickers[symbol] = ticker
+        ticker.price = price
+        ticker.buy = self._f(data.get("bestBid")) or ticker.buy
+        ticker.sell = self._f(data.get("bestAsk")) or ticker.sell
+        ticker.timestamp = int(data.get("time", 0) or 0)
+
+        self.client._tickers[symbol] = ticker
+        self.client._ticker_cache_time[symbol] = int(time.time())
+        self.stats["ticker_updates"] += 1
+        for listener in self.ticker_listeners:
+            try:
+                listener(symbol, price, ticker.timestamp)
+            except Exception as e:
+                logger.warning(f"⚠️ Ticker listener failed for {symbol}: {e}")
+
+    def _on_candle(self, topic: str, subject: str, data: Dict) -> None:
+        symbol = data.get("symbol", "")
+        kline = data.get("candles")
+        if not symbol or not kline:
+            return
+        interval = topic.rsplit("_", 1)[-1]
+        store = self.client._candle_store
+        # Only extend series that REST has already seeded with history
+        if (symbol, interval) not in store:
+            return
+        candle = Candle.from_kline(kline, symbol)
+        if candle.close <= 0 or candle.volume <= 0:
+            return
+        store.merge(symbol, interval, [candle])
+        self.stats["candle_updates"] += 1
+        for listener in self.candle_listeners:
+            try:
+                listener(symbol, interval, candle)
+            except Exception as e:
+                logger.warning(f"⚠️ Candle listener failed for {symbol} {interval}: {e}")
+
+    def _on_depth(self, topic: str, subject: str, data: Dict) -> None:
+        symbol = topic.split(":", 1)[-1]
+        orderbook = OrderBook(
+            symbol=symbol,
+            bids=data.get("bids", []),
+            asks=data.get("asks", []),
+            timestamp=int(data.get("timestamp", 0) or time.time() * 1000),
+        )
+        if not orderbook.bids or not orderbook.asks:
+            return
+        self.client._orderbooks[symbol] = orderbook
+        self.client._orderbook_cache_time[symbol] = int(time.time())
+        self.stats["orderbook_updates"] += 1
+
+    async def _on_reconnect(self) -> None:
+        """
+        Pushes were missed while disconnected. Tracked series are dropped
+        rather than merely expired: merging the next push into the old series
+        would leave a hole that an incremental startAt fetch never fills.
+        """
+        self.stats["reconnects"] += 1
+        for symbol in self._tracked:
+            self.client._candle_store.clear(symbol)
+        self._ticker_snapshot_ts = 0.0
+
+    def get_stats(self) -> Dict:
+        stats = dict(self.stats)
+        stats["live"] = self.is_live()
+        stats["tracked_symbols"] = len(self._tracked)
+        stats["ws_messages"] = self.ws.messages_received
+        return stats
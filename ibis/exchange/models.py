@@ -0,0 +1,322 @@
+"""
+IBIS Exchange Models
+Market data and order records shared by the KuCoin client, codec and streams
+"""
+
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+# Thousands of these are built per scan cycle; slotted instances drop the
+# per-object __dict__ (dataclass(slots=True) needs Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
+class Ticker:
+    symbol: str = ""
+    price: float = 0.0
+    change_24h: float = 0.0
+    change_percent_24h: float = 0.0
+    volume_24h: float = 0.0
+    high_24h: float = 0.0
+    low_24h: float = 0.0
+    buy: float = 0.0  # Bid
+    sell: float = 0.0  # Ask
+    timestamp: int = 0
+
+    @classmethod
+    def from_response(cls, data: Dict, symbol: str) -> "Ticker":
+        ticker = data.get("ticker", {})
+
+        def _f(val):
+            try:
+                return float(val)
+            except Exception:
+                return 0.0
+
+        price = _f(ticker.get("last", ticker.get("price", 0)))
+        return cls(
+            symbol=symbol,
+            price=price,
+            change_24h=_f(ticker.get("changeRate", 0)) * 100,
+            change_percent_24h=_f(ticker.get("changePrice", 0)),
+            volume_24h=_f(ticker.get("vol", 0)),
+            high_24h=_f(ticker.get("high", 0)),
+            low_24h=_f(ticker.get("low", 0)),
+            buy=_f(ticker.get("buy", ticker.get("bestBid", 0))),
+            sell=_f(ticker.get("sell", ticker.get("bestAsk", 0))),
+            timestamp=int(ticker.get("time", 0) or 0),
+        )
+
+
+@dataclass(**_SLOTS)
+class Candle:
+    symbol: str
+    timestamp: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    turnover: float
+
+    @classmethod
+    def from_kline(cls, kline: List, symbol: str) -> "Candle":
+        return cls(
+            symbol=symbol,
+            timestamp=int(kline[0]),
+            open=float(kline[1]),
+            high=float(kline[2]),
+            low=float(kline[3]),
+            close=float(kline[4]),
+            volume=float(kline[5]),
+            turnover=float(kline[7]) if len(kline) > 7 else 0,
+        )
+
+
+# Column layout of CandleSeries; the first six fields match
+# ibis.indicators.columnar.OHLCV_DTYPE
+CANDLE_DTYPE = np.dtype(
+    [
+        ("timestamp", "i8"),
+        ("open", "f8"),
+        ("high", "f8"),
+        ("low", "f8"),
+        ("close", "f8"),
+        ("volume", "f8"),
+        ("turnover", "f8"),
+    ]
+)
+
+
+class CandleSeries:
+    """
+    Columnar candles for one symbol, oldest -> newest.
+
+    One structured CANDLE_DTYPE array instead of a Candle object per bar.
+    Columns index by name (series["close"]) and the series has an `ohlcv`
+    attribute, so IndicatorEngine and batch scoring read it without
+    conversion. Integer indexing and iteration still yield Candle objects.
+    """
+
+    __slots__ = ("symbol", "rows")
+
+    def __init__(self, symbol: str, rows: Optional[np.ndarray] = None):
+        self.symbol = symbol
+        self.rows = rows if rows is not None else np.empty(0, dtype=CANDLE_DTYPE)
+
+    @classmethod
+    def from_klines(cls, klines: List, symbol: str) -> "CandleSeries":
+        """KuCoin kline rows (strings or floats), same columns as Candle.from_kline."""
+        rows = np.empty(len(klines), dtype=CANDLE_DTYPE)
+        if len(klines):
+            raw = np.asarray(klines, dtype=np.float64)
+            rows["timestamp"] = raw[:, 0]
+            for i, name in enumerate(("open", "high", "low", "close", "volume"), 1):
+                rows[name] = raw[:, i]
+            rows["turnover"] = raw[:, 7] if raw.shape[1] > 7 else 0.0
+        return cls(symbol, rows)
+
+    @classmethod
+    def from_candles(cls, candles: Iterable["Candle"], symbol: str = "") -> "CandleSeries":
+        candles = list(candles)
+        rows = np.array(
+            [(c.timestamp, c.open, c.high, c.low, c.close, c.volume, c.turnover) for c in candles],
+            dtype=CANDLE_DTYPE,
+        )
+        return cls(symbol or (candles[0].symbol if candles else ""), rows)
+
+    @property
+    def ohlcv(self) -> np.ndarray:
+        return self.rows
+
+    @property
+    def nbytes(self) -> int:
+        return self.rows.nbytes
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.rows[key]
+        if isinstance(key, slice):
+            return CandleSeries(self.symbol, self.rows[key])
+        return self._candle(self.rows[key])
+
+    def __iter__(self) -> Iterator["Candle"]:
+        return (self._candle(row) for row in self.rows)
+
+    def _candle(self, row) -> "Candle":
+        ts, o, h, l, c, v, t = row.tolist()
+        return Candle(self.symbol, ts, o, h, l, c, v, t)
+
+    def to_candles(self) -> List["Candle"]:
+        return list(self)
+
+
+Levels = Union["BookSide", np.ndarray, Iterable]
+
+
+class BookSide:
+    """
+    Price/size levels of one side of an order book as an (n, 2) float array.
+
+    Behaves like the list of [price, size] pairs it replaces (len, truth,
+    side[0][0], side[:5], iteration, == against lists) and adds column
+    views and depth sums for scoring code.
+    """
+
+    __slots__ = ("levels",)
+    __hash__ = None
+
+    def __init__(self, levels: Levels = ()):
+        if isinstance(levels, BookSide):
+            levels = levels.levels
+        if len(levels):
+            self.levels = np.asarray(levels, dtype=np.float64).reshape(-1, 2)
+        else:
+            self.levels = np.empty((0, 2))
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self.levels[:, 0]
+
+    @property
+    def sizes(self) -> np.ndarray:
+        return self.levels[:, 1]
+
+    @property
+    def best(self) -> float:
+        """Top-of-book price, 0.0 for an empty side."""
+        return float(self.levels[0, 0]) if len(self.levels) else 0.0
+
+    def total_size(self, depth: Optional[int] = None) -> float:
+        return float(self.levels[:depth, 1].sum())
+
+    def notional(self, depth: Optional[int] = None) -> float:
+        top = self.levels[:depth]
+        return float(top[:, 0] @ top[:, 1])
+
+    def tolist(self) -> List[List[float]]:
+        return self.levels.tolist()
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            side = BookSide()
+            side.levels = self.levels[key]
+            return side
+        price, size = self.levels[key].tolist()
+        return (price, size)
+
+    def __iter__(self) -> Iterator[Tuple[float, float]]:
+        return (tuple(level) for level in self.levels.tolist())
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BookSide):
+            try:
+                other = BookSide(other)
+            except (TypeError, ValueError):
+                return NotImplemented
+        return np.array_equal(self.levels, other.levels)
+
+    def __repr__(self) -> str:
+        return f"BookSide({self.tolist()})"
+
+
+@dataclass(**_SLOTS)
+class OrderBook:
+    symbol: str
+    bids: BookSide
+    asks: BookSide
+    timestamp: int
+
+    def __post_init__(self):
+        # Raw [price, size] lists (strings or floats) become columnar sides
+        if not isinstance(self.bids, BookSide):
+            self.bids = BookSide(self.bids)
+        if not isinstance(self.asks, BookSide):
+            self.asks = BookSide(self.asks)
+
+    @classmethod
+    def from_response(cls, data: Dict, symbol: str) -> "OrderBook":
+        return cls(
+            symbol=symbol,
+            bids=BookSide(data.get("bids", [])),
+            asks=BookSide(data.get("asks", [])),
+            timestamp=int(data.get("time", 0)),
+        )
+
+
+@dataclass(**_SLOTS)
+class TradeOrder:
+    order_id: str
+    symbol: str
+    side: str
+    type: str
+    price: float
+    size: float
+    status: str
+    filled_size: float
+    deal_funds: float
+    avg_price: float
+    created_at: int
+    fee: float = 0.0  # Actual fee from KuCoin (in quote currency)
+    fee_currency: str = "USDT"  # Fee currency (usually quote currency)
+
+    @classmethod
+    def from_response(cls, data: Dict, symbol: str) -> "TradeOrder":
+        raw_fee = data.get("fee", "0")
+        if isinstance(raw_fee, str):
+            try:
+                fee = abs(float(raw_fee))
+            except (ValueError, TypeError):
+                fee = 0.0
+        else:
+            fee = abs(float(raw_fee)) if raw_fee else 0.0
+
+        filled_size_str = data.get("dealSize", "0")
+        if isinstance(filled_size_str, str):
+            try:
+                filled_size = float(filled_size_str)
+            except (ValueError, TypeError):
+                filled_size = 0.0
+        else:
+            filled_size = float(filled_size_str) if filled_size_str else 0.0
+
+        deal_size_str = data.get("dealSize", "0")
+        if isinstance(deal_size_str, str):
+            try:
+                deal_size = float(deal_size_str)
+            except (ValueError, TypeError):
+                deal_size = 0.0
+        else:
+            deal_size = float(deal_size_str) if deal_size_str else 0.0
+
+        deal_funds = float(data.get("dealFunds", "0"))
+        avg_price = (
+            deal_funds / max(filled_size, 0.001) if filled_size > 0 and deal_funds > 0 else 0.0
+        )
+
+        status = "ACTIVE" if data.get("isActive", True) else "DONE"
+        return cls(
+            order_id=data.get("orderId", ""),
+            symbol=symbol,
+            side=data.get("side", ""),
+            type=data.get("type", ""),
+            price=float(data.get("price", 0)) if data.get("price") else 0.0,
+            size=float(data.get("size", 0)) if data.get("size") else 0.0,
+            status=status,
+            filled_size=filled_size,
+            deal_funds=deal_funds,
+            avg_price=avg_price,
+            created_at=int(data.get("createdAt", 0)),
+            fee=fee,
+            fee_currency=data.get("feeCurrency", "USDT"),
+        )
@@ -0,0 +1,152 @@
+"""
+IBIS Position Pricing
+Batch price resolution for held symbols from one tickers snapshot
+"""
+
+import asyncio
+import time
+from typing import Dict, Iterable, Optional
+
+from .kucoin_client import KuCoinClient, Ticker
+
+from ibis.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class PositionPricer:
+    """
+    Resolves tickers for a set of base symbols ("SOL") in one pass.
+
+    Resolution order per symbol:
+      1. the streaming ticker cache, while the market stream is live
+      2. a shared allTickers snapshot younger than `ttl` seconds
+      3. one allTickers request when several symbols are still missing
+         (concurrent callers share the same in-flight request)
+      4. per-symbol get_ticker for the remainder, fanned out concurrently
+         under a `max_concurrency` semaphore
+
+    update_positions_awareness, check_positions, reconcile_holdings and the
+    balance-pricing loops all go through the same instance, so a cycle pays
+    for at most one snapshot plus a handful of misses instead of one round
+    trip per position.
+    """
+
+    def __init__(
+        self,
+        client: KuCoinClient,
+        market_state=None,
+        ttl: float = 5.0,
+        max_concurrency: int = 8,
+        snapshot_min_misses: int = 3,
+    ):
+        self.client = client
+        self.market_state = market_state
+        self.ttl = ttl
+        self.snapshot_min_misses = snapshot_min_misses
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._snapshot: Dict[str, Ticker] = {}
+        self._snapshot_ts = 0.0
+        self._snapshot_task: Optional[asyncio.Task] = None
+        self.stats = {
+            "requests": 0,
+            "symbols": 0,
+            "stream_hits": 0,
+            "snapshot_hits": 0,
+            "snapshot_fetches": 0,
+            "single_fetches": 0,
+            "unpriced": 0,
+        }
+
+    def absorb(self, tickers: Iterable[Ticker]) -> None:
+        """Adopt a full tickers list fetched elsewhere (e.g. the market scan)."""
+        snapshot = {t.symbol[:-5]: t for t in tickers if t.symbol.endswith("-USDT")}
+        if snapshot:
+            self._snapshot = snapshot
+            self._snapshot_ts = time.monotonic()
+
+    def _stream_ticker(self, full_symbol: str) -> Optional[Ticker]:
+        if self.market_state is None or not self.market_state.is_live():
+            return None
+        ticker = self.client._tickers.get(full_symbol)
+        cached_at = self.client._ticker_cache_time.get(full_symbol, 0)
+        if ticker is not None and ticker.price > 0 and time.time() - cached_at < self.ttl:
+            return ticker
+        return None
+
+    async def tickers(self, symbols: Iterable[str]) -> Dict[str, Ticker]:
+        """Ticker per base symbol; symbols that cannot be priced are omitted."""
+        self.stats["requests"] += 1
+        wanted = list(dict.fromkeys(s for s in symbols if s))
+        self.stats["symbols"] += len(wanted)
+        out: Dict[str, Ticker] = {}
+
+        missing = []
+        for sym in wanted:
+            ticker = self._stream_ticker(f"{sym}-USDT")
+            if ticker is not None:
+                out[sym] = ticker
+                self.stats["stream_hits"] += 1
+            else:
+                missing.append(sym)
+
+        if missing and not self._snapshot_fresh() and len(missing) >= self.snapshot_min_misses:
+            await self._refresh_snapshot()
+        if self._snapshot_fresh():
+            still = []
+            for sym in missing:
+                ticker = self._snapshot.get(sym)
+                if ticker is not None and ticker.price > 0:
+                    out[sym] = ticker
+                    self.stats["snapshot_hits"] += 1
+                else:
+                    still.append(sym)
+            missing = still
+
+        if missing:
+            fetched = await asyncio.gather(*(self._fetch_one(sym) for sym in missing))
+            for sym, ticker in zip(missing, fetched):
+                if ticker is not None:
+                    out[sym] = ticker
+                else:
+                    self.stats["unpriced"] += 1
+        return out
+
+    async def prices(self, symbols: Iterable[str]) -> Dict[str, float]:
+        return {sym: float(t.price) for sym, t in (await self.tickers(symbols)).items()}
+
+    def _snapshot_fresh(self) -> bool:
+        return bool(self._snapshot) and time.monotonic() - self._snapshot_ts < self.ttl
+
+    async def _refresh_snapshot(self) -> None:
+        # Single flight: callers arriving mid-request await the same task
+        if self._snapshot_task is None or self._snapshot_task.done():
+            self._snapshot_task = asyncio.ensure_future(self._fetch_snapshot())
+        await asyncio.shield(self._snapshot_task)
+
+    async def _fetch_snapshot(self) -> None:
+        try:
+            tickers = await self.client.get_tickers()
+        except Exception as e:
+            logger.warning(f"⚠️ Tickers snapshot failed, pricing per symbol: {e}")
+            return
+        self.stats["snapshot_fetches"] += 1
+        self.absorb(tickers)
+
+    async def _fetch_one(self, sym: str) -> Optional[Ticker]:
+        async with self._semaphore:
+            self.stats["single_fetches"] += 1
+            try:
+                ticker = await self.client.get_ticker(f"{sym}-USDT")
+            except Exception as e:
+                logger.debug(f"Price lookup failed for {sym}: {e}")
+                return None
+        return ticker if ticker is not None and ticker.price > 0 else None
+
+    def get_stats(self) -> Dict:
+        stats = dict(self.stats)
+        stats["snapshot_symbols"] = len(self._snapshot)
+        stats["snapshot_age_s"] = (
+            round(time.monotonic() - self._snapshot_ts, 3) if self._snapshot else None
+        )
+        return stats
@@ -0,0 +1,236 @@
+"""
+IBIS Rate Limiter
+Client-side KuCoin weight pools, priority lanes and adaptive REST concurrency
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Tuple
+
+# KuCoin resource pools: (weight quota, window seconds). Public market data is
+# limited per IP, spot account/order endpoints per UID (VIP0 quotas).
+POOL_QUOTAS: Dict[str, Tuple[int, float]] = {
+    "public": (2000, 30.0),
+    "spot": (4000, 30.0),
+}
+
+# Lanes in priority order: order entry never queues behind account reads, and
+# account reads never queue behind market-data fan-out
+LANE_PRIORITY: Dict[str, int] = {"trade": 0, "account": 1, "market": 2}
+
+# (method, path prefix) -> (pool, weight, lane); first match wins
+ENDPOINT_CLASSES: List[Tuple[str, str, str, int, str]] = [
+    ("POST", "/api/v1/orders", "spot", 2, "trade"),
+    ("DELETE", "/api/v1/orders/", "spot", 3, "trade"),
+    ("DELETE", "/api/v1/orders", "spot", 100, "trade"),
+    ("POST", "/api/v1/stop-order", "spot", 2, "trade"),
+    ("DELETE", "/api/v1/stop-order", "spot", 3, "trade"),
+    ("GET", "/api/v1/accounts", "spot", 5, "account"),
+    ("GET", "/api/v1/orders/", "spot", 2, "account"),
+    ("GET", "/api/v1/orders", "spot", 2, "account"),
+    ("GET", "/api/v1/stop-order", "spot", 8, "account"),
+    ("GET", "/api/v1/fills", "spot", 10, "account"),
+    ("GET", "/api/v1/market/allTickers", "public", 15, "market"),
+    ("GET", "/api/v1/market/stats", "public", 15, "market"),
+    ("GET", "/api/v1/market/orderbook/level1", "public", 2, "market"),
+    ("GET", "/api/v1/market/orderbook/level2_100", "public", 4, "market"),
+    ("GET", "/api/v1/market/orderbook/", "public", 2, "market"),
+    ("GET", "/api/v1/market/candles", "public", 3, "market"),
+    ("GET", "/api/v2/symbols", "public", 4, "market"),
+]
+DEFAULT_CLASS = ("public", 2, "market")
+
+
+def classify(method: str, path: str) -> Tuple[str, int, str]:
+    """(pool, weight, lane) for a REST call."""
+    method = method.upper()
+    endpoint = path.split("?", 1)[0]
+    for m, prefix, pool, weight, lane in ENDPOINT_CLASSES:
+        if m == method and endpoint.startswith(prefix):
+            return pool, weight, lane
+    return DEFAULT_CLASS
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    text = str(error)
+    return "429" in text or "rate limit" in text.lower()
+
+
+class TokenBucket:
+    """
+    Weight bucket refilled continuously at capacity/period per second.
+
+    Waiters are served strictly by (priority, arrival), so a trade-lane
+    request that arrives behind a queue of reads is granted first.
+    """
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = float(capacity)
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._queue: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._cond = asyncio.Condition()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, weight: int = 1, priority: int = 1) -> float:
+        """Take `weight` tokens; returns the seconds spent waiting."""
+        weight = min(float(weight), self.capacity)
+        started = time.monotonic()
+        entry = (priority, next(self._seq))
+        async with self._cond:
+            heapq.heappush(self._queue, entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    timeout = None
+                    if self._queue[0] == entry:
+                        if now >= self._blocked_until and self.tokens >= weight:
+                            heapq.heappop(self._queue)
+                            self.tokens -= weight
+                            self._cond.notify_all()
+                            return now - started
+                        timeout = max(
+                            self._blocked_until - now, (weight - self.tokens) / self.rate, 0.001
+                        )
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                if entry in self._queue:
+                    self._queue.remove(entry)
+                    heapq.heapify(self._queue)
+                    self._cond.notify_all()
+                raise
+
+    def throttle(self, seconds: float) -> None:
+        """Exchange said 429: drain the bucket and hold it closed for `seconds`."""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = 0.0
+        self._blocked_until = max(self._blocked_until, now + seconds)
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on in-flight requests.
+
+    Every fast success adds 1/limit (about +1 per round trip of the whole
+    window); a 429 or a response slower than `target_latency` cuts the limit
+    by `backoff`, at most once per `decrease_interval` seconds so a burst of
+    slow replies from one congested moment counts as a single signal.
+    """
+
+    def __init__(
+        self,
+        initial: int = 60,
+        min_limit: int = 4,
+        max_limit: int = 120,
+        target_latency: float = 1.5,
+        backoff: float = 0.7,
+        decrease_interval: float = 2.0,
+    ):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.decrease_interval = decrease_interval
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            while self.in_flight >= int(self.limit):
+                await self._cond.wait()
+            self.in_flight += 1
+
+    async def release(self, latency: float, throttled: bool = False) -> None:
+        async with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if throttled or latency > self.target_latency:
+                if now - self._last_decrease >= self.decrease_interval:
+                    self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                    self._last_decrease = now
+            else:
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / max(self.limit, 1.0))
+            self._cond.notify_all()
+
+
+class RateLimiter:
+    """
+    Gate for every KuCoin REST call.
+
+    Each call is classified into a weight pool and a lane. Market-data calls
+    also take a slot from the adaptive concurrency controller; trade and
+    account calls bypass it and outrank market calls in the weight buckets.
+    A 429 drains the pool's bucket for `throttle_seconds` instead of each
+    caller sleeping its own exponential backoff.
+    """
+
+    def __init__(self, initial_concurrency: int = 60, throttle_seconds: float = 2.0):
+        self.buckets = {pool: TokenBucket(q, period) for pool, (q, period) in POOL_QUOTAS.items()}
+        self.concurrency = AdaptiveConcurrency(initial=initial_concurrency)
+        self.throttle_seconds = throttle_seconds
+        self.stats: Dict[str, Dict[str, float]] = {
+            lane: {"requests": 0, "throttled": 0, "wait_s": 0.0} for lane in LANE_PRIORITY
+        }
+
+    @asynccontextmanager
+    async def slot(self, method: str, path: str) -> AsyncIterator[None]:
+        pool, weight, lane = classify(method, path)
+        stats = self.stats[lane]
+        stats["requests"] += 1
+        started = time.monotonic()
+        gated = lane == "market"
+        if gated:
+            await self.concurrency.acquire()
+        throttled = False
+        sent = None
+        try:
+            await self.buckets[pool].acquire(weight, LANE_PRIORITY[lane])
+            sent = time.monotonic()
+            stats["wait_s"] += sent - started
+            try:
+                yield
+            except Exception as e:
+                if is_rate_limited(e):
+                    throttled = True
+                    stats["throttled"] += 1
+                    self.buckets[pool].throttle(self.throttle_seconds)
+                raise
+        finally:
+            if gated:
+                # Latency of the exchange round trip only, not our own queueing
+                latency = time.monotonic() - (sent or started)
+                await self.concurrency.release(latency, throttled)
+
+    def parallelism(self, requests_per_task: int = 1, cap: int = 0) -> int:
+        """Tasks to run at once when each issues `requests_per_task` market calls."""
+        tasks = max(1, int(self.concurrency.limit) // max(1, requests_per_task))
+        return min(tasks, cap) if cap else tasks
+
+    def get_stats(self) -> Dict:
+        lanes = {lane: dict(s, wait_s=round(s["wait_s"], 3)) for lane, s in self.stats.items()}
+        return {
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "in_flight": self.concurrency.in_flight,
+            "tokens": {pool: round(b.tokens, 1) for pool, b in self.buckets.items()},
+            "lanes": lanes,
+        }
@@ -0,0 +1,116 @@
+"""
+IBIS Request Cache
+Cycle-scoped memoization and single-flight coalescing for KuCoinClient reads
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+# Endpoints whose answers change when we place or cancel an order
+ACCOUNT_ENDPOINTS = ("accounts", "orders", "stop_orders")
+
+
+class RequestCache:
+    """
+    Memoizes read-only REST answers for the duration of one agent cycle.
+
+    Keys are (endpoint, params). While a cycle is open, the first caller for a
+    key fetches and every later caller gets the memoized answer until the cycle
+    ends, the entry is older than `max_age`, or the endpoint is invalidated
+    (our own orders invalidate ACCOUNT_ENDPOINTS). Identical requests that are
+    in flight at the same time share one fetch whether or not a cycle is open.
+
+    Outside a cycle nothing is memoized, so scripts and the tick-exit path that
+    never call begin_cycle() always see fresh data.
+    """
+
+    def __init__(self, max_age: float = 30.0):
+        self.max_age = max_age
+        self._active = False
+        self._values: Dict[Tuple[str, Hashable], Tuple[float, Any]] = {}
+        self._inflight: Dict[Tuple[str, Hashable], asyncio.Future] = {}
+        # Bumped per endpoint on invalidation so fetches started earlier
+        # cannot repopulate the memo with pre-order data
+        self._epochs: Dict[str, int] = {}
+        self.cycles = 0
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def begin_cycle(self) -> None:
+        self._values.clear()
+        self._active = True
+        self.cycles += 1
+
+    def end_cycle(self) -> None:
+        self._values.clear()
+        self._active = False
+
+    def invalidate(self, endpoints: Optional[Iterable[str]] = None) -> None:
+        """Drop memoized and in-flight entries for `endpoints` (all when None)."""
+        if endpoints is None:
+            endpoints = {key[0] for key in list(self._values) + list(self._inflight)}
+        for endpoint in endpoints:
+            self._epochs[endpoint] = self._epochs.get(endpoint, 0) + 1
+            for key in [k for k in self._values if k[0] == endpoint]:
+                del self._values[key]
+            for key in [k for k in self._inflight if k[0] == endpoint]:
+                del self._inflight[key]
+            self._counter(endpoint)["invalidations"] += 1
+
+    def _counter(self, endpoint: str) -> Dict[str, int]:
+        counter = self.stats.get(endpoint)
+        if counter is None:
+            counter = {"hits": 0, "misses": 0, "coalesced": 0, "invalidations": 0}
+            self.stats[endpoint] = counter
+        return counter
+
+    async def get(
+        self,
+        endpoint: str,
+        params: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        copy: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        """
+        Memoized/coalesced `fetch()`.
+
+        `copy` is applied to every answer handed out so callers that mutate
+        their result cannot corrupt what the next caller in the cycle sees.
+        """
+        key = (endpoint, params)
+        counter = self._counter(endpoint)
+
+        if self._active:
+            cached = self._values.get(key)
+            if cached is not None and time.monotonic() - cached[0] < self.max_age:
+                counter["hits"] += 1
+                return copy(cached[1]) if copy else cached[1]
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            counter["coalesced"] += 1
+            value = await asyncio.shield(pending)
+            return copy(value) if copy else value
+
+        counter["misses"] += 1
+        epoch = self._epochs.get(endpoint, 0)
+        future = asyncio.ensure_future(fetch())
+        self._inflight[key] = future
+        try:
+            value = await asyncio.shield(future)
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        if self._active and self._epochs.get(endpoint, 0) == epoch:
+            self._values[key] = (time.monotonic(), value)
+        return copy(value) if copy else value
+
+    def get_stats(self) -> Dict[str, Any]:
+        endpoints = {}
+        for endpoint, counter in self.stats.items():
+            lookups = counter["hits"] + counter["misses"] + counter["coalesced"]
+            endpoints[endpoint] = dict(
+                counter,
+                saved_rate=round((lookups - counter["misses"]) / lookups, 4) if lookups else 0.0,
+            )
+        return {"cycles": self.cycles, "entries": len(self._values), "endpoints": endpoints}
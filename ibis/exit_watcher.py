@@ -0,0 +1,223 @@
+"""
+IBIS Exit Watcher
+Tick-level take-profit / stop-loss triggers fed by streamed ticker prices
+"""
+
+import asyncio
+import bisect
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ibis.core.logging_config import get_logger
+from ibis.core.trading_constants import TRADING
+
+logger = get_logger(__name__)
+
+# Upper bucket bounds in milliseconds; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+# on_trigger(symbol, reason, price) -> True when the position was closed
+ExitCallback = Callable[[str, str, float], Awaitable[bool]]
+
+
+class LatencyHistogram:
+    """Fixed log-spaced millisecond buckets; O(log B) record, O(B) snapshot."""
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the pct-th sample (max_ms if open-ended)."""
+        if not self.count:
+            return 0.0
+        rank = pct / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return float(self.bounds[i]) if i < len(self.bounds) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> Dict:
+        buckets = {f"<={b}ms": n for b, n in zip(self.bounds, self.counts) if n}
+        if self.counts[-1]:
+            buckets[f">{self.bounds[-1]}ms"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": buckets,
+        }
+
+
+class ExitLevels:
+    """Armed thresholds for one held position."""
+
+    __slots__ = ("symbol", "tp", "sl", "buy_price", "armed", "retry_at", "triggered_at", "acked")
+
+    def __init__(self, symbol: str, tp: float, sl: float, buy_price: float):
+        self.symbol = symbol
+        self.tp = tp
+        self.sl = sl
+        self.buy_price = buy_price
+        self.armed = True
+        self.retry_at = 0.0
+        self.triggered_at = 0.0
+        self.acked = False
+
+    def crossed(self, price: float) -> Optional[str]:
+        if price >= self.tp:
+            return "TAKE_PROFIT"
+        if price <= self.sl:
+            return "STOP_LOSS"
+        return None
+
+
+class ExitWatcher:
+    """
+    Fires a close the moment a streamed price crosses a held position's TP or
+    SL, independent of the scan cycle.
+
+    sync() rebuilds the per-symbol levels from the agent's positions (cheap,
+    called whenever state is saved); on_ticker() is a MarketStateService
+    ticker listener, so each push costs one dict lookup for unheld symbols
+    and two comparisons for held ones. A trigger disarms the level and runs
+    the close as a task; a close that is refused re-arms after
+    retry_seconds. Latencies are kept as histograms:
+
+      trigger_to_order  trigger -> exit order acknowledged (order_acked())
+      trigger_to_close  trigger -> close callback returned
+      push_to_trigger   exchange ticker time -> trigger
+    """
+
+    def __init__(self, on_trigger: ExitCallback, retry_seconds: float = 5.0):
+        self.on_trigger = on_trigger
+        self.retry_seconds = retry_seconds
+        self._levels: Dict[str, ExitLevels] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.histograms = {
+            "trigger_to_order": LatencyHistogram(),
+            "trigger_to_close": LatencyHistogram(),
+            "push_to_trigger": LatencyHistogram(),
+        }
+        self.stats = {"ticks": 0, "triggers": 0, "closed": 0, "refused": 0, "errors": 0}
+
+    # ------------------------------------------------------------------
+    # Levels
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def levels_for(pos: Dict) -> Optional[Tuple[float, float, float]]:
+        """(tp, sl, buy_price) with the same defaults check_positions applies."""
+        buy_price = float(pos.get("buy_price", 0) or 0)
+        if buy_price <= 0:
+            return None
+        tp = float(pos.get("tp") or 0) or buy_price * (1 + TRADING.RISK.TAKE_PROFIT_PCT)
+        sl = float(pos.get("sl") or 0) or buy_price * (1 - TRADING.RISK.STOP_LOSS_PCT)
+        return tp, sl, buy_price
+
+    def sync(self, positions: Dict[str, Dict]) -> None:
+        """Mirror the agent's positions (keyed by base symbol, e.g. "SOL")."""
+        fresh: Dict[str, ExitLevels] = {}
+        for sym, pos in positions.items():
+            levels = self.levels_for(pos)
+            if levels is None:
+                continue
+            full = f"{sym}-USDT"
+            current = self._levels.get(full)
+            if current is not None and (current.tp, current.sl, current.buy_price) == levels:
+                fresh[full] = current  # keep armed/retry state
+            else:
+                fresh[full] = ExitLevels(full, *levels)
+        self._levels = fresh
+
+    def watched(self) -> List[str]:
+        return sorted(self._levels)
+
+    # ------------------------------------------------------------------
+    # Ticks
+    # ------------------------------------------------------------------
+
+    def on_ticker(self, symbol: str, price: float, pushed_ms: int = 0) -> None:
+        levels = self._levels.get(symbol)
+        if levels is None:
+            return
+        self.stats["ticks"] += 1
+        now = time.monotonic()
+        if not levels.armed:
+            if not levels.retry_at or now < levels.retry_at:
+                return
+            levels.armed = True
+        reason = levels.crossed(price)
+        if reason is None:
+            return
+
+        levels.armed = False
+        levels.retry_at = 0.0
+        levels.triggered_at = time.perf_counter()
+        levels.acked = False
+        self.stats["triggers"] += 1
+        if pushed_ms:
+            self.histograms["push_to_trigger"].record(max(0.0, time.time() * 1000 - pushed_ms))
+        logger.info(f"⚡ Tick exit {reason}: {symbol} @ {price} (tp={levels.tp} sl={levels.sl})")
+        self._tasks[symbol] = asyncio.get_running_loop().create_task(
+            self._fire(levels, reason, price)
+        )
+
+    async def _fire(self, levels: ExitLevels, reason: str, price: float) -> None:
+        symbol = levels.symbol.replace("-USDT", "")
+        try:
+            closed = await self.on_trigger(symbol, reason, price)
+        except Exception as e:
+            closed = False
+            self.stats["errors"] += 1
+            logger.warning(f"⚠️ Tick exit {reason} failed for {symbol}: {e}")
+        self.histograms["trigger_to_close"].record(
+            (time.perf_counter() - levels.triggered_at) * 1000
+        )
+        if closed:
+            self.stats["closed"] += 1
+            if self._levels.get(levels.symbol) is levels:
+                del self._levels[levels.symbol]
+        else:
+            self.stats["refused"] += 1
+            levels.retry_at = time.monotonic() + self.retry_seconds
+        if self._tasks.get(levels.symbol) is asyncio.current_task():
+            del self._tasks[levels.symbol]
+
+    def order_acked(self, symbol: str) -> None:
+        """Called by the close path once the exit order is acknowledged."""
+        levels = self._levels.get(f"{symbol}-USDT")
+        if levels is not None and levels.triggered_at and not levels.armed and not levels.acked:
+            levels.acked = True
+            self.histograms["trigger_to_order"].record(
+                (time.perf_counter() - levels.triggered_at) * 1000
+            )
+
+    def in_flight(self, symbol: str) -> bool:
+        task = self._tasks.get(f"{symbol}-USDT")
+        return task is not None and not task.done()
+
+    async def stop(self) -> None:
+        tasks = [t for t in self._tasks.values() if not t.done()]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict:
+        stats = dict(self.stats)
+        stats["watched"] = len(self._levels)
+        stats["latency"] = {name: h.snapshot() for name, h in self.histograms.items()}
+        return stats
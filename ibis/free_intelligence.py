@@ -1,4 +1,5 @@
 from ibis.core.logging_config import get_logger
+from ibis.core.http_transport import get_http_transport
 #!/usr/bin/env python3
 """
 🦅 IBIS TRUE AGENT - FREE & INDEPENDENT INTELLIGENCE SOURCES
@@ -39,7 +40,9 @@ class FreeIntelligence:
 
     async def get_session(self):
         if self.session is None:
-            self.session = aiohttp.ClientSession(headers={"User-Agent": "IBIS-Trading-Bot/1.0"})
+            self.session = get_http_transport().session(
+                headers={"User-Agent": "IBIS-Trading-Bot/1.0"}
+            )
         return self.session
 
     async def close(self):
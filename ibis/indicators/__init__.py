@@ -18,6 +18,8 @@ from .indicators import (
     SupportResistance,
     calculate_indicators,
 )
+from .columnar import OHLCV_DTYPE, to_ohlcv_array
+from .streaming import IndicatorSet, StreamingIndicatorHub
 
 __all__ = [
     "IndicatorEngine",
@@ -34,4 +36,8 @@ __all__ = [
     "Fibonacci",
     "SupportResistance",
     "calculate_indicators",
+    "OHLCV_DTYPE",
+    "to_ohlcv_array",
+    "IndicatorSet",
+    "StreamingIndicatorHub",
 ]
@@ -0,0 +1,322 @@
+"""
+IBIS Columnar Indicators
+NumPy array-backed indicator kernels with O(n) rolling windows
+"""
+
+from typing import Dict, Iterable, Union
+
+import numpy as np
+
+# Structured OHLCV row layout accepted by IndicatorEngine.calculate_all
+OHLCV_DTYPE = np.dtype(
+    [
+        ("timestamp", "i8"),
+        ("open", "f8"),
+        ("high", "f8"),
+        ("low", "f8"),
+        ("close", "f8"),
+        ("volume", "f8"),
+    ]
+)
+
+ArrayLike = Union[np.ndarray, Iterable[float]]
+
+
+def to_ohlcv_array(candles) -> np.ndarray:
+    """
+    Convert OHLCV/Candle objects (anything with timestamp/open/high/low/close/
+    volume attributes) into an OHLCV_DTYPE structured array. Structured arrays
+    are passed through without copying, and so are CandleArchive series, whose
+    memory-mapped columns index the same way (series["close"]).
+    """
+    if isinstance(candles, np.ndarray) and candles.dtype.names:
+        return candles
+    if hasattr(candles, "ohlcv"):
+        return candles
+    rows = [(c.timestamp, c.open, c.high, c.low, c.close, c.volume) for c in candles]
+    return np.array(rows, dtype=OHLCV_DTYPE)
+
+
+def _f64(values: ArrayLike) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _nan(n: int) -> np.ndarray:
+    return np.full(n, np.nan)
+
+
+# ----------------------------------------------------------------------
+# Rolling windows
+# ----------------------------------------------------------------------
+
+
+def rolling_sum(values: ArrayLike, period: int) -> np.ndarray:
+    """Trailing window sum; NaN until the first full window and for windows holding a NaN."""
+    x = _f64(values)
+    out = _nan(len(x))
+    if period <= 0 or len(x) < period:
+        return out
+    missing = np.isnan(x)
+    csum = np.cumsum(np.concatenate(([0.0], np.where(missing, 0.0, x))))
+    out[period - 1 :] = csum[period:] - csum[:-period]
+    if missing.any():
+        gaps = np.cumsum(np.concatenate(([0], missing)))
+        out[period - 1 :][(gaps[period:] - gaps[:-period]) > 0] = np.nan
+    return out
+
+
+def sma(values: ArrayLike, period: int) -> np.ndarray:
+    return rolling_sum(values, period) / period
+
+
+def wma(values: ArrayLike, period: int) -> np.ndarray:
+    """
+    Linearly weighted moving average (newest bar weight = period).
+
+    Uses prefix sums of x and i*x, so each step is O(1) instead of
+    re-weighting the whole window.
+    """
+    x = _f64(values)
+    out = _nan(len(x))
+    if period <= 0 or len(x) < period:
+        return out
+    idx = np.arange(len(x), dtype=np.float64)
+    window_x = rolling_sum(x, period)[period - 1 :]
+    window_ix = rolling_sum(idx * x, period)[period - 1 :]
+    start = idx[: len(x) - period + 1] - 1  # weight of bar k is k - start
+    out[period - 1 :] = (window_ix - start * window_x) / (period * (period + 1) / 2)
+    return out
+
+
+def rolling_std(values: ArrayLike, period: int) -> np.ndarray:
+    """Population standard deviation over a trailing window."""
+    x = _f64(values)
+    if len(x) == 0:
+        return _nan(0)
+    # Centre first so the sum-of-squares difference doesn't lose precision
+    finite = x[np.isfinite(x)]
+    centred = x - (finite.mean() if len(finite) else 0.0)
+    mean = sma(centred, period)
+    mean_sq = sma(centred * centred, period)
+    return np.sqrt(np.maximum(mean_sq - mean * mean, 0.0))
+
+
+def _rolling_extreme(x: np.ndarray, period: int, accumulate) -> np.ndarray:
+    """
+    Van Herk / Gil-Werman rolling max or min: prefix and suffix scans over
+    period-sized blocks, so the cost is O(n) regardless of the window.
+    """
+    n = len(x)
+    out = _nan(n)
+    if period <= 0 or n < period:
+        return out
+    if period == 1:
+        return x.copy()
+    fill = -np.inf if accumulate is np.maximum else np.inf
+    blocks = -(-n // period)
+    padded = np.full(blocks * period, fill)
+    padded[:n] = x
+    grid = padded.reshape(blocks, period)
+    prefix = accumulate.accumulate(grid, axis=1).ravel()
+    suffix = accumulate.accumulate(grid[:, ::-1], axis=1)[:, ::-1].ravel()
+    out[period - 1 :] = accumulate(suffix[: n - period + 1], prefix[period - 1 : n])
+    return out
+
+
+def rolling_max(values: ArrayLike, period: int) -> np.ndarray:
+    return _rolling_extreme(_f64(values), period, np.maximum)
+
+
+def rolling_min(values: ArrayLike, period: int) -> np.ndarray:
+    return _rolling_extreme(_f64(values), period, np.minimum)
+
+
+# ----------------------------------------------------------------------
+# Recursive smoothers
+# ----------------------------------------------------------------------
+
+
+def _smooth(values: np.ndarray, seed: float, alpha: float) -> np.ndarray:
+    """y[0] = seed, y[i] = y[i-1] + alpha * (x[i] - y[i-1]); one O(n) pass."""
+    out = np.empty(len(values) + 1)
+    out[0] = prev = seed
+    keep = 1.0 - alpha
+    for i, v in enumerate(values.tolist(), 1):
+        prev = alpha * v + keep * prev
+        out[i] = prev
+    return out
+
+
+def ema(values: ArrayLike, period: int) -> np.ndarray:
+    """
+    SMA-seeded EMA aligned to the input (NaN before the seed bar).
+
+    Matches MovingAverage.ema, which returns the same values without the
+    leading NaNs.
+    """
+    x = _f64(values)
+    out = _nan(len(x))
+    if period <= 0 or len(x) < period:
+        return out
+    out[period - 1 :] = _smooth(x[period:], x[:period].mean(), 2 / (period + 1))
+    return out
+
+
+def wilder(values: ArrayLike, period: int) -> np.ndarray:
+    """Wilder smoothing (alpha = 1/period), seeded with the first window mean."""
+    x = _f64(values)
+    out = _nan(len(x))
+    if period <= 0 or len(x) < period:
+        return out
+    out[period - 1 :] = _smooth(x[period:], x[:period].mean(), 1 / period)
+    return out
+
+
+# ----------------------------------------------------------------------
+# Indicators
+# ----------------------------------------------------------------------
+
+
+def rsi(closes: ArrayLike, period: int = 14) -> np.ndarray:
+    """Wilder RSI aligned to closes, identical to RSI.calculate."""
+    x = _f64(closes)
+    out = _nan(len(x))
+    if len(x) < period + 1:
+        return out
+    deltas = np.diff(x)
+    avg_gain = wilder(np.maximum(deltas, 0.0), period)[period - 1 :]
+    avg_loss = wilder(np.maximum(-deltas, 0.0), period)[period - 1 :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = 100 - 100 / (1 + avg_gain / avg_loss)
+    out[period:] = np.where(avg_loss == 0, 100.0, values)
+    return out
+
+
+def macd(
+    closes: ArrayLike, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9
+) -> Dict[str, np.ndarray]:
+    x = _f64(closes)
+    line = ema(x, fast_period) - ema(x, slow_period)
+    signal = _nan(len(x))
+    valid = np.flatnonzero(~np.isnan(line))
+    if len(valid):
+        start = valid[0]
+        signal[start:] = ema(line[start:], signal_period)
+    return {"macd": line, "signal": signal, "histogram": line - signal}
+
+
+def bollinger(
+    closes: ArrayLike, period: int = 20, std_multiplier: float = 2.0
+) -> Dict[str, np.ndarray]:
+    middle = sma(closes, period)
+    width = std_multiplier * rolling_std(closes, period)
+    return {"middle": middle, "upper": middle + width, "lower": middle - width}
+
+
+def true_range(high: ArrayLike, low: ArrayLike, close: ArrayLike) -> np.ndarray:
+    """True range for bars 1..n-1 (bar 0 has no previous close)."""
+    h, l, c = _f64(high), _f64(low), _f64(close)
+    prev_close = c[:-1]
+    return np.maximum.reduce(
+        [h[1:] - l[1:], np.abs(h[1:] - prev_close), np.abs(l[1:] - prev_close)]
+    )
+
+
+def atr(high: ArrayLike, low: ArrayLike, close: ArrayLike, period: int = 14) -> np.ndarray:
+    """Wilder ATR aligned to the bars (NaN for the first `period` bars)."""
+    n = len(close)
+    out = _nan(n)
+    if n < period + 1:
+        return out
+    out[1:] = wilder(true_range(high, low, close), period)
+    return out
+
+
+def vwap(high: ArrayLike, low: ArrayLike, close: ArrayLike, volume: ArrayLike) -> np.ndarray:
+    """Cumulative session VWAP from typical price."""
+    v = _f64(volume)
+    typical = (_f64(high) + _f64(low) + _f64(close)) / 3
+    cum_volume = np.cumsum(v)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(cum_volume > 0, np.cumsum(typical * v) / cum_volume, np.nan)
+
+
+def stochastic(
+    high: ArrayLike, low: ArrayLike, close: ArrayLike, k_period: int = 14, d_period: int = 3
+) -> Dict[str, np.ndarray]:
+    highest = rolling_max(high, k_period)
+    lowest = rolling_min(low, k_period)
+    span = highest - lowest
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = np.where(span == 0, 50.0, (_f64(close) - lowest) / span * 100)
+    return {"k": k, "d": sma(k, d_period)}
+
+
+def obv(close: ArrayLike, volume: ArrayLike) -> np.ndarray:
+    c, v = _f64(close), _f64(volume)
+    if len(c) == 0:
+        return np.zeros(1)
+    flow = np.sign(np.diff(c)) * v[1:]
+    return np.concatenate(([0.0], np.cumsum(flow)))
+
+
+def ichimoku(
+    high: ArrayLike,
+    low: ArrayLike,
+    close: ArrayLike,
+    tenkan_period: int = 9,
+    kijun_period: int = 26,
+    senkou_span_b_period: int = 52,
+    displacement: int = 26,
+) -> Dict[str, np.ndarray]:
+    h, l, c = _f64(high), _f64(low), _f64(close)
+    n = len(c)
+
+    def midpoint(period):
+        return (rolling_max(h, period) + rolling_min(l, period)) / 2
+
+    tenkan = midpoint(tenkan_period)
+    kijun = midpoint(kijun_period)
+    senkou_a = _nan(n + displacement)
+    senkou_b = _nan(n + displacement)
+    chikou = _nan(n + displacement)
+
+    span_a = (tenkan + kijun) / 2
+    span_a[: kijun_period - 1] = np.nan
+    senkou_a[displacement:] = span_a
+    senkou_b[displacement:] = midpoint(senkou_span_b_period)
+    if n > displacement:
+        chikou[: n - displacement] = c[displacement:]
+
+    return {
+        "tenkan": tenkan,
+        "kijun": kijun,
+        "senkou_a": senkou_a,
+        "senkou_b": senkou_b,
+        "chikou": chikou,
+    }
+
+
+def compute_all(ohlcv: np.ndarray) -> Dict[str, np.ndarray]:
+    """Every IndicatorEngine series from one structured OHLCV array."""
+    high, low, close, volume = ohlcv["high"], ohlcv["low"], ohlcv["close"], ohlcv["volume"]
+    columns: Dict[str, np.ndarray] = {
+        "sma_20": sma(close, 20),
+        "sma_50": sma(close, 50),
+        "sma_200": sma(close, 200),
+        "ema_12": ema(close, 12),
+        "ema_26": ema(close, 26),
+        "rsi": rsi(close, 14),
+        "atr": atr(high, low, close, 14),
+        "vwap": vwap(high, low, close, volume),
+        "obv": obv(close, volume),
+    }
+    for prefix, series in (
+        ("macd", macd(close, 12, 26, 9)),
+        ("bollinger", bollinger(close, 20, 2.0)),
+        ("stochastic", stochastic(high, low, close, 14, 3)),
+        ("ichimoku", ichimoku(high, low, close)),
+    ):
+        for name, values in series.items():
+            columns[f"{prefix}_{name}"] = values
+    return columns
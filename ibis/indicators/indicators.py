@@ -9,6 +9,8 @@ from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, field
 from collections import deque
 
+from . import columnar
+
 
 @dataclass
 class OHLCV:
@@ -61,42 +63,17 @@ class MultiIndicatorResult:
 class MovingAverage:
     @staticmethod
     def sma(prices: List[float], period: int) -> List[float]:
-        result = []
-        for i in range(len(prices)):
-            if i < period - 1:
-                result.append(float("nan"))
-            else:
-                sma = sum(prices[i - period + 1 : i + 1]) / period
-                result.append(sma)
-        return result
+        return columnar.sma(prices, period).tolist()
 
     @staticmethod
     def ema(prices: List[float], period: int) -> List[float]:
-        result = []
-        multiplier = 2 / (period + 1)
-
-        ema = sum(prices[:period]) / period
-        result.append(ema)
-
-        for i in range(period, len(prices)):
-            ema = (prices[i] - ema) * multiplier + ema
-            result.append(ema)
-
-        return result
+        if len(prices) < period:
+            return [sum(prices) / period]
+        return columnar.ema(prices, period)[period - 1 :].tolist()
 
     @staticmethod
     def wma(prices: List[float], period: int) -> List[float]:
-        result = []
-        denominator = period * (period + 1) / 2
-
-        for i in range(len(prices)):
-            if i < period - 1:
-                result.append(float("nan"))
-            else:
-                weighted_sum = sum(prices[i - period + j + 1] * (period - j) for j in range(period))
-                result.append(weighted_sum / denominator)
-
-        return result
+        return columnar.wma(prices, period).tolist()
 
     @staticmethod
     def cross_signal(short_ma: List[float], long_ma: List[float]) -> Tuple[List[str], List[float]]:
@@ -122,31 +99,7 @@ class MovingAverage:
 class RSI:
     @staticmethod
     def calculate(prices: List[float], period: int = 14) -> List[float]:
-        if len(prices) < period + 1:
-            return [float("nan")] * len(prices)
-
-        deltas = [prices[i] - prices[i - 1] for i in range(1, len(prices))]
-        gains = [max(d, 0) for d in deltas]
-        losses = [-min(d, 0) for d in deltas]
-
-        avg_gain = sum(gains[:period]) / period
-        avg_loss = sum(losses[:period]) / period
-
-        rsi_values = [float("nan")] * period
-
-        for i in range(period, len(prices)):
-            if avg_loss == 0:
-                rsi_values.append(100)
-            else:
-                rs = avg_gain / avg_loss
-                rsi = 100 - (100 / (1 + rs))
-                rsi_values.append(rsi)
-
-            if i < len(prices) - 1:
-                avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-                avg_loss = (avg_loss * (period - 1) + losses[i]) / period
-
-        return rsi_values
+        return columnar.rsi(prices, period).tolist()
 
     @staticmethod
     def signal(rsi_values: List[float]) -> Tuple[str, float]:
@@ -174,40 +127,8 @@ class MACD:
         slow_period: int = 26,
         signal_period: int = 9,
     ) -> Dict[str, List[float]]:
-        ema_fast = MovingAverage.ema(prices, fast_period)
-        ema_slow = MovingAverage.ema(prices, slow_period)
-
-        ema_fast = [float("nan")] * (len(prices) - len(ema_fast)) + ema_fast
-        ema_slow = [float("nan")] * (len(prices) - len(ema_slow)) + ema_slow
-
-        macd_line = []
-        for i in range(len(prices)):
-            if math.isnan(ema_fast[i]) or math.isnan(ema_slow[i]):
-                macd_line.append(float("nan"))
-            else:
-                macd_line.append(ema_fast[i] - ema_slow[i])
-
-        signal_line = []
-        valid_macd = [m for m in macd_line if not math.isnan(m)]
-        if valid_macd:
-            start_idx = len(macd_line) - len(valid_macd)
-            signal = MovingAverage.ema(valid_macd, signal_period)
-            signal_line = [float("nan")] * start_idx + signal
-
-        histogram = []
-        for i in range(len(macd_line)):
-            if i >= len(signal_line):
-                histogram.append(float("nan"))
-            elif math.isnan(macd_line[i]) or math.isnan(signal_line[i]):
-                histogram.append(float("nan"))
-            else:
-                histogram.append(macd_line[i] - signal_line[i])
-
-        return {
-            "macd": macd_line,
-            "signal": signal_line,
-            "histogram": histogram,
-        }
+        data = columnar.macd(prices, fast_period, slow_period, signal_period)
+        return {name: values.tolist() for name, values in data.items()}
 
     @staticmethod
     def signal(macd_data: Dict[str, List[float]]) -> Tuple[str, float]:
@@ -234,25 +155,8 @@ class BollingerBands:
     def calculate(
         prices: List[float], period: int = 20, std_multiplier: float = 2.0
     ) -> Dict[str, List[float]]:
-        sma = MovingAverage.sma(prices, period)
-        upper = []
-        lower = []
-
-        for i in range(len(prices)):
-            if math.isnan(sma[i]) or i < period - 1:
-                upper.append(float("nan"))
-                lower.append(float("nan"))
-            else:
-                window = prices[i - period + 1 : i + 1]
-                std = math.sqrt(sum((p - sma[i]) ** 2 for p in window) / period)
-                upper.append(sma[i] + std_multiplier * std)
-                lower.append(sma[i] - std_multiplier * std)
-
-        return {
-            "middle": sma,
-            "upper": upper,
-            "lower": lower,
-        }
+        data = columnar.bollinger(prices, period, std_multiplier)
+        return {name: values.tolist() for name, values in data.items()}
 
     @staticmethod
     def signal(prices: List[float], bb_data: Dict) -> Tuple[str, float]:
@@ -287,26 +191,11 @@ class ATR:
     def calculate(ohlcv: List[OHLCV], period: int = 14) -> List[float]:
         if len(ohlcv) < 2:
             return [float("nan")] * len(ohlcv)
+        if len(ohlcv) - 1 < period:
+            return [float("nan")] * period
 
-        true_ranges = []
-
-        for i in range(1, len(ohlcv)):
-            high_low = ohlcv[i].high - ohlcv[i].low
-            high_close = abs(ohlcv[i].high - ohlcv[i - 1].close)
-            low_close = abs(ohlcv[i].low - ohlcv[i - 1].close)
-            true_ranges.append(max(high_low, high_close, low_close))
-
-        atr_values = [float("nan")] * (period)
-
-        if len(true_ranges) >= period:
-            atr = sum(true_ranges[:period]) / period
-            atr_values.append(atr)
-
-            for i in range(period, len(true_ranges)):
-                atr = (atr * (period - 1) + true_ranges[i]) / period
-                atr_values.append(atr)
-
-        return atr_values
+        bars = columnar.to_ohlcv_array(ohlcv)
+        return columnar.atr(bars["high"], bars["low"], bars["close"], period).tolist()
 
     @staticmethod
     def volatility(atr_values: List[float], price: float) -> Tuple[str, float]:
@@ -327,29 +216,15 @@ class ATR:
 class VWAP:
     @staticmethod
     def calculate(ohlcv: List[OHLCV]) -> List[float]:
-        if not ohlcv:
+        if len(ohlcv) == 0:
             return []
 
-        cumulative_tpv = 0.0
-        cumulative_volume = 0.0
-        vwap_values = []
-
-        for bar in ohlcv:
-            typical_price = (bar.high + bar.low + bar.close) / 3
-            tpv = typical_price * bar.volume
-            cumulative_tpv += tpv
-            cumulative_volume += bar.volume
-
-            if cumulative_volume > 0:
-                vwap_values.append(cumulative_tpv / cumulative_volume)
-            else:
-                vwap_values.append(float("nan"))
-
-        return vwap_values
+        bars = columnar.to_ohlcv_array(ohlcv)
+        return columnar.vwap(bars["high"], bars["low"], bars["close"], bars["volume"]).tolist()
 
     @staticmethod
     def signal(prices: List[float], vwap_values: List[float]) -> Tuple[str, float]:
-        if not vwap_values or math.isnan(vwap_values[-1]):
+        if len(vwap_values) == 0 or math.isnan(vwap_values[-1]):
             return "NEUTRAL", 0.0
 
         current_price = prices[-1]
@@ -366,36 +241,9 @@ class Stochastic:
     def calculate(
         ohlcv: List[OHLCV], k_period: int = 14, d_period: int = 3
     ) -> Dict[str, List[float]]:
-        k_values = []
-        d_values = []
-
-        for i in range(len(ohlcv)):
-            if i < k_period - 1:
-                k_values.append(float("nan"))
-                d_values.append(float("nan"))
-                continue
-
-            window = ohlcv[i - k_period + 1 : i + 1]
-            highest_high = max(c.high for c in window)
-            lowest_low = min(c.low for c in window)
-
-            if highest_high == lowest_low:
-                k_values.append(50)
-            else:
-                current_close = ohlcv[i].close
-                k = ((current_close - lowest_low) / (highest_high - lowest_low)) * 100
-                k_values.append(k)
-
-            if len(k_values) >= d_period:
-                valid_k = [k for k in k_values[-d_period:] if not math.isnan(k)]
-                if len(valid_k) == d_period:
-                    d_values.append(sum(valid_k) / d_period)
-                else:
-                    d_values.append(float("nan"))
-            else:
-                d_values.append(float("nan"))
-
-        return {"k": k_values, "d": d_values}
+        bars = columnar.to_ohlcv_array(ohlcv)
+        data = columnar.stochastic(bars["high"], bars["low"], bars["close"], k_period, d_period)
+        return {name: values.tolist() for name, values in data.items()}
 
     @staticmethod
     def signal(stoch_data: Dict) -> Tuple[str, float]:
@@ -418,17 +266,11 @@ class Stochastic:
 class OBV:
     @staticmethod
     def calculate(ohlcv: List[OHLCV]) -> List[float]:
-        obv_values = [0]
+        if len(ohlcv) == 0:
+            return [0]
 
-        for i in range(1, len(ohlcv)):
-            if ohlcv[i].close > ohlcv[i - 1].close:
-                obv_values.append(obv_values[-1] + ohlcv[i].volume)
-            elif ohlcv[i].close < ohlcv[i - 1].close:
-                obv_values.append(obv_values[-1] - ohlcv[i].volume)
-            else:
-                obv_values.append(obv_values[-1])
-
-        return obv_values
+        bars = columnar.to_ohlcv_array(ohlcv)
+        return columnar.obv(bars["close"], bars["volume"]).tolist()
 
     @staticmethod
     def trend(obv_values: List[float]) -> Tuple[str, float]:
@@ -446,50 +288,9 @@ class OBV:
 class Ichimoku:
     @staticmethod
     def calculate(ohlcv: List[OHLCV]) -> Dict[str, List[float]]:
-        tenkan_period = 9
-        kijun_period = 26
-        senkou_span_b_period = 52
-        senkou_displacement = 26
-
-        n = len(ohlcv)
-        full_length = n + senkou_displacement
-
-        tenkan = [float("nan")] * n
-        kijun = [float("nan")] * n
-        senkou_a = [float("nan")] * full_length
-        senkou_b = [float("nan")] * full_length
-        chikou = [float("nan")] * full_length
-
-        for i in range(tenkan_period - 1, n):
-            window = ohlcv[i - tenkan_period + 1 : i + 1]
-            tenkan[i] = (max(c.high for c in window) + min(c.low for c in window)) / 2
-
-        for i in range(kijun_period - 1, n):
-            window = ohlcv[i - kijun_period + 1 : i + 1]
-            kijun[i] = (max(c.high for c in window) + min(c.low for c in window)) / 2
-
-        for i in range(kijun_period - 1, n):
-            if not math.isnan(tenkan[i]) and not math.isnan(kijun[i]):
-                sa = (tenkan[i] + kijun[i]) / 2
-                senkou_a[i + senkou_displacement] = sa
-
-        for i in range(senkou_span_b_period - 1, n):
-            window = ohlcv[i - senkou_span_b_period + 1 : i + 1]
-            senkou_b[i + senkou_displacement] = (
-                max(c.high for c in window) + min(c.low for c in window)
-            ) / 2
-
-        for i in range(n):
-            if i >= senkou_displacement:
-                chikou[i - senkou_displacement] = ohlcv[i].close
-
-        return {
-            "tenkan": tenkan,
-            "kijun": kijun,
-            "senkou_a": senkou_a,
-            "senkou_b": senkou_b,
-            "chikou": chikou,
-        }
+        bars = columnar.to_ohlcv_array(ohlcv)
+        data = columnar.ichimoku(bars["high"], bars["low"], bars["close"])
+        return {name: values.tolist() for name, values in data.items()}
 
     @staticmethod
     def signal(ichimoku_data: Dict, price: float) -> Tuple[str, float]:
@@ -640,50 +441,62 @@ class IndicatorEngine:
             "ichimoku": None,
         }
 
-    async def calculate_all(self, candles: List[OHLCV]) -> MultiIndicatorResult:
-        if len(candles) < 100:
-            raise ValueError(f"Need at least 100 candles, got {len(candles)}")
-
-        closes = [c.close for c in candles]
-        highs = [c.high for c in candles]
-        lows = [c.low for c in candles]
-        opens = [c.open for c in candles]
-        volumes = [c.volume for c in candles]
-
-        result = MultiIndicatorResult(timestamp=candles[-1].timestamp)
-
-        sma_20 = MovingAverage.sma(closes, 20)
-        sma_50 = MovingAverage.sma(closes, 50)
-        sma_200 = MovingAverage.sma(closes, 200)
-
-        sma_cross = []
-        for i in range(len(closes)):
-            if math.isnan(sma_20[i]) or math.isnan(sma_50[i]):
-                sma_cross.append("NEUTRAL")
-            elif sma_20[i] > sma_50[i]:
-                sma_cross.append("BULLISH")
-            else:
-                sma_cross.append("BEARISH")
+    def calculate_columns(self, candles) -> Dict:
+        """Every indicator series in one pass over a structured OHLCV array."""
+        return columnar.compute_all(columnar.to_ohlcv_array(candles))
+
+    async def calculate_all(self, candles) -> MultiIndicatorResult:
+        """
+        Accepts a list of OHLCV/Candle objects, a columnar.OHLCV_DTYPE
+        structured array or a CandleArchive series; all series are computed
+        column-wise in one pass.
+        """
+        ohlcv = columnar.to_ohlcv_array(candles)
+        if len(ohlcv) < 100:
+            raise ValueError(f"Need at least 100 candles, got {len(ohlcv)}")
+
+        cols = columnar.compute_all(ohlcv)
+        closes = ohlcv["close"]
+        highs = ohlcv["high"]
+        lows = ohlcv["low"]
+        close = float(closes[-1])
+
+        result = MultiIndicatorResult(timestamp=int(ohlcv["timestamp"][-1]))
+
+        sma_20 = cols["sma_20"]
+        sma_50 = cols["sma_50"]
+        sma_200 = cols["sma_200"]
+
+        if math.isnan(sma_20[-1]) or math.isnan(sma_50[-1]):
+            sma_cross = "NEUTRAL"
+        elif sma_20[-1] > sma_50[-1]:
+            sma_cross = "BULLISH"
+        else:
+            sma_cross = "BEARISH"
 
         self.indicators["sma_20"] = sma_20[-1]
         self.indicators["sma_50"] = sma_50[-1]
         self.indicators["sma_200"] = sma_200[-1]
+        self.indicators["ema_12"] = cols["ema_12"][-1]
+        self.indicators["ema_26"] = cols["ema_26"][-1]
 
         result.indicators["sma_20"] = IndicatorResult(
             "SMA_20",
             sma_20[-1],
-            sma_cross[-1],
-            min(abs(sma_20[-1] - closes[-1]) / closes[-1] * 10, 1.0)
-            if not math.isnan(sma_20[-1])
-            else 0,
+            sma_cross,
+            min(abs(sma_20[-1] - close) / close * 10, 1.0) if not math.isnan(sma_20[-1]) else 0,
         )
 
-        rsi_values = RSI.calculate(closes, 14)
+        rsi_values = cols["rsi"]
         rsi_signal, rsi_strength = RSI.signal(rsi_values)
         self.indicators["rsi"] = rsi_values[-1]
         result.indicators["rsi"] = IndicatorResult("RSI", rsi_values[-1], rsi_signal, rsi_strength)
 
-        macd_data = MACD.calculate(closes, 12, 26, 9)
+        macd_data = {
+            "macd": cols["macd_macd"],
+            "signal": cols["macd_signal"],
+            "histogram": cols["macd_histogram"],
+        }
         macd_signal, macd_strength = MACD.signal(macd_data)
         self.indicators["macd"] = macd_data["macd"][-1]
         self.indicators["macd_signal"] = macd_data["signal"][-1]
@@ -692,15 +505,19 @@ class IndicatorEngine:
             "MACD", macd_data["histogram"][-1], macd_signal, macd_strength
         )
 
-        bb_data = BollingerBands.calculate(closes, 20, 2.0)
+        bb_data = {
+            "middle": cols["bollinger_middle"],
+            "upper": cols["bollinger_upper"],
+            "lower": cols["bollinger_lower"],
+        }
         bb_signal, bb_strength = BollingerBands.signal(closes, bb_data)
         self.indicators["bollinger_upper"] = bb_data["upper"][-1]
         self.indicators["bollinger_middle"] = bb_data["middle"][-1]
         self.indicators["bollinger_lower"] = bb_data["lower"][-1]
-        result.indicators["bollinger"] = IndicatorResult("BB", closes[-1], bb_signal, bb_strength)
+        result.indicators["bollinger"] = IndicatorResult("BB", close, bb_signal, bb_strength)
 
-        atr_values = ATR.calculate(candles, 14)
-        atr_signal, atr_strength = ATR.volatility(atr_values, closes[-1])
+        atr_values = cols["atr"]
+        atr_signal, atr_strength = ATR.volatility(atr_values, close)
         self.indicators["atr"] = atr_values[-1] if not math.isnan(atr_values[-1]) else 0
         result.indicators["atr"] = IndicatorResult(
             "ATR",
@@ -709,14 +526,14 @@ class IndicatorEngine:
             atr_strength,
         )
 
-        vwap_values = VWAP.calculate(candles)
+        vwap_values = cols["vwap"]
         vwap_signal, vwap_strength = VWAP.signal(closes, vwap_values)
-        self.indicators["vwap"] = vwap_values[-1] if vwap_values else 0
+        self.indicators["vwap"] = vwap_values[-1]
         result.indicators["vwap"] = IndicatorResult(
-            "VWAP", vwap_values[-1] if vwap_values else 0, vwap_signal, vwap_strength
+            "VWAP", vwap_values[-1], vwap_signal, vwap_strength
         )
 
-        stoch_data = Stochastic.calculate(candles, 14, 3)
+        stoch_data = {"k": cols["stochastic_k"], "d": cols["stochastic_d"]}
         stoch_signal, stoch_strength = Stochastic.signal(stoch_data)
         self.indicators["stochastic_k"] = stoch_data["k"][-1]
         self.indicators["stochastic_d"] = stoch_data["d"][-1]
@@ -724,24 +541,29 @@ class IndicatorEngine:
             "STOCH", stoch_data["k"][-1], stoch_signal, stoch_strength
         )
 
-        obv_values = OBV.calculate(candles)
+        obv_values = cols["obv"]
         obv_signal, obv_strength = OBV.trend(obv_values)
         self.indicators["obv"] = obv_values[-1]
         result.indicators["obv"] = IndicatorResult("OBV", obv_values[-1], obv_signal, obv_strength)
 
-        ichimoku_data = Ichimoku.calculate(candles)
-        ichimoku_signal, ichimoku_strength = Ichimoku.signal(ichimoku_data, closes[-1])
+        ichimoku_data = {
+            name: cols[f"ichimoku_{name}"]
+            for name in ("tenkan", "kijun", "senkou_a", "senkou_b", "chikou")
+        }
+        ichimoku_signal, ichimoku_strength = Ichimoku.signal(ichimoku_data, close)
         self.indicators["ichimoku"] = ichimoku_signal
         result.indicators["ichimoku"] = IndicatorResult(
             "ICHIMOKU", 0, ichimoku_signal, ichimoku_strength
         )
 
-        fib_levels = Fibonacci.levels(max(highs[-50:]), min(lows[-50:]))
-        current_fib = Fibonacci.retrace(closes[-1], max(highs[-50:]), min(lows[-50:]))
+        swing_high = float(highs[-50:].max())
+        swing_low = float(lows[-50:].min())
+        fib_levels = Fibonacci.levels(swing_high, swing_low)
+        current_fib = Fibonacci.retrace(close, swing_high, swing_low)
         result.indicators["fibonacci"] = IndicatorResult("FIBONACCI", 0, current_fib, 0.5)
 
-        sr_levels = SupportResistance.find_levels(closes[-200:], 5, 0.02)
-        sr_support, sr_resistance = SupportResistance.nearest(closes[-1], sr_levels)
+        sr_levels = SupportResistance.find_levels(closes[-200:].tolist(), 5, 0.02)
+        sr_support, sr_resistance = SupportResistance.nearest(close, sr_levels)
         result.indicators["support"] = IndicatorResult("SUPPORT", sr_support, "SUPPORT", 0.5)
         result.indicators["resistance"] = IndicatorResult(
             "RESISTANCE", sr_resistance, "RESISTANCE", 0.5
@@ -0,0 +1,571 @@
+"""
+IBIS Streaming Indicators
+Stateful indicators updated one bar (or trade) at a time in O(1)
+"""
+
+import json
+import math
+import os
+import tempfile
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ibis.core.logging_config import get_logger
+from ibis.exchange.candle_store import interval_seconds
+
+logger = get_logger(__name__)
+
+NAN = float("nan")
+
+
+class StreamingEMA:
+    """SMA-seeded EMA, same values as MovingAverage.ema once `period` bars are in."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 2 / (period + 1)
+        self.count = 0
+        self._seed_sum = 0.0
+        self.value = NAN
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.period
+
+    def update(self, x: float) -> float:
+        self.count += 1
+        if self.count < self.period:
+            self._seed_sum += x
+        elif self.count == self.period:
+            self.value = (self._seed_sum + x) / self.period
+        else:
+            self.value = (x - self.value) * self.alpha + self.value
+        return self.value
+
+    def peek(self, x: float) -> float:
+        """Value update(x) would return, without changing state."""
+        count = self.count + 1
+        if count < self.period:
+            return NAN
+        if count == self.period:
+            return (self._seed_sum + x) / self.period
+        return (x - self.value) * self.alpha + self.value
+
+    def to_dict(self) -> Dict:
+        return {
+            "period": self.period,
+            "count": self.count,
+            "seed": self._seed_sum,
+            "value": self.value,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "StreamingEMA":
+        obj = cls(data["period"])
+        obj.count = data["count"]
+        obj._seed_sum = data["seed"]
+        obj.value = data["value"]
+        return obj
+
+
+class WilderAverage(StreamingEMA):
+    """Wilder smoothing (alpha = 1/period) seeded with the first window mean."""
+
+    def __init__(self, period: int):
+        super().__init__(period)
+        self.alpha = 1 / period
+
+
+class StreamingRSI:
+    """Wilder RSI over closes, same values as RSI.calculate."""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.gain = WilderAverage(period)
+        self.loss = WilderAverage(period)
+
+    @property
+    def ready(self) -> bool:
+        return self.gain.ready
+
+    @staticmethod
+    def _rsi(gain: float, loss: float) -> float:
+        if math.isnan(gain):
+            return NAN
+        if loss == 0:
+            return 100.0
+        return 100 - 100 / (1 + gain / loss)
+
+    @property
+    def value(self) -> float:
+        return self._rsi(self.gain.value, self.loss.value)
+
+    def update(self, close: float) -> float:
+        if self.prev_close is not None:
+            delta = close - self.prev_close
+            self.gain.update(max(delta, 0.0))
+            self.loss.update(max(-delta, 0.0))
+        self.prev_close = close
+        return self.value
+
+    def peek(self, close: float) -> float:
+        if self.prev_close is None:
+            return self.value
+        delta = close - self.prev_close
+        return self._rsi(self.gain.peek(max(delta, 0.0)), self.loss.peek(max(-delta, 0.0)))
+
+    def to_dict(self) -> Dict:
+        return {
+            "period": self.period,
+            "prev_close": self.prev_close,
+            "gain": self.gain.to_dict(),
+            "loss": self.loss.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "StreamingRSI":
+        obj = cls(data["period"])
+        obj.prev_close = data["prev_close"]
+        obj.gain = WilderAverage.from_dict(data["gain"])
+        obj.loss = WilderAverage.from_dict(data["loss"])
+        return obj
+
+
+class StreamingATR:
+    """Wilder ATR over bars, same values as ATR.calculate."""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.tr = WilderAverage(period)
+        self.last_tr = NAN
+
+    @property
+    def ready(self) -> bool:
+        return self.tr.ready
+
+    @property
+    def value(self) -> float:
+        return self.tr.value
+
+    def update(self, high: float, low: float, close: float) -> float:
+        if self.prev_close is not None:
+            self.last_tr = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+            self.tr.update(self.last_tr)
+        self.prev_close = close
+        return self.value
+
+    def peek(self, high: float, low: float, close: float) -> Tuple[float, float]:
+        """(atr, true range) update() would produce, without changing state."""
+        if self.prev_close is None:
+            return self.value, NAN
+        tr = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        return self.tr.peek(tr), tr
+
+    def to_dict(self) -> Dict:
+        return {
+            "period": self.period,
+            "prev_close": self.prev_close,
+            "last_tr": self.last_tr,
+            "tr": self.tr.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "StreamingATR":
+        obj = cls(data["period"])
+        obj.prev_close = data["prev_close"]
+        obj.last_tr = data["last_tr"]
+        obj.tr = WilderAverage.from_dict(data["tr"])
+        return obj
+
+
+class RollingStats:
+    """
+    Mean and population variance over the last `period` values.
+
+    Keeps running sums of x and x^2 around a fixed shift (the first value
+    seen) so the variance stays accurate for large prices.
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window: deque = deque(maxlen=period)
+        self.shift: Optional[float] = None
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return len(self.window) == self.period
+
+    def update(self, x: float) -> None:
+        if self.shift is None:
+            self.shift = x
+        if len(self.window) == self.period:
+            old = self.window[0] - self.shift
+            self._sum -= old
+            self._sum_sq -= old * old
+        self.window.append(x)
+        d = x - self.shift
+        self._sum += d
+        self._sum_sq += d * d
+
+    def peek(self, x: float) -> Tuple[bool, float, float]:
+        """(ready, mean, std) with x appended, without changing state."""
+        shift = x if self.shift is None else self.shift
+        total, total_sq, n = self._sum, self._sum_sq, len(self.window)
+        if n == self.period:
+            old = self.window[0] - shift
+            total -= old
+            total_sq -= old * old
+            n -= 1
+        d = x - shift
+        total += d
+        total_sq += d * d
+        n += 1
+        m = total / n
+        return n == self.period, shift + m, math.sqrt(max(total_sq / n - m * m, 0.0))
+
+    @property
+    def mean(self) -> float:
+        n = len(self.window)
+        return self.shift + self._sum / n if n else NAN
+
+    @property
+    def variance(self) -> float:
+        n = len(self.window)
+        if not n:
+            return NAN
+        m = self._sum / n
+        return max(self._sum_sq / n - m * m, 0.0)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> Dict:
+        return {"period": self.period, "window": list(self.window)}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RollingStats":
+        obj = cls(data["period"])
+        for x in data["window"]:
+            obj.update(x)
+        return obj
+
+
+class StreamingVWAP:
+    """Cumulative VWAP from typical price, or from raw trades via update_trade."""
+
+    def __init__(self):
+        self.pv = 0.0
+        self.volume = 0.0
+
+    @property
+    def value(self) -> float:
+        return self.pv / self.volume if self.volume > 0 else NAN
+
+    def update(self, high: float, low: float, close: float, volume: float) -> float:
+        return self.update_trade((high + low + close) / 3, volume)
+
+    def update_trade(self, price: float, size: float) -> float:
+        self.pv += price * size
+        self.volume += size
+        return self.value
+
+    def peek(self, high: float, low: float, close: float, volume: float) -> float:
+        total = self.volume + volume
+        return (self.pv + (high + low + close) / 3 * volume) / total if total > 0 else NAN
+
+    def reset(self) -> None:
+        self.pv = self.volume = 0.0
+
+    def to_dict(self) -> Dict:
+        return {"pv": self.pv, "volume": self.volume}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "StreamingVWAP":
+        obj = cls()
+        obj.pv = data["pv"]
+        obj.volume = data["volume"]
+        return obj
+
+
+class StreamingOBV:
+    def __init__(self):
+        self.prev_close: Optional[float] = None
+        self.value = 0.0
+
+    def update(self, close: float, volume: float) -> float:
+        if self.prev_close is not None:
+            if close > self.prev_close:
+                self.value += volume
+            elif close < self.prev_close:
+                self.value -= volume
+        self.prev_close = close
+        return self.value
+
+    def peek(self, close: float, volume: float) -> float:
+        if self.prev_close is None or close == self.prev_close:
+            return self.value
+        return self.value + volume if close > self.prev_close else self.value - volume
+
+    def to_dict(self) -> Dict:
+        return {"prev_close": self.prev_close, "value": self.value}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "StreamingOBV":
+        obj = cls()
+        obj.prev_close = data["prev_close"]
+        obj.value = data["value"]
+        return obj
+
+
+class IndicatorSet:
+    """
+    All streaming indicators for one (symbol, interval) candle series.
+
+    Kline pushes repeat the still-forming bar many times. The indicators hold
+    the state as of the last closed bar; the forming bar is only kept as
+    OHLCV and folded in once the next bar opens, so a revision is an O(1)
+    overwrite and values() peeks the forming bar on top of the closed state.
+    """
+
+    def __init__(
+        self, period: int = 14, ema_fast: int = 12, ema_slow: int = 26, bb_period: int = 20
+    ):
+        self.config = {
+            "period": period,
+            "ema_fast": ema_fast,
+            "ema_slow": ema_slow,
+            "bb_period": bb_period,
+        }
+        self.ema_fast = StreamingEMA(ema_fast)
+        self.ema_slow = StreamingEMA(ema_slow)
+        self.rsi = StreamingRSI(period)
+        self.atr = StreamingATR(period)
+        self.true_range = RollingStats(period)
+        self.closes = RollingStats(bb_period)
+        self.vwap = StreamingVWAP()
+        self.obv = StreamingOBV()
+        self.timestamp = 0
+        self.bars = 0
+        # (high, low, close, volume) of the bar at `timestamp`, not yet applied
+        self._forming: Optional[Tuple[float, float, float, float]] = None
+
+    @property
+    def close(self) -> float:
+        return self._forming[2] if self._forming else NAN
+
+    def _apply(self, bar: Tuple[float, float, float, float]) -> None:
+        high, low, close, volume = bar
+        self.ema_fast.update(close)
+        self.ema_slow.update(close)
+        self.rsi.update(close)
+        self.atr.update(high, low, close)
+        if not math.isnan(self.atr.last_tr):
+            self.true_range.update(self.atr.last_tr)
+        self.closes.update(close)
+        self.vwap.update(high, low, close, volume)
+        self.obv.update(close, volume)
+
+    def update(self, candle) -> bool:
+        """Apply a new or revised bar; returns False for out-of-order bars."""
+        ts = int(candle.timestamp)
+        if self.bars and ts < self.timestamp:
+            return False
+        if not self.bars or ts > self.timestamp:
+            # The previous forming bar is final now
+            if self._forming is not None:
+                self._apply(self._forming)
+            self.bars += 1
+            self.timestamp = ts
+        self._forming = (
+            float(candle.high),
+            float(candle.low),
+            float(candle.close),
+            float(candle.volume),
+        )
+        return True
+
+    def values(self) -> Dict[str, float]:
+        values = {"timestamp": self.timestamp, "close": self.close, "bars": self.bars}
+        if self._forming is None:
+            keys = ("ema_fast", "ema_slow", "rsi", "atr", "atr_sma", "bb_middle", "bb_upper")
+            return {**values, **dict.fromkeys(keys + ("bb_lower", "vwap"), NAN), "obv": 0.0}
+        high, low, close, volume = self._forming
+        atr, tr = self.atr.peek(high, low, close)
+        if math.isnan(tr):
+            tr_ready, tr_mean = self.true_range.ready, self.true_range.mean
+        else:
+            tr_ready, tr_mean, _ = self.true_range.peek(tr)
+        bb_ready, bb_mid, bb_std = self.closes.peek(close)
+        if not bb_ready:
+            bb_mid = bb_std = NAN
+        return {
+            **values,
+            "ema_fast": self.ema_fast.peek(close),
+            "ema_slow": self.ema_slow.peek(close),
+            "rsi": self.rsi.peek(close),
+            "atr": atr,
+            "atr_sma": tr_mean if tr_ready else NAN,
+            "bb_middle": bb_mid,
+            "bb_upper": bb_mid + 2 * bb_std,
+            "bb_lower": bb_mid - 2 * bb_std,
+            "vwap": self.vwap.peek(high, low, close, volume),
+            "obv": self.obv.peek(close, volume),
+        }
+
+    def _state(self) -> Dict:
+        return {
+            "ema_fast": self.ema_fast.to_dict(),
+            "ema_slow": self.ema_slow.to_dict(),
+            "rsi": self.rsi.to_dict(),
+            "atr": self.atr.to_dict(),
+            "true_range": self.true_range.to_dict(),
+            "closes": self.closes.to_dict(),
+            "vwap": self.vwap.to_dict(),
+            "obv": self.obv.to_dict(),
+            "timestamp": self.timestamp,
+            "forming": list(self._forming) if self._forming else None,
+        }
+
+    def _load(self, state: Dict) -> None:
+        self.ema_fast = StreamingEMA.from_dict(state["ema_fast"])
+        self.ema_slow = StreamingEMA.from_dict(state["ema_slow"])
+        self.rsi = StreamingRSI.from_dict(state["rsi"])
+        self.atr = StreamingATR.from_dict(state["atr"])
+        self.true_range = RollingStats.from_dict(state["true_range"])
+        self.closes = RollingStats.from_dict(state["closes"])
+        self.vwap = StreamingVWAP.from_dict(state["vwap"])
+        self.obv = StreamingOBV.from_dict(state["obv"])
+        self.timestamp = state["timestamp"]
+        self._forming = tuple(state["forming"]) if state["forming"] else None
+
+    def to_dict(self) -> Dict:
+        return {"config": self.config, "bars": self.bars, "state": self._state()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "IndicatorSet":
+        obj = cls(**data["config"])
+        obj._load(data["state"])
+        obj.bars = data["bars"]
+        return obj
+
+
+class StreamingIndicatorHub:
+    """
+    IndicatorSets keyed by (symbol, interval), fed by MarketStateService
+    kline pushes.
+
+    A series is seeded from `history(symbol, interval)` (the client's candle
+    store) the first time a push arrives for it, then updated per push in
+    O(1). A push more than one interval past the series (a restart gap from
+    a restored snapshot, missed pushes) drops the series and reseeds it, as
+    averages run across missing bars would be silently wrong. Scoring code
+    reads the latest values with `values()`.
+    """
+
+    def __init__(self, history: Optional[Callable[[str, str], List]] = None, **set_config):
+        self.history = history
+        self.set_config = set_config
+        self._sets: Dict[Tuple[str, str], IndicatorSet] = {}
+        self.stats = {"seeded": 0, "updates": 0, "rejected": 0, "resets": 0, "gaps": 0}
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._sets
+
+    def attach(self, market_state) -> None:
+        """Subscribe to a MarketStateService's candle pushes and reconnects."""
+        market_state.candle_listeners.append(self.on_candle)
+        market_state.ws.reconnect_callbacks.append(self._on_reconnect)
+
+    def seed(self, symbol: str, interval: str, candles: List) -> IndicatorSet:
+        """(Re)build a series from history, oldest -> newest."""
+        indicator_set = IndicatorSet(**self.set_config)
+        for candle in candles:
+            indicator_set.update(candle)
+        self._sets[(symbol, interval)] = indicator_set
+        self.stats["seeded"] += 1
+        return indicator_set
+
+    def on_candle(self, symbol: str, interval: str, candle) -> None:
+        ts = int(candle.timestamp)
+        step = interval_seconds(interval)
+        indicator_set = self._sets.get((symbol, interval))
+        if indicator_set is not None and indicator_set.bars and ts - indicator_set.timestamp > step:
+            del self._sets[(symbol, interval)]
+            self.stats["gaps"] += 1
+            indicator_set = None
+        if indicator_set is None:
+            history = self.history(symbol, interval) if self.history else []
+            # History normally already includes this push
+            if history and int(history[-1].timestamp) >= ts:
+                self.seed(symbol, interval, history)
+                return
+            if history and ts - int(history[-1].timestamp) > step:
+                history = []  # it does not reach this push either: start clean
+            indicator_set = self.seed(symbol, interval, history)
+        if indicator_set.update(candle):
+            self.stats["updates"] += 1
+        else:
+            self.stats["rejected"] += 1
+
+    def values(self, symbol: str, interval: str) -> Optional[Dict[str, float]]:
+        indicator_set = self._sets.get((symbol, interval))
+        return indicator_set.values() if indicator_set else None
+
+    def reset(self, symbol: Optional[str] = None) -> None:
+        for key in [k for k in self._sets if symbol is None or k[0] == symbol]:
+            del self._sets[key]
+        self.stats["resets"] += 1
+
+    async def _on_reconnect(self) -> None:
+        # Missed bars would be skipped silently; reseed from history on the next push
+        self.reset()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict:
+        return {f"{symbol}|{interval}": s.to_dict() for (symbol, interval), s in self._sets.items()}
+
+    def load_dict(self, data: Dict) -> None:
+        for key, value in data.items():
+            symbol, interval = key.split("|", 1)
+            self._sets[(symbol, interval)] = IndicatorSet.from_dict(value)
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.to_dict(), f)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def load(self, path: str) -> bool:
+        try:
+            with open(path) as f:
+                self.load_dict(json.load(f))
+        except FileNotFoundError:
+            return False
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable indicator snapshot {path}: {e}")
+            return False
+        logger.info(f"✅ Restored {len(self._sets)} streaming indicator series")
+        return True
+
+    def get_stats(self) -> Dict:
+        stats = dict(self.stats)
+        stats["series"] = len(self._sets)
+        return stats
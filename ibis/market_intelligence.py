@@ -14,6 +14,7 @@ import time
 import pandas as pd
 from datetime import datetime, timedelta
 
+from ibis.core.http_transport import get_http_transport
 from ibis.advanced_intelligence import (
     MarketMovementAnalyzer,
     SymbolMovementAnalyzer,
@@ -56,7 +57,7 @@ class MarketIntelligence:
 
     async def _get_session(self):
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            self._session = get_http_transport().session()
         return self._session
 
     async def close(self):
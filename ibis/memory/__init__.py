@@ -14,6 +14,7 @@ from .memory import (
     MemoryType,
     get_memory,
 )
+from .store import MemoryStore
 
 __all__ = [
     "EpisodicMemory",
@@ -25,4 +26,5 @@ __all__ = [
     "RuleMemory",
     "MemoryType",
     "get_memory",
+    "MemoryStore",
 ]
@@ -8,13 +8,18 @@ Stores trading experiences for continuous learning:
 - Working: Current context window
 """
 
-import asyncio
-import json
+import os
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field, asdict
 from enum import Enum
-from collections import defaultdict
+
+from .store import MemoryStore, parse_timestamp
+
+
+def _store_for(storage_path: str) -> MemoryStore:
+    """Own database next to the legacy JSON path (same name, .db)"""
+    return MemoryStore(os.path.splitext(storage_path)[0] + ".db")
 
 
 class MemoryType(Enum):
@@ -98,14 +103,32 @@ class RuleMemory:
 
 
 class EpisodicMemory:
-    """Episodic memory - stores specific trade experiences."""
-
-    def __init__(self, storage_path: str = "data/ibis_memories.json"):
+    """Episodic memory - stores specific trade experiences.
+
+    Trades live in a MemoryStore (SQLite, WAL): storing a trade appends one
+    row, recent-trade queries use the symbol/mode/timestamp indexes and the
+    pattern/mode statistics come from incrementally maintained aggregates.
+    A legacy JSON file at `storage_path` is imported once on first open;
+    without an explicit store the database sits beside it.
+    """
+
+    MODES = ["SCALPER", "MOMENTUM", "VOLATILITY"]
+
+    def __init__(
+        self,
+        storage_path: str = "data/ibis_memories.json",
+        store: Optional[MemoryStore] = None,
+    ):
         self.storage_path = storage_path
-        self.trades: List[TradeMemory] = []
         self.max_trades = 10000
+        self.store = store if store is not None else _store_for(storage_path)
         self._load()
 
+    @property
+    def trades(self) -> List[TradeMemory]:
+        """Every stored trade, oldest first (full read; prefer the query methods)."""
+        return [self._to_trade(t) for t in self.store.all_trades()]
+
     async def store_trade(self, trade_data: Dict) -> TradeMemory:
         """Store a trade experience."""
         trade = TradeMemory(
@@ -134,93 +157,95 @@ class EpisodicMemory:
             confidence_at_exit=trade_data.get("confidence_exit", 0.5),
         )
 
-        self.trades.append(trade)
-
-        if len(self.trades) > self.max_trades:
-            self.trades = self.trades[-self.max_trades :]
-
-        await self._save()
+        self.store.add_trade(asdict(trade), self.max_trades)
         return trade
 
+    async def update_reflection(self, trade_id: str, reflection: str, lessons: List[str]) -> bool:
+        """Attach a post-trade reflection to a stored trade."""
+        return self.store.update_trade(trade_id, {"reflection": reflection, "lessons": lessons})
+
     async def get_recent_trades(
         self, symbol: str = None, mode: str = None, limit: int = 50
     ) -> List[TradeMemory]:
         """Get recent trades with optional filters."""
-        filtered = self.trades
-
-        if symbol:
-            filtered = [t for t in filtered if t.symbol == symbol]
-        if mode:
-            filtered = [t for t in filtered if t.mode == mode]
-
-        return sorted(filtered, key=lambda x: x.timestamp, reverse=True)[:limit]
+        rows = self.store.recent_trades(symbol=symbol, mode=mode, limit=limit)
+        return [self._to_trade(t) for t in rows]
 
     async def get_winning_patterns(self) -> Dict:
         """Analyze winning trades for patterns."""
-        wins = [t for t in self.trades if t.outcome == "WIN"]
-        patterns = defaultdict(lambda: {"count": 0, "total_pnl": 0, "avg_pnl": 0})
+        patterns = {}
+        for agg in self.store.aggregates(outcome="WIN"):
+            key = f"{agg['mode']}_{agg['regime']}"
+            entry = patterns.setdefault(key, {"count": 0, "total_pnl": 0, "avg_pnl": 0})
+            entry["count"] += agg["count"]
+            entry["total_pnl"] += agg["total_pnl"]
 
-        for trade in wins:
-            key = f"{trade.mode}_{trade.regime_during}"
-            patterns[key]["count"] += 1
-            patterns[key]["total_pnl"] += trade.pnl_abs
+        for entry in patterns.values():
+            entry["avg_pnl"] = entry["total_pnl"] / entry["count"]
 
-        for key in patterns:
-            patterns[key]["avg_pnl"] = (
-                patterns[key]["total_pnl"] / patterns[key]["count"]
-            )
-
-        return dict(patterns)
+        return patterns
 
     async def get_failure_patterns(self) -> Dict:
         """Analyze losing trades for patterns."""
-        losses = [t for t in self.trades if t.outcome == "LOSS"]
-        patterns = defaultdict(lambda: {"count": 0, "total_loss": 0})
-
-        for trade in losses:
-            key = f"{trade.mode}_{trade.regime_during}"
-            patterns[key]["count"] += 1
-            patterns[key]["total_loss"] += abs(trade.pnl_abs)
+        patterns = {}
+        for agg in self.store.aggregates(outcome="LOSS"):
+            key = f"{agg['mode']}_{agg['regime']}"
+            entry = patterns.setdefault(key, {"count": 0, "total_loss": 0})
+            entry["count"] += agg["count"]
+            entry["total_loss"] += agg["total_abs_pnl"]
 
-        return dict(patterns)
+        return patterns
 
     async def get_mode_performance(self) -> Dict:
         """Calculate performance metrics by mode."""
-        performance = {}
-
-        for mode in ["SCALPER", "MOMENTUM", "VOLATILITY"]:
-            mode_trades = [t for t in self.trades if t.mode == mode]
-
-            if mode_trades:
-                wins = len([t for t in mode_trades if t.outcome == "WIN"])
-                total_pnl = sum(t.pnl_abs for t in mode_trades)
+        totals = {}
+        for agg in self.store.aggregates():
+            if agg["mode"] not in self.MODES:
+                continue
+            entry = totals.setdefault(
+                agg["mode"], {"count": 0, "wins": 0, "total_pnl": 0, "total_duration": 0}
+            )
+            entry["count"] += agg["count"]
+            entry["total_pnl"] += agg["total_pnl"]
+            entry["total_duration"] += agg["total_duration"]
+            if agg["outcome"] == "WIN":
+                entry["wins"] += agg["count"]
 
+        performance = {}
+        for mode in self.MODES:
+            entry = totals.get(mode)
+            if entry and entry["count"]:
+                count = entry["count"]
                 performance[mode] = {
-                    "total_trades": len(mode_trades),
-                    "wins": wins,
-                    "losses": len(mode_trades) - wins,
-                    "win_rate": wins / len(mode_trades),
-                    "total_pnl": total_pnl,
-                    "avg_pnl": total_pnl / len(mode_trades),
-                    "avg_duration": sum(t.duration_seconds for t in mode_trades)
-                    / len(mode_trades),
+                    "total_trades": count,
+                    "wins": entry["wins"],
+                    "losses": count - entry["wins"],
+                    "win_rate": entry["wins"] / count,
+                    "total_pnl": entry["total_pnl"],
+                    "avg_pnl": entry["total_pnl"] / count,
+                    "avg_duration": entry["total_duration"] / count,
                 }
 
         return performance
 
     async def get_statistics(self) -> Dict:
         """Get overall memory statistics."""
-        total = len(self.trades)
-        wins = len([t for t in self.trades if t.outcome == "WIN"])
+        total = wins = 0
+        total_pnl = total_confidence = 0.0
+        for agg in self.store.aggregates():
+            total += agg["count"]
+            total_pnl += agg["total_pnl"]
+            total_confidence += agg["total_confidence"]
+            if agg["outcome"] == "WIN":
+                wins += agg["count"]
 
         return {
             "total_trades_stored": total,
             "wins": wins,
             "losses": total - wins,
             "win_rate": wins / max(1, total),
-            "total_pnl": sum(t.pnl_abs for t in self.trades),
-            "avg_confidence": sum(t.confidence_at_entry for t in self.trades)
-            / max(1, total),
+            "total_pnl": total_pnl,
+            "avg_confidence": total_confidence / max(1, total),
             "memory_filled_pct": min(100, (total / self.max_trades) * 100),
         }
 
@@ -235,40 +260,45 @@ class EpisodicMemory:
         else:
             return "BREAK_EVEN"
 
+    @staticmethod
+    def _to_trade(data: Dict) -> TradeMemory:
+        data["timestamp"] = parse_timestamp(data.get("timestamp"))
+        return TradeMemory(**data)
+
     def _load(self):
-        """Load memories from disk."""
-        try:
-            with open(self.storage_path, "r") as f:
-                data = json.load(f)
-                self.trades = [TradeMemory(**t) for t in data.get("trades", [])]
-        except:
-            self.trades = []
+        """Import the legacy JSON memories file, once."""
+        self.store.migrate_json(self.storage_path, max_trades=self.max_trades)
 
     async def _save(self):
-        """Save memories to disk."""
-        data = {
-            "last_saved": datetime.now().isoformat(),
-            "trades": [asdict(t) for t in self.trades],
-        }
-
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(
-            None,
-            lambda: open(self.storage_path, "w").write(
-                json.dumps(data, indent=2, default=str)
-            ),
-        )
+        """Checkpoint the store (every trade is already committed)."""
+        self.store.checkpoint()
 
 
 class SemanticMemory:
-    """Semantic memory - stores learned patterns and rules."""
-
-    def __init__(self, storage_path: str = "data/ibis_semantic.json"):
+    """Semantic memory - stores learned patterns and rules.
+
+    Patterns and rules are rows in the shared MemoryStore, indexed by the
+    mode / regime they are conditioned on. Without an explicit store the
+    database sits beside `storage_path`.
+    """
+
+    def __init__(
+        self,
+        storage_path: str = "data/ibis_semantic.json",
+        store: Optional[MemoryStore] = None,
+    ):
         self.storage_path = storage_path
-        self.patterns: List[PatternMemory] = []
-        self.rules: List[RuleMemory] = []
+        self.store = store if store is not None else _store_for(storage_path)
         self._load()
 
+    @property
+    def patterns(self) -> List[PatternMemory]:
+        return [self._to_pattern(p) for p in self.store.semantic("pattern")]
+
+    @property
+    def rules(self) -> List[RuleMemory]:
+        return [self._to_rule(r) for r in self.store.semantic("rule")]
+
     async def store_pattern(self, pattern_data: Dict) -> PatternMemory:
         """Store a discovered pattern."""
         pattern = PatternMemory(
@@ -288,8 +318,7 @@ class SemanticMemory:
             confidence=pattern_data.get("confidence", 0.5),
         )
 
-        self.patterns.append(pattern)
-        await self._save()
+        self.store.add_semantic("pattern", asdict(pattern))
         return pattern
 
     async def store_rule(self, rule_data: Dict) -> RuleMemory:
@@ -309,80 +338,45 @@ class SemanticMemory:
             validated=rule_data.get("validated", False),
         )
 
-        self.rules.append(rule)
-        await self._save()
+        self.store.add_semantic("rule", asdict(rule))
         return rule
 
     async def get_patterns_for_context(self, context: Dict) -> List[PatternMemory]:
         """Get relevant patterns for current context."""
-        relevant = []
-
-        for pattern in self.patterns:
-            if self._matches_context(pattern, context):
-                relevant.append(pattern)
-
-        return sorted(relevant, key=lambda x: x.confidence, reverse=True)
+        rows = self.store.semantic(
+            "pattern", context.get("mode"), context.get("regime"), match=True
+        )
+        return [self._to_pattern(p) for p in rows]
 
     async def get_rules_for_context(self, context: Dict) -> List[RuleMemory]:
         """Get relevant rules for current context."""
-        relevant = []
+        rows = self.store.semantic("rule", context.get("mode"), match=True)
+        return [self._to_rule(r) for r in rows]
 
-        for rule in self.rules:
-            if self._matches_context_rule(rule, context):
-                relevant.append(rule)
+    def pattern_count(self) -> int:
+        return self.store.semantic_count("pattern")
 
-        return sorted(relevant, key=lambda x: x.confidence, reverse=True)
+    def rule_count(self) -> int:
+        return self.store.semantic_count("rule")
 
-    def _matches_context(self, pattern: PatternMemory, context: Dict) -> bool:
-        """Check if pattern matches current context."""
-        conditions = pattern.conditions
+    @staticmethod
+    def _to_pattern(data: Dict) -> PatternMemory:
+        data["timestamp"] = parse_timestamp(data.get("timestamp"))
+        data["last_validated"] = parse_timestamp(data.get("last_validated"))
+        return PatternMemory(**data)
 
-        if "mode" in conditions:
-            if conditions["mode"] != context.get("mode"):
-                return False
-
-        if "regime" in conditions:
-            if conditions["regime"] != context.get("regime"):
-                return False
-
-        return True
-
-    def _matches_context_rule(self, rule: RuleMemory, context: Dict) -> bool:
-        """Check if rule matches current context."""
-        rule_context = rule.context
-
-        if "mode" in rule_context:
-            if rule_context["mode"] != context.get("mode"):
-                return False
-
-        return True
+    @staticmethod
+    def _to_rule(data: Dict) -> RuleMemory:
+        data["timestamp"] = parse_timestamp(data.get("timestamp"))
+        return RuleMemory(**data)
 
     def _load(self):
-        """Load from disk."""
-        try:
-            with open(self.storage_path, "r") as f:
-                data = json.load(f)
-                self.patterns = [PatternMemory(**p) for p in data.get("patterns", [])]
-                self.rules = [RuleMemory(**r) for r in data.get("rules", [])]
-        except:
-            self.patterns = []
-            self.rules = []
+        """Import the legacy JSON semantic file, once."""
+        self.store.migrate_json(self.storage_path)
 
     async def _save(self):
-        """Save to disk."""
-        data = {
-            "last_saved": datetime.now().isoformat(),
-            "patterns": [asdict(p) for p in self.patterns],
-            "rules": [asdict(r) for r in self.rules],
-        }
-
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(
-            None,
-            lambda: open(self.storage_path, "w").write(
-                json.dumps(data, indent=2, default=str)
-            ),
-        )
+        """Checkpoint the store (every pattern and rule is already committed)."""
+        self.store.checkpoint()
 
 
 class WorkingMemory:
@@ -446,9 +440,10 @@ class WorkingMemory:
 class IBISMemory:
     """Unified memory system coordinating episodic, semantic, and working memory."""
 
-    def __init__(self):
-        self.episodic = EpisodicMemory()
-        self.semantic = SemanticMemory()
+    def __init__(self, store: Optional[MemoryStore] = None):
+        self.store = store if store is not None else MemoryStore()
+        self.episodic = EpisodicMemory(store=self.store)
+        self.semantic = SemanticMemory(store=self.store)
         self.working = WorkingMemory()
 
     async def remember_trade(self, trade_data: Dict):
@@ -459,19 +454,16 @@ class IBISMemory:
 
     async def store_reflection(self, trade_id: str, reflection: Dict):
         """Store trade reflection."""
-        for trade in self.episodic.trades:
-            if trade.id == trade_id:
-                trade.reflection = reflection.get("analysis", "")
-                trade.lessons = reflection.get("lessons", [])
-                await self.episodic._save()
-                break
+        await self.episodic.update_reflection(
+            trade_id, reflection.get("analysis", ""), reflection.get("lessons", [])
+        )
 
     async def get_statistics(self) -> Dict:
         """Get overall memory statistics."""
         return {
             "episodic": await self.episodic.get_statistics(),
-            "patterns_count": len(self.semantic.patterns),
-            "rules_count": len(self.semantic.rules),
+            "patterns_count": self.semantic.pattern_count(),
+            "rules_count": self.semantic.rule_count(),
             "working_items": len(self.working.items),
         }
 
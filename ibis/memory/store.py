@@ -0,0 +1,366 @@
+"""
+IBIS Memory Store
+SQLite (WAL) storage for episodic trade memories and semantic patterns/rules
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ibis.core.codec import dumps, loads
+from ibis.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_DB_PATH = "data/ibis_memory.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trade_memories (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    symbol TEXT,
+    mode TEXT,
+    outcome TEXT,
+    regime TEXT,
+    pnl_abs REAL NOT NULL DEFAULT 0,
+    duration_seconds REAL NOT NULL DEFAULT 0,
+    confidence REAL NOT NULL DEFAULT 0,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_trade_memories_id ON trade_memories(id);
+CREATE INDEX IF NOT EXISTS idx_trade_memories_timestamp ON trade_memories(timestamp);
+CREATE INDEX IF NOT EXISTS idx_trade_memories_symbol ON trade_memories(symbol, timestamp);
+CREATE INDEX IF NOT EXISTS idx_trade_memories_mode ON trade_memories(mode, timestamp);
+CREATE INDEX IF NOT EXISTS idx_trade_memories_outcome ON trade_memories(outcome);
+
+-- Running sums per (mode, regime, outcome), kept in step with trade_memories
+CREATE TABLE IF NOT EXISTS trade_aggregates (
+    mode TEXT NOT NULL,
+    regime TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    total_pnl REAL NOT NULL DEFAULT 0,
+    total_abs_pnl REAL NOT NULL DEFAULT 0,
+    total_duration REAL NOT NULL DEFAULT 0,
+    total_confidence REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (mode, regime, outcome)
+);
+
+CREATE TABLE IF NOT EXISTS semantic_memories (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL CHECK(kind IN ('pattern', 'rule')),
+    id TEXT NOT NULL,
+    mode TEXT,
+    regime TEXT,
+    confidence REAL NOT NULL DEFAULT 0.5,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_semantic_memories_context ON semantic_memories(kind, mode, regime);
+
+CREATE TABLE IF NOT EXISTS memory_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_AGGREGATE_UPSERT = """
+INSERT INTO trade_aggregates
+    (mode, regime, outcome, count, total_pnl, total_abs_pnl, total_duration, total_confidence)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(mode, regime, outcome) DO UPDATE SET
+    count = count + excluded.count,
+    total_pnl = total_pnl + excluded.total_pnl,
+    total_abs_pnl = total_abs_pnl + excluded.total_abs_pnl,
+    total_duration = total_duration + excluded.total_duration,
+    total_confidence = total_confidence + excluded.total_confidence
+"""
+
+
+def timestamp_key(value: Any) -> str:
+    """
+    Sortable ISO text for a memory timestamp.
+
+    Old JSON files hold str(datetime) ("2025-01-01 12:00:00"), new trades
+    carry datetime objects; both normalize to isoformat() so the timestamp
+    index orders them correctly.
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if value is None:
+        return datetime.now().isoformat()
+    try:
+        return datetime.fromisoformat(str(value)).isoformat()
+    except ValueError:
+        return str(value)
+
+
+def parse_timestamp(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    return value
+
+
+class MemoryStore:
+    """
+    One SQLite database in WAL mode behind EpisodicMemory and SemanticMemory.
+
+    A stored trade is one INSERT plus one aggregate upsert, replacing the
+    full JSON rewrite per trade. Recent-trade filters read the symbol / mode
+    / timestamp indexes, and pattern and mode statistics read the
+    trade_aggregates table instead of rescanning every trade. Evicting the
+    oldest trade past `max_trades` subtracts it from the aggregates.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if db_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._trade_count = self._conn.execute("SELECT COUNT(*) FROM trade_memories").fetchone()[0]
+        self.stats = {"trades_written": 0, "trades_evicted": 0, "semantic_written": 0, "migrated": 0}
+
+    # ------------------------------------------------------------------
+    # Trades
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _trade_row(trade: Dict) -> Tuple:
+        return (
+            str(trade.get("id", "")),
+            timestamp_key(trade.get("timestamp")),
+            trade.get("symbol"),
+            trade.get("mode"),
+            trade.get("outcome"),
+            trade.get("regime_during"),
+            float(trade.get("pnl_abs") or 0),
+            float(trade.get("duration_seconds") or 0),
+            float(trade.get("confidence_at_entry") or 0),
+            dumps(trade).decode(),
+        )
+
+    @staticmethod
+    def _aggregate_delta(row, sign: int) -> Tuple:
+        # Keys use str() so None groups as "None", as the old f-string keys did
+        return (
+            str(row["mode"]),
+            str(row["regime"]),
+            str(row["outcome"]),
+            sign,
+            sign * row["pnl_abs"],
+            sign * abs(row["pnl_abs"]),
+            sign * row["duration_seconds"],
+            sign * row["confidence"],
+        )
+
+    def _insert_trades(self, trades: Iterable[Dict]) -> int:
+        columns = (
+            "id", "timestamp", "symbol", "mode", "outcome", "regime",
+            "pnl_abs", "duration_seconds", "confidence",
+        )
+        added = 0
+        for trade in trades:
+            row = self._trade_row(trade)
+            self._conn.execute(
+                "INSERT INTO trade_memories"
+                " (id, timestamp, symbol, mode, outcome, regime, pnl_abs,"
+                " duration_seconds, confidence, payload)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+            self._conn.execute(_AGGREGATE_UPSERT, self._aggregate_delta(dict(zip(columns, row)), 1))
+            added += 1
+        self._trade_count += added
+        return added
+
+    def _evict(self, max_trades: int) -> int:
+        excess = self._trade_count - max_trades
+        if excess <= 0:
+            return 0
+        oldest = self._conn.execute(
+            "SELECT seq, mode, regime, outcome, pnl_abs, duration_seconds, confidence"
+            " FROM trade_memories ORDER BY seq LIMIT ?",
+            (excess,),
+        ).fetchall()
+        self._conn.executemany(_AGGREGATE_UPSERT, [self._aggregate_delta(r, -1) for r in oldest])
+        self._conn.execute("DELETE FROM trade_memories WHERE seq <= ?", (oldest[-1]["seq"],))
+        self._conn.execute("DELETE FROM trade_aggregates WHERE count <= 0")
+        self._trade_count -= excess
+        return excess
+
+    def add_trade(self, trade: Dict, max_trades: int) -> None:
+        with self._lock, self._conn:
+            self._insert_trades([trade])
+            self.stats["trades_evicted"] += self._evict(max_trades)
+        self.stats["trades_written"] += 1
+
+    def update_trade(self, trade_id: str, changes: Dict) -> bool:
+        """Merge `changes` into the newest trade with this id (reflections, lessons)."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT seq, payload FROM trade_memories WHERE id = ? ORDER BY seq DESC LIMIT 1",
+                (trade_id,),
+            ).fetchone()
+            if row is None:
+                return False
+            payload = loads(row["payload"])
+            payload.update(changes)
+            self._conn.execute(
+                "UPDATE trade_memories SET payload = ? WHERE seq = ?",
+                (dumps(payload).decode(), row["seq"]),
+            )
+        return True
+
+    def recent_trades(
+        self, symbol: Optional[str] = None, mode: Optional[str] = None, limit: int = 50
+    ) -> List[Dict]:
+        where, params = [], []
+        if symbol:
+            where.append("symbol = ?")
+            params.append(symbol)
+        if mode:
+            where.append("mode = ?")
+            params.append(mode)
+        sql = "SELECT payload FROM trade_memories"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY timestamp DESC, seq DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [loads(r["payload"]) for r in rows]
+
+    def all_trades(self) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute("SELECT payload FROM trade_memories ORDER BY seq").fetchall()
+        return [loads(r["payload"]) for r in rows]
+
+    def trade_count(self) -> int:
+        return self._trade_count
+
+    def aggregates(self, outcome: Optional[str] = None) -> List[Dict]:
+        sql = "SELECT * FROM trade_aggregates"
+        params: Tuple = ()
+        if outcome is not None:
+            sql += " WHERE outcome = ?"
+            params = (outcome,)
+        with self._lock:
+            return [dict(r) for r in self._conn.execute(sql + " ORDER BY rowid", params)]
+
+    # ------------------------------------------------------------------
+    # Patterns and rules
+    # ------------------------------------------------------------------
+
+    def _insert_semantic(self, kind: str, memory: Dict) -> None:
+        # Patterns match on conditions.mode / .regime, rules on context.mode
+        context = memory.get("conditions") if kind == "pattern" else memory.get("context")
+        mode = context.get("mode") if isinstance(context, dict) else None
+        regime = context.get("regime") if isinstance(context, dict) and kind == "pattern" else None
+        self._conn.execute(
+            "INSERT INTO semantic_memories (kind, id, mode, regime, confidence, payload)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                kind,
+                str(memory.get("id", "")),
+                None if mode is None else str(mode),
+                None if regime is None else str(regime),
+                float(memory.get("confidence") or 0),
+                dumps(memory).decode(),
+            ),
+        )
+
+    def add_semantic(self, kind: str, memory: Dict) -> None:
+        with self._lock, self._conn:
+            self._insert_semantic(kind, memory)
+        self.stats["semantic_written"] += 1
+
+    def semantic(self, kind: str, mode: Any = None, regime: Any = None, match: bool = False) -> List[Dict]:
+        """
+        Patterns or rules, highest confidence first. With match=True only
+        entries whose stored mode / regime condition is absent or equal to the
+        given context are returned.
+        """
+        sql = "SELECT payload FROM semantic_memories WHERE kind = ?"
+        params: List = [kind]
+        if match:
+            sql += " AND (mode IS NULL OR mode = ?) AND (regime IS NULL OR regime = ?)"
+            params += [None if mode is None else str(mode), None if regime is None else str(regime)]
+        sql += " ORDER BY confidence DESC, seq"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [loads(r["payload"]) for r in rows]
+
+    def semantic_count(self, kind: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM semantic_memories WHERE kind = ?", (kind,)
+            ).fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Migration and maintenance
+    # ------------------------------------------------------------------
+
+    def migrate_json(self, json_path: str, max_trades: Optional[int] = None) -> int:
+        """
+        One-time import of a legacy ibis_memories.json / ibis_semantic.json.
+
+        The file is left in place; a marker in memory_meta keeps it from
+        being imported twice. Returns the number of records imported.
+        """
+        key = f"migrated:{os.path.abspath(json_path)}"
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM memory_meta WHERE key = ?", (key,)).fetchone():
+                return 0
+        if not os.path.exists(json_path):
+            return 0
+        try:
+            with open(json_path, "rb") as f:
+                data = loads(f.read())
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Memory migration skipped for {json_path}: {e}")
+            return 0
+
+        with self._lock, self._conn:
+            imported = self._insert_trades(data.get("trades", []))
+            if max_trades is not None:
+                self._evict(max_trades)
+            for kind, records in (("pattern", data.get("patterns", [])), ("rule", data.get("rules", []))):
+                for record in records:
+                    self._insert_semantic(kind, record)
+                    imported += 1
+            self._conn.execute(
+                "INSERT INTO memory_meta (key, value) VALUES (?, ?)",
+                (key, datetime.now().isoformat()),
+            )
+        self.stats["migrated"] += imported
+        logger.info(f"🧠 Migrated {imported} memories from {json_path} into {self.db_path}")
+        return imported
+
+    def checkpoint(self) -> None:
+        """Fold the WAL back into the main database file (on shutdown)."""
+        with self._lock:
+            self._conn.commit()
+            if self.db_path != ":memory:":
+                self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
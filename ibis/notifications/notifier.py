@@ -12,6 +12,7 @@ from enum import Enum
 from abc import ABC, abstractmethod
 import aiohttp
 
+from ibis.core.http_transport import get_http_transport
 from ibis.core.logging_config import get_logger
 logger = get_logger(__name__)
 
@@ -196,7 +197,7 @@ class TelegramNotifier(BaseNotifier):
 
     async def _get_session(self) -> aiohttp.ClientSession:
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            self.session = get_http_transport().session()
         return self.session
 
     async def _send_message(self, message: str, **kwargs) -> bool:
@@ -253,7 +254,7 @@ class DiscordNotifier(BaseNotifier):
 
     async def _get_session(self) -> aiohttp.ClientSession:
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            self.session = get_http_transport().session()
         return self.session
 
     async def _send_message(self, message: str, **kwargs) -> bool:
@@ -18,6 +18,16 @@ from datetime import datetime
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from ..backtest import BacktestEngine, BacktestConfig, BacktestResult
+from .sweep import (
+    SharedCandles,
+    SweepOptimizer,
+    SweepReport,
+    SweepResult,
+    apply_parameters,
+    grid_points,
+    random_points,
+    walk_forward_windows,
+)
 
 logger = get_logger(__name__)
 
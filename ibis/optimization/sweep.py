@@ -0,0 +1,590 @@
+"""
+IBIS Parameter Sweeps
+Grid, random and Bayesian-style sweeps plus walk-forward validation over
+BacktestConfig fields and TRADING thresholds, evaluated on a process pool
+"""
+
+import asyncio
+import itertools
+import json
+import math
+import os
+import random
+import shutil
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field, fields, replace
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+import numpy as np
+
+from ibis.backtest.backtester import BacktestConfig, BacktestEngine, Strategy
+from ibis.core.logging_config import get_logger
+from ibis.core.trading_constants import TRADING, IBISTradingConstants
+
+logger = get_logger(__name__)
+
+# A dimension is either a list of discrete values or a (low, high) float range
+Dimension = Union[Sequence[Any], Tuple[float, float]]
+ParameterSpace = Dict[str, Dimension]
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_CONFIG_FIELDS = {f.name for f in fields(BacktestConfig)}
+METRICS = (
+    "total_return_pct",
+    "sharpe_ratio",
+    "profit_factor",
+    "win_rate",
+    "max_drawdown",
+    "expectancy",
+    "total_trades",
+)
+
+
+# ----------------------------------------------------------------------
+# Shared candle data
+# ----------------------------------------------------------------------
+
+
+class SharedCandles:
+    """
+    Candle dicts frozen into one memory-mapped .npy file per symbol.
+
+    The parent writes the arrays once; pool workers map the same files, so
+    candle data is never pickled per task. Datetime timestamps are stored as
+    integer microseconds and restored on the way back out.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, directory: str, symbols: List[str], datetime_timestamps: bool):
+        self.directory = directory
+        self.symbols = symbols
+        self.datetime_timestamps = datetime_timestamps
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def create(cls, candles: Dict[str, List[Dict]], directory: str = None) -> "SharedCandles":
+        directory = directory or tempfile.mkdtemp(prefix="ibis_sweep_")
+        os.makedirs(directory, exist_ok=True)
+        sample = next((c["timestamp"] for series in candles.values() for c in series), 0)
+        as_datetime = isinstance(sample, datetime)
+        dtype = np.dtype(
+            [("timestamp", "i8" if as_datetime else "f8")]
+            + [(name, "f8") for name in ("open", "high", "low", "close", "volume")]
+        )
+
+        symbols = list(candles)
+        for index, symbol in enumerate(symbols):
+            series = sorted(candles[symbol], key=lambda c: c["timestamp"])
+            array = np.empty(len(series), dtype=dtype)
+            stamps = [c["timestamp"] for c in series]
+            array["timestamp"] = (
+                [(ts - _EPOCH) // _MICROSECOND for ts in stamps] if as_datetime else stamps
+            )
+            for name in ("open", "high", "low", "close", "volume"):
+                array[name] = [c[name] for c in series]
+            np.save(os.path.join(directory, f"{index}.npy"), array)
+
+        manifest = {"symbols": symbols, "datetime_timestamps": as_datetime}
+        with open(os.path.join(directory, cls.MANIFEST), "w") as f:
+            json.dump(manifest, f)
+        return cls(directory, symbols, as_datetime)
+
+    @classmethod
+    def open(cls, directory: str) -> "SharedCandles":
+        with open(os.path.join(directory, cls.MANIFEST)) as f:
+            manifest = json.load(f)
+        return cls(directory, manifest["symbols"], manifest["datetime_timestamps"])
+
+    def array(self, symbol: str) -> np.ndarray:
+        array = self._arrays.get(symbol)
+        if array is None:
+            path = os.path.join(self.directory, f"{self.symbols.index(symbol)}.npy")
+            array = np.load(path, mmap_mode="r")
+            self._arrays[symbol] = array
+        return array
+
+    def timeline(self) -> np.ndarray:
+        """Every distinct stored timestamp across all symbols, sorted."""
+        return np.unique(np.concatenate([self.array(s)["timestamp"] for s in self.symbols]))
+
+    def candles(self, start=None, end=None) -> Dict[str, List[Dict]]:
+        """Rebuild backtest candle dicts for stored timestamps in [start, end)."""
+        out = {}
+        for symbol in self.symbols:
+            array = self.array(symbol)
+            stamps = array["timestamp"]
+            lo = 0 if start is None else int(np.searchsorted(stamps, start, "left"))
+            hi = len(array) if end is None else int(np.searchsorted(stamps, end, "left"))
+            rows = array[lo:hi].tolist()
+            out[symbol] = [
+                {
+                    "symbol": symbol,
+                    "timestamp": self.decode(row[0]),
+                    "open": row[1],
+                    "high": row[2],
+                    "low": row[3],
+                    "close": row[4],
+                    "volume": row[5],
+                }
+                for row in rows
+            ]
+        return out
+
+    def decode(self, value):
+        """Stored timestamp back to the caller's type (None passes through)."""
+        if value is None:
+            return None
+        return _EPOCH + timedelta(microseconds=value) if self.datetime_timestamps else value
+
+    def cleanup(self):
+        self._arrays.clear()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+# ----------------------------------------------------------------------
+# Worker side
+# ----------------------------------------------------------------------
+
+_WORKER_DATA: Optional[SharedCandles] = None
+_WINDOW_CACHE: Dict[Tuple, Dict[str, List[Dict]]] = {}
+
+
+def _init_worker(directory: str):
+    global _WORKER_DATA
+    _WORKER_DATA = SharedCandles.open(directory)
+    _WINDOW_CACHE.clear()
+
+
+def apply_parameters(
+    params: Dict[str, Any],
+    base_config: BacktestConfig = None,
+    constants: IBISTradingConstants = None,
+) -> Tuple[BacktestConfig, IBISTradingConstants]:
+    """
+    Split a parameter set into a BacktestConfig and a TRADING copy.
+
+    Bare names ("stop_loss_pct") are BacktestConfig fields; dotted names
+    ("TECHNICAL.RSI_OVERSOLD") replace a field of a TRADING section. Sections
+    are rebuilt with dataclasses.replace so their validation still runs.
+    """
+    config_updates = {}
+    section_updates: Dict[str, Dict[str, Any]] = {}
+    for name, value in params.items():
+        if "." in name:
+            section, key = name.split(".", 1)
+            section_updates.setdefault(section, {})[key] = value
+        elif name in _CONFIG_FIELDS:
+            config_updates[name] = value
+        else:
+            raise ValueError(f"Unknown sweep parameter: {name}")
+
+    config = replace(base_config or BacktestConfig(), **config_updates)
+    constants = constants or TRADING
+    if section_updates:
+        constants = replace(
+            constants,
+            **{
+                section: replace(getattr(constants, section), **updates)
+                for section, updates in section_updates.items()
+            },
+        )
+    return config, constants
+
+
+def _evaluate(
+    strategy_cls: Type[Strategy],
+    base_config: BacktestConfig,
+    params: Dict[str, Any],
+    window: Tuple[Any, Any] = (None, None),
+) -> Dict[str, Any]:
+    """Run one backtest in a worker and return its metrics (never the trade list)."""
+    try:
+        config, constants = apply_parameters(params, base_config)
+    except (AttributeError, TypeError, ValueError) as e:
+        return {"error": str(e)}
+
+    candles = _WINDOW_CACHE.get(window)
+    if candles is None:
+        if len(_WINDOW_CACHE) >= 8:
+            _WINDOW_CACHE.clear()
+        candles = _WINDOW_CACHE[window] = _WORKER_DATA.candles(*window)
+
+    result = asyncio.run(BacktestEngine(config).run(strategy_cls(config, constants), candles))
+    metrics = {name: getattr(result, name) for name in METRICS}
+    metrics["bars_per_second"] = result.bars_per_second
+    return metrics
+
+
+# ----------------------------------------------------------------------
+# Results
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class SweepResult:
+    params: Dict[str, Any]
+    score: float
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    error: str = ""
+    fold: Optional[int] = None
+
+
+@dataclass
+class SweepReport:
+    objective: str
+    results: List[SweepResult] = field(default_factory=list)
+    folds: List[Dict[str, Any]] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    def ranked(self) -> List[SweepResult]:
+        return sorted(self.results, key=lambda r: r.score, reverse=True)
+
+    @property
+    def best(self) -> Optional[SweepResult]:
+        ranked = self.ranked()
+        return ranked[0] if ranked and math.isfinite(ranked[0].score) else None
+
+    def table(self, top: int = 20) -> str:
+        """Ranked results as a fixed-width text table."""
+        names = sorted({name for r in self.results for name in r.params})
+        header = ["#", self.objective] + names + ["trades", "return%", "maxDD%"]
+        rows = []
+        for rank, r in enumerate(self.ranked()[:top], 1):
+            rows.append(
+                [str(rank), f"{r.score:.4f}"]
+                + [_fmt(r.params.get(name)) for name in names]
+                + [
+                    str(r.metrics.get("total_trades", "-")),
+                    _fmt(r.metrics.get("total_return_pct")),
+                    _fmt(r.metrics.get("max_drawdown")),
+                ]
+            )
+        widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+        lines = ["  ".join(cell.rjust(w) for cell, w in zip(row, widths)) for row in [header] + rows]
+        lines.insert(1, "-" * len(lines[0]))
+        return "\n".join(lines)
+
+
+def _fmt(value) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.4g}"
+    return str(value)
+
+
+# ----------------------------------------------------------------------
+# Sampling
+# ----------------------------------------------------------------------
+
+
+def _is_range(dimension: Dimension) -> bool:
+    return (
+        isinstance(dimension, tuple)
+        and len(dimension) == 2
+        and all(isinstance(v, float) for v in dimension)
+    )
+
+
+def grid_points(space: ParameterSpace, steps: int = 5) -> List[Dict[str, Any]]:
+    """Cartesian product of the space; float ranges are split into `steps` points."""
+    axes = []
+    for name, dimension in space.items():
+        if _is_range(dimension):
+            values = np.linspace(dimension[0], dimension[1], steps).tolist()
+        else:
+            values = list(dimension)
+        axes.append([(name, v) for v in values])
+    return [dict(combo) for combo in itertools.product(*axes)]
+
+
+def random_points(space: ParameterSpace, count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    return [
+        {
+            name: rng.uniform(*dimension) if _is_range(dimension) else rng.choice(list(dimension))
+            for name, dimension in space.items()
+        }
+        for _ in range(count)
+    ]
+
+
+def _encode(space: ParameterSpace, params: Dict[str, Any]) -> List[float]:
+    """Map a parameter set into the unit cube for the surrogate's distances."""
+    point = []
+    for name, dimension in space.items():
+        value = params[name]
+        if _is_range(dimension):
+            low, high = dimension
+            point.append((value - low) / (high - low) if high != low else 0.0)
+        else:
+            values = list(dimension)
+            point.append(values.index(value) / max(len(values) - 1, 1))
+    return point
+
+
+def _surrogate_pick(
+    space: ParameterSpace,
+    observed: List[SweepResult],
+    count: int,
+    rng: random.Random,
+    candidates: int = 256,
+    bandwidth: float = 0.15,
+    exploration: float = 1.0,
+) -> List[Dict[str, Any]]:
+    """
+    Choose the next batch with a kernel-regression surrogate.
+
+    Each candidate is scored by the kernel-weighted mean of the observed
+    objective (exploitation) plus a bonus that grows where few observations
+    sit nearby (exploration), an upper-confidence-bound rule that needs no
+    external optimisation library.
+    """
+    finite = [r for r in observed if math.isfinite(r.score)]
+    pool = random_points(space, candidates, rng)
+    if len(finite) < 2:
+        return pool[:count]
+
+    x = np.array([_encode(space, r.params) for r in finite])
+    y = np.array([r.score for r in finite])
+    spread = float(y.std()) or 1.0
+    c = np.array([_encode(space, p) for p in pool])
+    distances = ((c[:, None, :] - x[None, :, :]) ** 2).sum(axis=2)
+    weights = np.exp(-distances / (2 * bandwidth**2))
+    mass = weights.sum(axis=1)
+    mean = np.where(mass > 1e-12, (weights @ y) / np.maximum(mass, 1e-12), y.mean())
+    acquisition = mean + exploration * spread / np.sqrt(1.0 + mass)
+
+    seen = {tuple(sorted(r.params.items())) for r in observed}
+    picked = []
+    for i in np.argsort(-acquisition):
+        key = tuple(sorted(pool[i].items()))
+        if key not in seen:
+            seen.add(key)
+            picked.append(pool[i])
+            if len(picked) == count:
+                break
+    return picked
+
+
+def walk_forward_windows(
+    timeline: Sequence, train_bars: int, test_bars: int, step: int = None
+) -> List[Tuple[Tuple[Any, Any], Tuple[Any, Any]]]:
+    """
+    Rolling (train, test) windows over a sorted timeline.
+
+    Windows are [start, end) timestamp ranges; each test window starts where
+    its train window ends and the next fold moves forward by `step` bars
+    (default: one test window).
+    """
+    step = step or test_bars
+    windows = []
+    n = len(timeline)
+    start = 0
+    while start + train_bars + test_bars <= n:
+        split = start + train_bars
+        stop = split + test_bars
+        end = timeline[stop] if stop < n else None
+        windows.append(((timeline[start], timeline[split]), (timeline[split], end)))
+        start += step
+    return windows
+
+
+# ----------------------------------------------------------------------
+# Optimizer
+# ----------------------------------------------------------------------
+
+
+class SweepOptimizer:
+    """
+    Parallel backtest sweeps over BacktestConfig fields and TRADING thresholds.
+
+    Candles are written once to memory-mapped arrays shared by a
+    ProcessPoolExecutor; each task ships only a parameter dict and a window,
+    so throughput scales with the number of cores.
+    """
+
+    def __init__(
+        self,
+        strategy_cls: Type[Strategy],
+        candles: Dict[str, List[Dict]],
+        base_config: BacktestConfig = None,
+        objective: str = "sharpe_ratio",
+        max_workers: int = None,
+        min_trades: int = 1,
+        data_dir: str = None,
+    ):
+        self.strategy_cls = strategy_cls
+        self.base_config = base_config or BacktestConfig()
+        self.objective = objective
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_trades = min_trades
+        self.data = SharedCandles.create(candles, data_dir)
+        self._pool: Optional[Executor] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        self.data.cleanup()
+
+    def _executor(self) -> Executor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.data.directory,),
+            )
+        return self._pool
+
+    def _score(self, metrics: Dict[str, Any]) -> float:
+        if "error" in metrics or metrics.get("total_trades", 0) < self.min_trades:
+            return float("-inf")
+        value = float(metrics.get(self.objective, float("-inf")))
+        return value if not math.isnan(value) else float("-inf")
+
+    async def evaluate(
+        self, points: List[Dict[str, Any]], window: Tuple[Any, Any] = (None, None)
+    ) -> List[SweepResult]:
+        """Backtest every parameter set in parallel over one timestamp window."""
+        loop = asyncio.get_running_loop()
+        pool = self._executor()
+        futures = [
+            loop.run_in_executor(
+                pool, _evaluate, self.strategy_cls, self.base_config, params, window
+            )
+            for params in points
+        ]
+        results = []
+        for params, metrics in zip(points, await asyncio.gather(*futures)):
+            results.append(
+                SweepResult(
+                    params=params,
+                    score=self._score(metrics),
+                    metrics=metrics,
+                    error=metrics.get("error", ""),
+                )
+            )
+        return results
+
+    async def grid(self, space: ParameterSpace, steps: int = 5, window=(None, None)) -> SweepReport:
+        return await self._report(self.evaluate(grid_points(space, steps), window))
+
+    async def random(
+        self, space: ParameterSpace, samples: int = 50, seed: int = None, window=(None, None)
+    ) -> SweepReport:
+        points = random_points(space, samples, random.Random(seed))
+        return await self._report(self.evaluate(points, window))
+
+    async def bayesian(
+        self,
+        space: ParameterSpace,
+        iterations: int = 50,
+        initial: int = None,
+        seed: int = None,
+        window=(None, None),
+    ) -> SweepReport:
+        """
+        Sequential model-based sweep: a random start, then batches (one task
+        per worker) chosen by the surrogate in _surrogate_pick.
+        """
+
+        async def run():
+            rng = random.Random(seed)
+            batch = self.max_workers
+            results = await self.evaluate(
+                random_points(space, min(initial or 2 * batch, iterations), rng), window
+            )
+            while len(results) < iterations:
+                points = _surrogate_pick(space, results, min(batch, iterations - len(results)), rng)
+                if not points:
+                    break
+                results += await self.evaluate(points, window)
+            return results
+
+        return await self._report(run())
+
+    async def walk_forward(
+        self,
+        space: ParameterSpace,
+        train_bars: int,
+        test_bars: int,
+        step: int = None,
+        method: str = "grid",
+        **kwargs,
+    ) -> SweepReport:
+        """
+        Optimise on each train window and score the winner on the following
+        test window. report.results holds the out-of-sample runs (one per
+        fold); report.folds summarises in-sample vs out-of-sample per fold.
+        """
+        search = {"grid": self.grid, "random": self.random, "bayesian": self.bayesian}[method]
+        windows = walk_forward_windows(self.data.timeline().tolist(), train_bars, test_bars, step)
+        report = SweepReport(objective=self.objective)
+        started = asyncio.get_running_loop().time()
+
+        for fold, (train, test) in enumerate(windows):
+            in_sample = await search(space, window=train, **kwargs)
+            best = in_sample.best
+            if best is None:
+                logger.warning(f"⚠️ Walk-forward fold {fold}: no valid in-sample result")
+                continue
+            (out_of_sample,) = await self.evaluate([best.params], test)
+            out_of_sample.fold = fold
+            report.results.append(out_of_sample)
+            report.folds.append(
+                {
+                    "fold": fold,
+                    "train": tuple(self.data.decode(ts) for ts in train),
+                    "test": tuple(self.data.decode(ts) for ts in test),
+                    "params": best.params,
+                    "in_sample": best.score,
+                    "out_of_sample": out_of_sample.score,
+                }
+            )
+
+        report.elapsed_seconds = asyncio.get_running_loop().time() - started
+        return report
+
+    async def _report(self, pending) -> SweepReport:
+        started = asyncio.get_running_loop().time()
+        results = await pending
+        report = SweepReport(objective=self.objective, results=results)
+        report.elapsed_seconds = asyncio.get_running_loop().time() - started
+        best = report.best
+        logger.info(
+            f"🔬 Sweep evaluated {len(results)} configs in {report.elapsed_seconds:.1f}s "
+            f"on {self.max_workers} workers"
+            + (f" | best {self.objective}={best.score:.4f} {best.params}" if best else "")
+        )
+        return report
+
+
+async def demo():
+    from ibis.backtest.backtester import CandleGenerator, RSI_MeanReversionStrategy
+
+    candles = {s: CandleGenerator.generate_candles(s, days=60) for s in ("AAA-USDT", "BBB-USDT")}
+    space = {
+        "stop_loss_pct": (0.01, 0.05),
+        "take_profit_pct": (0.02, 0.10),
+        "TECHNICAL.RSI_OVERSOLD": [20.0, 25.0, 30.0, 35.0],
+    }
+    async with SweepOptimizer(RSI_MeanReversionStrategy, candles) as optimizer:
+        report = await optimizer.bayesian(space, iterations=40, seed=7)
+        print(report.table(10))
+        walk = await optimizer.walk_forward(space, 24 * 30, 24 * 10, method="random", samples=16)
+        for fold in walk.folds:
+            print(fold["fold"], fold["params"], f"{fold['in_sample']:.3f} -> {fold['out_of_sample']:.3f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(demo())
@@ -1,3 +1,4 @@
+from ibis.core.codec import dumps, loads
 from ibis.core.logging_config import get_logger
 
 """
@@ -22,13 +23,18 @@ Validation Rules:
 
 import json
 import asyncio
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, field, asdict
+from operator import itemgetter
+from typing import Deque, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field, asdict, replace
 from pathlib import Path
 
 logger = get_logger(__name__)
 
+# Remaining quantity below which a lot or sell counts as fully matched
+DUST_QTY = 0.00000001
+
 
 class ValidationError(Exception):
     """Custom exception for validation errors"""
@@ -63,6 +69,7 @@ class Trade:
         fee_currency: Currency the fee was paid in
         timestamp: Unix timestamp in milliseconds
         executed_at: ISO format timestamp
+        trade_id: KuCoin fill id when the trade is a single fill ("" for whole orders)
     """
 
     order_id: str
@@ -75,6 +82,7 @@ class Trade:
     fee_currency: str
     timestamp: int  # Unix timestamp in milliseconds
     executed_at: str  # ISO format
+    trade_id: str = ""
 
     def validate(self) -> List[str]:
         """Validate trade data against business rules"""
@@ -177,6 +185,35 @@ class Trade:
         except Exception as e:
             raise ValidationError(f"Failed to parse KuCoin order: {str(e)}", [str(e)])
 
+    @classmethod
+    def from_kucoin_fill(cls, fill: Dict) -> "Trade":
+        """Create Trade from one /api/v1/fills entry
+
+        Raises:
+            ValidationError: If fill data is invalid
+        """
+        try:
+            trade = cls(
+                order_id=str(fill.get("orderId", "")),
+                symbol=str(fill.get("symbol", "")).replace("-USDT", ""),
+                side=str(fill.get("side", "")).lower(),
+                price=float(fill.get("price", 0) or 0),
+                size=float(fill.get("size", 0) or 0),
+                funds=float(fill.get("funds", 0) or 0),
+                fee=float(fill.get("fee", 0) or 0),
+                fee_currency=fill.get("feeCurrency") or "USDT",
+                timestamp=int(fill.get("createdAt", 0) or 0),
+                executed_at=str(fill.get("createdAt", "")),
+                trade_id=str(fill.get("tradeId", "")),
+            )
+        except Exception as e:
+            raise ValidationError(f"Failed to parse KuCoin fill: {str(e)}", [str(e)])
+
+        errors = trade.validate()
+        if errors:
+            raise ValidationError(f"Invalid trade data from KuCoin fill {trade.trade_id}", errors)
+        return trade
+
 
 @dataclass
 class MatchedTrade:
@@ -270,25 +307,371 @@ class MatchedTrade:
         }
 
 
+def _closed_at_time(closed_at) -> Optional[datetime]:
+    """Close time used by the period filters (ms timestamp, digit string or ISO)"""
+    if not closed_at:
+        return None
+    if isinstance(closed_at, (int, float)):
+        return datetime.fromtimestamp(closed_at / 1000)
+    if isinstance(closed_at, str) and closed_at.isdigit():
+        return datetime.fromtimestamp(int(closed_at) / 1000)
+    if isinstance(closed_at, str):
+        return datetime.fromisoformat(closed_at.replace("Z", "+00:00"))
+    return datetime.max
+
+
+def _check_trades(trades: List[Trade]):
+    """Raise ValidationError listing every trade that fails Trade.validate()"""
+    invalid_trades = []
+    for trade in trades:
+        errors = trade.validate()
+        if errors:
+            invalid_trades.append(
+                {"order_id": trade.order_id, "symbol": trade.symbol, "errors": errors}
+            )
+            logger.warning(f"Invalid trade {trade.order_id}: {', '.join(errors)}")
+
+    if invalid_trades:
+        raise ValidationError(
+            f"Found {len(invalid_trades)} invalid trades",
+            [f"{t['order_id']}: {', '.join(t['errors'])}" for t in invalid_trades],
+        )
+
+
+class _PnLWindow:
+    """Running PnL summary over round-trips closed in the last `days` (None = all time)
+
+    Entries are (closed_at, order_key, MatchedTrade) and arrive in close-time
+    order, so expiry pops from the left and best/worst come from monotonic
+    deques. An entry that closes before the newest one marks the window
+    stale; the ledger rebuilds it on the next read.
+    """
+
+    def __init__(self, days: Optional[int]):
+        self.days = days
+        self.stale = False
+        self._reset()
+
+    def _reset(self):
+        self.entries: Deque[tuple] = deque()
+        self._best: Deque[tuple] = deque()
+        self._worst: Deque[tuple] = deque()
+        self.count = 0
+        self.wins = 0
+        self.pnl = 0.0
+        self.win_pnl = 0.0
+        self.loss_pnl = 0.0
+        self.fees = 0.0
+        self.quantity = 0.0
+        self.duration = 0.0
+
+    def _tally(self, trade: MatchedTrade, sign: int):
+        net = trade.net_pnl
+        self.count += sign
+        self.pnl += sign * net
+        if net > 0:
+            self.wins += sign
+            self.win_pnl += sign * net
+        else:
+            self.loss_pnl += sign * net
+        self.fees += sign * trade.fees
+        self.quantity += sign * trade.quantity
+        self.duration += sign * trade.duration_seconds
+
+    def add(self, entry: tuple):
+        if self.stale:
+            return
+        if self.days is not None:
+            if entry[0] is None:
+                return
+            if self.entries and entry[0] < self.entries[-1][0]:
+                self.stale = True
+                return
+
+        net = entry[2].net_pnl
+        while self._best and self._best[-1][2].net_pnl <= net:
+            self._best.pop()
+        self._best.append(entry)
+        while self._worst and self._worst[-1][2].net_pnl >= net:
+            self._worst.pop()
+        self._worst.append(entry)
+        self.entries.append(entry)
+        self._tally(entry[2], 1)
+
+    def expire(self, start: datetime):
+        entries = self.entries
+        while entries and entries[0][0] < start:
+            entry = entries.popleft()
+            if self._best[0] is entry:
+                self._best.popleft()
+            if self._worst[0] is entry:
+                self._worst.popleft()
+            self._tally(entry[2], -1)
+        if not entries:
+            # Drop float residue left by the running subtraction
+            self._reset()
+
+    def summary(self) -> Dict:
+        count, wins = self.count, self.wins
+        losses = count - wins
+        trades = [entry[2] for entry in sorted(self.entries, key=itemgetter(1))]
+        return {
+            "pnl": self.pnl,
+            "trades": count,
+            "wins": wins,
+            "losses": losses,
+            "win_rate": wins / count * 100 if count else 0,
+            "avg_win": self.win_pnl / wins if wins > 0 else 0,
+            "avg_loss": self.loss_pnl / losses if losses > 0 else 0,
+            "best_trade": self._best[0][2].net_pnl if self._best else 0,
+            "worst_trade": self._worst[0][2].net_pnl if self._worst else 0,
+            "total_fees": self.fees,
+            "avg_fees_per_trade": self.fees / count if count else 0,
+            "avg_trade_size": self.quantity / count if count else 0,
+            "avg_duration": self.duration / count if count else 0,
+            "trades_detail": [t.to_dict() for t in trades],
+        }
+
+
+class _SymbolBook:
+    """FIFO state for one symbol"""
+
+    __slots__ = ("rank", "lots", "sells", "last_buy", "last_sell", "matched")
+
+    def __init__(self, rank: int):
+        self.rank = rank
+        # Open buy lots (copies - size is the remaining quantity) and sells
+        # still waiting for a lot, as [trade, remaining quantity]
+        self.lots: Deque[Trade] = deque()
+        self.sells: Deque[list] = deque()
+        self.last_buy = float("-inf")
+        self.last_sell = float("-inf")
+        self.matched: List[MatchedTrade] = []
+
+
+class FifoLedger:
+    """Per-symbol FIFO lot ledger with running realized PnL
+
+    Each fill is applied once: a buy opens a lot, a sell is queued and drained
+    against the oldest open lots, and every resulting MatchedTrade is pushed
+    into the running all-time and rolling-window summaries. Because buys and
+    sells are consumed in timestamp order per side, the round-trips are
+    exactly those a full re-match of the history produces. A fill older than
+    one already applied on its side replays the history instead.
+    """
+
+    def __init__(self):
+        self.stats = {"fills_applied": 0, "matched": 0, "rebuilds": 0}
+        self._reset(None)
+
+    def _reset(self, trades: Optional[List[Trade]]):
+        self._source = trades
+        self._applied = 0
+        self._books: Dict[str, _SymbolBook] = {}
+        self._entries: List[tuple] = []
+        self._windows: Dict[Optional[str], Dict[Optional[int], _PnLWindow]] = {}
+        self._all_matched: Optional[List[MatchedTrade]] = None
+        self._seq = 0
+        self.invalid: List[Tuple[MatchedTrade, List[str]]] = []
+
+    def sync(self, trades: List[Trade]) -> List[MatchedTrade]:
+        """Apply the trades appended to `trades` since the last sync
+
+        Returns:
+            Newly matched round-trips (everything, after a replay)
+
+        Raises:
+            ValidationError: If any new trade fails validation (nothing is applied)
+        """
+        if trades is not self._source or len(trades) < self._applied:
+            if self._source is not None:
+                self.stats["rebuilds"] += 1
+            self._reset(trades)
+
+        new = trades[self._applied :]
+        if not new:
+            return []
+        _check_trades(new)
+
+        ordered = sorted(new, key=lambda t: t.timestamp)
+        if not self._in_order(ordered):
+            logger.debug("Out-of-order fill - replaying trade history into the FIFO ledger")
+            self.stats["rebuilds"] += 1
+            self._reset(trades)
+            new = trades
+            ordered = sorted(trades, key=lambda t: t.timestamp)
+
+        for trade in new:
+            if trade.symbol not in self._books:
+                self._books[trade.symbol] = _SymbolBook(len(self._books))
+
+        matched = []
+        for trade in ordered:
+            matched.extend(self._apply(trade))
+        self._applied = len(trades)
+        if matched:
+            self._all_matched = None
+        return matched
+
+    def _in_order(self, ordered: List[Trade]) -> bool:
+        for trade in ordered:
+            book = self._books.get(trade.symbol)
+            if book is None:
+                continue
+            last = book.last_buy if trade.side == "buy" else book.last_sell
+            if trade.timestamp < last:
+                return False
+        return True
+
+    def _apply(self, trade: Trade) -> List[MatchedTrade]:
+        book = self._books[trade.symbol]
+        if trade.side == "buy":
+            book.last_buy = trade.timestamp
+            book.lots.append(replace(trade))
+        else:
+            book.last_sell = trade.timestamp
+            book.sells.append([trade, trade.size])
+        self.stats["fills_applied"] += 1
+        return self._drain(book)
+
+    def _drain(self, book: _SymbolBook) -> List[MatchedTrade]:
+        lots, sells = book.lots, book.sells
+        matched = []
+        while lots and sells:
+            buy = lots[0]
+            if buy.size <= DUST_QTY:
+                lots.popleft()
+                continue
+            pending = sells[0]
+            sell, remaining = pending
+            if remaining <= DUST_QTY:
+                sells.popleft()
+                continue
+
+            qty = min(buy.size, remaining)
+            gross_pnl = (sell.price - buy.price) * qty
+            # Buy fee share is taken against the lot's remaining size, as the
+            # full re-match always has, so both paths report the same fees
+            fees = (buy.fee * (qty / buy.size)) + (sell.fee * (qty / sell.size))
+            trade = MatchedTrade(
+                buy_trade=buy,
+                sell_trade=sell,
+                quantity=qty,
+                entry_price=buy.price,
+                exit_price=sell.price,
+                gross_pnl=gross_pnl,
+                fees=fees,
+                net_pnl=gross_pnl - fees,
+                pnl_pct=((sell.price - buy.price) / buy.price * 100) if buy.price > 0 else 0,
+                duration_seconds=(sell.timestamp - buy.timestamp) / 1000,
+                opened_at=buy.executed_at,
+                closed_at=sell.executed_at,
+            )
+            errors = trade.validate()
+            if errors:
+                self.invalid.append((trade, errors))
+            self._record(book, trade)
+            matched.append(trade)
+
+            buy.size -= qty
+            pending[1] = remaining - qty
+            if buy.size <= DUST_QTY:
+                lots.popleft()
+            if pending[1] <= DUST_QTY:
+                sells.popleft()
+        return matched
+
+    def _record(self, book: _SymbolBook, trade: MatchedTrade):
+        self._seq += 1
+        entry = (_closed_at_time(trade.closed_at), (book.rank, self._seq), trade)
+        book.matched.append(trade)
+        self._entries.append(entry)
+        self.stats["matched"] += 1
+        for key in (None, trade.buy_trade.symbol):
+            for window in self._windows.get(key, {}).values():
+                window.add(entry)
+
+    def matched(self, symbol: str = None) -> List[MatchedTrade]:
+        """Round-trips grouped by symbol (first-seen order), then by close"""
+        if symbol:
+            book = self._books.get(symbol)
+            return list(book.matched) if book else []
+        if self._all_matched is None:
+            self._all_matched = [t for book in self._books.values() for t in book.matched]
+        return self._all_matched
+
+    def invalid_matches(self, symbol: str = None) -> List[Tuple[MatchedTrade, List[str]]]:
+        if symbol:
+            return [item for item in self.invalid if item[0].buy_trade.symbol == symbol]
+        return self.invalid
+
+    def summary(self, symbol: str = None, days: Optional[int] = None, now: datetime = None) -> Dict:
+        """PnL summary for the last `days` (None = all time), optionally one symbol"""
+        windows = self._windows.setdefault(symbol or None, {})
+        window = windows.get(days)
+        if window is None or window.stale:
+            window = _PnLWindow(days)
+            entries = self._entries
+            if symbol:
+                entries = [e for e in entries if e[2].buy_trade.symbol == symbol]
+            if days is not None:
+                entries = sorted((e for e in entries if e[0] is not None), key=itemgetter(0))
+            for entry in entries:
+                window.add(entry)
+            windows[days] = window
+
+        if days is not None:
+            window.expire((now or datetime.now()) - timedelta(days=days))
+        return window.summary()
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "symbols": len(self._books),
+            "open_lots": sum(len(book.lots) for book in self._books.values()),
+            "pending_sells": sum(len(book.sells) for book in self._books.values()),
+        }
+
+
 class PnLTracker:
     """Track PnL from actual KuCoin trade history"""
 
-    def __init__(self, trade_history_file: str = None):
+    def __init__(self, trade_history_file: str = None, ingestor=None, fee_model=None):
         self.trade_history_file = (
             trade_history_file
             or "/root/projects/Dont enter unless solicited/AGI Trader/data/trade_history.json"
         )
         self.trade_history_path = Path(self.trade_history_file)
         self._trades: List[Trade] = []
-        self._matched_trades: List[MatchedTrade] = []
+        # Order ids of whole-order trades plus trade ids of fills already held
+        self._trade_ids = set()
+        self._ledger = FifoLedger()
+        self._ingestor = None
+        self._fee_model = fee_model
         self._load_trade_history()
+        if ingestor is not None:
+            self.attach_ingestor(ingestor)
+
+    @property
+    def fee_model(self):
+        """FeeModel behind the fee-rate queries (the shared one unless given)"""
+        if self._fee_model is None:
+            from ibis.core.fee_model import get_fee_model
+
+            self._fee_model = get_fee_model()
+        return self._fee_model
+
+    @property
+    def _matched_trades(self) -> List[MatchedTrade]:
+        """Round-trips as of the last match_trades_fifo()"""
+        return self._ledger.matched()
 
     def _load_trade_history(self):
         """Load existing trade history from file"""
         try:
             if self.trade_history_path.exists():
-                with open(self.trade_history_path, "r") as f:
-                    data = json.load(f)
+                with open(self.trade_history_path, "rb") as f:
+                    data = loads(f.read())
                     self._trades = [Trade(**t) for t in data.get("trades", [])]
                     # Load matched trades as dicts for reference, not as MatchedTrade objects
                     # since MatchedTrade expects Trade objects
@@ -297,8 +680,7 @@ class PnLTracker:
             logger.warning(f"Could not load trade history: {e}")
             self._trades = []
 
-        # Always start with fresh matching from KuCoin
-        self._matched_trades = []
+        self._trade_ids = {t.trade_id or t.order_id for t in self._trades}
 
     def _save_trade_history(self):
         """Save trade history to file"""
@@ -308,67 +690,58 @@ class PnLTracker:
                 "matched_trades": [t.to_dict() for t in self._matched_trades],
                 "last_updated": datetime.now().isoformat(),
             }
-            with open(self.trade_history_path, "w") as f:
-                json.dump(data, f, indent=2)
+            with open(self.trade_history_path, "wb") as f:
+                f.write(dumps(data, indent=True))
         except Exception as e:
             logger.error(f"Could not save trade history: {e}", exc_info=True)
 
+    def attach_ingestor(self, ingestor):
+        """Take new trades from a shared FillIngestor stream"""
+        self._ingestor = ingestor
+        ingestor.subscribe(self.apply_fills)
+
+    def apply_fills(self, fills: List[Dict]) -> List[Trade]:
+        """FillIngestor consumer: append fills not yet in the history
+
+        A fill whose order is already recorded as a whole-order trade (history
+        synced from /api/v1/orders before fill ingestion) is skipped so the
+        execution is not counted twice.
+        """
+        new_trades = []
+        for fill in fills:
+            try:
+                trade = Trade.from_kucoin_fill(fill)
+            except ValidationError as e:
+                logger.warning(f"Skipping fill {fill.get('tradeId', 'unknown')}: {e.errors}")
+                continue
+            if trade.trade_id in self._trade_ids or trade.order_id in self._trade_ids:
+                continue
+            self._trade_ids.add(trade.trade_id)
+            self._trades.append(trade)
+            new_trades.append(trade)
+
+        if new_trades:
+            logger.info(f"Synced {len(new_trades)} new fills from KuCoin")
+            self._save_trade_history()
+        return new_trades
+
     async def sync_trades_from_kucoin(self, client) -> List[Trade]:
-        """Fetch all trades from KuCoin and sync with local history"""
+        """Pull fills since the last sync through the FillIngestor and apply them
+
+        Without an attached ingestor one is created next to the trade history
+        file, feeding this tracker, the fee history table and the fee model.
+        """
         try:
-            # Use retry logic for reliability
-            data = await client._request_with_retry("GET", "/api/v1/orders")
-            items = data.get("items", []) if data else []
-
-            # Filter to filled orders
-            filled_orders = [
-                o
-                for o in items
-                if o.get("isActive") == False and o.get("dealSize", "0") not in ["", "0", "0.0", 0]
-            ]
-
-            # Convert to Trade objects with validation
-            new_trades = []
-            from ibis.database.db import IbisDB
-
-            db = IbisDB()
-
-            for order in filled_orders:
-                try:
-                    trade = Trade.from_kucoin_order(order)
-
-                    # Validate trade data
-                    if trade.price <= 0 or trade.size <= 0:
-                        logger.warning(f"Invalid trade data: {order.get('orderId', 'unknown')}")
-                        continue
-
-                    # Check if we already have this trade
-                    existing_ids = {t.order_id for t in self._trades}
-                    if trade.order_id not in existing_ids:
-                        self._trades.append(trade)
-                        new_trades.append(trade)
-
-                    # Record fee information in fee_history table
-                    if trade.fee > 0:
-                        db.update_fee_tracking(
-                            symbol=trade.symbol,
-                            fees=trade.fee,
-                            trade_value=trade.funds,
-                            side=trade.side.upper(),
-                            order_id=trade.order_id,
-                        )
-
-                except Exception as e:
-                    logger.error(
-                        f"Error processing order {order.get('orderId', 'unknown')}: {e}",
-                        exc_info=True,
-                    )
-                    continue
+            if self._ingestor is None:
+                from ibis.database.db import IbisDB
+                from ibis.exchange.fill_ingest import FillIngestor, FillStore
 
-            if new_trades:
-                logger.info(f"Synced {len(new_trades)} new trades from KuCoin")
-                self._save_trade_history()
+                store = FillStore(str(self.trade_history_path.with_name("fills.db")))
+                self.attach_ingestor(FillIngestor(client, store))
+                self._ingestor.subscribe(IbisDB().record_fill_fees)
+                self._ingestor.subscribe(self.fee_model.record_fills)
 
+            await self._ingestor.ingest()
             return self._trades
 
         except Exception as e:
@@ -376,7 +749,11 @@ class PnLTracker:
             return self._trades
 
     def match_trades_fifo(self, symbol: str = None, validate: bool = True) -> List[MatchedTrade]:
-        """Match buy and sell trades using FIFO method - interleaved by timestamp
+        """Match buy and sell trades using FIFO method
+
+        Trades appended since the last call are applied to the FIFO ledger;
+        earlier round-trips, open lots and the PnL summaries are kept as
+        running state rather than re-matched.
 
         Args:
             symbol: Optional symbol to filter trades
@@ -386,7 +763,8 @@ class PnLTracker:
             List of matched round-trip trades
 
         Raises:
-            ValidationError: If any trade or matched trade fails validation
+            ValidationError: If any trade fails validation
+            CalculationError: If validate is set and a matched trade is invalid
         """
         # Validate input
         if symbol and not isinstance(symbol, str):
@@ -394,171 +772,27 @@ class PnLTracker:
         if symbol and len(symbol.strip()) == 0:
             raise ValidationError("Symbol cannot be empty")
 
-        # Filter trades by symbol if provided
-        if symbol:
-            trades = [t for t in self._trades if t.symbol == symbol]
-        else:
-            trades = self._trades
-
-        logger.debug(f"Matching {len(trades)} trades for symbol: {symbol or 'all'}")
-
-        # Validate all trades before matching
-        invalid_trades = []
-        for trade in trades:
-            errors = trade.validate()
-            if errors:
-                invalid_trades.append(
-                    {"order_id": trade.order_id, "symbol": trade.symbol, "errors": errors}
-                )
-                logger.warning(f"Invalid trade {trade.order_id}: {', '.join(errors)}")
-
-        if invalid_trades:
-            raise ValidationError(
-                f"Found {len(invalid_trades)} invalid trades",
-                [f"{t['order_id']}: {', '.join(t['errors'])}" for t in invalid_trades],
-            )
-
-        # Group trades by symbol first for proper matching
-        trades_by_symbol = {}
-        for trade in trades:
-            if trade.symbol not in trades_by_symbol:
-                trades_by_symbol[trade.symbol] = {"buy": [], "sell": []}
-            if trade.side == "buy":
-                # Create copy to avoid modifying original trade objects
-                trades_by_symbol[trade.symbol]["buy"].append(
-                    Trade(
-                        order_id=trade.order_id,
-                        symbol=trade.symbol,
-                        side=trade.side,
-                        price=trade.price,
-                        size=trade.size,
-                        funds=trade.funds,
-                        fee=trade.fee,
-                        fee_currency=trade.fee_currency,
-                        timestamp=trade.timestamp,
-                        executed_at=trade.executed_at,
-                    )
-                )
-            elif trade.side == "sell":
-                trades_by_symbol[trade.symbol]["sell"].append(
-                    Trade(
-                        order_id=trade.order_id,
-                        symbol=trade.symbol,
-                        side=trade.side,
-                        price=trade.price,
-                        size=trade.size,
-                        funds=trade.funds,
-                        fee=trade.fee,
-                        fee_currency=trade.fee_currency,
-                        timestamp=trade.timestamp,
-                        executed_at=trade.executed_at,
-                    )
+        new_matches = self._ledger.sync(self._trades)
+        logger.debug(f"FIFO ledger applied {len(new_matches)} new round-trips")
+
+        if validate:
+            invalid = self._ledger.invalid_matches(symbol)
+            if invalid:
+                trade, errors = invalid[0]
+                buy, sell = trade.buy_trade, trade.sell_trade
+                raise CalculationError(
+                    f"Failed to match trade {buy.symbol}: buy={buy.order_id}, sell={sell.order_id} - "
+                    f"Invalid matched trade: {', '.join(errors)}",
+                    {"buy_trade": asdict(buy), "sell_trade": asdict(sell)},
                 )
 
-        # Sort each symbol's trades by timestamp
-        for symbol in trades_by_symbol:
-            trades_by_symbol[symbol]["buy"].sort(key=lambda x: x.timestamp)
-            trades_by_symbol[symbol]["sell"].sort(key=lambda x: x.timestamp)
-
-        matched = []
-
-        # Process each symbol separately
-        for symbol, sides in trades_by_symbol.items():
-            buy_queue = sides["buy"].copy()
-            sells = sides["sell"].copy()
-            buy_index = 0
-            sell_index = 0
-
-            logger.debug(f"Processing symbol {symbol}: {len(buy_queue)} buys, {len(sells)} sells")
-
-            while buy_index < len(buy_queue) and sell_index < len(sells):
-                buy = buy_queue[buy_index]
-                sell = sells[sell_index]
-
-                remaining_sell_qty = sell.size
-
-                while remaining_sell_qty > 0.00000001 and buy_index < len(buy_queue):
-                    buy = buy_queue[buy_index]
-
-                    if buy.size <= 0.00000001:
-                        buy_index += 1
-                        continue
-
-                    # Match the minimum quantity
-                    matched_qty = min(buy.size, remaining_sell_qty)
-
-                    try:
-                        # Calculate P&L
-                        gross_pnl = (sell.price - buy.price) * matched_qty
-                        fees = (buy.fee * (matched_qty / buy.size)) + (
-                            sell.fee * (matched_qty / sell.size)
-                        )
-                        net_pnl = gross_pnl - fees
-
-                        # Calculate duration
-                        duration_sec = (sell.timestamp - buy.timestamp) / 1000
-
-                        matched_trade = MatchedTrade(
-                            buy_trade=buy,
-                            sell_trade=sell,
-                            quantity=matched_qty,
-                            entry_price=buy.price,
-                            exit_price=sell.price,
-                            gross_pnl=gross_pnl,
-                            fees=fees,
-                            net_pnl=net_pnl,
-                            pnl_pct=((sell.price - buy.price) / buy.price * 100)
-                            if buy.price > 0
-                            else 0,
-                            duration_seconds=duration_sec,
-                            opened_at=buy.executed_at,
-                            closed_at=sell.executed_at,
-                        )
-
-                        # Validate the matched trade
-                        if validate:
-                            errors = matched_trade.validate()
-                            if errors:
-                                raise ValidationError(
-                                    f"Invalid matched trade: buy={buy.order_id}, sell={sell.order_id}",
-                                    errors,
-                                )
-
-                        matched.append(matched_trade)
-                        logger.debug(
-                            f"Matched trade {symbol}: buy={buy.order_id}, sell={sell.order_id}, "
-                            f"qty={matched_qty:.8f}, net_pnl={net_pnl:.4f}"
-                        )
-
-                        # Update quantities
-                        buy.size -= matched_qty
-                        remaining_sell_qty -= matched_qty
-
-                        # Move to next buy if fully matched
-                        if buy.size <= 0.00000001:
-                            buy_index += 1
-
-                    except Exception as e:
-                        raise CalculationError(
-                            f"Failed to match trade {symbol}: buy={buy.order_id}, sell={sell.order_id} - {str(e)}",
-                            {
-                                "buy_trade": buy.to_dict() if hasattr(buy, "to_dict") else str(buy),
-                                "sell_trade": sell.to_dict()
-                                if hasattr(sell, "to_dict")
-                                else str(sell),
-                            },
-                        )
-
-                # Move to next sell if fully matched
-                if remaining_sell_qty <= 0.00000001:
-                    sell_index += 1
-
-        self._matched_trades = matched
-        self._save_trade_history()
+        if new_matches:
+            self._save_trade_history()
 
+        matched = self._ledger.matched(symbol)
         logger.debug(f"Successfully matched {len(matched)} round-trip trades")
 
-        return matched
+        return list(matched)
 
     def get_weekly_pnl(self, symbol: str = None) -> Dict:
         """Calculate weekly PnL from matched trades
@@ -594,12 +828,7 @@ class PnLTracker:
         if symbol and not isinstance(symbol, str):
             raise ValidationError("Symbol must be a string")
 
-        if symbol:
-            trades = [t for t in self._matched_trades if t.buy_trade.symbol == symbol]
-        else:
-            trades = self._matched_trades
-
-        return self._calculate_pnl_summary(trades)
+        return self._ledger.summary(symbol)
 
     def _get_period_pnl(self, symbol: str, days: int) -> Dict:
         """Internal method to calculate PnL for a specific time period
@@ -616,29 +845,7 @@ class PnLTracker:
         if days <= 0:
             raise ValidationError("Days must be a positive integer")
 
-        now = datetime.now()
-        period_start = now - timedelta(days=days)
-
-        if symbol:
-            trades = [t for t in self._matched_trades if t.buy_trade.symbol == symbol]
-        else:
-            trades = self._matched_trades
-
-        def parse_timestamp(ts):
-            """Parse timestamp (ms) to datetime"""
-            if isinstance(ts, (int, float)):
-                return datetime.fromtimestamp(ts / 1000)
-            elif isinstance(ts, str) and ts.isdigit():
-                return datetime.fromtimestamp(int(ts) / 1000)
-            elif isinstance(ts, str):
-                return datetime.fromisoformat(ts.replace("Z", "+00:00"))
-            return now
-
-        period_trades = [
-            t for t in trades if t.closed_at and parse_timestamp(t.closed_at) >= period_start
-        ]
-
-        return self._calculate_pnl_summary(period_trades)
+        return self._ledger.summary(symbol, days, now=datetime.now())
 
     def _calculate_pnl_summary(self, trades: List[MatchedTrade]) -> Dict:
         """Internal method to calculate PnL summary from matched trades
@@ -874,39 +1081,12 @@ class PnLTracker:
         ]
 
     def calculate_average_fees_per_symbol(self) -> Dict[str, Dict[str, float]]:
-        """Calculate average maker/taker fees per symbol from historical trades"""
-        symbol_fees = {}
+        """Per-symbol maker/taker fee rates from the fee model
 
-        # Group trades by symbol and side
-        trades_by_symbol = {}
-        for trade in self._trades:
-            if trade.symbol not in trades_by_symbol:
-                trades_by_symbol[trade.symbol] = {"buy": [], "sell": []}
-            trades_by_symbol[trade.symbol][trade.side].append(trade)
-
-        # Calculate average fees per symbol
-        for symbol, sides in trades_by_symbol.items():
-            # Calculate fee rates (fee / funds) for each trade
-            maker_fees = []
-            taker_fees = []
-
-            for trade in sides["buy"] + sides["sell"]:
-                if trade.funds > 0:
-                    fee_rate = trade.fee / trade.funds
-                    # For now, assume all trades are taker (we can add order type detection later)
-                    # In future, we could analyze order types from KuCoin data
-                    taker_fees.append(fee_rate)
-                    # For maker fees, we can use the same rate if we don't have order type info
-                    maker_fees.append(fee_rate)
-
-            if maker_fees and taker_fees:
-                symbol_fees[symbol] = {
-                    "maker": sum(maker_fees) / len(maker_fees),
-                    "taker": sum(taker_fees) / len(taker_fees),
-                    "count": len(maker_fees),
-                }
-
-        return symbol_fees
+        Value-weighted over fills, decayed by age; fills without a liquidity
+        flag count toward both maker and taker.
+        """
+        return self.fee_model.per_symbol()
 
     def update_trading_constants_fees(self):
         """Update trading constants with dynamic fee rates from historical data"""
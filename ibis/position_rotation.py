@@ -10,7 +10,8 @@ Continuous portfolio rotation system:
 - Reallocates capital to new opportunities
 - Keeps portfolio fresh and rotating
 
-IMPORTANT: Reads positions from ibis_true_state.json (source of truth)
+IMPORTANT: Reads positions from ibis_true_state.json plus its journal tail
+(source of truth, via data_consolidation.load_state)
 Writes closed trades to SQLite DB for analytics
 """
 
@@ -0,0 +1,619 @@
+"""
+IBIS State Persistence
+Write-behind, coalescing state writer with an append-only journal, snapshot
+compaction and incremental SQLite row sync
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from ibis.core.codec import dumps, loads
+from ibis.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+RowMap = Dict[Hashable, Tuple]
+# sync_rows(upserts, deletes, reconcile): reconcile is the full live key set on
+# the first sync (so rows left by earlier runs can be dropped), else None
+RowSync = Callable[[RowMap, Set[Hashable], Optional[Set[Hashable]]], None]
+
+# Snapshot key holding the last journal sequence folded into the snapshot
+JOURNAL_SEQ_KEY = "_journal_seq"
+_MISSING = object()
+
+
+def _encode(value) -> bytes:
+    return dumps(value)
+
+
+def _list_delta(old: list, new: list) -> Optional[Tuple[int, list]]:
+    """
+    (drop, items) when new == old[drop:] + items, i.e. a list that was only
+    appended to and/or trimmed from the front (ring-buffer histories).
+    """
+    if len(new) >= len(old) and new[: len(old)] == old:
+        return 0, new[len(old) :]
+    if not new:
+        return len(old), []
+    try:
+        drop = old.index(new[0])
+    except ValueError:
+        return None
+    while drop < len(old):
+        kept = len(old) - drop
+        if new[:kept] == old[drop:]:
+            return drop, new[kept:]
+        try:
+            drop = old.index(new[0], drop + 1)
+        except ValueError:
+            return None
+    return None
+
+
+def apply_ops(state: Dict[str, Any], ops: list) -> None:
+    """Apply journal ops ([op, path, ...]) to a decoded state dict in place."""
+    for op in ops:
+        kind, path = op[0], op[1]
+        parent = state
+        for key in path[:-1]:
+            parent = parent.setdefault(key, {})
+        key = path[-1]
+        if kind == "set":
+            parent[key] = op[2]
+        elif kind == "del":
+            parent.pop(key, None)
+        elif kind == "ext":
+            current = parent.get(key)
+            if not isinstance(current, list):
+                current = parent[key] = []
+            del current[: op[2]]
+            current.extend(op[3])
+
+
+class JournalStore:
+    """
+    Snapshot file plus append-only journal for one JSON state document.
+
+    capture() diffs the live state against the last journaled mirror at
+    (key) and (key, sub-key) granularity and returns one compact record of
+    set/del/ext ops, so encoding and I/O scale with the change rather than
+    with the whole document (the comparison itself is a C-level dict/list
+    equality pass). append() writes and fsyncs records; compact() folds the
+    mirror into the snapshot, which stays a plain JSON file at `path` for
+    existing readers, and truncates the journal. load() replays journal
+    records newer than the snapshot and stops at a torn line or the first
+    sequence gap. A failed append, a torn line or a gap leaves the journal
+    untrustworthy past that point, so the next append compacts instead.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        compact_records: int = 500,
+        compact_bytes: int = 4 * 1024 * 1024,
+        compact_interval: float = 60.0,
+    ):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.compact_records = compact_records
+        self.compact_bytes = compact_bytes
+        self.compact_interval = compact_interval
+
+        self._mirror: Dict[str, Any] = {}
+        self._mirror_lock = threading.Lock()
+        self._loaded = False
+        self._seq = 0
+        self._snapshot_seq = 0
+        self._journal_records = 0
+        self._journal_bytes = 0
+        self._last_compact = time.monotonic()
+        self._needs_compaction = False
+        self.stats = {
+            "records": 0,
+            "ops": 0,
+            "journal_bytes": 0,
+            "compactions": 0,
+            "snapshot_bytes": 0,
+            "replayed": 0,
+            "replay_gaps": 0,
+            "forced_compactions": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Recovery
+    # ------------------------------------------------------------------
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Snapshot + journal tail; {} when neither exists. Once loaded, the
+        mirror is authoritative (it may hold records still queued for the
+        writer thread), so later calls return a copy of it instead.
+        """
+        if self._loaded:
+            with self._mirror_lock:
+                return loads(_encode(self._mirror))
+        state: Dict[str, Any] = {}
+        try:
+            with open(self.path, "rb") as f:
+                state = loads(f.read())
+        except (OSError, ValueError):
+            state = {}
+        snapshot_seq = int(state.pop(JOURNAL_SEQ_KEY, 0) or 0)
+
+        records = []
+        intact = True
+        try:
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    try:
+                        records.append(loads(line))
+                    except ValueError:
+                        intact = False  # torn write: stop replay here
+                        break
+        except OSError:
+            pass
+
+        seq = snapshot_seq
+        for record in sorted(records, key=lambda r: r["seq"]):
+            if record["seq"] <= seq:
+                continue
+            if record["seq"] != seq + 1:
+                # A record never reached disk; later ones were diffed against it
+                logger.warning(
+                    f"⚠️ State journal gap after seq {seq} (next {record['seq']}), "
+                    f"stopping replay"
+                )
+                self.stats["replay_gaps"] += 1
+                intact = False
+                break
+            apply_ops(state, record["ops"])
+            seq = record["seq"]
+            self.stats["replayed"] += 1
+
+        with self._mirror_lock:
+            self._mirror = loads(_encode(state))
+            self._seq = seq
+            self._snapshot_seq = snapshot_seq
+            self._loaded = True
+        # New records would land after lines replay cannot get past
+        self._needs_compaction = not intact
+        self._journal_records = len(records)
+        self._journal_bytes = os.path.getsize(self.journal_path) if records else 0
+        return state
+
+    # ------------------------------------------------------------------
+    # Capture (caller thread) and persistence (writer thread)
+    # ------------------------------------------------------------------
+
+    def capture(self, state: Dict[str, Any]) -> Tuple[int, bytes]:
+        """Diff `state` against the mirror; returns (seq, record) or (seq, b"")."""
+        if not self._loaded:
+            self.load()  # sequence numbers must continue from what is on disk
+        with self._mirror_lock:
+            ops = self._diff(state)
+            if not ops:
+                return self._seq, b""
+            self._seq += 1
+            record = _encode({"seq": self._seq, "ops": ops}) + b"\n"
+            # Apply the decoded ops so the mirror is exactly what replay rebuilds
+            apply_ops(self._mirror, loads(record)["ops"])
+            self.stats["ops"] += len(ops)
+            return self._seq, record
+
+    def _diff(self, state: Dict[str, Any]) -> list:
+        mirror = self._mirror
+        ops = []
+        for key, value in state.items():
+            old = mirror.get(key, _MISSING)
+            if isinstance(value, dict) and isinstance(old, dict):
+                for sub, sub_value in value.items():
+                    if old.get(sub, _MISSING) != sub_value:
+                        ops.append(["set", [key, sub], sub_value])
+                for sub in old.keys() - value.keys():
+                    ops.append(["del", [key, sub]])
+            elif isinstance(value, list) and isinstance(old, list):
+                if old != value:
+                    delta = _list_delta(old, value)
+                    if delta is None:
+                        ops.append(["set", [key], value])
+                    else:
+                        ops.append(["ext", [key], delta[0], delta[1]])
+            elif old is _MISSING or old != value:
+                ops.append(["set", [key], value])
+        for key in mirror.keys() - state.keys():
+            ops.append(["del", [key]])
+        return ops
+
+    def append(self, record: bytes) -> None:
+        if self._needs_compaction:
+            # The mirror already holds this record's ops (and any lost ones)
+            self.compact()
+            self.stats["forced_compactions"] += 1
+            return
+        try:
+            with open(self.journal_path, "ab") as f:
+                f.write(record)
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception:
+            self._needs_compaction = True
+            raise
+        self._journal_records += 1
+        self._journal_bytes += len(record)
+        self.stats["records"] += 1
+        self.stats["journal_bytes"] += len(record)
+
+    def should_compact(self) -> bool:
+        if self._needs_compaction:
+            return True
+        if not self._journal_records:
+            return False
+        return (
+            self._journal_records >= self.compact_records
+            or self._journal_bytes >= self.compact_bytes
+            or time.monotonic() - self._last_compact >= self.compact_interval
+        )
+
+    def compact(self) -> int:
+        """Write the mirror as the new snapshot and start an empty journal."""
+        with self._mirror_lock:
+            seq = self._seq
+            payload = _encode({**self._mirror, JOURNAL_SEQ_KEY: seq})
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        # Records <= seq are now in the snapshot; load() skips any survivors
+        with open(self.journal_path, "wb") as f:
+            os.fsync(f.fileno())
+        self._snapshot_seq = seq
+        self._needs_compaction = False
+        self._journal_records = 0
+        self._journal_bytes = 0
+        self._last_compact = time.monotonic()
+        self.stats["compactions"] += 1
+        self.stats["snapshot_bytes"] = len(payload)
+        return len(payload)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["seq"] = self._seq
+        stats["pending_records"] = self._journal_records
+        return stats
+
+
+def read_state(path: str) -> Dict[str, Any]:
+    """
+    Current contents of a journaled state file (snapshot + journal replay),
+    for readers outside the process that writes it. The snapshot at `path`
+    alone is only as fresh as the last compaction.
+    """
+    return JournalStore(path).load()
+
+
+def write_state(path: str, state: Dict[str, Any]) -> None:
+    """
+    Replace a journaled state file from outside the writing process: `state`
+    becomes a snapshot past every journaled seq and the journal is emptied,
+    so no replay can reapply older records on top of it.
+    """
+    store = JournalStore(path)
+    store.load()
+    with store._mirror_lock:
+        store._mirror = loads(_encode(state))
+    store.compact()
+
+
+class StateWriter:
+    """
+    Coalescing write-behind persistence for one JSON state file.
+
+    save() only marks the state dirty. Within `max_latency` seconds the
+    snapshot is captured on the caller's event loop (so it never races with
+    mutations) and handed to a background thread that writes, fsyncs and
+    renames it; any number of save() calls in between collapse into that one
+    write. save(immediate=True) captures and writes synchronously for
+    post-trade durability, and a newer capture is never overwritten by an
+    older one still queued.
+
+    With a `journal`, each capture is a diff record appended to the
+    JournalStore instead of a full rewrite; captures are then never dropped
+    (each carries only its own changes), and the snapshot at `path` is
+    refreshed by compaction on the writer thread and on close().
+
+    When `rows`/`sync_rows` are given, each capture also diffs the row
+    signatures (e.g. open positions) against the last synced set, and the
+    thread pushes only changed and removed rows at most every
+    `sync_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        snapshot: Callable[[], Dict[str, Any]],
+        rows: Optional[Callable[[], RowMap]] = None,
+        sync_rows: Optional[RowSync] = None,
+        max_latency: float = 0.5,
+        sync_interval: float = 5.0,
+        journal: Optional[JournalStore] = None,
+    ):
+        self.path = path
+        self.snapshot = snapshot
+        self.journal = journal
+        self.rows = rows
+        self.sync_rows = sync_rows
+        self.max_latency = max_latency
+        self.sync_interval = sync_interval
+
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._writing = False  # writer thread holds a batch taken from _pending
+
+        self._dirty_since: Optional[float] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._seq = 0
+        self._written_seq = 0
+        self._pending: List[Tuple[int, bytes, float]] = []
+
+        self._synced_rows: Optional[RowMap] = None
+        self._row_upserts: RowMap = {}
+        self._row_deletes: Set[Hashable] = set()
+        self._reconcile: Optional[Set[Hashable]] = None
+        self._last_row_sync = 0.0
+
+        self.stats = {
+            "save_calls": 0,
+            "coalesced": 0,
+            "captures": 0,
+            "writes": 0,
+            "immediate_writes": 0,
+            "bytes_written": 0,
+            "row_syncs": 0,
+            "rows_synced": 0,
+            "blocked_ms": 0.0,
+            "write_ms": 0.0,
+            "max_latency_ms": 0.0,
+            "errors": 0,
+            "last_error": "",
+        }
+
+    # ------------------------------------------------------------------
+    # Caller side (event loop thread)
+    # ------------------------------------------------------------------
+
+    def save(self, immediate: bool = False) -> None:
+        self.stats["save_calls"] += 1
+        if immediate:
+            self.flush()
+            return
+        if self._dirty_since is not None:
+            self.stats["coalesced"] += 1
+            return
+        self._dirty_since = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop to defer on (scripts, shutdown): capture now, write behind
+            self._capture_and_queue()
+            return
+        self._handle = loop.call_later(self.max_latency, self._capture_and_queue)
+
+    def flush(self) -> None:
+        """Capture and write now, in the calling thread, including row sync."""
+        started = time.perf_counter()
+        capture = self._capture()
+        if capture is None and self.journal is None:
+            return
+        with self._cond:
+            if self.journal is not None:
+                # Records the writer thread already took must land before ours
+                while self._writing:
+                    self._cond.wait()
+            # Journal records are incremental, so queued ones go out first;
+            # a full snapshot supersedes anything older
+            writes = self._pending if self.journal is not None else []
+            self._pending = []
+            upserts, deletes, reconcile = self._take_rows()
+        if capture is not None:
+            writes.append(capture)
+        for pending in writes:
+            self._write(*pending)
+        self._sync(upserts, deletes, reconcile)
+        self.stats["immediate_writes"] += 1
+        self.stats["blocked_ms"] += (time.perf_counter() - started) * 1000
+
+    def close(self) -> None:
+        """Flush anything dirty and stop the writer thread."""
+        if self._dirty_since is not None:
+            self.flush()
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        # Rows deferred by sync_interval still go out before exit
+        with self._cond:
+            leftover, self._pending = self._pending, []
+            upserts, deletes, reconcile = self._take_rows()
+        for pending in leftover:
+            self._write(*pending)
+        self._sync(upserts, deletes, reconcile)
+        if self.journal is not None:
+            self._compact()
+
+    def _capture(self) -> Optional[Tuple[int, bytes, float]]:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        dirty_since = self._dirty_since or time.monotonic()
+        self._dirty_since = None
+        try:
+            if self.journal is not None:
+                seq, payload = self.journal.capture(self.snapshot())
+            else:
+                payload = _encode(self.snapshot())
+            if self.rows is not None:
+                self._diff_rows(self.rows())
+        except Exception as e:
+            self._record_error(f"snapshot failed: {e}")
+            return None
+        self.stats["captures"] += 1
+        if self.journal is None:
+            self._seq += 1
+            seq = self._seq
+        elif not payload:
+            return None  # nothing changed since the last record
+        return seq, payload, dirty_since
+
+    def _capture_and_queue(self) -> None:
+        started = time.perf_counter()
+        capture = self._capture()
+        if capture is not None:
+            with self._cond:
+                if self.journal is not None:
+                    self._pending.append(capture)
+                else:
+                    self._pending = [capture]
+                self._cond.notify_all()
+            self._ensure_thread()
+        self.stats["blocked_ms"] += (time.perf_counter() - started) * 1000
+
+    def _diff_rows(self, current: RowMap) -> None:
+        with self._cond:
+            if self._synced_rows is None:
+                self._synced_rows = {}
+                self._reconcile = set(current)
+            for key, row in current.items():
+                if self._synced_rows.get(key) != row:
+                    self._synced_rows[key] = row
+                    self._row_upserts[key] = row
+                    self._row_deletes.discard(key)
+            for key in [k for k in self._synced_rows if k not in current]:
+                del self._synced_rows[key]
+                self._row_upserts.pop(key, None)
+                self._row_deletes.add(key)
+            if self._reconcile is not None:
+                self._reconcile = set(current)
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name="ibis-state-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _rows_due(self) -> bool:
+        pending = self._row_upserts or self._row_deletes or self._reconcile is not None
+        return bool(pending) and time.monotonic() - self._last_row_sync >= self.sync_interval
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not (self._stopping or self._pending or self._rows_due()):
+                    timeout = None
+                    if self._row_upserts or self._row_deletes or self._reconcile is not None:
+                        timeout = max(
+                            0.0, self.sync_interval - (time.monotonic() - self._last_row_sync)
+                        )
+                    self._cond.wait(timeout)
+                pending, self._pending = self._pending, []
+                self._writing = bool(pending)
+                rows = self._take_rows() if self._rows_due() else ({}, set(), None)
+                stopping = self._stopping
+            try:
+                for capture in pending:
+                    self._write(*capture)
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+            self._sync(*rows)
+            if self.journal is not None and self.journal.should_compact():
+                self._compact()
+            if stopping and not self._pending:
+                return
+
+    def _take_rows(self):
+        rows = (self._row_upserts, self._row_deletes, self._reconcile)
+        self._row_upserts, self._row_deletes, self._reconcile = {}, set(), None
+        return rows
+
+    def _write(self, seq: int, payload: bytes, dirty_since: float) -> None:
+        with self._io_lock:
+            if self.journal is None and seq <= self._written_seq:
+                return  # a newer capture already reached disk
+            started = time.perf_counter()
+            try:
+                if self.journal is not None:
+                    self.journal.append(payload)
+                else:
+                    tmp = f"{self.path}.tmp"
+                    with open(tmp, "wb") as f:
+                        f.write(payload)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp, self.path)
+            except Exception as e:
+                self._record_error(f"write failed: {e}")
+                return
+            self._written_seq = max(self._written_seq, seq)
+            self.stats["writes"] += 1
+            self.stats["bytes_written"] += len(payload)
+            self.stats["write_ms"] += (time.perf_counter() - started) * 1000
+            latency = (time.monotonic() - dirty_since) * 1000
+            self.stats["max_latency_ms"] = max(self.stats["max_latency_ms"], latency)
+
+    def _compact(self) -> None:
+        with self._io_lock:
+            try:
+                self.journal.compact()
+            except Exception as e:
+                self._record_error(f"compaction failed: {e}")
+
+    def _sync(self, upserts: RowMap, deletes: Set[Hashable], reconcile) -> None:
+        if self.sync_rows is None or not (upserts or deletes or reconcile is not None):
+            return
+        self._last_row_sync = time.monotonic()
+        try:
+            with self._io_lock:
+                self.sync_rows(upserts, deletes, reconcile)
+        except Exception as e:
+            self._record_error(f"row sync failed: {e}")
+            # Re-queue so the next sync retries these rows
+            with self._cond:
+                for key, row in upserts.items():
+                    self._row_upserts.setdefault(key, row)
+                self._row_deletes |= deletes - set(self._row_upserts)
+                if reconcile is not None and self._reconcile is None:
+                    self._reconcile = reconcile
+            return
+        self.stats["row_syncs"] += 1
+        self.stats["rows_synced"] += len(upserts) + len(deletes)
+
+    def _record_error(self, message: str) -> None:
+        self.stats["errors"] += 1
+        self.stats["last_error"] = message
+        logger.warning(f"⚠️ State persistence {message}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["blocked_ms"] = round(stats["blocked_ms"], 3)
+        stats["write_ms"] = round(stats["write_ms"], 3)
+        stats["max_latency_ms"] = round(stats["max_latency_ms"], 3)
+        stats["dirty"] = self._dirty_since is not None or bool(self._pending)
+        if self.journal is not None:
+            stats["journal"] = self.journal.get_stats()
+        return stats
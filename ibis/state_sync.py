@@ -6,7 +6,6 @@ This ensures real-time updates for monitoring tools.
 """
 
 import asyncio
-import json
 import os
 import fcntl
 from datetime import datetime
@@ -15,6 +14,7 @@ from typing import Dict
 from ibis.database.db import IbisDB
 from ibis.exchange.kucoin_client import get_kucoin_client
 from ibis.core.trading_constants import TRADING
+from ibis.state_persistence import read_state, write_state
 
 from ibis.core.logging_config import get_logger
 logger = get_logger(__name__)
@@ -181,10 +181,9 @@ class StateSynchronizer:
             with open(self.state_lock_file, "w") as lock_f:
                 fcntl.flock(lock_f, fcntl.LOCK_EX)
                 existing_state = {}
-                if os.path.exists(self.state_file):
+                if os.path.exists(self.state_file) or os.path.exists(f"{self.state_file}.journal"):
                     try:
-                        with open(self.state_file, "r") as f:
-                            existing_state = json.load(f)
+                        existing_state = read_state(self.state_file)
 
                         # Filter out any fields with empty string values
                         def filter_empty(obj):
@@ -277,12 +276,7 @@ class StateSynchronizer:
                 # Debug: Print capital awareness before saving
                 logger.debug("Debug - Capital awareness before saving:", capital_awareness)
 
-                tmp_path = f"{self.state_file}.tmp"
-                with open(tmp_path, "w") as f:
-                    json.dump(state, f, indent=2)
-                    f.flush()
-                    os.fsync(f.fileno())
-                os.replace(tmp_path, self.state_file)
+                write_state(self.state_file, state)
                 fcntl.flock(lock_f, fcntl.LOCK_UN)
 
             return True
@@ -6,10 +6,10 @@ Comprehensive validation of system configuration and positions.
 Run this to ensure all components are coherent and properly configured.
 """
 
-import json
 from pathlib import Path
 from typing import Dict, List, Tuple
 from ibis.core.trading_constants import TRADING
+from ibis.state_persistence import read_state
 
 
 class SystemHealthCheck:
@@ -85,8 +85,7 @@ class SystemHealthCheck:
             return False
             
         try:
-            with open(state_file, 'r') as f:
-                state = json.load(f)
+            state = read_state(str(state_file))
         except Exception as e:
             self.log_error(f"Failed to load state: {e}")
             return False
@@ -151,8 +150,7 @@ class SystemHealthCheck:
             return False
             
         try:
-            with open(state_file, 'r') as f:
-                state = json.load(f)
+            state = read_state(str(state_file))
         except:
             return False
             
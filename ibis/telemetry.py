@@ -7,7 +7,7 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 
 REDACT_KEYS = {"api_key", "api_secret", "api_passphrase", "passphrase", "secret", "key"}
@@ -27,45 +27,161 @@ def _redact(obj: Any) -> Any:
     return obj
 
 
+class Event:
+    """One bus entry; the dict view is built on first read and shared."""
+
+    __slots__ = ("id", "type", "ts", "_payload", "_view")
+
+    def __init__(self, event_id: int, event_type: str, payload: Dict[str, Any]):
+        self.id = event_id
+        self.type = event_type
+        self.ts = datetime.now(timezone.utc).isoformat()
+        # Redacted at emit: _redact rebuilds every dict and list, so later
+        # mutations by the emitter (nested ones included) can't reach a queued
+        # event or un-redact it
+        self._payload = _redact(payload)
+        self._view: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self._view is None:
+            self._view = {
+                "id": self.id,
+                "type": self.type,
+                "ts": self.ts,
+                "payload": self._payload,
+            }
+            self._payload = None
+        return self._view
+
+
+class Subscription:
+    """
+    Push feed of new events for one consumer (e.g. a dashboard websocket).
+
+    Events are queued up to `maxsize`; when the consumer falls behind, new
+    events are dropped for it and counted instead of growing the queue. A
+    consumer that sees `dropped` rise can backfill from the ring with
+    get_events(since_id=...) as long as the gap is within max_events.
+    """
+
+    def __init__(self, bus: "EventBus", maxsize: int):
+        self._bus = bus
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.delivered = 0
+        self.dropped = 0
+
+    def _offer(self, event: Event) -> None:
+        try:
+            self.queue.put_nowait(event)
+            self.delivered += 1
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def next_batch(self, limit: int = 200) -> List[Dict[str, Any]]:
+        """Wait for at least one event, then take whatever else is queued (up to limit)."""
+        events = [await self.queue.get()]
+        while len(events) < limit and not self.queue.empty():
+            events.append(self.queue.get_nowait())
+        return [e.to_dict() for e in events]
+
+    async def batches(
+        self, backlog: int = 200, limit: int = 200
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield event batches in id order, starting with the newest `backlog`
+        events in the ring. After the queue sheds events, everything past
+        the last yielded id is paged forward from the ring, oldest first,
+        so the gap is only lost if it outgrew max_events.
+        """
+        last_id = 0
+        dropped = 0  # drops before the first read count too
+        items = await self._bus.get_events(limit=backlog)
+        while True:
+            if self.dropped > dropped:
+                dropped = self.dropped
+                items = await self._bus.get_events(limit=self._bus.max_events, since_id=last_id)
+            items = [e for e in items if e["id"] > last_id]
+            if items:
+                last_id = items[-1]["id"]
+                yield items
+            items = await self.next_batch(limit=limit)
+
+    def close(self) -> None:
+        self._bus.unsubscribe(self)
+
+    async def __aenter__(self) -> "Subscription":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+
 class EventBus:
+    """
+    Fixed-size ring of the last `max_events` events plus push subscribers.
+
+    Ids are consecutive, so event N lives in slot N % max_events: append is
+    O(1) and get_events(since_id) jumps straight to the first newer slot
+    instead of scanning. Everything runs on the event loop without awaiting,
+    so no lock is needed.
+    """
+
     def __init__(self, max_events: int = 10000):
         self.max_events = max_events
-        self._events: List[Dict[str, Any]] = []
-        self._lock = asyncio.Lock()
+        self._ring: List[Optional[Event]] = [None] * max_events
         self._seq = 0
-
-    async def emit(self, event_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        async with self._lock:
-            self._seq += 1
-            event = {
-                "id": self._seq,
-                "type": event_type,
-                "ts": datetime.now(timezone.utc).isoformat(),
-                "payload": _redact(payload),
-            }
-            self._events.append(event)
-            if len(self._events) > self.max_events:
-                self._events = self._events[-self.max_events :]
-            return event
+        self._first_id = 1  # oldest id still readable (moves on clear/overflow)
+        self._subscribers: List[Subscription] = []
+        self.stats = {"emitted": 0, "dropped": 0}
+
+    async def emit(self, event_type: str, payload: Dict[str, Any]) -> Event:
+        self._seq += 1
+        event = Event(self._seq, event_type, payload)
+        self._ring[self._seq % self.max_events] = event
+        self.stats["emitted"] += 1
+        for subscriber in self._subscribers:
+            dropped = subscriber.dropped
+            subscriber._offer(event)
+            self.stats["dropped"] += subscriber.dropped - dropped
+        return event
 
     async def get_events(
         self, limit: int = 200, since_id: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        async with self._lock:
-            events = self._events
-            if since_id is not None:
-                events = [e for e in events if e["id"] > since_id]
-            return events[-limit:]
+        if limit <= 0:
+            return []
+        start = max(self._first_id, self._seq - self.max_events + 1, self._seq - limit + 1)
+        if since_id is not None:
+            start = max(start, since_id + 1)
+        ring, size = self._ring, self.max_events
+        return [ring[i % size].to_dict() for i in range(start, self._seq + 1)]
+
+    def subscribe(self, maxsize: int = 1000) -> Subscription:
+        subscriber = Subscription(self, maxsize)
+        self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscription) -> None:
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
 
     async def clear(self) -> None:
-        async with self._lock:
-            self._events.clear()
+        self._ring = [None] * self.max_events
+        self._first_id = self._seq + 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "last_id": self._seq,
+            "buffered": self._seq - max(self._first_id, self._seq - self.max_events + 1) + 1,
+            "subscribers": len(self._subscribers),
+        }
 
 
 _BUS = EventBus()
 
 
-async def emit_event(event_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+async def emit_event(event_type: str, payload: Dict[str, Any]) -> Event:
     return await _BUS.emit(event_type, payload)
 
 
@@ -75,3 +191,11 @@ async def get_events(limit: int = 200, since_id: Optional[int] = None) -> List[D
 
 async def clear_events() -> None:
     await _BUS.clear()
+
+
+def subscribe_events(maxsize: int = 1000) -> Subscription:
+    return _BUS.subscribe(maxsize)
+
+
+def get_event_stats() -> Dict[str, Any]:
+    return _BUS.get_stats()
@@ -182,14 +182,17 @@ recover_database() {
 import json
 import os
 import sqlite3
+import sys
 from datetime import datetime
 
 base_dir = os.environ["BASE_DIR"]
+sys.path.insert(0, base_dir)
+from ibis.state_persistence import read_state
+
 state_path = os.path.join(base_dir, "data", "ibis_true_state.json")
 db_path = os.path.join(base_dir, "data", "ibis_v8.db")
 
-with open(state_path, 'r') as f:
-    state = json.load(f)
+state = read_state(state_path)
 
 conn = sqlite3.connect(db_path)
 cursor = conn.cursor()
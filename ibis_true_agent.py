@@ -20,12 +20,21 @@ import logging
 from decimal import Decimal, ROUND_DOWN, ROUND_UP, InvalidOperation
 from datetime import datetime
 from typing import Dict, List, Optional, Any
+import numpy as np
 from ibis.exchange.kucoin_client import get_kucoin_client, clear_kucoin_client_instance
+from ibis.exchange.candle_archive import CandleArchive
+from ibis.state_persistence import JournalStore, StateWriter
+from ibis.exchange.market_state import MarketStateService
+from ibis.exchange.account_state import AccountStateService
+from ibis.exchange.position_pricing import PositionPricer
+from ibis.exit_watcher import ExitWatcher, LatencyHistogram
+from ibis.indicators.streaming import StreamingIndicatorHub
 from ibis.free_intelligence import FreeIntelligence
 from ibis.cross_exchange_monitor import CrossExchangeMonitor
 from ibis.core.trading_constants import TRADING, SCORE_THRESHOLDS, RISK_CONFIG
 from ibis.data_consolidation import run_full_sync as sync_data_stores
-from ibis.core.logging_config import get_logger, configure_logging
+from ibis.core.logging_config import configure_logging, get_event_log, get_logger
+from ibis.core.http_transport import close_http_transport
 
 # from ibis_phase1_optimizations import create_phase1_optimizer
 # from ibis_enhanced_integration import IBISEnhancedIntegration
@@ -143,6 +152,7 @@ class IBISTrueAgent:
 
     # Initialize logger as class attribute
     logger = get_logger(__name__)
+    EVENT_LOG_FILE = "/root/projects/Dont enter unless solicited/AGI Trader/data/ibis_true.log"
 
     def __init__(self):
         # Configure logging at agent initialization
@@ -153,9 +163,21 @@ class IBISTrueAgent:
         self.single_scan = False  # Set via CLI
 
         self.client = None
+        self.market_state = None
+        self.account_state = None
+        self.indicator_hub = None
+        self._pending_orders_lock = asyncio.Lock()
+        self._fill_check_task = None
+        self.exit_watcher = None
+        self._exit_strategy = {}
+        self.pricer = None
         self.symbols_cache = []
         self.market_intel = {}
         self.latest_tickers = {}
+        self._latest_tickers_ts = 0.0
+        # Entry fast path: decision (open_position called) to create_order ack
+        self.entry_latency = LatencyHistogram()
+        self.entry_stats = {"scan_quotes": 0, "rest_quotes": 0, "orders_acked": 0}
         self.cross_exchange = CrossExchangeMonitor()
         self.symbol_rules = {}
         self._close_lock = None
@@ -167,84 +189,114 @@ class IBISTrueAgent:
         self.memory_file = (
             "/root/projects/Dont enter unless solicited/AGI Trader/data/ibis_true_memory.json"
         )
+        self.indicator_snapshot_file = (
+            "/root/projects/Dont enter unless solicited/AGI Trader/data/ibis_indicators.json"
+        )
+        self.candle_archive_dir = (
+            "/root/projects/Dont enter unless solicited/AGI Trader/data/candles"
+        )
 
         os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
         os.makedirs(os.path.dirname(self.memory_file), exist_ok=True)
 
-        import json as state_json
         import fcntl
         from ibis.database.db import IbisDB
 
         def _normalize_symbol(sym: str) -> str:
             return str(sym).replace("-USDT", "").replace("-USDC", "")
 
-        def _sync_state_positions_to_db():
-            """Mirror in-memory state positions into SQLite for monitor/reconciliation consistency."""
-            try:
-                lock_path = os.path.join(os.path.dirname(self.state_file), "ibis_db.lock")
-                with open(lock_path, "w") as lock_f:
-                    fcntl.flock(lock_f, fcntl.LOCK_EX)
-
-                    db = IbisDB()
-                    active_symbols = set()
-                    for sym, pos in self.state.get("positions", {}).items():
-                        db_sym = _normalize_symbol(sym)
-                        active_symbols.add(db_sym)
-                        qty = float(pos.get("quantity", 0) or 0)
-                        entry = float(
-                            pos.get("buy_price", 0)
-                            or pos.get("entry_price", 0)
-                            or pos.get("current_price", 0)
-                            or 0
-                        )
-                        if qty <= 0 or entry <= 0:
-                            continue
+        def _position_rows():
+            """DB row signature per open position (only changed rows are re-synced)."""
+            rows = {}
+            for sym, pos in self.state.get("positions", {}).items():
+                qty = float(pos.get("quantity", 0) or 0)
+                entry = float(
+                    pos.get("buy_price", 0)
+                    or pos.get("entry_price", 0)
+                    or pos.get("current_price", 0)
+                    or 0
+                )
+                if qty <= 0 or entry <= 0:
+                    continue
+                rows[_normalize_symbol(sym)] = (
+                    qty,
+                    entry,
+                    pos.get("sl"),
+                    pos.get("tp"),
+                    pos.get("opportunity_score"),
+                    pos.get("agi_insight"),
+                    pos.get("fee"),
+                )
+            return rows
+
+        state_db = {}
+
+        def _sync_state_positions_to_db(upserts, deletes, reconcile):
+            """Mirror changed state positions into SQLite for monitor/reconciliation consistency."""
+            lock_path = os.path.join(os.path.dirname(self.state_file), "ibis_db.lock")
+            with open(lock_path, "w") as lock_f:
+                fcntl.flock(lock_f, fcntl.LOCK_EX)
+                try:
+                    # One IbisDB for the writer thread: schema init runs once
+                    db = state_db.get("db")
+                    if db is None:
+                        db = state_db["db"] = IbisDB()
+                    for db_sym, row in upserts.items():
+                        qty, entry, sl, tp, score, insight, fee = row
                         db.update_position(
                             symbol=db_sym,
                             quantity=qty,
                             price=entry,
-                            stop_loss=pos.get("sl"),
-                            take_profit=pos.get("tp"),
-                            agi_score=pos.get("opportunity_score"),
-                            agi_insight=pos.get("agi_insight"),
-                            entry_fee=pos.get("fee"),
+                            stop_loss=sl,
+                            take_profit=tp,
+                            agi_score=score,
+                            agi_insight=insight,
+                            entry_fee=fee,
                         )
 
-                    # Remove stale rows to keep DB aligned with live state.
+                    # Remove closed positions; on the first sync also drop rows
+                    # left behind by earlier runs to keep DB aligned with live state.
                     with db.get_conn() as conn:
-                        rows = conn.execute("SELECT symbol FROM positions").fetchall()
-                        db_symbols = {str(r["symbol"]) for r in rows}
-                        stale = db_symbols - active_symbols
+                        stale = set(deletes)
+                        if reconcile is not None:
+                            rows = conn.execute("SELECT symbol FROM positions").fetchall()
+                            stale |= {str(r["symbol"]) for r in rows} - set(reconcile)
                         for stale_sym in stale:
                             conn.execute("DELETE FROM positions WHERE symbol = ?", (stale_sym,))
-
+                finally:
                     fcntl.flock(lock_f, fcntl.LOCK_UN)
-            except Exception as e:
-                self.logger.info(f"   ⚠️ DB position sync failed: {e}")
+
+        # State and memory are journaled: saves append only what changed to
+        # <file>.journal, and compaction periodically rewrites <file> itself
+        # as a full JSON snapshot. Loads replay the journal tail on top.
+        self._state_journal = JournalStore(self.state_file)
+        self._memory_journal = JournalStore(self.memory_file)
 
         def _load_memory():
             try:
-                with open(self.memory_file) as f:
-                    return state_json.load(f)
-            except:
-                return {
-                    "learned_regimes": {},
-                    "performance_by_symbol": {},
-                    "market_insights": [],
-                    "adaptation_history": [],
-                    "total_cycles": 0,
-                }
+                memory = self._memory_journal.load()
+            except Exception:
+                memory = {}
+            return memory or {
+                "learned_regimes": {},
+                "performance_by_symbol": {},
+                "market_insights": [],
+                "adaptation_history": [],
+                "total_cycles": 0,
+            }
 
-        def _save_memory():
+        self._memory_writer = StateWriter(
+            self.memory_file,
+            snapshot=lambda: self.agent_memory,
+            max_latency=1.0,
+            journal=self._memory_journal,
+        )
+
+        def _save_memory(immediate: bool = False):
             try:
-                tmp_memory_file = f"{self.memory_file}.tmp"
-                with open(tmp_memory_file, "w") as f:
-                    state_json.dump(self.agent_memory, f, indent=2)
-                    f.flush()
-                    os.fsync(f.fileno())
-                os.replace(tmp_memory_file, self.memory_file)
-            except:
-                pass
+                self._memory_writer.save(immediate=immediate)
+            except Exception as e:
+                print(f"   ⚠️ Memory save error: {e}")
 
         self._load_memory = _load_memory
         self._save_memory = _save_memory
@@ -256,10 +308,8 @@ class IBISTrueAgent:
         self.agent_memory.setdefault("entry_reject_cooldown_until", {})
         self.agent_memory.setdefault("stale_buy_cancel_counts", {})
         self.agent_memory.setdefault("stale_buy_last_cancel", {})
-        self._last_db_sync_ts = 0.0
         self._symbol_fee_profile = {}
         self._symbol_fee_counts = {}
-        self._last_fee_profile_refresh_ts = 0.0
         self._last_open_orders_log_sig = ""
         self._last_open_orders_log_ts = 0.0
         self._last_recycle_close_ts = self.agent_memory.get("recycle_close_ts", {}) or {}
@@ -268,43 +318,43 @@ class IBISTrueAgent:
             self.agent_memory["recycle_close_ts"] = self._last_recycle_close_ts
         self._recycle_closes_this_cycle = 0
 
-        def _save_state():
+        def _state_snapshot():
+            return {
+                "positions": self.state.get("positions", {}),
+                "market_regime": self.state.get("market_regime", "unknown"),
+                "agent_mode": self.state.get("agent_mode", "ADAPTIVE"),
+                "daily": self.state.get("daily", {}),
+                "capital_awareness": self.state.get("capital_awareness", {}),
+                "liquidity_history": self.state.get("liquidity_history", [])[-20:],
+                "updated": datetime.now().isoformat(),
+            }
+
+        # Write-behind: _save_state() marks dirty and coalesces into one write
+        # per window on a background thread; immediate=True persists right away
+        # (after fills, opens and closes).
+        self._state_writer = StateWriter(
+            self.state_file,
+            snapshot=_state_snapshot,
+            rows=_position_rows,
+            sync_rows=_sync_state_positions_to_db,
+            max_latency=0.5,
+            sync_interval=5.0,
+            journal=self._state_journal,
+        )
+
+        def _save_state(immediate: bool = False):
             try:
-                state = {
-                    "positions": self.state.get("positions", {}),
-                    "market_regime": self.state.get("market_regime", "unknown"),
-                    "agent_mode": self.state.get("agent_mode", "ADAPTIVE"),
-                    "daily": self.state.get("daily", {}),
-                    "capital_awareness": self.state.get("capital_awareness", {}),
-                    "liquidity_history": self.state.get("liquidity_history", [])[-20:],
-                    "updated": datetime.now().isoformat(),
-                }
-                tmp_state_file = f"{self.state_file}.tmp"
-                with open(tmp_state_file, "w") as f:
-                    state_json.dump(state, f, indent=2)
-                    f.flush()
-                    os.fsync(f.fileno())
-                os.replace(tmp_state_file, self.state_file)
-
-                # Keep SQLite view fresh for monitors and reconciliations.
-                now_ts = time.time()
-                if now_ts - self._last_db_sync_ts >= 5:
-                    _sync_state_positions_to_db()
-                    self._last_db_sync_ts = now_ts
+                # Every position mutation is followed by a save: re-arm tick exits
+                if self.exit_watcher is not None:
+                    self.exit_watcher.sync(self.state.get("positions", {}))
+                self._state_writer.save(immediate=immediate)
             except Exception as e:
                 print(f"   ⚠️ State save error: {e}")
-                pass
-
-        def _save_state_immediate(self):
-            """Force immediate state save after trades"""
-            self._save_state()
-            print(f"   💾 State saved at {datetime.now().strftime('%H:%M:%S')}")
 
         def _load_state():
             try:
-                with open(self.state_file) as f:
-                    return state_json.load(f)
-            except:
+                return self._state_journal.load()
+            except Exception:
                 return {}
 
         self._save_state = _save_state
@@ -364,7 +414,14 @@ class IBISTrueAgent:
             "recycle_min_projected_profit_usdt": 0.03,
             "recycle_min_projected_pnl_pct": 0.003,
             "reconcile_cycle_interval": 10,
-            "fee_profile_history_limit": 400,
+            "market_stream_enabled": True,
+            "account_stream_enabled": True,
+            "tick_exit_enabled": True,
+            "pricing_max_concurrency": 8,
+            "request_cache_max_age": 30,
+            "batch_scoring_enabled": True,
+            "streaming_indicator_scoring": True,
+            "candle_archive_enabled": True,
             "execution_fee_guard_enabled": True,
             "execution_fee_max_per_side": 0.0035,
             "execution_fee_override_score": 90,
@@ -384,6 +441,7 @@ class IBISTrueAgent:
             "stale_buy_reentry_price_improvement_bps": 8,
             "entry_reject_cooldown_seconds": 45,
             "entry_reject_cooldown_max_seconds": 180,
+            "entry_quote_max_age_seconds": 5.0,
             "entry_admission_enabled": True,
             "entry_admission_min_edge": 45.0,
             "entry_admission_fee_penalty_points": 4000.0,
@@ -674,9 +732,10 @@ class IBISTrueAgent:
             balances = await self.client.get_all_balances()
             self.state["usdt_balance"] = float(balances.get("USDT", {}).get("available", 0))
 
+            tickers = await self._price_tickers(self.state["positions"])
             for sym, pos in list(self.state["positions"].items()):
                 try:
-                    ticker = await self.client.get_ticker(self.to_full_symbol(sym))
+                    ticker = tickers.get(sym)
                     current_price = float(ticker.price) if ticker else pos.get("buy_price", 0)
 
                     quantity = pos.get("quantity", 0)
@@ -984,16 +1043,18 @@ class IBISTrueAgent:
                         }
                     )
 
+            tickers = await self._price_tickers(
+                c for c, d in balances.items() if c != "USDT" and float(d.get("balance", 0)) > 0
+            )
             for currency, data in balances.items():
                 if currency == "USDT":
                     continue
                 balance = float(data.get("balance", 0))
                 if balance > 0:
-                    # Get real-time price directly from exchange (not cache)
-                    try:
-                        ticker = await self.client.get_ticker(f"{currency}-USDT")
-                        price = float(ticker.price) if ticker else 0
-                    except:
+                    ticker = tickers.get(currency)
+                    if ticker:
+                        price = float(ticker.price)
+                    else:
                         price = self.market_intel.get(currency, {}).get("price", 0)
 
                     if price > 0:
@@ -1095,59 +1156,15 @@ class IBISTrueAgent:
             self.logger.info(f"   💵 Capital refresh ({context}): ${strategy['available']:.2f}")
         return strategy["available"]
 
-    def _load_symbol_fee_profile(self, force: bool = False) -> Dict[str, float]:
-        """Build rolling fee-rate profile from recent fills: symbol -> fee_rate_per_side."""
-        now_ts = time.time()
-        if (
-            not force
-            and self._symbol_fee_profile
-            and now_ts - self._last_fee_profile_refresh_ts < 60
-        ):
-            return self._symbol_fee_profile
-
-        profile: Dict[str, float] = {}
-        counts: Dict[str, int] = {}
-        history_limit = int(self.config.get("fee_profile_history_limit", 400))
-        trade_history_path = os.path.join(os.path.dirname(self.state_file), "trade_history.json")
-
+    def _load_symbol_fee_profile(self) -> Dict[str, float]:
+        """Rolling fee-rate profile from the fee model: symbol -> fee_rate_per_side."""
         try:
-            with open(trade_history_path, "r") as f:
-                trade_obj = json.load(f)
-            trades = trade_obj.get("trades", []) if isinstance(trade_obj, dict) else []
-            recent = trades[-history_limit:] if history_limit > 0 else trades
-
-            accum: Dict[str, Dict[str, float]] = {}
-            for row in recent:
-                symbol = (
-                    str(row.get("symbol", "")).replace("-USDT", "").replace("-USDC", "").strip()
-                )
-                if not symbol:
-                    continue
-                try:
-                    funds = float(row.get("funds", 0) or 0)
-                    fee = float(row.get("fee", row.get("fees", 0)) or 0)
-                except (TypeError, ValueError):
-                    continue
-                if funds <= 0 or fee < 0:
-                    continue
-                if symbol not in accum:
-                    accum[symbol] = {"fee": 0.0, "funds": 0.0}
-                    counts[symbol] = 0
-                accum[symbol]["fee"] += fee
-                accum[symbol]["funds"] += funds
-                counts[symbol] += 1
-
-            for sym, vals in accum.items():
-                if vals["funds"] > 0:
-                    profile[sym] = vals["fee"] / vals["funds"]
-        except Exception:
-            profile = {}
-            counts = {}
-
-        self._symbol_fee_profile = profile
-        self._symbol_fee_counts = counts
-        self._last_fee_profile_refresh_ts = now_ts
-        return profile
+            fee_model = self.pnl_tracker.fee_model
+            self._symbol_fee_profile = fee_model.profile()
+            self._symbol_fee_counts = fee_model.counts()
+        except Exception as e:
+            self.logger.debug(f"Fee profile unavailable: {e}")
+        return self._symbol_fee_profile
 
     def _get_execution_fee_blocklist(self) -> set:
         """Symbols to avoid for execution efficiency based on observed fee pressure."""
@@ -1556,14 +1573,18 @@ class IBISTrueAgent:
                 if c not in STABLECOINS and float(b.get("balance", 0)) > 0.00000001
             }
 
+            # One batch prices every holding; the scan snapshot covers any misses
+            tickers = await self._price_tickers(actual_holdings)
+            for currency in actual_holdings:
+                if currency not in tickers and currency in self.latest_tickers:
+                    tickers[currency] = self.latest_tickers[currency]
+
             # 1. Update/Add actual holdings to state
             for currency, balance in actual_holdings.items():
                 if currency not in self.state["positions"]:
                     # New asset found on exchange not in state
                     try:
-                        ticker = self.latest_tickers.get(currency) or await self.client.get_ticker(
-                            f"{currency}-USDT"
-                        )
+                        ticker = tickers.get(currency)
                         price = float(ticker.price) if ticker else 0.1  # Fallback
 
                         position_value = balance * price
@@ -1603,9 +1624,7 @@ class IBISTrueAgent:
                         self.state["positions"][currency]["quantity"] = balance
                     # Fix invalid entry price
                     if self.state["positions"][currency]["buy_price"] == 0.0:
-                        ticker = self.latest_tickers.get(currency) or await self.client.get_ticker(
-                            f"{currency}-USDT"
-                        )
+                        ticker = tickers.get(currency)
                         price = (
                             float(ticker.price)
                             if ticker
@@ -1638,11 +1657,7 @@ class IBISTrueAgent:
                     continue
 
                 balance = actual_holdings.get(sym, 0)
-                ticker = (
-                    self.latest_tickers.get(sym) or await self.client.get_ticker(f"{sym}-USDT")
-                    if sym in actual_holdings
-                    else None
-                )
+                ticker = tickers.get(sym)
                 price = float(ticker.price) if ticker else pos.get("current_price", 0)
                 position_value = balance * price
 
@@ -1735,7 +1750,7 @@ class IBISTrueAgent:
 
     async def initialize(self):
         """Initialize the agent with basic setup"""
-        self.log_file = "/root/projects/Dont enter unless solicited/AGI Trader/data/ibis_true.log"
+        self.log_file = self.EVENT_LOG_FILE
 
         self.logger.info("=" * 70)
         self.logger.info("🦅 IBIS TRUE AUTONOMOUS AGENT v3.1")
@@ -1750,6 +1765,51 @@ class IBISTrueAgent:
         self.client = get_kucoin_client()
         if not self.client:
             raise Exception("Failed to initialize KuCoin client")
+        self.client.request_cache.max_age = float(self.config.get("request_cache_max_age", 30))
+
+        # On-disk candle archive: warm-up reads history locally, fetches only the gap
+        if self.config.get("candle_archive_enabled", True):
+            self.client.candle_archive = CandleArchive(self.candle_archive_dir)
+
+        # Streaming market state (tickers/candles/orderbooks pushed over WebSocket)
+        if self.config.get("market_stream_enabled", True):
+            self.market_state = MarketStateService(self.client)
+            # Incremental RSI/EMA/ATR/Bollinger/VWAP/OBV fed by kline pushes
+            self.indicator_hub = StreamingIndicatorHub(history=self.client._candle_store.get)
+            self.indicator_hub.load(self.indicator_snapshot_file)
+            self.indicator_hub.attach(self.market_state)
+            # TP/SL evaluated on every streamed price of a held symbol
+            if self.config.get("tick_exit_enabled", True):
+                self.exit_watcher = ExitWatcher(self._on_tick_exit)
+                self.exit_watcher.sync(self.state.get("positions", {}))
+                self.market_state.ticker_listeners.append(self.exit_watcher.on_ticker)
+            try:
+                await self.market_state.start()
+            except Exception as e:
+                self.logger.info(f"   ⚠️ Market stream unavailable, using REST: {e}")
+
+        # Held symbols priced in one pass: stream cache, then one allTickers
+        # snapshot shared by the cycle, then bounded concurrent lookups
+        self.pricer = PositionPricer(
+            self.client,
+            market_state=self.market_state,
+            max_concurrency=self.config.get("pricing_max_concurrency", 8),
+        )
+
+        # Own orders and balances pushed over the private channels; the client
+        # answers get_order/get_open_orders/get_all_balances from memory
+        if (
+            self.config.get("account_stream_enabled", True)
+            and not self.client.paper_trading
+            and self.client.api_key
+        ):
+            self.account_state = AccountStateService(self.client)
+            self.account_state.order_listeners.append(self._on_account_order_event)
+            self.client.account_state = self.account_state
+            try:
+                await self.account_state.start()
+            except Exception as e:
+                self.logger.info(f"   ⚠️ Account stream unavailable, using REST: {e}")
 
         # Initialize cross-exchange monitor (Binance)
         await self.cross_exchange.initialize()
@@ -1837,6 +1897,39 @@ class IBISTrueAgent:
             print(f"   ⚠️ Discovery error: {e}")
             self.symbols_cache = []
 
+    async def _get_market_tickers(self):
+        """All USDT tickers, served from the streaming market state when it is live"""
+        if self.market_state is not None:
+            return await self.market_state.get_tickers()
+        return await self.client.get_tickers()
+
+    async def _price_tickers(self, symbols) -> Dict:
+        """Tickers for base symbols ("SOL") resolved in one batch by the shared pricer"""
+        if self.pricer is None:
+            self.pricer = PositionPricer(self.client, market_state=self.market_state)
+        try:
+            return await self.pricer.tickers(symbols)
+        except Exception as e:
+            self.logger.info(f"   ⚠️ Batch pricing failed: {e}")
+            return {}
+
+    async def _balance_prices(self, balances: Dict) -> Dict[str, float]:
+        """Price every non-USDT balance: scan intel first, one pricer batch for the rest"""
+        prices = {}
+        missing = []
+        for currency, data in balances.items():
+            if currency == "USDT" or float(data.get("balance", 0)) <= 0:
+                continue
+            price = self.market_intel.get(currency, {}).get("price", 0)
+            if price > 0:
+                prices[currency] = price
+            else:
+                missing.append(currency)
+        if missing:
+            for currency, ticker in (await self._price_tickers(missing)).items():
+                prices[currency] = float(ticker.price)
+        return prices
+
     async def fetch_symbol_rules(self):
         """Fetch symbol trading rules (minSize, increment) for proper order sizing"""
         try:
@@ -1862,25 +1955,19 @@ class IBISTrueAgent:
         """Comprehensive AI-powered market intelligence analysis optimized for SPEED and DEPTH"""
 
         market_intel = {}
-        log_file = "/root/projects/Dont enter unless solicited/AGI Trader/data/ibis_true.log"
-
-        def log_event(msg):
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            try:
-                with open(log_file, "a") as f:
-                    f.write(f"[{timestamp}] {msg}\n")
-            except:
-                pass
-            print(msg)
+        log_event = get_event_log(self.EVENT_LOG_FILE, echo=True)
 
         log_event("   🔍 IBIS performing rapid market screening...")
 
         try:
-            tickers = await self.client.get_tickers()
+            tickers = await self._get_market_tickers()
             self.latest_tickers = {
                 t.symbol.replace("-USDT", ""): t for t in tickers if t.symbol.endswith("-USDT")
             }
+            self._latest_tickers_ts = time.time()
             ticker_map = self.latest_tickers
+            if self.pricer is not None:
+                self.pricer.absorb(tickers)
         except Exception as e:
             log_event(f"   ⚠️ Could not fetch all tickers: {e}")
             ticker_map = {}
@@ -1956,7 +2043,9 @@ class IBISTrueAgent:
                 except Exception as e:
                     return None
 
-                candle_analysis = self._analyze_candles(candles_1m, candles_5m, candles_15m)
+                candle_analysis = self._analyze_candles(
+                    candles_1m, candles_5m, candles_15m, streamed=self._streaming_indicators(sym)
+                )
 
                 # Extract closes and volumes from 1-minute candles
                 closes = [candle.close for candle in candles_1m] if candles_1m else []
@@ -2046,67 +2135,23 @@ class IBISTrueAgent:
                 # Calculate funnel score
                 funnel_score = unified_scorer.calculate_funnel_score(symbol_data)
 
-                # Calculate final score with funnel adjustment
-                score = unified_result["score"] * (0.8 + (funnel_score / 500))
-                accumulation_confidence = liquidity_signals.get("accumulation_confidence", 1.0)
-                liquidity_boost = max(0.0, liquidity_signals["volume_spike_ratio"] - 1.0) * 4.0
-                pressure_advantage = (
-                    liquidity_signals["orderbook_bid_pressure"]
-                    - liquidity_signals["orderbook_ask_pressure"]
+                return self._build_symbol_intel(
+                    sym,
+                    price=price,
+                    change_24h=change_24h,
+                    volume_24h=volume_24h,
+                    volatility=volatility,
+                    closes=closes,
+                    volumes=volumes,
+                    candle_analysis=candle_analysis,
+                    liquidity_signals=liquidity_signals,
+                    base_score=base_score,
+                    indicator_composite=indicator_composite,
+                    momentum_mtf_score=momentum_mtf_score,
+                    unified_result=unified_result,
+                    funnel_score=funnel_score,
+                    fg_score=fg_score,
                 )
-                liquidity_boost += max(0.0, pressure_advantage) * 8.0
-                liquidity_boost += max(0.0, liquidity_signals["orderbook_imbalance"]) * 6.0
-                liquidity_boost += max(0.0, accumulation_confidence - 1.0) * 5.0
-                liquidity_bonus = min(7.0, liquidity_boost)
-                score += liquidity_bonus
-
-                # Get snipe score for comparison
-                if len(closes) >= 10 and len(volumes) >= 10:
-                    snipe_result = score_snipe_opportunity(
-                        symbol=sym,
-                        closes=closes,
-                        volumes=volumes,
-                        technical_score=base_score,
-                        agi_score=indicator_composite,
-                        mtf_score=momentum_mtf_score,
-                        volume_24h=volume_24h,
-                        fear_greed_index=fg_score,
-                        momentum_1h=momentum_1h,
-                        change_24h=change_24h,
-                    )
-                else:
-                    snipe_result = {"final_score": 50, "tier": "STANDARD"}
-
-                return {
-                    "symbol": sym,
-                    "price": price,
-                    "current_price": price,
-                    "change_24h": change_24h,
-                    "momentum_1h": momentum_1h,
-                    "momentum_1h_raw": momentum_1h_raw,
-                    "momentum_15m": momentum_15m,
-                    "momentum_5m": momentum_5m,
-                    "volume_momentum": volume_momentum,
-                    "momentum_confidence": momentum_confidence,
-                    "momentum_mtf_score": momentum_mtf_score,
-                    "volatility": volatility,
-                    "volatility_1m": candle_analysis.get("volatility_1m", 0.02),
-                    "volatility_5m": candle_analysis.get("volatility_5m", 0.02),
-                    "volatility_15m": candle_analysis.get("volatility_15m", 0.02),
-                    "spread": min(volatility * 0.3, 0.02),
-                    "volume_24h": volume_24h,
-                    "score": score,
-                    "unified_score": unified_result["score"],
-                    "unified_confidence": unified_result["confidence"],
-                    "funnel_score": funnel_score,
-                    "snipe_score": snipe_result,
-                    "unified_intel": unified_result,
-                    "enhanced_intel": candle_analysis,
-                    "timestamp": datetime.now().isoformat(),
-                    "risk_level": self._calculate_risk_level(volatility, score),
-                    "candle_analysis": candle_analysis,
-                    "agi_insight": f"Score: {score:.1f} | Confidence: {unified_result['confidence']:.1f} | Funnel: {funnel_score:.1f}",
-                }
             except Exception as e:
                 import traceback
 
@@ -2165,7 +2210,7 @@ class IBISTrueAgent:
                 self.logger.info("   ⚠️ No trading pairs found - attempting fallback discovery")
                 # Fallback to fetching symbols directly from tickers
                 try:
-                    tickers = await self.client.get_tickers()
+                    tickers = await self._get_market_tickers()
                     fallback_symbols = []
                     # Use local definitions since self.stablecoins/self.ignored_symbols may not be defined
                     stablecoins = {"USDT", "USDC", "DAI", "TUSD", "USDP", "USD1", "USDY"}
@@ -2203,13 +2248,8 @@ class IBISTrueAgent:
         # Dynamic symbol filtering based on real-time market data
         qualified_symbols = []
 
-        # Get current tickers
-        tickers = await self.client.get_tickers()
-        ticker_map = {}
-        for t in tickers:
-            if t.symbol.endswith("-USDT"):
-                sym = t.symbol.replace("-USDT", "")
-                ticker_map[sym] = t
+        # Reuse the tickers fetched at the start of this scan
+        ticker_map = self.latest_tickers
 
         for sym in self.symbols_cache:
             if sym in holdings:
@@ -2336,7 +2376,15 @@ class IBISTrueAgent:
 
         self.logger.info(f"   📋 Priority Symbols: {priority_symbols}")
 
-        semaphore = asyncio.Semaphore(E.PARALLEL_ANALYSIS_SIZE)
+        if self.market_state is not None:
+            await self.market_state.track_symbols(f"{sym}-USDT" for sym in priority_symbols)
+
+        # Each symbol costs ~4 market requests; the client's AIMD controller
+        # decides how many fit in flight right now (429s/latency shrink it)
+        parallel = self.client.rate_limiter.parallelism(
+            requests_per_task=4, cap=E.PARALLEL_ANALYSIS_SIZE * 4
+        )
+        semaphore = asyncio.Semaphore(parallel)
 
         # Pre-fetch Fear & Greed index once per cycle
         fg_data = None
@@ -2358,12 +2406,27 @@ class IBISTrueAgent:
             f"   ⚡ IBIS performing deep analysis on top {len(priority_symbols)} priority symbols..."
         )
 
-        # Create analysis tasks
-        tasks = []
-        for sym in priority_symbols:
-            tasks.append(analyze_with_limit(sym))
+        if self.config.get("batch_scoring_enabled", True):
+            try:
+                results = await self._score_symbols_batch(
+                    priority_symbols, ticker_map, fg_score, parallel
+                )
+                for res in results:
+                    self.logger.info(
+                        f"      ✅ Opportunity: {res['symbol']} (Score: {res['score']:.1f})"
+                    )
+            except Exception as e:
+                self.logger.info(f"      ⚠️ Batch scoring failed, falling back per symbol: {e}")
+                results = await asyncio.gather(
+                    *(analyze_with_limit(sym) for sym in priority_symbols)
+                )
+        else:
+            # Create analysis tasks
+            tasks = []
+            for sym in priority_symbols:
+                tasks.append(analyze_with_limit(sym))
 
-        results = await asyncio.gather(*tasks)
+            results = await asyncio.gather(*tasks)
 
         for result in results:
             if result:
@@ -2373,6 +2436,263 @@ class IBISTrueAgent:
         self.market_intel = market_intel
         return market_intel
 
+    def _build_symbol_intel(
+        self,
+        sym,
+        price,
+        change_24h,
+        volume_24h,
+        volatility,
+        closes,
+        volumes,
+        candle_analysis,
+        liquidity_signals,
+        base_score,
+        indicator_composite,
+        momentum_mtf_score,
+        unified_result,
+        funnel_score,
+        fg_score,
+    ):
+        """Final per-symbol market_intel entry shared by the scalar and batch scoring paths"""
+        momentum_1h = candle_analysis.get("momentum_1h", 0)
+        momentum_1h_raw = candle_analysis.get("momentum_1h_raw", momentum_1h)
+        momentum_15m = candle_analysis.get("momentum_15m", 0)
+        momentum_5m = candle_analysis.get("momentum_5m", 0)
+        volume_momentum = candle_analysis.get("volume_momentum", 0)
+        momentum_confidence = candle_analysis.get("momentum_confidence", 0.0)
+
+        # Calculate final score with funnel adjustment
+        score = unified_result["score"] * (0.8 + (funnel_score / 500))
+        accumulation_confidence = liquidity_signals.get("accumulation_confidence", 1.0)
+        liquidity_boost = max(0.0, liquidity_signals["volume_spike_ratio"] - 1.0) * 4.0
+        pressure_advantage = (
+            liquidity_signals["orderbook_bid_pressure"]
+            - liquidity_signals["orderbook_ask_pressure"]
+        )
+        liquidity_boost += max(0.0, pressure_advantage) * 8.0
+        liquidity_boost += max(0.0, liquidity_signals["orderbook_imbalance"]) * 6.0
+        liquidity_boost += max(0.0, accumulation_confidence - 1.0) * 5.0
+        liquidity_bonus = min(7.0, liquidity_boost)
+        score += liquidity_bonus
+
+        # Get snipe score for comparison
+        if len(closes) >= 10 and len(volumes) >= 10:
+            snipe_result = score_snipe_opportunity(
+                symbol=sym,
+                closes=closes,
+                volumes=volumes,
+                technical_score=base_score,
+                agi_score=indicator_composite,
+                mtf_score=momentum_mtf_score,
+                volume_24h=volume_24h,
+                fear_greed_index=fg_score,
+                momentum_1h=momentum_1h,
+                change_24h=change_24h,
+            )
+        else:
+            snipe_result = {"final_score": 50, "tier": "STANDARD"}
+
+        return {
+            "symbol": sym,
+            "price": price,
+            "current_price": price,
+            "change_24h": change_24h,
+            "momentum_1h": momentum_1h,
+            "momentum_1h_raw": momentum_1h_raw,
+            "momentum_15m": momentum_15m,
+            "momentum_5m": momentum_5m,
+            "volume_momentum": volume_momentum,
+            "momentum_confidence": momentum_confidence,
+            "momentum_mtf_score": momentum_mtf_score,
+            "volatility": volatility,
+            "volatility_1m": candle_analysis.get("volatility_1m", 0.02),
+            "volatility_5m": candle_analysis.get("volatility_5m", 0.02),
+            "volatility_15m": candle_analysis.get("volatility_15m", 0.02),
+            "spread": min(volatility * 0.3, 0.02),
+            "volume_24h": volume_24h,
+            "score": score,
+            "unified_score": unified_result["score"],
+            "unified_confidence": unified_result["confidence"],
+            "funnel_score": funnel_score,
+            "snipe_score": snipe_result,
+            "unified_intel": unified_result,
+            "enhanced_intel": candle_analysis,
+            "timestamp": datetime.now().isoformat(),
+            "risk_level": self._calculate_risk_level(volatility, score),
+            "candle_analysis": candle_analysis,
+            "agi_insight": f"Score: {score:.1f} | Confidence: {unified_result['confidence']:.1f} | Funnel: {funnel_score:.1f}",
+        }
+
+    async def _score_symbols_batch(self, symbols, ticker_map, fg_score, concurrency=10):
+        """Score the whole priority universe at once with ibis.batch_scoring.
+
+        Candles and orderbook signals are still fetched per symbol (I/O); the
+        numeric work - momentum bundle, volatility, trend, technical, unified
+        and funnel scores - runs as NumPy column operations across all symbols.
+        Returns market_intel entries identical to analyze_symbol's.
+        """
+        from ibis.batch_scoring import (
+            batch_candle_features,
+            batch_funnel_score,
+            batch_liquidity_score,
+            batch_technical_score,
+            batch_unified_score,
+            row,
+        )
+        from ibis.core.unified_scoring import unified_scorer
+
+        symbols = [sym for sym in symbols if ticker_map.get(sym)]
+        if not symbols:
+            return []
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_candles(sym):
+            async with semaphore:
+                try:
+                    return await asyncio.gather(
+                        self.client.get_candles(f"{sym}-USDT", "1min", limit=61),
+                        self.client.get_candles(f"{sym}-USDT", "5min", limit=24),
+                        self.client.get_candles(f"{sym}-USDT", "15min", limit=16),
+                    )
+                except Exception:
+                    return None
+
+        fetched = await asyncio.gather(*(fetch_candles(sym) for sym in symbols))
+        symbols = [sym for sym, res in zip(symbols, fetched) if res is not None]
+        fetched = [res for res in fetched if res is not None]
+        if not symbols:
+            return []
+
+        candles_1m = [res[0] or [] for res in fetched]
+        candles_5m = [res[1] or [] for res in fetched]
+        candles_15m = [res[2] or [] for res in fetched]
+        features = batch_candle_features(candles_1m, candles_5m, candles_15m)
+
+        price = np.array([float(ticker_map[sym].price) for sym in symbols])
+        change_24h = np.array(
+            [float(getattr(ticker_map[sym], "change_24h", 0) or 0) for sym in symbols]
+        )
+        volume_24h = np.array(
+            [
+                float(
+                    getattr(ticker_map[sym], "vol_24h", 0)
+                    or getattr(ticker_map[sym], "volume_24h", 0)
+                    or 0
+                )
+                for sym in symbols
+            ]
+        )
+        high_24h = np.array(
+            [float(getattr(ticker_map[sym], "high_24h", 0) or 0) for sym in symbols]
+        )
+        low_24h = np.array([float(getattr(ticker_map[sym], "low_24h", 0) or 0) for sym in symbols])
+        high_24h = np.where(high_24h > 0, high_24h, price * 1.01)
+        low_24h = np.where(low_24h > 0, low_24h, price * 0.99)
+        volatility = np.where(high_24h > low_24h, (high_24h - low_24h) / price, 0.02)
+
+        candle_analyses = [
+            self._analyze_candles(
+                c1, c5, c15, features=row(features, i), streamed=self._streaming_indicators(sym)
+            )
+            for i, (sym, c1, c5, c15) in enumerate(zip(symbols, candles_1m, candles_5m, candles_15m))
+        ]
+        closes = [[c.close for c in c1] for c1 in candles_1m]
+        volumes = [[c.volume for c in c1] for c1 in candles_1m]
+
+        liquidity = await asyncio.gather(
+            *(
+                self._assess_liquidity_signals(sym, float(price[i]), float(volatility[i]), volumes[i])
+                for i, sym in enumerate(symbols)
+            )
+        )
+
+        momentum_1h = features["momentum_composite"]
+        indicator_composite = np.array([ca.get("composite_score", 50) for ca in candle_analyses])
+        base_score = batch_technical_score(momentum_1h, change_24h)
+        momentum_mtf_score = np.clip(
+            50
+            + features["momentum_5m"] * 6.0
+            + features["momentum_15m"] * 8.0
+            + features["momentum_1h_raw"] * 4.0,
+            0,
+            100,
+        )
+        volume_momentum_score = np.clip(50 + features["volume_momentum"] * 0.4, 0, 100)
+        blended_volume_score = np.clip(
+            volume_momentum_score * 0.65 + batch_liquidity_score(volume_24h) * 0.35, 0, 100
+        )
+        sentiment = np.full(len(symbols), float(fg_score))
+
+        cfg = unified_scorer.regime_config
+        unified = batch_unified_score(
+            base_score,
+            indicator_composite,
+            momentum_mtf_score,
+            blended_volume_score,
+            sentiment,
+            symbols,
+            cfg,
+        )
+        funnel = batch_funnel_score(
+            volume_24h,
+            volatility,
+            change_24h,
+            momentum_1h,
+            base_score,
+            indicator_composite,
+            np.minimum(volatility * 0.3, 0.02),
+        )
+
+        results = []
+        for i, sym in enumerate(symbols):
+            components = (
+                base_score[i],
+                indicator_composite[i],
+                momentum_mtf_score[i],
+                blended_volume_score[i],
+                sentiment[i],
+            )
+            weights = (
+                cfg.technical_weight,
+                cfg.agi_weight,
+                cfg.mtf_weight,
+                cfg.volume_weight,
+                cfg.sentiment_weight,
+            )
+            unified_result = {
+                "score": float(unified["score"][i]),
+                "confidence": float(unified["confidence"][i]),
+                "breakdown": {
+                    name: {"score": float(score), "weight": weight}
+                    for name, score, weight in zip(
+                        ("technical", "agi", "mtf", "volume", "sentiment"), components, weights
+                    )
+                },
+                "regime": unified_scorer.regime,
+            }
+            results.append(
+                self._build_symbol_intel(
+                    sym,
+                    price=float(price[i]),
+                    change_24h=float(change_24h[i]),
+                    volume_24h=float(volume_24h[i]),
+                    volatility=float(volatility[i]),
+                    closes=closes[i],
+                    volumes=volumes[i],
+                    candle_analysis=candle_analyses[i],
+                    liquidity_signals=liquidity[i],
+                    base_score=float(base_score[i]),
+                    indicator_composite=float(indicator_composite[i]),
+                    momentum_mtf_score=float(momentum_mtf_score[i]),
+                    unified_result=unified_result,
+                    funnel_score=float(funnel[i]),
+                    fg_score=fg_score,
+                )
+            )
+        return results
+
     def _calculate_risk_level(self, volatility, score):
         if volatility > 0.05 and score < 60:
             return "HIGH"
@@ -3013,6 +3333,10 @@ class IBISTrueAgent:
 
     async def _calculate_atr(self, symbol, period=14):
         """Average True Range for dynamic TP/SL"""
+        streamed = self._streaming_indicators(symbol, "15min")
+        if streamed and period == 14 and streamed["atr_sma"] > 0 and streamed["close"] > 0:
+            atr = streamed["atr_sma"]
+            return {"atr": atr, "atr_percent": atr / streamed["close"]}
         try:
             candles = await self.client.get_candles(f"{symbol}-USDT", "15min", limit=period + 10)
             if not candles or len(candles) < period:
@@ -3040,6 +3364,14 @@ class IBISTrueAgent:
             self.logger.info(f"⚠️ Unexpected error: {e}")
             return {"atr": 0, "atr_percent": 0.02}
 
+    def _streaming_indicators(self, symbol, interval="1min"):
+        """Precomputed streaming indicator values for a base symbol, if the feed has them"""
+        hub = getattr(self, "indicator_hub", None)
+        market_state = getattr(self, "market_state", None)
+        if hub is None or market_state is None or not market_state.is_live():
+            return None
+        return hub.values(f"{symbol}-USDT", interval)
+
     def _calculate_dynamic_tp_sl(self, price, atr_percent, regime, confidence_score):
         """Dynamic TP/SL based on ATR and regime"""
         tp_multiplier = self.config.get("atr_multiplier_tp", 2.0)
@@ -3278,8 +3610,16 @@ class IBISTrueAgent:
 
         return final_score, breakdown_str
 
-    def _analyze_candles(self, candles_1m, candles_5m, candles_15m):
-        """Comprehensive candle analysis with OHLCV patterns and market structure recognition"""
+    def _analyze_candles(self, candles_1m, candles_5m, candles_15m, features=None, streamed=None):
+        """Comprehensive candle analysis with OHLCV patterns and market structure recognition
+
+        `features` is one row of ibis.batch_scoring.batch_candle_features; when
+        given, volatility, trend strength and the momentum bundle are taken from
+        it instead of being recomputed per symbol. `streamed` is the symbol's
+        1min StreamingIndicatorHub values; once warm (and with
+        streaming_indicator_scoring on), its RSI, EMA trend and Bollinger
+        signals set the indicator composite instead of the neutral 50.
+        """
         analysis = {
             "volatility_1m": 0.02,  # Default volatility (2%)
             "volatility_5m": 0.02,
@@ -3299,8 +3639,14 @@ class IBISTrueAgent:
             "indicators": {},  # Indicator results
         }
 
+        streamed_signals = None
+        if streamed is not None and self.config.get("streaming_indicator_scoring", True):
+            streamed_signals = self._streamed_indicator_signals(streamed)
+        if streamed_signals is not None:
+            analysis["indicators"] = streamed_signals["indicators"]
+            analysis["composite_score"] = streamed_signals["composite_score"]
         # Integrate IndicatorEngine for comprehensive technical analysis
-        if candles_1m and len(candles_1m) >= 200:
+        elif candles_1m and len(candles_1m) >= 200:
             try:
                 from ibis.indicators.indicators import IndicatorEngine
 
@@ -3318,17 +3664,23 @@ class IBISTrueAgent:
                 print(f"Indicator engine error: {e}")
 
         # Analyze volatility across timeframes
-        if candles_1m:
-            analysis["volatility_1m"] = self._calculate_volatility(candles_1m)
+        if features is not None:
+            analysis["volatility_1m"] = features["volatility_1m"]
+            analysis["volatility_5m"] = features["volatility_5m"]
+            analysis["volatility_15m"] = features["volatility_15m"]
+            analysis["trend_strength"] = features["trend_strength"]
+        else:
+            if candles_1m:
+                analysis["volatility_1m"] = self._calculate_volatility(candles_1m)
 
-        if candles_5m:
-            analysis["volatility_5m"] = self._calculate_volatility(candles_5m)
+            if candles_5m:
+                analysis["volatility_5m"] = self._calculate_volatility(candles_5m)
 
-        if candles_15m:
-            analysis["volatility_15m"] = self._calculate_volatility(candles_15m)
+            if candles_15m:
+                analysis["volatility_15m"] = self._calculate_volatility(candles_15m)
 
-        # Analyze trend strength
-        analysis["trend_strength"] = self._calculate_trend_strength(candles_15m)
+            # Analyze trend strength
+            analysis["trend_strength"] = self._calculate_trend_strength(candles_15m)
 
         # Analyze volume profile
         analysis["volume_profile"] = self._analyze_volume_profile(candles_5m)
@@ -3359,7 +3711,7 @@ class IBISTrueAgent:
         volume_momentum = 0.0
         momentum_confidence = 0.0
 
-        if candles_1m and len(candles_1m) >= 2:
+        if features is None and candles_1m and len(candles_1m) >= 2:
             try:
                 # 1h momentum from available 1m candles (up to 60 bars)
                 lookback_1h = min(60, len(candles_1m) - 1)
@@ -3396,7 +3748,7 @@ class IBISTrueAgent:
                 pass
 
         # Fallback reinforcement from 5m candles for momentum_15m when available
-        if candles_5m and len(candles_5m) >= 4:
+        if features is None and candles_5m and len(candles_5m) >= 4:
             try:
                 p15_5m = float(candles_5m[-4].close)
                 last_5m = float(candles_5m[-1].close)
@@ -3416,6 +3768,14 @@ class IBISTrueAgent:
         confidence_alpha = max(0.25, min(1.0, momentum_confidence / 100.0))
         momentum_composite = raw_composite * confidence_alpha
 
+        if features is not None:
+            momentum_1h_raw = features["momentum_1h_raw"]
+            momentum_15m = features["momentum_15m"]
+            momentum_5m = features["momentum_5m"]
+            volume_momentum = features["volume_momentum"]
+            momentum_confidence = features["momentum_confidence"]
+            momentum_composite = features["momentum_composite"]
+
         analysis["momentum_1h_raw"] = momentum_1h_raw
         analysis["momentum_15m"] = momentum_15m
         analysis["momentum_5m"] = momentum_5m
@@ -3443,6 +3803,62 @@ class IBISTrueAgent:
 
         return analysis
 
+    def _streamed_indicator_signals(self, streamed):
+        """RSI, EMA trend and Bollinger signals from precomputed streaming values
+
+        Scored with the same per-indicator table as _calculate_enhanced_intel.
+        Returns None until the hub has every value warm.
+        """
+        keys = ("close", "rsi", "ema_fast", "ema_slow", "bb_middle", "bb_upper", "bb_lower")
+        if not streamed or not all(math.isfinite(streamed.get(k, math.nan)) for k in keys):
+            return None
+
+        close = streamed["close"]
+        rsi = streamed["rsi"]
+        rsi_signal, rsi_strength = RSI.signal([rsi])
+
+        ema_fast, ema_slow = streamed["ema_fast"], streamed["ema_slow"]
+        if close > ema_fast > ema_slow:
+            ema_signal = "BULLISH"
+        elif close < ema_fast < ema_slow:
+            ema_signal = "BEARISH"
+        else:
+            ema_signal = "NEUTRAL"
+
+        upper, middle, lower = streamed["bb_upper"], streamed["bb_middle"], streamed["bb_lower"]
+        if close > upper:
+            bb_signal = "OVERBOUGHT"
+        elif close < lower:
+            bb_signal = "OVERSOLD"
+        elif close > middle:
+            bb_signal = "BULLISH"
+        else:
+            bb_signal = "BEARISH"
+        bb_position = (close - lower) / (upper - lower + 0.001)
+
+        scores = {"rsi": 0, "ema_trend": 0, "bollinger": 0}
+        if 40 < rsi < 60:
+            scores["rsi"] = 10
+        elif rsi_signal == "OVERSOLD":
+            scores["rsi"] = 20
+        elif rsi_signal == "OVERBOUGHT":
+            scores["rsi"] = -10
+        scores["ema_trend"] = {"BULLISH": 15, "BEARISH": -15}.get(ema_signal, 0)
+        scores["bollinger"] = {"OVERSOLD": 15, "BULLISH": 10, "BEARISH": -5, "OVERBOUGHT": -15}[
+            bb_signal
+        ]
+
+        return {
+            "indicators": {
+                "source": "streaming",
+                "rsi": {"signal": rsi_signal, "strength": rsi_strength, "value": rsi},
+                "ema_trend": {"signal": ema_signal, "fast": ema_fast, "slow": ema_slow},
+                "bollinger": {"signal": bb_signal, "position": max(0, min(1, bb_position))},
+                "breakdown": scores,
+            },
+            "composite_score": max(0, min(100, 50 + sum(scores.values()))),
+        }
+
     def _calculate_volatility(self, candles):
         """Calculate volatility from candle data"""
         if not candles or len(candles) == 0:
@@ -3962,7 +4378,7 @@ class IBISTrueAgent:
             return False
 
         try:
-            tickers = await self.client.get_tickers()
+            tickers = await self._get_market_tickers()
             ticker_map = {
                 t.symbol.replace("-USDT", ""): t for t in tickers if t.symbol.endswith("-USDT")
             }
@@ -4013,22 +4429,13 @@ class IBISTrueAgent:
 
         holdings_value = 0
 
+        prices = await self._balance_prices(balances)
         for currency, data in balances.items():
             if currency == "USDT":
                 continue
             balance = float(data.get("balance", 0))
             if balance > 0:
-                price = self.market_intel.get(currency, {}).get("price", 0)
-
-                if price <= 0:
-                    try:
-                        ticker = await self.client.get_ticker(f"{currency}-USDT")
-                        if ticker and ticker.price:
-                            price = float(ticker.price)
-                    except (TypeError, ValueError) as e:
-                        self.logger.info(f"⚠️ Failed to parse price for {currency}: {e}")
-                    except Exception as e:
-                        self.logger.info(f"⚠️ Unexpected error getting price for {currency}: {e}")
+                price = prices.get(currency, 0)
 
                 if price > 0:
                     value = balance * price
@@ -4287,22 +4694,13 @@ class IBISTrueAgent:
         usdt_balance = float(balances.get("USDT", {}).get("balance", 0))
         total_assets = usdt_balance
 
+        prices = await self._balance_prices(balances)
         for currency, data in balances.items():
             if currency == "USDT":
                 continue
             balance = float(data.get("balance", 0))
             if balance > 0:
-                price = self.market_intel.get(currency, {}).get("price", 0)
-
-                if price <= 0:
-                    try:
-                        ticker = await self.client.get_ticker(f"{currency}-USDT")
-                        if ticker and ticker.price:
-                            price = float(ticker.price)
-                    except (TypeError, ValueError) as e:
-                        self.logger.info(f"⚠️ Failed to parse price for {currency}: {e}")
-                    except Exception as e:
-                        self.logger.info(f"⚠️ Unexpected error getting price for {currency}: {e}")
+                price = prices.get(currency, 0)
 
                 if price > 0:
                     total_assets += balance * price
@@ -4317,12 +4715,7 @@ class IBISTrueAgent:
     async def find_all_opportunities(self, strategy):
         """Find ALL intelligent opportunities in the market (MAXIMUM UTILIZATION)"""
         market_intel = self.market_intel
-        log_file = "/root/projects/Dont enter unless solicited/AGI Trader/data/ibis_true.log"
-
-        def log_event(msg):
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            with open(log_file, "a") as f:
-                f.write(f"[{timestamp}] {msg}\n")
+        log_event = get_event_log(self.EVENT_LOG_FILE)
 
         log_event(f"   🔍 Screening {len(market_intel)} potential trades...")
 
@@ -4357,7 +4750,9 @@ class IBISTrueAgent:
         min_threshold = self.config.get(
             "min_score", 70
         )  # More aggressive threshold for opportunities
-        log_event(f"   📄 DEBUG: config min_score={self.config.get('min_score', 'not set')}")
+        log_event(
+            f"   📄 DEBUG: config min_score={self.config.get('min_score', 'not set')}", logging.DEBUG
+        )
         liquidity_ratio_threshold = float(
             self.config.get("liquidity_volume_spike_ratio_threshold", 1.00)
         )
@@ -4398,7 +4793,8 @@ class IBISTrueAgent:
             # Force fee cap to 0.35% for debugging
             max_fee_per_side = 0.0035
             log_event(
-                f"   📄 DEBUG: {sym} fee_rate={sym_fee_rate * 100:.3f}%, max_fee={max_fee_per_side * 100:.3f}%, score={score:.1f}"
+                f"   📄 DEBUG: {sym} fee_rate={sym_fee_rate * 100:.3f}%, max_fee={max_fee_per_side * 100:.3f}%, score={score:.1f}",
+                logging.DEBUG,
             )
             if fee_guard_enabled and sym_fee_rate > max_fee_per_side and score < fee_override_score:
                 log_event(
@@ -4647,60 +5043,41 @@ class IBISTrueAgent:
         log_event(f"   📊 Found {len(opportunities)} valid opportunities this cycle")
         return opportunities
 
-    async def open_position(self, opportunity, strategy):
-        """🚀 SUPREME ENTRY: Intelligence-Validated Execution"""
-        symbol = opportunity["symbol"]
-        price = opportunity["price"]
-        score = opportunity["score"]
-
-        self.logger.info(f"      🎯 Executing with Intelligence Score: {score:.1f}")
-
-        # 🛡️ DEDUPLICATION: Check if we already have an open order for this symbol
-        buy_orders = self.state.get("capital_awareness", {}).get("buy_orders", {})
-        if symbol in buy_orders:
-            self.logger.info(f"      ⚠️ DEDUPLICATION: {symbol} already has open order - skipping")
-            return None
-
-        # Use dynamic AGI-powered position sizing
-        # Note: opportunity already contains the agi-enhanced score
-        position_value = await self.dynamic_position_sizing(strategy, symbol, self.market_intel)
+    async def _entry_quote(self, symbol: str):
+        """
+        Bid/ask for an entry decision, from the scan when it is fresh enough.
 
-        # 🚀 SPREAD FILTER: Verify liquidity for market order
+        latest_tickers holds the scan cycle's tickers; with the market stream
+        live they are the same objects the pushes update, so the quote age is
+        the newer of the last push and the scan itself. Only a quote older
+        than entry_quote_max_age_seconds costs a get_ticker round trip.
+        """
+        max_age = float(self.config.get("entry_quote_max_age_seconds", 5.0))
+        ticker = self.latest_tickers.get(symbol)
+        if ticker is not None and ticker.buy > 0 and ticker.sell > 0:
+            quote_ts = max(ticker.timestamp / 1000.0, self._latest_tickers_ts)
+            if time.time() - quote_ts <= max_age:
+                self.entry_stats["scan_quotes"] += 1
+                return ticker
+        self.entry_stats["rest_quotes"] += 1
         try:
-            ticker = await self.client.get_ticker(f"{symbol}-USDT")
-            if ticker:
-                bid = ticker.buy
-                ask = ticker.sell
-                spread = (ask - bid) / bid if bid > 0 else 0
-                if spread > 0.01:  # 1% max spread for Supreme Mode
-                    base_cd = max(0, int(self.config.get("entry_reject_cooldown_seconds", 45)))
-                    max_cd = max(
-                        base_cd,
-                        int(self.config.get("entry_reject_cooldown_max_seconds", 180)),
-                    )
-                    # Wider spread => longer backoff to reduce execution churn.
-                    spread_factor = min(4.0, max(1.0, spread / 0.01))
-                    cooldown_seconds = min(max_cd, int(base_cd * spread_factor))
-                    self._mark_entry_reject_cooldown(
-                        symbol, cooldown_seconds, reason="spread_too_wide"
-                    )
-                    self.logger.info(
-                        f"      🛑 SPREAD TOO WIDE: {symbol} ({spread * 100:.2f}%) - skipping "
-                        f"(cooldown {cooldown_seconds}s)"
-                    )
-                    return None
-        except (TypeError, ValueError) as e:
-            self.logger.info(f"⚠️ Failed to parse data: {e}")
+            return await self.client.get_ticker(f"{symbol}-USDT")
         except Exception as e:
             self.logger.info(f"⚠️ Unexpected error: {e}")
-            pass
+            return None
+
+    def _plan_entry(self, symbol, price, score, position_value, available_for_trade, use_market):
+        """
+        Size, round and protect an entry from symbol_rules alone (no I/O).
 
+        Returns the order parameters {order_type, price, quantity, tp, sl,
+        tp_pct, sl_pct}, or None when the order cannot meet the exchange and
+        IBIS minimums.
+        """
         rules = self.symbol_rules.get(symbol, {})
         base_increment = float(rules.get("baseIncrement", 0.000001))
         base_min_size = float(rules.get("baseMinSize", 0.001))
-        quote_min_size = float(rules.get("quoteMinSize", 0.1))
         price_increment = float(rules.get("priceIncrement", rules.get("quoteIncrement", 0.0000001)))
-        available_for_trade = strategy["available"]
 
         # Determine minimum position value - check if this could be final trade
         min_position_value = TRADING.POSITION.MIN_CAPITAL_PER_TRADE  # $10 minimum
@@ -4734,212 +5111,171 @@ class IBISTrueAgent:
             )
             return None
 
-        # 🎯 PRECISION EXECUTION: Get adaptive stop levels using ATR
-        candles_5m = await self.client.get_candles(f"{symbol}-USDT", "5min", limit=20)
+        min_trade_value = TRADING.EXECUTION.MIN_TRADE_VALUE
+        # Add small epsilon for floating-point precision
+        if final_order_value < min_trade_value - 0.01:
+            print(
+                f"⚠️ Order value ${final_order_value:.2f} below minimum ${min_trade_value:.2f} - skipping"
+            )
+            return None
 
-        # Calculate smart stops (adaptive based on volatility, averages ~2%)
-        try:
-            # Use self.enhanced if available, otherwise skip
-            if hasattr(self, "enhanced") and self.enhanced:
-                stop_data = await self.enhanced.calculate_smart_stop_levels(
-                    entry_price=price, direction="LONG", candles=candles_5m, timeframe="5m"
-                )
+        # Dynamic TP from score, standard SL, rounded to valid price increments
+        tp_pct = self._get_dynamic_tp_pct(score)
+        sl_pct = TRADING.RISK.STOP_LOSS_PCT
+        tp = round_up_to_increment(price * (1 + tp_pct), price_increment)  # Target rounds up
+        sl = round_down_to_increment(price * (1 - sl_pct), price_increment)  # Stop rounds down
+
+        plan = {
+            "order_type": "market" if use_market else "limit",
+            "price": price,
+            "quantity": quantity,
+            "tp": tp,
+            "sl": sl,
+            "tp_pct": tp_pct,
+            "sl_pct": sl_pct,
+        }
+        if use_market:
+            return plan
 
-                tp = stop_data["take_profit"]
-                sl_pct = stop_data["stop_distance_pct"] / 100
-                tp_pct = stop_data["tp_distance_pct"] / 100
+        # LIMIT order 0.2% below current price, rounded down so a buy never crosses
+        suggested_price = price * (1 - 0.002)
+        if price_increment > 0:
+            suggested_price = round_down_to_increment(suggested_price, price_increment)
+            suggested_price = max(suggested_price, price_increment)
+            suggested_price = format_decimal_for_increment(suggested_price, price_increment)
+
+        # Ensure submitted limit notional respects the hard minimum.
+        required_notional = min_trade_value + 0.01
+        actual_limit_value = quantity * suggested_price
+        if actual_limit_value < required_notional:
+            required_qty = required_notional / max(suggested_price, 1e-12)
+            quantity = round_up_to_increment(required_qty, base_increment)
+            quantity = max(quantity, base_min_size)
+            quantity = format_decimal_for_increment(quantity, base_increment)
+            actual_limit_value = quantity * suggested_price
+            self.logger.info(
+                f"      🔧 ADJUSTED QTY FOR MIN NOTIONAL: qty={quantity:.8f}, value=${actual_limit_value:.2f}"
+            )
 
-                self.logger.info(
-                    f"      🎯 SMART STOPS: SL {stop_data['stop_distance_pct']:.2f}% ({stop_data['volatility_mode']}) | "
-                    f"TP {stop_data['tp_distance_pct']:.2f}%"
-                )
-            else:
-                # Fallback: use dynamic TP from score with god tier optimization
-                tp_pct = self._get_dynamic_tp_pct(score)
-                sl_pct = TRADING.RISK.STOP_LOSS_PCT
-
-                # God tier signals get tighter SL and higher TP
-                if score >= 95:
-                    sl_pct = 0.03  # 3% SL for god tier (tighter risk)
-                    tp_pct = 0.06  # 6% TP for god tier (higher reward)
-                elif score >= 90:
-                    sl_pct = 0.035  # 3.5% SL for high confidence
-                    tp_pct = 0.05  # 5% TP for high confidence
-                elif score >= 85:
-                    sl_pct = 0.04  # 4% SL for strong setup
-                    tp_pct = 0.04  # 4% TP for strong setup
+        max_affordable = available_for_trade * 0.995
+        if actual_limit_value > max_affordable + 1e-9:
+            self.logger.info(
+                f"      🛑 LIMIT NOTIONAL EXCEEDS AVAILABLE: ${actual_limit_value:.2f} > ${max_affordable:.2f}"
+            )
+            return None
 
-                tp = price * (1 + tp_pct)
+        # Re-check against minimum using the ACTUAL submitted limit price.
+        if actual_limit_value < min_trade_value - 0.01:
+            self.logger.info(
+                f"      🛑 LIMIT VALUE TOO LOW: ${actual_limit_value:.2f} < ${min_trade_value:.2f} minimum for {symbol}"
+            )
+            return None
 
-        except Exception as e:
-            self.logger.info(f"      ⚠️ Smart stops calculation failed: {e}")
-            # Fallback: use dynamic TP from score
-            tp_pct = self._get_dynamic_tp_pct(score)
-            sl_pct = TRADING.RISK.STOP_LOSS_PCT
-            tp = price * (1 + tp_pct)
-
-        # Keep the calculated dynamic TP/SL (do NOT overwrite)
-        if "tp" not in locals() or "sl" not in locals():
-            tp_pct = self._get_dynamic_tp_pct(score)
-            sl_pct = TRADING.RISK.STOP_LOSS_PCT
-            tp = price * (1 + tp_pct)
-            sl = price * (1 - sl_pct)
-
-        # Round TP and SL to valid price increments
-        tp = round_up_to_increment(tp, price_increment)  # Target should be higher, round up
-        sl = round_down_to_increment(sl, price_increment)  # Stop should be lower, round down
+        plan["price"] = suggested_price
+        plan["quantity"] = quantity
+        return plan
 
-        sl_str = f"${sl:.8f} (-{sl_pct * 100:.1f}%)"
+    def get_entry_stats(self) -> Dict:
+        return {**self.entry_stats, "decision_to_ack": self.entry_latency.snapshot()}
 
-        self.logger.info(f"      📊 Position sizing: ${position_value:.2f} | Qty: {quantity:.8f}")
-
-        print(f"\n   ╔{'═' * 68}╗")
-        print(f"   ║ {'🚀 EXECUTING TRADE':^66} ║")
-        print(f"   ╠{'═' * 68}╣")
-        print(f"   ║ Symbol: {symbol:<56} ║")
-        print(f"   ║ Score: {score}/100 {self._get_score_label(score):<42} ║")
-        print(f"   ║ Price: ${price:<55.8f} ║")
-        print(f"   ║ Position: ${position_value:<54.2f} ║")
-        print(f"   ║ Quantity: {quantity:<56} ║")
-        print(f"   ║ Target: ${tp:<55.8f} (+{tp_pct * 100:.1f}%) ║")
-        print(f"   ║ Stop: {sl_str:<55} ║")
-
-        # 🚀 SUPREME INSIGHT
-        insight = opportunity.get("agi_insight", "Neural Consensus Confirmed")
-        # Truncate if too long
-        display_insight = (insight[:53] + "...") if len(insight) > 53 else insight
-
-        # 🎯 ENTRY REASON - Why entering this trade
-        entry_reasons = []
-        if score >= 90:
-            entry_reasons.append("GOD_TIER")
-        elif score >= 80:
-            entry_reasons.append("HIGH_CONFIDENCE")
-        elif score >= 70:
-            entry_reasons.append("STRONG_SETUP")
-        else:
-            entry_reasons.append("STANDARD")
-
-        if opportunity.get("agi_confidence", 0) >= 80:
-            entry_reasons.append("AGI_CONFIRMED")
-
-        intel = opportunity
-        if intel.get("change_24h", 0) > 2:
-            entry_reasons.append(f"24h_UP_{intel.get('change_24h', 0):.1f}%")
-        if intel.get("momentum_1h", 0) > 0.5:
-            entry_reasons.append(f"MOMENTUM_+{intel.get('momentum_1h', 0):.2f}")
-        if intel.get("trend") == "bullish":
-            entry_reasons.append("BULLISH_TREND")
+    async def open_position(self, opportunity, strategy):
+        """
+        🚀 SUPREME ENTRY: Intelligence-Validated Execution
 
-        # 💰 RISK/REWARD RATIO
-        tp_distance = (tp - price) / price if tp > price else 0
-        sl_distance = (price - sl) / price if sl < price else 0
-        risk_reward = tp_distance / sl_distance if sl_distance > 0 else 0
+        Fast path: the spread and maker-first checks share one quote (the
+        scan's when fresh), the order is fully planned from symbol_rules, and
+        create_order is the only round trip between the decision and the ack.
+        Tick-exit protection is armed straight from the ack; the trade banner
+        is printed after it.
+        """
+        decided_at = time.perf_counter()
+        symbol = opportunity["symbol"]
+        price = opportunity["price"]
+        score = opportunity["score"]
 
-        print(f"   ║ AGI: {display_insight:<59} ║")
-        print(f"   ║ 🎯 ENTRY: {' + '.join(entry_reasons):<50} ║")
-        print(
-            f"   ║ 💰 R:R = 1:{risk_reward:.1f} (TP: +{tp_distance * 100:.1f}% / SL: -{sl_distance * 100:.1f}%) ║"
-        )
-        print(f"   ║ Regime: {strategy['regime']:<54} ║")
-        print(f"   ║ Mode: {strategy['mode']:<55} ║")
-        print(f"   ╚{'═' * 68}╝\n")
+        self.logger.info(f"      🎯 Executing with Intelligence Score: {score:.1f}")
 
-        # Check for existing pending order before creating new one
+        # 🛡️ DEDUPLICATION: Check if we already have an open order for this symbol
         buy_orders = self.state.get("capital_awareness", {}).get("buy_orders", {})
         if symbol in buy_orders:
-            print(f"⚠️ Pending order already exists for {symbol} - skipping duplicate")
+            self.logger.info(f"      ⚠️ DEDUPLICATION: {symbol} already has open order - skipping")
             return None
 
-        min_trade_value = TRADING.EXECUTION.MIN_TRADE_VALUE
-        actual_value = quantity * price
-        # Add small epsilon for floating-point precision
-        if actual_value < min_trade_value - 0.01:
-            print(
-                f"⚠️ Order value ${actual_value:.2f} below minimum ${min_trade_value:.2f} - skipping"
-            )
-            return None
+        # Use dynamic AGI-powered position sizing
+        # Note: opportunity already contains the agi-enhanced score
+        position_value = await self.dynamic_position_sizing(strategy, symbol, self.market_intel)
 
+        # 🚀 SPREAD FILTER: Verify liquidity (one quote serves this and maker-first)
+        spread = None
+        ticker = await self._entry_quote(symbol)
         try:
-            # 🎯 ENTRY TYPE: MARKET for PERFECT/STRONG_BULL, LIMIT otherwise
-            # In perfect conditions, we want instant entry to capture moves
-            order_regime = strategy.get("regime", "NORMAL")
-            use_market = TRADING.SCAN.MARKET_ORDERS_BY_REGIME.get(order_regime, False)
-            if self.config.get("maker_first_execution", True) and use_market:
-                # Guardrail: allow taker only when signal strength and spread justify it.
-                market_score_min = float(self.config.get("market_entry_score_threshold", 90))
-                market_max_spread = float(self.config.get("market_entry_max_spread", 0.0035))
-                if score < market_score_min:
-                    use_market = False
+            if ticker:
+                bid = float(ticker.buy or 0)
+                ask = float(ticker.sell or 0)
+                spread = (ask - bid) / bid if bid > 0 and ask > 0 else 0
+                if spread > 0.01:  # 1% max spread for Supreme Mode
+                    base_cd = max(0, int(self.config.get("entry_reject_cooldown_seconds", 45)))
+                    max_cd = max(
+                        base_cd,
+                        int(self.config.get("entry_reject_cooldown_max_seconds", 180)),
+                    )
+                    # Wider spread => longer backoff to reduce execution churn.
+                    spread_factor = min(4.0, max(1.0, spread / 0.01))
+                    cooldown_seconds = min(max_cd, int(base_cd * spread_factor))
+                    self._mark_entry_reject_cooldown(
+                        symbol, cooldown_seconds, reason="spread_too_wide"
+                    )
                     self.logger.info(
-                        f"      🧩 MAKER-FIRST: {symbol} score {score:.1f} < {market_score_min:.0f}, using limit"
+                        f"      🛑 SPREAD TOO WIDE: {symbol} ({spread * 100:.2f}%) - skipping "
+                        f"(cooldown {cooldown_seconds}s)"
                     )
-                else:
-                    try:
-                        ticker_for_spread = await self.client.get_ticker(f"{symbol}-USDT")
-                        bid = float(getattr(ticker_for_spread, "buy", 0) or 0)
-                        ask = float(getattr(ticker_for_spread, "sell", 0) or 0)
-                        spread_now = ((ask - bid) / bid) if bid > 0 and ask > 0 else 0
-                        if spread_now > market_max_spread:
-                            use_market = False
-                            self.logger.info(
-                                f"      🧩 MAKER-FIRST: {symbol} spread {spread_now * 100:.2f}% > {market_max_spread * 100:.2f}%, using limit"
-                            )
-                    except Exception:
-                        use_market = False
+                    return None
+        except (TypeError, ValueError) as e:
+            spread = None
+            self.logger.info(f"⚠️ Failed to parse data: {e}")
 
-            if use_market:
-                # MARKET order for instant entry in optimal conditions
-                order_type = "market"
-                suggested_price = price
+        # 🎯 ENTRY TYPE: MARKET for PERFECT/STRONG_BULL, LIMIT otherwise
+        # In perfect conditions, we want instant entry to capture moves
+        order_regime = strategy.get("regime", "NORMAL")
+        use_market = TRADING.SCAN.MARKET_ORDERS_BY_REGIME.get(order_regime, False)
+        if self.config.get("maker_first_execution", True) and use_market:
+            # Guardrail: allow taker only when signal strength and spread justify it.
+            market_score_min = float(self.config.get("market_entry_score_threshold", 90))
+            market_max_spread = float(self.config.get("market_entry_max_spread", 0.0035))
+            if score < market_score_min:
+                use_market = False
                 self.logger.info(
-                    f"      🚀 EXECUTING MARKET buy for {symbol} @ ${price:.6f} (PERFECT CONDITIONS - MAX SPEED)"
+                    f"      🧩 MAKER-FIRST: {symbol} score {score:.1f} < {market_score_min:.0f}, using limit"
                 )
-            else:
-                # LIMIT order for better price in normal conditions
-                order_type = "limit"
-                discount_pct = 0.002  # 0.2% below current price
-                suggested_price = price * (1 - discount_pct)
-
-                # Round price to valid increment based on symbol rules.
-                # Use downward rounding for buy limits to avoid crossing.
-                if price_increment > 0:
-                    suggested_price = round_down_to_increment(suggested_price, price_increment)
-                    suggested_price = max(suggested_price, price_increment)
-                    suggested_price = format_decimal_for_increment(suggested_price, price_increment)
-
+            elif spread is None:
+                use_market = False
+            elif spread > market_max_spread:
+                use_market = False
                 self.logger.info(
-                    f"      🚀 EXECUTING LIMIT buy for {symbol} @ ${suggested_price:.8f} (${price:.6f} - 0.2%)..."
+                    f"      🧩 MAKER-FIRST: {symbol} spread {spread * 100:.2f}% > {market_max_spread * 100:.2f}%, using limit"
                 )
 
-                # Ensure submitted limit notional respects the hard minimum.
-                required_notional = min_trade_value + 0.01
-                actual_limit_value = quantity * suggested_price
-                if actual_limit_value < required_notional:
-                    required_qty = required_notional / max(suggested_price, 1e-12)
-                    quantity = round_up_to_increment(required_qty, base_increment)
-                    quantity = max(quantity, base_min_size)
-                    quantity = format_decimal_for_increment(quantity, base_increment)
-                    actual_limit_value = quantity * suggested_price
-                    self.logger.info(
-                        f"      🔧 ADJUSTED QTY FOR MIN NOTIONAL: qty={quantity:.8f}, value=${actual_limit_value:.2f}"
-                    )
-
-                max_affordable = available_for_trade * 0.995
-                if actual_limit_value > max_affordable + 1e-9:
-                    self.logger.info(
-                        f"      🛑 LIMIT NOTIONAL EXCEEDS AVAILABLE: ${actual_limit_value:.2f} > ${max_affordable:.2f}"
-                    )
-                    return None
+        plan = self._plan_entry(
+            symbol, price, score, position_value, strategy["available"], use_market
+        )
+        if plan is None:
+            return None
+        order_type = plan["order_type"]
+        suggested_price = plan["price"]
+        quantity = plan["quantity"]
+        tp, sl, tp_pct, sl_pct = plan["tp"], plan["sl"], plan["tp_pct"], plan["sl_pct"]
 
-                # Re-check against minimum using the ACTUAL submitted limit price.
-                if actual_limit_value < min_trade_value - 0.01:
-                    self.logger.info(
-                        f"      🛑 LIMIT VALUE TOO LOW: ${actual_limit_value:.2f} < ${min_trade_value:.2f} minimum for {symbol}"
-                    )
-                    return None
+        # Re-check: another entry may have landed while sizing awaited
+        buy_orders = self.state.get("capital_awareness", {}).get("buy_orders", {})
+        if symbol in buy_orders:
+            print(f"⚠️ Pending order already exists for {symbol} - skipping duplicate")
+            return None
 
+        try:
             if order_type == "market":
+                self.logger.info(
+                    f"      🚀 EXECUTING MARKET buy for {symbol} @ ${price:.6f} (PERFECT CONDITIONS - MAX SPEED)"
+                )
                 # For market buy orders, KuCoin uses funds (USD amount) instead of size (quantity)
                 resp = await self.client.create_order(
                     symbol=f"{symbol}-USDT",
@@ -4949,6 +5285,9 @@ class IBISTrueAgent:
                     size=position_value,
                 )
             else:
+                self.logger.info(
+                    f"      🚀 EXECUTING LIMIT buy for {symbol} @ ${suggested_price:.8f} (${price:.6f} - 0.2%)..."
+                )
                 # For limit orders, use quantity
                 resp = await self.client.create_order(
                     symbol=f"{symbol}-USDT",
@@ -4957,13 +5296,17 @@ class IBISTrueAgent:
                     price=suggested_price,
                     size=quantity,
                 )
+            ack_ms = (time.perf_counter() - decided_at) * 1000
 
             if not resp or not getattr(resp, "order_id", None):
                 self.logger.info(f"      ❌ ORDER FAILED for {symbol}: No order ID returned")
                 return None
 
+            self.entry_latency.record(ack_ms)
+            self.entry_stats["orders_acked"] += 1
             self.logger.info(
                 f"      ✅ ORDER SUCCESS for {symbol} | OrderID: {getattr(resp, 'order_id', 'unknown')}"
+                f" | decision→ack {ack_ms:.1f}ms"
             )
 
             # Track order status and fill information
@@ -4980,11 +5323,13 @@ class IBISTrueAgent:
                 "mode": strategy["mode"],
                 "regime": strategy["regime"],
                 "opportunity_score": opportunity.get("adjusted_score", score),
+                "decision_to_ack_ms": round(ack_ms, 3),
             }
 
             self.state["capital_awareness"]["buy_orders"][symbol] = order_info
             self.state["capital_awareness"]["open_orders_count"] += 1
 
+            pos = None
             if order_type == "market":
                 pos = {
                     "symbol": symbol,
@@ -4996,44 +5341,19 @@ class IBISTrueAgent:
                     "regime": strategy["regime"],
                     "opened": datetime.now().isoformat(),
                     "opportunity_score": opportunity.get("adjusted_score", score),
+                    "decision_to_ack_ms": round(ack_ms, 3),
                 }
                 self.state["positions"][symbol] = pos
                 self.state["daily"]["trades"] += 1
-
-                sl_info = (
-                    f"SL: -{strategy['stop_loss'] * 100:.1f}%"
-                    if strategy.get("stop_loss")
-                    else "SL: Manual"
-                )
-
-                print(f"\n🚀 OPENED: {symbol} {quantity:.4f} @ ${price:.4f}")
-                print(f"   Regime: {strategy['regime']} | Mode: {strategy['mode']}")
-                tp_display = f"+{tp_pct * 100:.1f}%"
-                print(
-                    f"   Score: {opportunity.get('adjusted_score', score):.0f} | TP: {tp_display} | {sl_info}"
-                )
-
-                self._save_state()
-                return pos
             else:
                 self.state["daily"]["orders_placed"] += 1
 
-                sl_info = (
-                    f"SL: -{strategy['stop_loss'] * 100:.1f}%"
-                    if strategy.get("stop_loss")
-                    else "SL: Manual"
-                )
-
-                print(f"\n📝 PENDING ORDER: {symbol} {quantity:.4f} @ ${price:.4f} (Limit Buy)")
-                print(f"   Regime: {strategy['regime']} | Mode: {strategy['mode']}")
-                tp_display = f"+{tp_pct * 100:.1f}%"
-                print(
-                    f"   Score: {opportunity.get('adjusted_score', score):.0f} | TP: {tp_display} | {sl_info}"
-                )
-                print(f"   ⚠️ Will move to positions when order fills")
-
-                self._save_state()
-                return None
+            # Arms tick-level TP/SL for the new position, then the terminal output
+            self._save_state(immediate=True)
+            self._print_entry_banner(
+                opportunity, strategy, plan, position_value, order_type, ack_ms
+            )
+            return pos
 
         except Exception as e:
             error_msg = str(e)
@@ -5047,35 +5367,17 @@ class IBISTrueAgent:
 
             # Simple error handling without complex retry logic for now
             return None
-        base_increment = float(rules.get("baseIncrement", 0.000001))
-        base_min_size = float(rules.get("baseMinSize", 0.001))
 
-        quantity = position_value / price
-
-        if base_increment > 0:
-            quantity = (int(quantity / base_increment + 0.5)) * base_increment
-
-        if quantity < base_min_size:
-            quantity = base_min_size
-
-        if quantity * price < 5:
-            return None
-
-        tp = price * (1 + strategy["target_profit"])
-        sl = None if strategy.get("stop_loss") is None else price * (1 - strategy["stop_loss"])
+    def _print_entry_banner(self, opportunity, strategy, plan, position_value, order_type, ack_ms):
+        """Trade box and fill summary for an acknowledged entry order"""
+        symbol = opportunity["symbol"]
+        price = opportunity["price"]
+        score = opportunity["score"]
+        quantity, tp, sl = plan["quantity"], plan["tp"], plan["sl"]
+        tp_pct, sl_pct = plan["tp_pct"], plan["sl_pct"]
+        sl_str = f"${sl:.8f} (-{sl_pct * 100:.1f}%)"
 
-        # Round TP and SL to valid price increments
-        if price_increment > 0:
-            if tp:
-                tp = round_up_to_increment(tp, price_increment)
-            if sl:
-                sl = round_down_to_increment(sl, price_increment)
-
-        sl_str = (
-            f"${sl:.8f} (-{strategy['stop_loss'] * 100:.1f}%)"
-            if sl and strategy.get("stop_loss") is not None
-            else "Manual/Trailing"
-        )
+        self.logger.info(f"      📊 Position sizing: ${position_value:.2f} | Qty: {quantity:.8f}")
 
         print(f"\n   ╔{'═' * 68}╗")
         print(f"   ║ {'🚀 EXECUTING TRADE':^66} ║")
@@ -5085,59 +5387,63 @@ class IBISTrueAgent:
         print(f"   ║ Price: ${price:<55.8f} ║")
         print(f"   ║ Position: ${position_value:<54.2f} ║")
         print(f"   ║ Quantity: {quantity:<56} ║")
-        print(f"   ║ Target: ${tp:<56.8f} (+{strategy['target_profit'] * 100:.1f}%) ║")
+        print(f"   ║ Target: ${tp:<55.8f} (+{tp_pct * 100:.1f}%) ║")
         print(f"   ║ Stop: {sl_str:<55} ║")
-        print(f"   ║ Regime: {strategy['regime']:<54} ║")
-        print(f"   ║ Mode: {strategy['mode']:<55} ║")
-        print(f"   ╚{'═' * 68}╝\n")
 
-        try:
-            await self.client.create_order(
-                symbol=f"{symbol}-USDT",
-                side="buy",
-                type="limit",
-                price=price,
-                size=quantity,
-            )
+        # 🚀 SUPREME INSIGHT
+        insight = opportunity.get("agi_insight", "Neural Consensus Confirmed")
+        # Truncate if too long
+        display_insight = (insight[:53] + "...") if len(insight) > 53 else insight
 
-            order_info = {
-                "order_id": getattr(resp, "order_id", "unknown")
-                if hasattr(resp, "order_id")
-                else "unknown",
-                "symbol": symbol,
-                "quantity": quantity,
-                "price": price,
-                "order_type": "limit",
-                "status": "pending",
-                "timestamp": datetime.now().isoformat(),
-                "tp": tp,
-                "sl": sl,
-                "mode": strategy["mode"],
-                "regime": strategy["regime"],
-                "opportunity_score": opportunity.get("adjusted_score", score),
-            }
-            self.state["capital_awareness"]["buy_orders"][symbol] = order_info
-            self.state["daily"]["orders_placed"] += 1
+        # 🎯 ENTRY REASON - Why entering this trade
+        entry_reasons = []
+        if score >= 90:
+            entry_reasons.append("GOD_TIER")
+        elif score >= 80:
+            entry_reasons.append("HIGH_CONFIDENCE")
+        elif score >= 70:
+            entry_reasons.append("STRONG_SETUP")
+        else:
+            entry_reasons.append("STANDARD")
 
-            sl_info = (
-                f"SL: -{strategy['stop_loss'] * 100:.1f}%"
-                if strategy.get("stop_loss")
-                else "SL: Manual"
-            )
+        if opportunity.get("agi_confidence", 0) >= 80:
+            entry_reasons.append("AGI_CONFIRMED")
 
-            print(f"\n📝 PENDING ORDER: {symbol} {quantity:.4f} @ ${price:.4f} (Limit Buy)")
-            print(f"   Regime: {strategy['regime']} | Mode: {strategy['mode']}")
-            print(
-                f"   Score: {opportunity['adjusted_score']:.0f} | TP: +{strategy['target_profit'] * 100:.1f}% | {sl_info}"
-            )
-            print(f"   ⚠️ Will move to positions when order fills")
+        intel = opportunity
+        if intel.get("change_24h", 0) > 2:
+            entry_reasons.append(f"24h_UP_{intel.get('change_24h', 0):.1f}%")
+        if intel.get("momentum_1h", 0) > 0.5:
+            entry_reasons.append(f"MOMENTUM_+{intel.get('momentum_1h', 0):.2f}")
+        if intel.get("trend") == "bullish":
+            entry_reasons.append("BULLISH_TREND")
 
-            self._save_state()
-            return pos
+        # 💰 RISK/REWARD RATIO
+        tp_distance = (tp - price) / price if tp > price else 0
+        sl_distance = (price - sl) / price if sl < price else 0
+        risk_reward = tp_distance / sl_distance if sl_distance > 0 else 0
 
-        except Exception as e:
-            print(f"❌ {symbol}: {e}")
-            return None
+        print(f"   ║ AGI: {display_insight:<59} ║")
+        print(f"   ║ 🎯 ENTRY: {' + '.join(entry_reasons):<50} ║")
+        print(
+            f"   ║ 💰 R:R = 1:{risk_reward:.1f} (TP: +{tp_distance * 100:.1f}% / SL: -{sl_distance * 100:.1f}%) ║"
+        )
+        print(f"   ║ Regime: {strategy['regime']:<54} ║")
+        print(f"   ║ Mode: {strategy['mode']:<55} ║")
+        print(f"   ║ Decision→ack: {ack_ms:<47.1f}ms ║")
+        print(f"   ╚{'═' * 68}╝\n")
+
+        sl_info = (
+            f"SL: -{strategy['stop_loss'] * 100:.1f}%" if strategy.get("stop_loss") else "SL: Manual"
+        )
+        tp_display = f"+{tp_pct * 100:.1f}%"
+        if order_type == "market":
+            print(f"\n🚀 OPENED: {symbol} {quantity:.4f} @ ${price:.4f}")
+        else:
+            print(f"\n📝 PENDING ORDER: {symbol} {quantity:.4f} @ ${price:.4f} (Limit Buy)")
+        print(f"   Regime: {strategy['regime']} | Mode: {strategy['mode']}")
+        print(f"   Score: {opportunity.get('adjusted_score', score):.0f} | TP: {tp_display} | {sl_info}")
+        if order_type != "market":
+            print(f"   ⚠️ Will move to positions when order fills")
 
     async def check_positions(self, strategy):
         """Check all positions with proper TP/SL handling"""
@@ -5157,14 +5463,10 @@ class IBISTrueAgent:
             self.config.get("recycle_min_projected_pnl_pct", 0.003)
         )
 
+        tickers = await self._price_tickers(self.state["positions"])
         for sym, pos in list(self.state["positions"].items()):
             try:
-                ticker = self.latest_tickers.get(sym)
-                if not ticker:
-                    try:
-                        ticker = await self.client.get_ticker(f"{sym}-USDT")
-                    except:
-                        pass
+                ticker = tickers.get(sym) or self.latest_tickers.get(sym)
 
                 # Use cached/current price, fall back to position data
                 if ticker:
@@ -5277,6 +5579,37 @@ class IBISTrueAgent:
 
             await self.close_position(sym, reason, exit_price, pnl_pct, strategy)
 
+    async def _on_tick_exit(self, symbol: str, reason: str, price: float) -> bool:
+        """ExitWatcher callback: close as soon as a streamed price crosses TP/SL"""
+        pos = self.state["positions"].get(symbol)
+        if not pos:
+            return True  # already closed elsewhere, nothing left to watch
+        buy_price = float(pos.get("buy_price", 0) or 0) or price
+        pnl_pct = (price - buy_price) / buy_price
+        pos["current_price"] = price
+        self.logger.info(
+            f"      ⚡ TICK EXIT: {symbol} | {reason} | ${price:.6f} | PnL: {pnl_pct * 100:.2f}%"
+        )
+        return await self.close_position(symbol, reason, price, pnl_pct, self._exit_strategy)
+
+    def _on_account_order_event(self, order: Dict, event: str) -> None:
+        """
+        Private-stream order push: a pending buy that just finished is
+        processed right away instead of waiting for the next scan cycle.
+        """
+        if order.get("isActive") or str(order.get("side", "")).lower() != "buy":
+            return
+        symbol = str(order.get("symbol", "")).replace("-USDT", "")
+        if symbol not in self.state.get("capital_awareness", {}).get("buy_orders", {}):
+            return
+        if self._fill_check_task is None or self._fill_check_task.done():
+            self._fill_check_task = asyncio.create_task(self._check_pending_orders_locked())
+
+    async def _check_pending_orders_locked(self):
+        """check_pending_orders is shared by the cycle and push-triggered checks"""
+        async with self._pending_orders_lock:
+            await self.check_pending_orders()
+
     async def check_pending_orders(self):
         """Check pending buy orders and move filled orders to positions"""
         buy_orders = self.state.get("capital_awareness", {}).get("buy_orders", {})
@@ -5541,7 +5874,7 @@ class IBISTrueAgent:
                             self.state["daily"]["trades"] += 1
                         if symbol in buy_orders:
                             del buy_orders[symbol]
-                        self._save_state()
+                        self._save_state(immediate=True)
                         continue
 
                     # No live balance => clear stale marker.
@@ -5567,7 +5900,7 @@ class IBISTrueAgent:
                 pass
 
         if filled_count > 0:
-            self._save_state()
+            self._save_state(immediate=True)
 
     async def manage_stale_sell_orders(self):
         """
@@ -5949,6 +6282,8 @@ class IBISTrueAgent:
                     ),
                     timeout=10.0,
                 )
+                if self.exit_watcher is not None:
+                    self.exit_watcher.order_acked(symbol)
                 # Fetch order details and require confirmed fills before finalizing close.
                 actual_fee = 0.0
                 actual_fill_price = exit_price
@@ -6030,7 +6365,7 @@ class IBISTrueAgent:
                     if filled_qty > 0:
                         remaining_qty = max(0.0, quantity - filled_qty)
                         self.state["positions"][symbol]["quantity"] = remaining_qty
-                        self._save_state()
+                        self._save_state(immediate=True)
                         self.logger.info(
                             f"   [CLOSE PARTIAL] {symbol}: filled={filled_qty:.8f}, remaining={remaining_qty:.8f}"
                         )
@@ -6235,7 +6570,7 @@ class IBISTrueAgent:
             print(f"   Regime: {pos.get('regime', 'unknown')} | Mode: {pos.get('mode', 'unknown')}")
 
             del self.state["positions"][symbol]
-            self._save_state()
+            self._save_state(immediate=True)
             self._save_memory()
             await self.update_capital_awareness()
             self._save_state()  # Save again after capital update
@@ -6402,13 +6737,17 @@ class IBISTrueAgent:
             usdt = float(balances.get("USDT", {}).get("available", 0))
 
             pos_value = 0
+            positions = self.state["positions"]
+            tickers = await self._price_tickers(
+                sym for sym, pos in positions.items() if pos.get("mode") != "PENDING_BUY"
+            )
             for sym, pos in self.state["positions"].items():
                 # Skip pending positions
                 if pos.get("mode") == "PENDING_BUY":
                     continue
 
                 try:
-                    ticker = await self.client.get_ticker(f"{sym}-USDT")
+                    ticker = tickers.get(sym)
                     if ticker:
                         price = float(ticker.price)
                         pos_value += pos["quantity"] * price
@@ -6496,22 +6835,13 @@ class IBISTrueAgent:
         holdings_value = 0
         holdings_display = []
         holdings_positions = []
+        prices = await self._balance_prices(balances)
         for currency, data in balances.items():
             if currency == "USDT":
                 continue
             balance = float(data.get("balance", 0))
             if balance > 0:
-                price = self.market_intel.get(currency, {}).get("price", 0)
-
-                if price <= 0:
-                    try:
-                        ticker = await self.client.get_ticker(f"{currency}-USDT")
-                        if ticker and ticker.price:
-                            price = float(ticker.price)
-                    except (TypeError, ValueError) as e:
-                        self.logger.info(f"⚠️ Failed to parse data: {e}")
-                    except Exception as e:
-                        self.logger.info(f"⚠️ Unexpected error: {e}")
+                price = prices.get(currency, 0)
 
                 if price > 0:
                     value = balance * price
@@ -6586,22 +6916,13 @@ class IBISTrueAgent:
         holdings_value = 0
         holdings_list = []
         holdings_display = []
+        prices = await self._balance_prices(balances)
         for currency, data in balances.items():
             if currency == "USDT":
                 continue
             balance = float(data.get("balance", 0))
             if balance > 0:
-                price = self.market_intel.get(currency, {}).get("price", 0)
-
-                if price <= 0:
-                    try:
-                        ticker = await self.client.get_ticker(f"{currency}-USDT")
-                        if ticker and ticker.price:
-                            price = float(ticker.price)
-                    except (TypeError, ValueError) as e:
-                        self.logger.info(f"⚠️ Failed to parse data: {e}")
-                    except Exception as e:
-                        self.logger.info(f"⚠️ Unexpected error: {e}")
+                price = prices.get(currency, 0)
 
                 if price > 0:
                     value = balance * price
@@ -6770,9 +7091,10 @@ class IBISTrueAgent:
         positions_to_show = []
 
         if self.state["positions"]:
+            tickers = await self._price_tickers(self.state["positions"])
             for sym, pos in self.state["positions"].items():
                 try:
-                    ticker = await self.client.get_ticker(f"{sym}-USDT")
+                    ticker = tickers.get(sym)
                     current_price = (
                         float(ticker.price) if ticker else float(pos.get("buy_price", 0))
                     )
@@ -7226,6 +7548,9 @@ class IBISTrueAgent:
             try:
                 cycle += 1
                 self._recycle_closes_this_cycle = 0
+                # Balances/tickers/open orders are fetched once per cycle and
+                # shared by every reader until our own orders invalidate them
+                self.client.begin_cycle()
 
                 # 🗓️ DAILY RESET: Check if date changed and reset daily stats
                 today = datetime.now().strftime("%Y-%m-%d")
@@ -7243,7 +7568,7 @@ class IBISTrueAgent:
                 await self.update_positions_awareness()
                 self._save_state()
                 await self.update_capital_awareness()
-                await self.check_pending_orders()
+                await self._check_pending_orders_locked()
 
                 # 🧠 Step 0b: Self-Learning from Past Performance
                 await self.learn_from_experience()
@@ -7274,6 +7599,7 @@ class IBISTrueAgent:
 
                 # Step 5: Execute strategy
                 strategy = await self.execute_strategy(regime, mode)
+                self._exit_strategy = strategy
                 self.logger.info(
                     f"   📜 Strategy: positions={len(self.state['positions'])}/{strategy['max_positions']}, avail=${strategy['available']:.2f}"
                 )
@@ -7282,7 +7608,7 @@ class IBISTrueAgent:
                 if not self.market_intel:
                     self.logger.info("   ⚡ Quick market scan...")
                     try:
-                        tickers = await self.client.get_tickers()
+                        tickers = await self._get_market_tickers()
                         min_score = self.config.get("min_score", 70)  # Use strategy threshold
                         for t in tickers[:20]:  # Top 20 by volume
                             sym = t.symbol.replace("-USDT", "")
@@ -7656,6 +7982,13 @@ class IBISTrueAgent:
 
                 # Step 11: Save and wait
                 self._save_state()
+                self.client.end_cycle()
+                if cycle % 10 == 0:
+                    self.logger.info(
+                        f"   🗃️ Request cache: {self.client.get_request_cache_stats()['endpoints']}"
+                    )
+                    self.logger.info(f"   🚦 Rate limiter: {self.client.get_rate_limiter_stats()}")
+                    self.logger.info(f"   🔌 Transport: {self.client.get_transport_stats()}")
 
                 if self.single_scan:
                     self.logger.info("   🏁 Single-scan complete. Exiting.")
@@ -7669,12 +8002,38 @@ class IBISTrueAgent:
                 break
             except Exception as e:
                 print(f"⚠️ Error: {e}")
+                self.client.end_cycle()
                 await asyncio.sleep(10)
 
-        self._save_state()
-        self._save_memory()
+        self._save_state(immediate=True)
+        self._state_writer.close()
+        self._memory_writer.close()
+        await self._stop_market_state()
         await self.client.close()
 
+    async def _stop_market_state(self):
+        """Stop the market/account streams and snapshot the streaming indicators for the next start"""
+        if getattr(self, "client", None) is not None:
+            try:
+                await self.client.flush_candle_archive()
+            except Exception as e:
+                self.logger.info(f"   ⚠️ Failed to flush candle archive: {e}")
+        if self.indicator_hub is not None:
+            try:
+                self.indicator_hub.save(self.indicator_snapshot_file)
+            except Exception as e:
+                self.logger.info(f"   ⚠️ Failed to save indicator snapshot: {e}")
+        if self.exit_watcher is not None:
+            await self.exit_watcher.stop()
+            self.logger.info(f"   ⚡ Tick exits: {self.exit_watcher.get_stats()}")
+        if self.entry_stats["orders_acked"]:
+            self.logger.info(f"   ⏱️ Entry latency: {self.get_entry_stats()}")
+        if self.market_state is not None:
+            await self.market_state.stop()
+        if self.account_state is not None:
+            self.client.account_state = None
+            await self.account_state.stop()
+
     async def close(self):
         """
         Close all resources used by the IBISTrueAgent.
@@ -7685,11 +8044,19 @@ class IBISTrueAgent:
         """
         self.logger.info("   🛑 Closing IBISTrueAgent resources...")
 
+        try:
+            if self.market_state is not None or self.account_state is not None:
+                await self._stop_market_state()
+                self.logger.info("   ✅ Market state stream closed")
+        except Exception as e:
+            self.logger.info(f"   ⚠️ Failed to close market state stream: {e}")
+
         try:
             # Close KuCoin client connection
             if hasattr(self, "client") and self.client is not None:
+                transport_stats = self.client.get_transport_stats()
                 await self.client.close()
-                self.logger.info("   ✅ KuCoin client closed")
+                self.logger.info(f"   ✅ KuCoin client closed | transport: {transport_stats}")
         except Exception as e:
             self.logger.info(f"   ⚠️ Failed to close KuCoin client: {e}")
 
@@ -7717,6 +8084,12 @@ class IBISTrueAgent:
         except Exception as e:
             self.logger.info(f"   ⚠️ Failed to close cross exchange monitor: {e}")
 
+        try:
+            # Close the connection pool shared by the intel feeds and notifiers
+            await close_http_transport()
+        except Exception as e:
+            self.logger.info(f"   ⚠️ Failed to close shared HTTP transport: {e}")
+
         try:
             # Clear KuCoin client instance from global state
             from ibis.exchange.kucoin_client import clear_kucoin_client_instance
@@ -7728,9 +8101,13 @@ class IBISTrueAgent:
 
         # Save final state and memory
         try:
-            self._save_state()
-            self._save_memory()
-            self.logger.info("   ✅ Final state and memory saved")
+            self._save_state(immediate=True)
+            self._state_writer.close()
+            self._memory_writer.close()
+            self.logger.info(
+                f"   ✅ Final state and memory saved | writer: {self._state_writer.get_stats()}"
+                f" | memory: {self._memory_writer.get_stats()}"
+            )
         except Exception as e:
             self.logger.info(f"   ⚠️ Failed to save final state: {e}")
 
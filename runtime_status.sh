@@ -78,7 +78,8 @@ db_positions=0
 db_trades=0
 trade_history_records=0
 if [ -f "$STATE_FILE" ]; then
-    state_positions=$(jq '.positions | length' "$STATE_FILE" 2>/dev/null || echo 0)
+    # Snapshot plus journal tail: the snapshot alone lags until compaction
+    state_positions=$(cd "$BASE_DIR" && python3 -c "from ibis.state_persistence import read_state; print(len(read_state('$STATE_FILE').get('positions', {})))" 2>/dev/null || echo 0)
 fi
 if [ -f "$DB_FILE" ]; then
     has_positions=$(sqlite3 "$DB_FILE" "SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name='positions';" 2>/dev/null || echo 0)
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Account state tests - a local mock KuCoin private WebSocket pushes order and
+balance events; fills are seen sub-second and order/balance reads stop
+hitting REST while the stream is up
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+import websockets
+
+from ibis.exchange.account_state import AccountStateService
+from ibis.exchange.kucoin_client import KuCoinClient
+from ibis.exchange.kucoin_websocket import KuCoinWebSocket
+
+
+class MockPrivateServer:
+    """Minimal KuCoin WS endpoint: welcome, subscribe acks, scripted pushes."""
+
+    def __init__(self, reject=False, silent=False):
+        self.reject = reject
+        self.silent = silent
+        self.subscriptions = []
+        self.connections = []
+        self._server = None
+        self.url = ""
+
+    async def __aenter__(self):
+        self._server = await websockets.serve(self._handler, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}/endpoint"
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handler(self, connection):
+        self.connections.append(connection)
+        await connection.send(json.dumps({"id": "welcome", "type": "welcome"}))
+        async for raw in connection:
+            message = json.loads(raw)
+            if message.get("type") == "subscribe":
+                self.subscriptions.append((message["topic"], message["privateChannel"]))
+                if self.silent:
+                    continue
+                if self.reject:
+                    reply = {"id": message["id"], "type": "error", "code": 401, "data": "denied"}
+                else:
+                    reply = {"id": message["id"], "type": "ack"}
+                await connection.send(json.dumps(reply))
+
+    async def push(self, topic, data, subject=""):
+        message = {"type": "message", "topic": topic, "subject": subject, "data": data}
+        await self.connections[-1].send(json.dumps(message))
+
+
+class RestClient(KuCoinClient):
+    """Live-mode client whose REST layer is canned and counted."""
+
+    def __init__(self, ws_url):
+        super().__init__(api_key="k", api_secret="s", api_passphrase="p")
+        self.paper_trading = False
+        self.ws_url_override = ws_url
+        self.rest_calls = []
+        self.active_orders = []
+        self.accounts = [
+            {"id": "a1", "currency": "USDT", "type": "trade", "balance": "100", "available": "60"}
+        ]
+        self.order_details = {}
+
+    async def _request(self, method, path, query="", body=""):
+        if path == "/api/v1/bullet-private":
+            server = {"endpoint": self.ws_url_override, "pingInterval": 18000}
+            return {"token": "t", "instanceServers": [server]}
+        self.rest_calls.append(path)
+        if path == "/api/v1/orders":
+            return {"items": [dict(o) for o in self.active_orders]}
+        if path == "/api/v1/accounts":
+            return [dict(a) for a in self.accounts]
+        if path.startswith("/api/v1/orders/"):
+            return dict(self.order_details[path.rsplit("/", 1)[-1]])
+        raise AssertionError(f"unexpected REST call {path}")
+
+    async def _request_with_retry(self, method, path, query="", body=""):
+        return await self._request(method, path, query, body)
+
+
+def _buy(order_id, symbol="SOL-USDT", price="10", size="4"):
+    return {
+        "id": order_id,
+        "symbol": symbol,
+        "side": "buy",
+        "type": "limit",
+        "price": price,
+        "size": size,
+        "dealSize": "0",
+        "dealFunds": "0",
+        "fee": "0",
+        "feeCurrency": "USDT",
+        "isActive": True,
+        "createdAt": int(time.time() * 1000),
+    }
+
+
+def _order_push(order_id, event, status, filled="0", **extra):
+    data = {
+        "orderId": order_id,
+        "symbol": "SOL-USDT",
+        "side": "buy",
+        "orderType": "limit",
+        "type": event,
+        "status": status,
+        "price": "10",
+        "size": "4",
+        "filledSize": filled,
+        "ts": time.time_ns(),
+    }
+    data.update(extra)
+    return data
+
+
+async def _wait_for(predicate, timeout=2.0):
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        assert time.perf_counter() < deadline, "timed out waiting for push"
+        await asyncio.sleep(0.005)
+
+
+async def test_fill_push_is_visible_sub_second_without_polling():
+    async with MockPrivateServer() as server:
+        client = RestClient(server.url)
+        client.active_orders = [_buy("o1")]
+        service = AccountStateService(client)
+        client.account_state = service
+        assert await service.start()
+        await _wait_for(lambda: len(server.subscriptions) == 2)
+        assert server.subscriptions == [
+            ("/spotMarket/tradeOrders", True),
+            ("/account/balance", True),
+        ]
+
+        events = []
+        service.order_listeners.append(lambda row, event: events.append((row["id"], event)))
+        client.rest_calls.clear()
+
+        # Polling an open order is answered from memory
+        order = await client.get_order("o1", "SOL-USDT")
+        assert order.status == "ACTIVE" and client.rest_calls == []
+
+        pushed = time.perf_counter()
+        await server.push(
+            "/spotMarket/tradeOrders",
+            _order_push("o1", "match", "match", "4", matchPrice="9.9", matchSize="4", tradeId="t1"),
+        )
+        await server.push("/spotMarket/tradeOrders", _order_push("o1", "filled", "done", "4"))
+        await _wait_for(lambda: ("o1", "filled") in events)
+        assert time.perf_counter() - pushed < 1.0
+
+        # Final fee/dealFunds come from one REST lookup, then from memory
+        client.order_details["o1"] = dict(
+            _buy("o1"), isActive=False, dealSize="4", dealFunds="39.6", fee="0.0396"
+        )
+        for _ in range(3):
+            order = await client.get_order("o1", "SOL-USDT")
+        assert order.status == "DONE" and order.filled_size == 4.0 and order.fee == 0.0396
+        assert client.rest_calls == ["/api/v1/orders/o1"]
+        assert await client.get_open_orders() == []
+
+        await service.stop()
+
+
+@pytest.mark.parametrize("reject", [True, False], ids=["error-reply", "no-ack"])
+async def test_unconfirmed_private_subscribe_keeps_reads_on_rest(reject):
+    async with MockPrivateServer(reject=reject, silent=not reject) as server:
+        client = RestClient(server.url)
+        client.active_orders = [_buy("o1")]
+        client.order_details["o1"] = _buy("o1")
+        service = AccountStateService(client)
+        service.ws.ack_timeout = 0.2
+        client.account_state = service
+
+        assert not await service.start()
+        assert not service.is_live()
+        assert KuCoinWebSocket.ORDERS_TOPIC not in service.ws.subscriptions
+        # Only the orders subscribe went out; the balance one is skipped
+        assert server.subscriptions == [("/spotMarket/tradeOrders", True)]
+
+        client.rest_calls.clear()
+        await client.get_order("o1", "SOL-USDT")
+        await client.get_open_orders()
+        assert client.rest_calls == ["/api/v1/orders/o1", "/api/v1/orders"]
+        await service.stop()
+
+
+async def test_cycle_reads_fall_from_rest_to_memory():
+    async with MockPrivateServer() as server:
+        client = RestClient(server.url)
+        client.active_orders = [_buy(f"o{i}", symbol=f"C{i}-USDT") for i in range(10)]
+        client.order_details = {o["id"]: o for o in client.active_orders}
+
+        async def cycle():
+            await client.get_all_balances(min_value_usd=0)
+            open_orders = await client.get_open_orders()
+            for row in open_orders:
+                await client.get_order(row["id"], row["symbol"])
+
+        await cycle()
+        polled = len(client.rest_calls)
+        assert polled == 12  # accounts + open orders + one lookup per pending buy
+
+        service = AccountStateService(client)
+        client.account_state = service
+        await service.start()
+        client.rest_calls.clear()
+        for _ in range(5):
+            await cycle()
+        assert client.rest_calls == []
+        assert service.get_stats()["order_hits"] == 50
+        await service.stop()
+
+
+async def test_balance_pushes_update_balances_and_ignore_stale_events():
+    async with MockPrivateServer() as server:
+        client = RestClient(server.url)
+        service = AccountStateService(client)
+        client.account_state = service
+        await service.start()
+        await _wait_for(lambda: len(server.subscriptions) == 2)
+        client.rest_calls.clear()
+
+        now = int(time.time() * 1000)
+        balance = {
+            "accountId": "a1",
+            "currency": "USDT",
+            "relationEvent": "trade.hold",
+            "total": "100",
+            "available": "20",
+            "hold": "80",
+            "time": str(now),
+        }
+        await server.push("/account/balance", balance)
+        await server.push("/account/balance", dict(balance, available="90", time=str(now - 5)))
+        await _wait_for(lambda: service.ws.messages_received >= 2)
+        assert service.stats["balance_events"] == 1
+
+        balances = await client.get_all_balances(min_value_usd=0)
+        assert balances["USDT"]["available"] == 20.0 and balances["USDT"]["balance"] == 100.0
+        assert client.rest_calls == []
+        await service.stop()
+
+
+async def test_resync_drops_vanished_orders_but_keeps_newer_pushes():
+    client = RestClient("ws://unused")
+    service = AccountStateService(client)
+    client.active_orders = [_buy("gone"), _buy("kept")]
+    await service.resync()
+    assert {row["id"] for row in service.open_orders()} == {"gone", "kept"}
+
+    client.active_orders = []
+    original = client._request
+
+    async def slow_request(method, path, query="", body=""):
+        if path == "/api/v1/orders":
+            # Push lands while the snapshot request is in flight
+            service._on_order("/spotMarket/tradeOrders", "", _order_push("kept", "update", "open"))
+        return await original(method, path, query, body)
+
+    client._request = slow_request
+    await service.resync()
+    assert [row["id"] for row in service.open_orders()] == ["kept"]
+    assert service.get_stats()["rest_resyncs"] == 2
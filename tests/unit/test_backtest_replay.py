@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Backtest replay tests - the event-indexed engine reproduces the original
+timestamp-scan loop trade for trade on the bundled strategies
+"""
+
+import random
+import statistics
+from datetime import datetime, timedelta
+
+import pytest
+
+from ibis.backtest.backtester import (
+    BacktestConfig,
+    BacktestEngine,
+    CandleGenerator,
+    CandleHistory,
+    ConfluenceStrategy,
+    MomentumStrategy,
+    PositionSide,
+    RSI_MeanReversionStrategy,
+    replay_events,
+)
+
+
+class LegacyEngine(BacktestEngine):
+    """The original O(T*S*N) run loop, kept as the reference."""
+
+    async def run(self, strategy, candles):
+        self.balance = self.config.initial_balance
+        self.equity_curve = []
+        self.trades = []
+        self.positions = {}
+        self.daily_pnl = {}
+
+        all_timestamps = sorted(set(c["timestamp"] for s in candles.values() for c in s))
+        for timestamp in all_timestamps:
+            for symbol, symbol_candles in candles.items():
+                candle = next((c for c in symbol_candles if c["timestamp"] == timestamp), None)
+                if candle and symbol in self.positions:
+                    self._update_position(symbol, candle, self.positions[symbol])
+
+            for symbol, symbol_candles in candles.items():
+                candle = next((c for c in symbol_candles if c["timestamp"] == timestamp), None)
+                if candle:
+                    history = symbol_candles[: symbol_candles.index(candle) + 1]
+                    analysis = strategy.analyze(history, PositionSide.NONE)
+                    if analysis["action"] == "BUY" and symbol not in self.positions:
+                        self._open_position(
+                            symbol, candle, PositionSide.LONG, analysis.get("reason", "")
+                        )
+                    elif analysis["action"] == "SELL" and symbol not in self.positions:
+                        self._open_position(
+                            symbol, candle, PositionSide.SHORT, analysis.get("reason", "")
+                        )
+
+            self.equity_curve.append((timestamp, self.balance))
+
+        return self._generate_report()
+
+
+def _universe(days=20, seed=9):
+    random.seed(seed)
+    candles = {
+        s: CandleGenerator.generate_candles(s, days=days, start_price=100, volatility=0.03)
+        for s in ("AAA-USDT", "BBB-USDT", "CCC-USDT", "DDD-USDT")
+    }
+    # Ragged streams: one symbol lists late and another has a gap
+    candles["CCC-USDT"] = candles["CCC-USDT"][100:]
+    del candles["DDD-USDT"][50:80]
+    return candles
+
+
+def _assert_same(result, expected):
+    assert result.trades == expected.trades
+    assert result.equity_curve == expected.equity_curve
+    for name in ("total_return_pct", "win_rate", "profit_factor", "sharpe_ratio", "max_drawdown"):
+        assert getattr(result, name) == getattr(expected, name), name
+
+
+@pytest.mark.parametrize(
+    "strategy_cls", [RSI_MeanReversionStrategy, MomentumStrategy, ConfluenceStrategy]
+)
+async def test_replay_matches_original_engine(strategy_cls):
+    candles = _universe()
+    config = BacktestConfig(max_open_positions=2)
+
+    expected = await LegacyEngine(config).run(strategy_cls(config), candles)
+    result = await BacktestEngine(config).run(strategy_cls(config), candles)
+
+    assert expected.total_trades > 0
+    _assert_same(result, expected)
+    assert result.bars_processed == sum(len(s) for s in candles.values())
+    assert result.bars_per_second > 0
+
+
+async def test_unsorted_and_duplicate_timestamps_match_original_engine():
+    candles = _universe(days=8)
+    shuffled = candles["AAA-USDT"][:]
+    random.Random(3).shuffle(shuffled)
+    candles["AAA-USDT"] = shuffled
+    candles["BBB-USDT"].insert(40, dict(candles["BBB-USDT"][40], close=1.0))
+    config = BacktestConfig()
+
+    expected = await LegacyEngine(config).run(MomentumStrategy(config), candles)
+    result = await BacktestEngine(config).run(MomentumStrategy(config), candles)
+    _assert_same(result, expected)
+
+
+def test_history_view_behaves_like_a_list_prefix():
+    candles = CandleGenerator.generate_candles("AAA-USDT", days=2)
+    view = CandleHistory(candles).view(30)
+    prefix = candles[:30]
+
+    assert len(view) == 30 and list(view) == prefix
+    assert view[-1] is candles[29] and view[0] is candles[0]
+    assert view[-15:] == prefix[-15:] and view[5:40] == prefix[5:40]
+    assert view[::-7] == prefix[::-7]
+    with pytest.raises(IndexError):
+        view[30]
+
+    closes = view.column("close")
+    assert closes.tolist() == [c["close"] for c in prefix]
+    assert not closes.flags.writeable
+    assert statistics.fmean(view.column("close")[-5:]) == pytest.approx(
+        sum(c["close"] for c in prefix[-5:]) / 5
+    )
+
+
+def test_replay_events_merge_streams_in_time_order():
+    start = datetime(2026, 1, 1)
+    candles = {
+        "B": [{"timestamp": start + timedelta(hours=h)} for h in (0, 2, 3)],
+        "A": [{"timestamp": start + timedelta(hours=h)} for h in (1, 2)],
+    }
+    groups = [(ts.hour, [(e[2], e[3]) for e in events]) for ts, events in replay_events(candles)]
+    assert groups == [
+        (0, [("B", 0)]),
+        (1, [("A", 0)]),
+        (2, [("B", 1), ("A", 1)]),
+        (3, [("B", 2)]),
+    ]
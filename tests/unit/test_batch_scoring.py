@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Batch scoring tests - vectorized features and scores match the per-symbol path
+"""
+
+import random
+
+import numpy as np
+
+from ibis.batch_scoring import (
+    batch_candle_features,
+    batch_funnel_score,
+    batch_technical_score,
+    batch_unified_score,
+    row,
+)
+from ibis.core.unified_scoring import UnifiedScorer
+from ibis.exchange.kucoin_client import Candle, OrderBook
+from ibis_true_agent import IBISTrueAgent
+
+TOL = 1e-9
+
+
+def _series(symbol, n, seed, start=100.0):
+    rng = random.Random(seed)
+    candles, price = [], start
+    for i in range(n):
+        price *= 1 + rng.uniform(-0.01, 0.012)
+        candles.append(
+            Candle(symbol, 1_700_000_000 + 60 * i, price, price * 1.004, price * 0.995, price,
+                   rng.uniform(5, 50), 0.0)
+        )
+    return candles
+
+
+def _universe(count=12):
+    # Uneven histories exercise the left padding
+    lengths_1m = [61, 61, 40, 19, 16, 5, 2, 1, 0, 61, 30, 61]
+    lengths_5m = [24, 3, 24, 10, 4, 0, 24, 2, 24, 24, 1, 24]
+    lengths_15m = [16, 16, 4, 16, 8, 16, 0, 16, 16, 16, 16, 3]
+    c1, c5, c15 = [], [], []
+    for i in range(count):
+        sym = f"S{i}-USDT"
+        c1.append(_series(sym, lengths_1m[i], seed=i))
+        c5.append(_series(sym, lengths_5m[i], seed=100 + i))
+        c15.append(_series(sym, lengths_15m[i], seed=200 + i))
+    return c1, c5, c15
+
+
+def _agent():
+    return object.__new__(IBISTrueAgent)
+
+
+def test_candle_features_match_analyze_candles():
+    agent = _agent()
+    c1, c5, c15 = _universe()
+    features = batch_candle_features(c1, c5, c15)
+
+    for i in range(len(c1)):
+        scalar = agent._analyze_candles(c1[i], c5[i], c15[i])
+        batched = row(features, i)
+        for key in (
+            "momentum_1h_raw",
+            "momentum_15m",
+            "momentum_5m",
+            "volume_momentum",
+            "momentum_confidence",
+            "momentum_composite",
+            "volatility_1m",
+            "volatility_5m",
+            "volatility_15m",
+            "trend_strength",
+        ):
+            assert abs(scalar[key] - batched[key]) < TOL, (i, key, scalar[key], batched[key])
+
+        reused = agent._analyze_candles(c1[i], c5[i], c15[i], features=batched)
+        assert reused["momentum_1h"] == batched["momentum_composite"]
+        assert reused["candle_patterns"] == scalar["candle_patterns"]
+
+
+def test_scores_match_unified_scorer():
+    rng = np.random.default_rng(7)
+    n = 64
+    scorer = UnifiedScorer()
+    symbols = ["BTC", "ETH"] + [f"ALT{i}" for i in range(n - 2)]
+    momentum = rng.uniform(-3, 3, n)
+    change = rng.uniform(-12, 12, n)
+    volume = rng.uniform(0, 8e6, n)
+    volatility = rng.uniform(0.005, 0.3, n)
+    agi = rng.uniform(0, 100, n)
+    mtf = rng.uniform(0, 100, n)
+    vol_score = rng.uniform(0, 100, n)
+    sentiment = np.full(n, 42.0)
+
+    technical = batch_technical_score(momentum, change, volatility, volume)
+    unified = batch_unified_score(
+        technical, agi, mtf, vol_score, sentiment, symbols, scorer.regime_config
+    )
+    spread = np.minimum(volatility * 0.3, 0.02)
+    funnel = batch_funnel_score(volume, volatility, change, momentum, technical, agi, spread)
+
+    for i in range(n):
+        t = scorer.calculate_technical_score(momentum[i], change[i], volatility[i], volume[i])
+        assert abs(technical[i] - t) < TOL
+        u = scorer.calculate_unified_score(
+            technical_score=t,
+            agi_score=agi[i],
+            mtf_score=mtf[i],
+            volume_score=vol_score[i],
+            sentiment_score=42.0,
+            symbol=symbols[i],
+        )
+        assert abs(unified["score"][i] - u["score"]) <= 0.01
+        assert abs(unified["confidence"][i] - u["confidence"]) <= 0.01
+        f = scorer.calculate_funnel_score(
+            {
+                "volume_24h": volume[i],
+                "volatility": volatility[i],
+                "change_24h": change[i],
+                "change_1h": momentum[i],
+                "technical_score": t,
+                "agi_score": agi[i],
+                "spread": spread[i],
+            }
+        )
+        assert abs(funnel[i] - f) < TOL
+
+
+class _Ticker:
+    def __init__(self, price, change, volume):
+        self.price = price
+        self.change_24h = change
+        self.volume_24h = volume
+        self.high_24h = price * 1.06
+        self.low_24h = price * 0.97
+
+
+class _Client:
+    def __init__(self, candles):
+        self.candles = candles
+
+    async def get_candles(self, symbol, interval, limit=None):
+        return self.candles[symbol][interval]
+
+    async def get_orderbook(self, symbol, limit=20):
+        return OrderBook(symbol=symbol, bids=[[9.9, 5.0]], asks=[[10.1, 3.0]])
+
+
+async def test_score_symbols_batch_builds_market_intel_entries():
+    c1, c5, c15 = _universe()
+    symbols = [f"S{i}" for i in range(len(c1))]
+    candles = {
+        f"{sym}-USDT": {"1min": c1[i], "5min": c5[i], "15min": c15[i]}
+        for i, sym in enumerate(symbols)
+    }
+    tickers = {sym: _Ticker(10.0 + i, (-1) ** i * i, 2e5 * i) for i, sym in enumerate(symbols)}
+
+    agent = _agent()
+    agent.client = _Client(candles)
+    agent.orderbook_cache = {}
+
+    results = await agent._score_symbols_batch(symbols, tickers, fg_score=55)
+    assert [r["symbol"] for r in results] == symbols
+
+    scorer = UnifiedScorer()
+    for i, res in enumerate(results):
+        analysis = agent._analyze_candles(c1[i], c5[i], c15[i])
+        technical = scorer.calculate_technical_score(
+            analysis["momentum_1h"], tickers[symbols[i]].change_24h
+        )
+        assert abs(res["momentum_1h"] - analysis["momentum_1h"]) < TOL
+        assert abs(res["unified_intel"]["breakdown"]["technical"]["score"] - technical) < TOL
+        assert abs(res["volatility"] - 0.09) < 1e-9
+        assert res["risk_level"] in ("LOW", "MEDIUM", "HIGH")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Candle archive tests - columnar files append incrementally, reopen as memmaps,
+warm the client's candle store and feed backtests and indicators
+"""
+
+import random
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from ibis.exchange.candle_archive import CandleArchive
+from ibis.exchange.kucoin_client import Candle, KuCoinClient
+from ibis.indicators.indicators import IndicatorEngine
+
+
+def _candles(n, start_ts=1_700_000_040, step=60, seed=2, symbol="ETH-USDT"):
+    rng = random.Random(seed)
+    out, price = [], 30.0
+    for i in range(n):
+        open_ = price
+        price *= 1 + rng.uniform(-0.01, 0.01)
+        high, low = max(open_, price) * 1.001, min(open_, price) * 0.999
+        out.append(Candle(symbol, start_ts + step * i, open_, high, low, price, rng.uniform(1, 9), 1.0))
+    return out
+
+
+def test_append_reopen_and_revise_forming_bar(tmp_path):
+    archive = CandleArchive(str(tmp_path))
+    candles = _candles(300)
+
+    assert archive.append("ETH-USDT", "1min", candles[:200]) == 200
+    forming = Candle("ETH-USDT", candles[199].timestamp, 1, 2, 0.5, 1.5, 3, 4)
+    assert archive.append("ETH-USDT", "1min", [forming] + candles[200:]) == 100
+
+    series = archive.open("ETH-USDT", "1min")
+    assert isinstance(series["close"], np.memmap)
+    assert len(series) == 300
+    assert series["close"][199] == 1.5
+    assert series["timestamp"].tolist() == [c.timestamp for c in candles]
+    assert archive.candles("ETH-USDT", "1min", limit=5) == candles[-5:]
+    assert archive.symbols("1min") == ["ETH-USDT"]
+    assert len(archive.open("BTC-USDT", "1min")) == 0
+
+
+def test_backfill_rewrites_in_order_and_torn_appends_are_ignored(tmp_path):
+    archive = CandleArchive(str(tmp_path))
+    candles = _candles(120)
+    archive.append("ETH-USDT", "1min", candles[60:])
+    assert archive.append("ETH-USDT", "1min", candles[:70]) == 60  # overlaps 10 bars
+    assert archive.stats["rewrites"] == 1
+    assert archive.candles("ETH-USDT", "1min") == candles
+
+    # Simulate a crash after only the timestamp column of a new bar was written
+    with open(tmp_path / "1min" / "ETH-USDT" / "timestamp.col", "ab") as f:
+        f.write(np.int64(candles[-1].timestamp + 60).tobytes())
+    assert len(archive.open("ETH-USDT", "1min")) == 120
+    extra = _candles(1, start_ts=candles[-1].timestamp + 60)
+    assert archive.append("ETH-USDT", "1min", extra) == 1
+    assert archive.candles("ETH-USDT", "1min")[-1] == extra[0]
+
+
+async def test_overlapping_fetches_and_flush_skip_the_rewrite(tmp_path, monkeypatch):
+    now = int(time.time()) // 60 * 60
+    history = _candles(1500, start_ts=now - 60 * 1499)
+    archive = CandleArchive(str(tmp_path))
+    # A series first created by stream pushes: only the newest bars are stored
+    archive.append("ETH-USDT", "1min", history[-3:])
+
+    client = KuCoinClient(paper_trading=True)
+    client.candle_archive = archive
+
+    async def full_fetch(symbol, candle_type, limit=None, start=None, end=None):
+        return history
+
+    monkeypatch.setattr(client, "_fetch_candles", full_fetch)
+    await client.get_candles("ETH-USDT", "1min", limit=100)
+    # The bars the archive was missing are a real backfill: one rewrite
+    assert archive.stats["rewrites"] == 1 and len(archive.open("ETH-USDT", "1min")) == 1500
+
+    # From then on overlap is trimmed to the tail, not merged
+    assert archive.append("ETH-USDT", "1min", history) == 0
+    assert await client.flush_candle_archive() == 0
+    assert archive.stats["rewrites"] == 1 and archive.stats["bars_skipped"] >= 2 * 1499
+    assert archive.candles("ETH-USDT", "1min") == history
+
+
+def test_backtest_and_indicator_reads(tmp_path):
+    archive = CandleArchive(str(tmp_path))
+    candles = _candles(400, step=3600)
+    archive.append("ETH-USDT", "1hour", candles)
+
+    data = archive.backtest_candles(["ETH-USDT"], "1hour")["ETH-USDT"]
+    assert data[0]["timestamp"] == datetime.fromtimestamp(candles[0].timestamp)
+    assert data[-1]["close"] == candles[-1].close
+    assert set(data[0]) == {"symbol", "timestamp", "open", "high", "low", "close", "volume"}
+
+    series = archive.open("ETH-USDT", "1hour")
+    from_archive = IndicatorEngine().calculate_columns(series)
+    from_list = IndicatorEngine().calculate_columns(candles)
+    for name, values in from_list.items():
+        np.testing.assert_array_equal(from_archive[name], values)
+    assert len(series.between(candles[10].timestamp, candles[20].timestamp)) == 10
+
+
+async def test_client_warms_store_from_archive_and_fetches_only_the_gap(tmp_path, monkeypatch):
+    now = int(time.time()) // 60 * 60
+    history = _candles(500, start_ts=now - 60 * 503)
+    gap = _candles(4, start_ts=history[-1].timestamp, seed=9)  # re-sends the last bar
+
+    archive = CandleArchive(str(tmp_path))
+    archive.append("ETH-USDT", "1min", history)
+    client = KuCoinClient(paper_trading=True)
+    client.candle_archive = archive
+
+    requests = []
+
+    async def fake_fetch(symbol, candle_type, limit=None, start=None, end=None):
+        requests.append(start)
+        return gap
+
+    monkeypatch.setattr(client, "_fetch_candles", fake_fetch)
+    candles = await client.get_candles("ETH-USDT", "1min", limit=200)
+
+    assert requests == [history[-1].timestamp]  # incremental, not a full 1500-bar fetch
+    assert candles[-4:] == gap and len(candles) == 200
+    assert len(archive.open("ETH-USDT", "1min")) == 503
+
+    client._candle_store.merge("ETH-USDT", "1min", _candles(1, start_ts=now, seed=4))
+    assert await client.flush_candle_archive() == 1
+
+
+async def test_sync_pages_only_missing_ranges(tmp_path):
+    step = 3600
+    now = int(time.time()) // step * step
+    full = _candles(24 * 100, start_ts=now - step * (24 * 100 - 1), step=step)
+
+    class _Client:
+        def __init__(self):
+            self.calls = []
+
+        async def get_candles(self, symbol, interval, start=None, end=None):
+            self.calls.append((start, end))
+            return [c for c in full if start <= c.timestamp <= end]
+
+    archive = CandleArchive(str(tmp_path))
+    archive.append("ETH-USDT", "1hour", full[1000:2000])
+    client = _Client()
+    added = await archive.sync(client, "ETH-USDT", "1hour", days=99)
+
+    stored = archive.open("ETH-USDT", "1hour")["timestamp"]
+    assert stored[0] >= now - 99 * 86400 and stored[-1] == full[-1].timestamp
+    assert np.all(np.diff(stored) == step)
+    assert added == len(stored) - 1000
+    # The stored 1000 bars were never requested again
+    assert all(
+        end < full[1000].timestamp or start >= full[1999].timestamp for start, end in client.calls
+    )
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Candle store tests - (symbol, interval) keying and incremental startAt fetches
+"""
+
+import time
+
+from ibis.exchange.kucoin_client import KuCoinClient
+
+
+def _kline(ts, close):
+    return [str(ts), str(close), str(close * 1.01), str(close * 0.99), str(close), "10", "0", "100"]
+
+
+class FakeCandleClient(KuCoinClient):
+    """KuCoinClient that serves klines from memory and records every request."""
+
+    def __init__(self, bars_by_interval):
+        super().__init__(paper_trading=True)
+        self.bars_by_interval = bars_by_interval
+        self.requests = []
+
+    async def _request_with_retry(self, method, path, query="", body=""):
+        self.requests.append(path)
+        params = dict(p.split("=") for p in path.split("?", 1)[1].split("&"))
+        bars = self.bars_by_interval[params["type"]]
+        start = int(params.get("startAt", 0))
+        rows = [_kline(ts, close) for ts, close in bars if ts >= start]
+        return list(reversed(rows))  # KuCoin returns newest first
+
+
+async def test_intervals_do_not_overwrite_each_other():
+    now = int(time.time())
+    client = FakeCandleClient(
+        {
+            "1min": [(now - 60 * i, 1.0) for i in range(100, 0, -1)],
+            "5min": [(now - 300 * i, 5.0) for i in range(30, 0, -1)],
+        }
+    )
+
+    c1 = await client.get_candles("BTC-USDT", "1min", limit=61)
+    c5 = await client.get_candles("BTC-USDT", "5min", limit=24)
+
+    assert len(c1) == 61 and all(c.close == 1.0 for c in c1)
+    assert len(c5) == 24 and all(c.close == 5.0 for c in c5)
+
+    # Both are cache hits now
+    again = await client.get_candles("BTC-USDT", "1min", limit=61)
+    assert again == c1
+    assert len(client.requests) == 2
+    stats = client.get_candle_store_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+
+
+async def test_stale_series_fetches_only_new_bars():
+    now = int(time.time())
+    bars = [(now - 60 * i, 1.0) for i in range(50, 0, -1)]
+    client = FakeCandleClient({"1min": bars})
+
+    await client.get_candles("ETH-USDT", "1min", limit=20)
+    last_ts = bars[-1][0]
+
+    # Forming bar gets a new close and two more bars print
+    bars[-1] = (last_ts, 2.0)
+    bars.extend([(last_ts + 60, 3.0), (last_ts + 120, 4.0)])
+    client._candle_store._updated_at[("ETH-USDT", "1min")] -= 10
+
+    candles = await client.get_candles("ETH-USDT", "1min", limit=20)
+
+    assert f"startAt={last_ts}" in client.requests[-1]
+    assert [c.close for c in candles[-3:]] == [2.0, 3.0, 4.0]
+    assert len({c.timestamp for c in candles}) == len(candles)
+    stats = client.get_candle_store_stats()
+    assert stats["incremental_fetches"] == 1
+    assert stats["bars_fetched"] == 50 + 3
+    assert stats["bytes_saved"] > 0
+
+
+async def test_explicit_range_bypasses_store():
+    now = int(time.time())
+    client = FakeCandleClient({"1min": [(now - 60 * i, 1.0) for i in range(10, 0, -1)]})
+
+    await client.get_candles("SOL-USDT", "1min", start=now - 300, end=now)
+
+    assert client.get_candle_store_stats()["series"] == 0
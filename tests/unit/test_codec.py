@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+JSON codec tests - every backend round-trips state the same way, NaN from old
+json.dump files still loads, and the typed KuCoin decoders build the same
+Ticker / TradeOrder objects as the dict-based from_response paths
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ibis.core import codec
+from ibis.exchange import kucoin_codec
+from ibis.exchange.kucoin_client import KuCoinClient, TradingClient
+from ibis.exchange.kucoin_codec import TYPED_DECODERS, UNTYPED, decode_all_tickers, decode_order
+from ibis.exchange.models import Ticker, TradeOrder
+
+STATE = {
+    "positions": {"SOL-USDT": {"quantity": 1.5, "entry_price": 140.25, "mode": "ACTIVE"}},
+    "daily": {"trades": 3, "pnl": -0.75},
+    "history": [1, 2.5, None, True, "x"],
+}
+
+TICKERS = {
+    "code": "200000",
+    "data": {
+        "time": 1700000000000,
+        "ticker": [
+            {
+                "symbol": "SOL-USDT",
+                "last": "140.25",
+                "buy": "140.2",
+                "sell": "140.3",
+                "changeRate": "0.0123",
+                "changePrice": "1.7",
+                "vol": "123456.78",
+                "high": "145",
+                "low": "130.5",
+            },
+            {"symbol": "NEW-USDT", "last": None, "buy": None, "sell": None},
+        ],
+    },
+}
+
+ORDER = {
+    "code": "200000",
+    "data": {
+        "orderId": "abc123",
+        "symbol": "SOL-USDT",
+        "side": "buy",
+        "type": "limit",
+        "price": "140.25",
+        "size": "1.5",
+        "dealSize": "1.5",
+        "dealFunds": "210.375",
+        "fee": "0.21",
+        "feeCurrency": "USDT",
+        "isActive": False,
+        "createdAt": 1700000000000,
+    },
+}
+
+
+@pytest.fixture(params=["orjson", "msgspec", "stdlib"])
+def backend(request, monkeypatch):
+    available = {"orjson": codec.ORJSON_AVAILABLE, "msgspec": codec.MSGSPEC_AVAILABLE}
+    if not available.get(request.param, True):
+        pytest.skip(f"{request.param} not installed")
+    monkeypatch.setattr(codec, "BACKEND", request.param)
+    return request.param
+
+
+def test_round_trip_matches_stdlib(backend):
+    encoded = codec.dumps(STATE)
+    assert isinstance(encoded, bytes)
+    assert codec.loads(encoded) == STATE
+    assert json.loads(encoded) == json.loads(json.dumps(STATE))
+    assert json.loads(codec.dumps(STATE, indent=True)) == STATE
+
+
+def test_non_native_values_encode_like_default_str(backend):
+    value = {1: np.float64(0.5), "n": np.int64(3), "path": Path("state/ibis.json")}
+    assert codec.loads(codec.dumps(value)) == {"1": 0.5, "n": 3, "path": "state/ibis.json"}
+
+
+def test_nan_written_by_json_dump_still_loads(backend):
+    restored = codec.loads(json.dumps({"pnl": float("nan")}).encode())
+    assert restored["pnl"] != restored["pnl"]
+    with pytest.raises(ValueError):
+        codec.loads(b'{"torn": ')
+
+
+def test_all_tickers_decode_matches_from_response(monkeypatch):
+    expected = [Ticker.from_response({"ticker": t}, t["symbol"]) for t in TICKERS["data"]["ticker"]]
+    body = json.dumps(TICKERS).encode()
+
+    assert decode_all_tickers(body)["ticker"] == expected
+    # Dict fallback when msgspec is not installed yields the same objects
+    monkeypatch.setattr(kucoin_codec, "MSGSPEC_AVAILABLE", False)
+    assert decode_all_tickers(body)["ticker"] == expected
+
+
+def test_order_decode_matches_from_response():
+    if not codec.MSGSPEC_AVAILABLE:
+        pytest.skip("msgspec not installed")
+    order = decode_order(json.dumps(ORDER).encode())
+    assert order == TradeOrder.from_response(ORDER["data"], "SOL-USDT")
+    assert order.status == "DONE"
+    assert order.avg_price == pytest.approx(140.25)
+
+
+async def test_order_posts_accept_typed_decode():
+    if not codec.MSGSPEC_AVAILABLE:
+        pytest.skip("msgspec not installed")
+    client = KuCoinClient(paper_trading=False)
+    posted = []
+
+    async def request(method, path, query="", body=""):
+        # What _request hands back once the typed decoder matches the endpoint
+        posted.append(json.loads(body))
+        return TYPED_DECODERS[(method, path)](b'{"code":"200000","data":{"orderId":"abc"}}')
+
+    client._request = request
+    stop = await TradingClient(client).place_stop_order("SOL-USDT", "sell", 130.0, 1.5, 131.0)
+    assert isinstance(stop, TradeOrder) and stop.order_id == "abc" and stop.symbol == "SOL-USDT"
+    assert posted[0]["stop"] == "price" and posted[0]["stopPrice"] == "131.0"
+
+    order = await client._live_create_order({"symbol": "ETH-USDT", "side": "buy"})
+    assert order.order_id == "abc" and order.symbol == "ETH-USDT"
+
+
+def test_candles_and_orderbook_decode_to_floats():
+    if not codec.MSGSPEC_AVAILABLE:
+        pytest.skip("msgspec not installed")
+    candles = kucoin_codec.decode_candles(
+        b'{"code":"200000","data":[["1700000000","1.0","1.2","1.3","0.9","10","12"]]}'
+    )
+    assert candles == [[1700000000.0, 1.0, 1.2, 1.3, 0.9, 10.0, 12.0]]
+    book = kucoin_codec.decode_orderbook(
+        b'{"code":"200000","data":{"time":5,"sequence":"9","bids":[["1.0","2"]],"asks":[["1.1","3"]]}}'
+    )
+    assert book["bids"] == [[1.0, 2.0]] and book["asks"] == [[1.1, 3.0]]
+
+
+def test_error_envelopes_fall_back_to_generic_decode():
+    error = b'{"code":"429000","msg":"Too many requests"}'
+    for decoder in kucoin_codec.TYPED_DECODERS.values():
+        assert decoder(error) is UNTYPED
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Columnar indicator tests - array kernels match the original list loops, plus
+pytest-benchmark timings (skipped when pytest-benchmark is not installed)
+"""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from ibis.indicators import columnar
+from ibis.indicators.indicators import (
+    ATR,
+    MACD,
+    OBV,
+    OHLCV,
+    RSI,
+    VWAP,
+    BollingerBands,
+    IndicatorEngine,
+    Ichimoku,
+    MovingAverage,
+    Stochastic,
+)
+
+try:
+    import pytest_benchmark  # noqa: F401
+
+    HAS_BENCHMARK = True
+except ImportError:
+    HAS_BENCHMARK = False
+
+needs_benchmark = pytest.mark.skipif(not HAS_BENCHMARK, reason="pytest-benchmark not installed")
+
+
+def _bars(n, seed=3):
+    rng = random.Random(seed)
+    bars, price = [], 50.0
+    for i in range(n):
+        open_ = price
+        price *= 1 + rng.uniform(-0.01, 0.01)
+        if i % 37 == 0:
+            price = open_  # flat bars exercise the equal-close branches
+        high = max(open_, price) * (1 + rng.uniform(0, 0.004))
+        low = min(open_, price) * (1 - rng.uniform(0, 0.004))
+        bars.append(OHLCV(i * 60, open_, high, low, price, rng.uniform(1, 100)))
+    return bars
+
+
+# Original O(n * period) list implementations, kept as the reference
+
+
+def legacy_sma(prices, period):
+    return [
+        float("nan") if i < period - 1 else sum(prices[i - period + 1 : i + 1]) / period
+        for i in range(len(prices))
+    ]
+
+
+def legacy_wma(prices, period):
+    denominator = period * (period + 1) / 2
+    return [
+        float("nan")
+        if i < period - 1
+        else sum(prices[i - period + j + 1] * (j + 1) for j in range(period)) / denominator
+        for i in range(len(prices))
+    ]
+
+
+def legacy_ema(prices, period):
+    multiplier = 2 / (period + 1)
+    ema = sum(prices[:period]) / period
+    result = [ema]
+    for price in prices[period:]:
+        ema = (price - ema) * multiplier + ema
+        result.append(ema)
+    return result
+
+
+def legacy_rsi(prices, period=14):
+    if len(prices) < period + 1:
+        return [float("nan")] * len(prices)
+    deltas = [prices[i] - prices[i - 1] for i in range(1, len(prices))]
+    gains = [max(d, 0) for d in deltas]
+    losses = [-min(d, 0) for d in deltas]
+    avg_gain = sum(gains[:period]) / period
+    avg_loss = sum(losses[:period]) / period
+    values = [float("nan")] * period
+    for i in range(period, len(prices)):
+        values.append(100 if avg_loss == 0 else 100 - (100 / (1 + avg_gain / avg_loss)))
+        if i < len(prices) - 1:
+            avg_gain = (avg_gain * (period - 1) + gains[i]) / period
+            avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+    return values
+
+
+def legacy_bollinger(prices, period=20, mult=2.0):
+    sma = legacy_sma(prices, period)
+    upper, lower = [], []
+    for i in range(len(prices)):
+        if i < period - 1:
+            upper.append(float("nan"))
+            lower.append(float("nan"))
+            continue
+        window = prices[i - period + 1 : i + 1]
+        std = math.sqrt(sum((p - sma[i]) ** 2 for p in window) / period)
+        upper.append(sma[i] + mult * std)
+        lower.append(sma[i] - mult * std)
+    return {"middle": sma, "upper": upper, "lower": lower}
+
+
+def legacy_atr(bars, period=14):
+    trs = [
+        max(b.high - b.low, abs(b.high - p.close), abs(b.low - p.close))
+        for p, b in zip(bars, bars[1:])
+    ]
+    values = [float("nan")] * period
+    atr = sum(trs[:period]) / period
+    values.append(atr)
+    for tr in trs[period:]:
+        atr = (atr * (period - 1) + tr) / period
+        values.append(atr)
+    return values
+
+
+def legacy_stochastic(bars, k_period=14, d_period=3):
+    k_values, d_values = [], []
+    for i in range(len(bars)):
+        if i < k_period - 1:
+            k_values.append(float("nan"))
+            d_values.append(float("nan"))
+            continue
+        window = bars[i - k_period + 1 : i + 1]
+        hh = max(c.high for c in window)
+        ll = min(c.low for c in window)
+        k_values.append(50 if hh == ll else (bars[i].close - ll) / (hh - ll) * 100)
+        valid = [k for k in k_values[-d_period:] if not math.isnan(k)]
+        d_values.append(sum(valid) / d_period if len(valid) == d_period else float("nan"))
+    return {"k": k_values, "d": d_values}
+
+
+def legacy_midpoint(bars, period, i):
+    window = bars[i - period + 1 : i + 1]
+    return (max(c.high for c in window) + min(c.low for c in window)) / 2
+
+
+def _close(actual, expected, rel=1e-9):
+    a = np.asarray(actual, dtype=float)
+    e = np.asarray(expected, dtype=float)
+    assert a.shape == e.shape
+    assert np.array_equal(np.isnan(a), np.isnan(e))
+    mask = ~np.isnan(e)
+    np.testing.assert_allclose(a[mask], e[mask], rtol=rel, atol=1e-9)
+
+
+def test_moving_averages_match_list_loops():
+    closes = [b.close for b in _bars(400)]
+    for period in (1, 5, 20, 50):
+        _close(MovingAverage.sma(closes, period), legacy_sma(closes, period))
+        _close(MovingAverage.wma(closes, period), legacy_wma(closes, period))
+        _close(MovingAverage.ema(closes, period), legacy_ema(closes, period))
+    assert MovingAverage.sma(closes[:3], 5) == pytest.approx([math.nan] * 3, nan_ok=True)
+
+
+def test_oscillators_and_bands_match_list_loops():
+    bars = _bars(400)
+    closes = [b.close for b in bars]
+
+    _close(RSI.calculate(closes, 14), legacy_rsi(closes, 14))
+    _close(RSI.calculate(closes[:10], 14), legacy_rsi(closes[:10], 14))
+
+    bb = BollingerBands.calculate(closes, 20, 2.0)
+    for name, values in legacy_bollinger(closes).items():
+        _close(bb[name], values)
+
+    _close(ATR.calculate(bars, 14), legacy_atr(bars, 14))
+
+    stoch = Stochastic.calculate(bars, 14, 3)
+    for name, values in legacy_stochastic(bars).items():
+        _close(stoch[name], values)
+
+
+def test_volume_and_ichimoku_match_list_loops():
+    bars = _bars(300)
+
+    cum_tpv = cum_vol = 0.0
+    expected_vwap = []
+    for b in bars:
+        cum_tpv += (b.high + b.low + b.close) / 3 * b.volume
+        cum_vol += b.volume
+        expected_vwap.append(cum_tpv / cum_vol)
+    _close(VWAP.calculate(bars), expected_vwap)
+
+    expected_obv = [0.0]
+    for prev, bar in zip(bars, bars[1:]):
+        direction = (bar.close > prev.close) - (bar.close < prev.close)
+        expected_obv.append(expected_obv[-1] + direction * bar.volume)
+    _close(OBV.calculate(bars), expected_obv)
+    assert OBV.calculate([]) == [0] and VWAP.calculate([]) == []
+
+    ichimoku = Ichimoku.calculate(bars)
+    n = len(bars)
+    assert len(ichimoku["senkou_b"]) == n + 26
+    for i in (8, 25, 51, n - 1):
+        assert ichimoku["tenkan"][i] == pytest.approx(legacy_midpoint(bars, 9, i))
+    assert ichimoku["kijun"][-1] == pytest.approx(legacy_midpoint(bars, 26, n - 1))
+    assert ichimoku["senkou_b"][-1] == pytest.approx(legacy_midpoint(bars, 52, n - 1))
+    assert ichimoku["chikou"][0] == bars[26].close
+
+
+def test_macd_signal_line_is_aligned_with_the_macd_line():
+    closes = [b.close for b in _bars(200)]
+    data = MACD.calculate(closes)
+    line = np.array(data["macd"])
+    start = 25
+    assert all(len(v) == len(closes) for v in data.values())
+    _close(data["signal"][start:], [math.nan] * 8 + legacy_ema(line[start:].tolist(), 9))
+    _close(data["histogram"], line - np.array(data["signal"]))
+
+
+def test_rolling_extremes_handle_any_window():
+    values = np.random.default_rng(1).normal(size=257)
+    for period in (1, 2, 7, 52, 257):
+        windows = [values[max(0, i - period + 1) : i + 1] for i in range(len(values))]
+        head = [math.nan] * (period - 1)
+        full = windows[period - 1 :]
+        _close(columnar.rolling_max(values, period), head + [w.max() for w in full])
+        _close(columnar.rolling_min(values, period), head + [w.min() for w in full])
+
+
+async def test_engine_accepts_structured_array():
+    bars = _bars(300)
+    ohlcv = columnar.to_ohlcv_array(bars)
+    assert ohlcv.dtype == columnar.OHLCV_DTYPE
+
+    from_list = await IndicatorEngine().calculate_all(bars)
+    from_array = await IndicatorEngine().calculate_all(ohlcv)
+
+    assert from_list.to_dict() == from_array.to_dict()
+    expected_rsi = legacy_rsi([b.close for b in bars])[-1]
+    assert from_array.indicators["rsi"].value == pytest.approx(expected_rsi)
+    columns = IndicatorEngine().calculate_columns(ohlcv)
+    assert all(len(v) in (len(bars), len(bars) + 26) for v in columns.values())
+
+
+@needs_benchmark
+@pytest.mark.parametrize("n", [1_000, 10_000])
+def test_benchmark_legacy_sma_wma_stochastic(benchmark, n):
+    bars = _bars(n)
+    closes = [b.close for b in bars]
+
+    def run():
+        legacy_sma(closes, 50)
+        legacy_wma(closes, 50)
+        legacy_stochastic(bars)
+
+    benchmark(run)
+
+
+@needs_benchmark
+@pytest.mark.parametrize("n", [1_000, 10_000])
+def test_benchmark_columnar_sma_wma_stochastic(benchmark, n):
+    ohlcv = columnar.to_ohlcv_array(_bars(n))
+
+    def run():
+        columnar.sma(ohlcv["close"], 50)
+        columnar.wma(ohlcv["close"], 50)
+        columnar.stochastic(ohlcv["high"], ohlcv["low"], ohlcv["close"])
+
+    benchmark(run)
+
+
+@needs_benchmark
+def test_benchmark_engine_calculate_all(benchmark):
+    ohlcv = columnar.to_ohlcv_array(_bars(1_500))
+    engine = IndicatorEngine()
+    benchmark(engine.calculate_columns, ohlcv)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Entry fast path tests - a fresh scan quote serves the spread and maker-first
+checks so create_order is the only round trip, a stale quote costs exactly one
+get_ticker, TP/SL and rounding come from symbol_rules, and decision-to-ack
+latency is recorded per trade
+"""
+
+import time
+
+import pytest
+
+from ibis.core.trading_constants import TRADING
+from ibis.exchange.kucoin_client import Ticker
+from ibis.exit_watcher import ExitWatcher
+from ibis_true_agent import IBISTrueAgent
+
+
+class FakeClient:
+    def __init__(self, bid=9.99, ask=10.0):
+        self.calls = []
+        self.bid, self.ask = bid, ask
+
+    async def get_ticker(self, symbol):
+        self.calls.append(("get_ticker", symbol))
+        return Ticker(symbol=symbol, price=self.ask, buy=self.bid, sell=self.ask)
+
+    async def get_candles(self, symbol, interval, limit=100):
+        self.calls.append(("get_candles", symbol))
+        return []
+
+    async def create_order(self, symbol, side, type, price, size):
+        self.calls.append(("create_order", symbol, type, price, size))
+
+        class Resp:
+            order_id = "OID-1"
+
+        return Resp()
+
+
+def _agent(client):
+    agent = IBISTrueAgent()
+    agent.client = client
+    agent.symbol_rules = {
+        "SOL": {"baseIncrement": 0.01, "baseMinSize": 0.01, "quoteMinSize": 0.1, "priceIncrement": 0.001}
+    }
+    agent.state["capital_awareness"]["buy_orders"] = {}
+    agent.state["capital_awareness"]["open_orders_count"] = 0
+    agent.state["positions"] = {}
+    agent.state["daily"]["trades"] = 0
+    agent.state["daily"]["orders_placed"] = 0
+    agent.exit_watcher = ExitWatcher(lambda *a: None)
+    saves = []
+
+    def save_state(immediate=False):
+        agent.exit_watcher.sync(agent.state["positions"])
+        saves.append(immediate)
+
+    agent._save_state = save_state
+
+    async def sizing(strategy, symbol, market_intel):
+        return 50.0
+
+    agent.dynamic_position_sizing = sizing
+    agent.entry_saves = saves
+    return agent
+
+
+def _strategy(regime):
+    return {"available": 200.0, "regime": regime, "mode": "NORMAL", "stop_loss": None}
+
+
+def _scan(agent, bid, ask, age=0.0):
+    agent.latest_tickers = {"SOL": Ticker(symbol="SOL-USDT", price=ask, buy=bid, sell=ask)}
+    agent._latest_tickers_ts = time.time() - age
+
+
+async def test_fresh_scan_quote_leaves_create_order_as_only_round_trip(monkeypatch):
+    client = FakeClient()
+    agent = _agent(client)
+    _scan(agent, 9.99, 10.0)
+    monkeypatch.setitem(TRADING.SCAN.MARKET_ORDERS_BY_REGIME, "PERFECT", True)
+
+    opportunity = {"symbol": "SOL", "price": 10.0, "score": 95}
+    pos = await agent.open_position(opportunity, _strategy("PERFECT"))
+
+    assert [c[0] for c in client.calls] == ["create_order"]
+    assert client.calls[0][2] == "market" and client.calls[0][4] == 50.0
+    assert pos["quantity"] == 5.0
+    assert pos["tp"] == pytest.approx(10.0 * (1 + agent._get_dynamic_tp_pct(95)))
+    assert pos["sl"] == pytest.approx(10.0 * (1 - TRADING.RISK.STOP_LOSS_PCT))
+    # Protection is armed on the ack and the order carries its latency
+    assert agent.exit_watcher.watched() == ["SOL-USDT"] and agent.entry_saves == [True]
+    order = agent.state["capital_awareness"]["buy_orders"]["SOL"]
+    assert order["decision_to_ack_ms"] >= 0 and pos["decision_to_ack_ms"] == order["decision_to_ack_ms"]
+    stats = agent.get_entry_stats()
+    assert stats["scan_quotes"] == 1 and stats["rest_quotes"] == 0
+    assert stats["orders_acked"] == 1 and stats["decision_to_ack"]["count"] == 1
+
+
+async def test_stale_quote_costs_one_ticker_and_wide_spread_falls_back_to_limit(monkeypatch):
+    client = FakeClient(bid=9.95, ask=10.0)
+    agent = _agent(client)
+    _scan(agent, 9.99, 10.0, age=agent.config["entry_quote_max_age_seconds"] + 1)
+    monkeypatch.setitem(TRADING.SCAN.MARKET_ORDERS_BY_REGIME, "PERFECT", True)
+
+    opportunity = {"symbol": "SOL", "price": 10.0, "score": 95}
+    assert await agent.open_position(opportunity, _strategy("PERFECT")) is None
+
+    # 0.5% live spread > market_entry_max_spread: maker-first limit at -0.2%
+    assert [c[0] for c in client.calls] == ["get_ticker", "create_order"]
+    _, _, order_type, price, size = client.calls[1]
+    assert order_type == "limit" and price == pytest.approx(9.98) and size == 5.0
+    order = agent.state["capital_awareness"]["buy_orders"]["SOL"]
+    assert order["price"] == price and agent.state["positions"] == {}
+    assert agent.get_entry_stats()["rest_quotes"] == 1
+
+
+async def test_wide_scan_spread_rejects_without_any_round_trip():
+    client = FakeClient()
+    agent = _agent(client)
+    _scan(agent, 9.5, 10.0)
+
+    opportunity = {"symbol": "SOL", "price": 10.0, "score": 80}
+    assert await agent.open_position(opportunity, _strategy("NORMAL")) is None
+    assert client.calls == [] and "SOL" not in agent.state["capital_awareness"]["buy_orders"]
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Exchange model tests - slotted Ticker/Candle/OrderBook, columnar CandleSeries
+and BookSide behave like the lists they replace, feed indicators and batch
+scoring directly, and allocate measurably less (tracemalloc)
+"""
+
+import random
+import tracemalloc
+from dataclasses import dataclass
+
+import numpy as np
+import pytest
+
+from ibis.batch_scoring import stack_candles
+from ibis.exchange.models import BookSide, Candle, CandleSeries, OrderBook, Ticker
+from ibis.indicators import columnar
+
+
+def _klines(n, seed=3):
+    rng = random.Random(seed)
+    price, rows = 10.0, []
+    for i in range(n):
+        price *= 1 + rng.uniform(-0.01, 0.01)
+        rows.append(
+            [str(1_700_000_000 + 60 * i), f"{price:.6f}", f"{price * 1.01:.6f}",
+             f"{price * 0.99:.6f}", f"{price:.6f}", f"{rng.uniform(1, 9):.4f}", "0", "12.5"]
+        )
+    return rows
+
+
+def _allocated(build):
+    tracemalloc.start()
+    try:
+        keep = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del keep
+    return size
+
+
+def test_models_are_slotted():
+    for obj in (Ticker(symbol="SOL-USDT"), Candle("SOL-USDT", 0, 1, 2, 0.5, 1.5, 3, 4)):
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            obj.unexpected = 1
+
+
+def test_candle_series_matches_from_kline():
+    klines = _klines(50)
+    series = CandleSeries.from_klines(klines, "SOL-USDT")
+    expected = [Candle.from_kline(k, "SOL-USDT") for k in klines]
+
+    assert len(series) == 50
+    assert series[0] == expected[0] and series[-1] == expected[-1]
+    assert series.to_candles() == expected
+    assert list(series[-5:]) == expected[-5:]
+    np.testing.assert_array_equal(series["close"], [c.close for c in expected])
+    assert CandleSeries.from_candles(expected).to_candles() == expected
+
+
+def test_candle_series_feeds_indicators_and_batch_scoring():
+    candles = [Candle.from_kline(k, "SOL-USDT") for k in _klines(120)]
+    series = CandleSeries.from_candles(candles)
+
+    assert columnar.to_ohlcv_array(series) is series
+    for name, values in columnar.compute_all(columnar.to_ohlcv_array(candles)).items():
+        np.testing.assert_allclose(columnar.compute_all(series)[name], values, equal_nan=True)
+
+    short = candles[:30]
+    from_lists = stack_candles([candles, short, []], bars=60)
+    from_series = stack_candles([series, CandleSeries.from_candles(short), CandleSeries("X")], bars=60)
+    for name in ("close", "high", "low", "volume", "lengths"):
+        np.testing.assert_array_equal(getattr(from_series, name), getattr(from_lists, name))
+
+
+def test_book_side_behaves_like_level_lists():
+    book = OrderBook.from_response(
+        {"bids": [["10.4", "3"], ["10.3", "1"]], "asks": [["10.6", "2"]], "time": 7}, "SOL-USDT"
+    )
+    assert book.bids == [[10.4, 3.0], [10.3, 1.0]]
+    assert book.bids[0][0] == 10.4 and book.asks.best == 10.6
+    assert sum(b[1] for b in book.bids[:5]) == book.bids.total_size(5) == 4.0
+    assert [p for p, _ in book.bids] == [10.4, 10.3]
+    assert book.asks.notional() == pytest.approx(21.2)
+    assert not OrderBook("X", [], [], 0).bids
+
+
+def test_compact_models_allocate_less():
+    klines = _klines(300)
+
+    @dataclass
+    class DictCandle:
+        symbol: str
+        timestamp: int
+        open: float
+        high: float
+        low: float
+        close: float
+        volume: float
+        turnover: float
+
+    def dict_candles():
+        return [DictCandle("SOL-USDT", int(k[0]), *map(float, k[1:6]), float(k[7])) for k in klines]
+
+    def slotted_candles():
+        return [Candle.from_kline(k, "SOL-USDT") for k in klines]
+
+    dict_bytes = _allocated(dict_candles)
+    slotted_bytes = _allocated(slotted_candles)
+    series_bytes = _allocated(lambda: CandleSeries.from_klines(klines, "SOL-USDT"))
+    assert slotted_bytes < dict_bytes * 0.9
+    assert series_bytes < slotted_bytes * 0.3
+
+    levels = [[100 + i * 0.01, 1.5 + i] for i in range(100)]
+    list_bytes = _allocated(lambda: [[float(p), float(s)] for p, s in levels])
+    side_bytes = _allocated(lambda: BookSide(levels))
+    assert side_bytes < list_bytes * 0.5
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Exit watcher tests - streamed prices trigger TP/SL closes without a scan
+cycle, refused closes re-arm, and trigger latencies land in the histograms
+"""
+
+import asyncio
+import json
+import time
+
+from ibis.core.trading_constants import TRADING
+from ibis.exchange.kucoin_client import KuCoinClient
+from ibis.exchange.market_state import MarketStateService
+from ibis.exit_watcher import ExitWatcher, LatencyHistogram
+
+
+def _positions():
+    return {
+        "SOL": {"buy_price": 100.0, "quantity": 1.0, "tp": 103.0, "sl": 98.0},
+        "ETH": {"buy_price": 2000.0, "quantity": 0.1},
+    }
+
+
+def _ticker(service, symbol, price):
+    message = {
+        "type": "message",
+        "topic": "/market/ticker:all",
+        "subject": symbol,
+        "data": {"price": str(price), "time": int(time.time() * 1000)},
+    }
+    return service.ws._process_message(json.dumps(message))
+
+
+async def test_stream_push_crossing_stop_fires_close_immediately():
+    closes = []
+
+    async def close(symbol, reason, price):
+        watcher.order_acked(symbol)
+        closes.append((symbol, reason, price))
+        return True
+
+    watcher = ExitWatcher(close)
+    watcher.sync(_positions())
+    service = MarketStateService(KuCoinClient(paper_trading=True))
+    service.ticker_listeners.append(watcher.on_ticker)
+
+    await _ticker(service, "SOL-USDT", 99.5)  # inside the band
+    await _ticker(service, "BTC-USDT", 1.0)  # not held
+    await _ticker(service, "SOL-USDT", 97.9)
+    await _ticker(service, "SOL-USDT", 97.0)  # already triggered, not re-fired
+    await asyncio.sleep(0)
+    await watcher.stop()
+
+    assert closes == [("SOL", "STOP_LOSS", 97.9)]
+    assert watcher.watched() == ["ETH-USDT"]
+    stats = watcher.get_stats()
+    assert stats["ticks"] == 3 and stats["triggers"] == 1 and stats["closed"] == 1
+    assert stats["latency"]["trigger_to_order"]["count"] == 1
+    assert stats["latency"]["trigger_to_close"]["count"] == 1
+    assert stats["latency"]["push_to_trigger"]["count"] == 1
+
+
+async def test_default_levels_match_check_positions_and_refusals_rearm():
+    attempts = []
+
+    async def close(symbol, reason, price):
+        attempts.append((symbol, reason))
+        return len(attempts) > 1  # first close refused (e.g. sell already open)
+
+    watcher = ExitWatcher(close, retry_seconds=0.05)
+    watcher.sync(_positions())
+    tp = 2000.0 * (1 + TRADING.RISK.TAKE_PROFIT_PCT)
+
+    watcher.on_ticker("ETH-USDT", tp * 0.999)
+    watcher.on_ticker("ETH-USDT", tp)
+    await asyncio.sleep(0)
+    watcher.on_ticker("ETH-USDT", tp)  # inside the retry window
+    await asyncio.sleep(0.06)
+    watcher.on_ticker("ETH-USDT", tp * 1.001)
+    await watcher.stop()
+
+    assert attempts == [("ETH", "TAKE_PROFIT"), ("ETH", "TAKE_PROFIT")]
+    assert watcher.get_stats()["refused"] == 1 and "ETH-USDT" not in watcher.watched()
+
+
+async def test_sync_keeps_trigger_state_until_levels_change():
+    async def close(symbol, reason, price):
+        await asyncio.sleep(0.01)
+        return False
+
+    watcher = ExitWatcher(close, retry_seconds=60)
+    positions = _positions()
+    watcher.sync(positions)
+    watcher.on_ticker("SOL-USDT", 90.0)
+    watcher.sync(positions)  # a save during the close must not re-arm
+    watcher.on_ticker("SOL-USDT", 89.0)
+    assert watcher.get_stats()["triggers"] == 1
+
+    positions["SOL"]["sl"] = 85.0  # moved stop re-arms with new levels
+    watcher.sync(positions)
+    watcher.on_ticker("SOL-USDT", 89.0)
+    watcher.on_ticker("SOL-USDT", 84.0)
+    await watcher.stop()
+    assert watcher.get_stats()["triggers"] == 2
+
+
+def test_latency_histogram_buckets_and_percentiles():
+    histogram = LatencyHistogram()
+    for ms in [0.4] * 90 + [15.0] * 9 + [45000.0]:
+        histogram.record(ms)
+    snap = histogram.snapshot()
+    assert snap["count"] == 100
+    assert snap["p50_ms"] == 1.0 and snap["p95_ms"] == 20.0 and snap["p99_ms"] == 20.0
+    assert histogram.percentile(100) == 45000.0
+    assert snap["buckets"] == {"<=1ms": 90, "<=20ms": 9, ">30000ms": 1}
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Fee model tests - fills fold into value-weighted, age-decayed maker/taker rates
+per symbol, the sums are materialized in fee_stats (seeded once from
+fee_history) and the risk manager, PnL tracker and ingestor read the same model
+"""
+
+import time
+
+import pytest
+
+from ibis.core.fee_model import FeeModel, get_fee_model
+from ibis.core.risk_manager import RiskManager
+from ibis.core.trading_constants import TRADING
+from ibis.database.db import IbisDB
+from ibis.exchange.fill_ingest import FillIngestor, FillStore
+from ibis.pnl_tracker import PnLTracker
+
+DAY_MS = 24 * 3600 * 1000
+
+
+def _fill(i, symbol, funds, fee, ts, liquidity=None):
+    return {"tradeId": f"T{i}", "orderId": f"O{i}", "symbol": symbol, "side": "buy",
+            "price": "1", "size": str(funds), "funds": str(funds), "fee": str(fee),
+            "liquidity": liquidity, "createdAt": ts}
+
+
+def test_rates_are_value_weighted_decayed_and_split_by_liquidity():
+    model = FeeModel(half_life_days=7)
+    t0 = 1_700_000_000_000
+    model.record_fills([
+        _fill(1, "SOL-USDT", 100, 0.1, t0, "taker"),
+        _fill(2, "SOL-USDT", 300, 0.06, t0, "maker"),
+        _fill(3, "ETH-USDT", 50, 0.05, t0),
+    ])
+
+    sol = model.rates("SOL-USDT")
+    assert sol == model.rates("SOL")
+    assert sol["taker"] == pytest.approx(0.001) and sol["maker"] == pytest.approx(0.0002)
+    assert sol["rate"] == pytest.approx(0.16 / 400)
+    assert sol["count"] == 2
+    assert model.get_total_friction("SOL") == pytest.approx(
+        0.0006 + TRADING.EXCHANGE.ESTIMATED_SLIPPAGE
+    )
+    # No liquidity flag: the fill counts toward both sides
+    assert model.rates("ETH")["maker"] == model.rates("ETH")["taker"] == pytest.approx(0.001)
+    assert model.get_total_friction("NOPE") == TRADING.EXCHANGE.get_total_friction("NOPE")
+
+    # One half-life later a new fill carries twice the weight of the old ones
+    model.record_fills([_fill(4, "ETH-USDT", 50, 0.2, t0 + 7 * DAY_MS)])
+    assert model.rates("ETH")["rate"] == pytest.approx((0.025 + 0.2) / (25 + 50))
+    # ...and a fill arriving late is weighted by its own age, not the arrival time
+    model.record_fills([_fill(5, "ETH-USDT", 50, 0.2, t0)])
+    assert model.rates("ETH")["rate"] == pytest.approx((0.025 + 0.2 + 0.1) / (25 + 50 + 25))
+
+    assert model.profile()["SOL"] == sol["rate"] and model.counts() == {"SOL": 2, "ETH": 3}
+    assert model.per_symbol()["SOL"] == {"maker": sol["maker"], "taker": sol["taker"], "count": 2}
+
+
+def test_stats_persist_and_seed_from_fee_history(tmp_path):
+    db = IbisDB(str(tmp_path / "ibis.db"))
+    db.update_fee_tracking("ADA", 0.02, 20.0, "BUY", "A1")
+    db.update_fee_tracking("ADA-USDT", 0.06, 20.0, "SELL", "A2")
+
+    seeded = FeeModel(db)
+    assert seeded.rates("ADA")["rate"] == pytest.approx(0.08 / 40, rel=1e-3)
+    assert seeded.get_stats()["seeded_from_history"] == 2
+
+    seeded.record_fills([_fill(1, "ADA-USDT", 10, 0.001, int(time.time() * 1000), "maker")])
+    reloaded = FeeModel(db)
+    assert reloaded.rates("ADA") == pytest.approx(seeded.rates("ADA"))
+    # The materialized table wins; fee_history is not folded in a second time
+    assert reloaded.get_stats()["seeded_from_history"] == 0 and reloaded.counts()["ADA"] == 3
+
+
+async def test_call_sites_share_the_ingested_model(tmp_path):
+    class Client:
+        async def get_fills_page(self, start_at, end_at, page, page_size):
+            now = int(time.time() * 1000)
+            return {"totalPage": 1, "items": [_fill(1, "PEPE-USDT", 100, 0.3, now - 1000, "taker")]}
+
+    db = IbisDB(str(tmp_path / "ibis.db"))
+    model = get_fee_model(db)
+    assert get_fee_model(db) is model
+
+    ingestor = FillIngestor(Client(), FillStore(str(tmp_path / "fills.db")), backfill_days=1)
+    ingestor.subscribe(model.record_fills)
+    tracker = PnLTracker(str(tmp_path / "trade_history.json"), ingestor=ingestor, fee_model=model)
+    await tracker.sync_trades_from_kucoin(None)
+
+    assert tracker.calculate_average_fees_per_symbol()["PEPE"]["taker"] == pytest.approx(0.003)
+    risk_manager = RiskManager()
+    risk_manager.set_database(db)
+    # The risk manager keeps its realistic-range clamp on top of the model
+    assert risk_manager._get_fee_rates("PEPE-USDT")["taker"] == 0.001
+    assert FeeModel(db).rates("PEPE")["count"] == 1
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+HTTP transport tests - sessions from different components share one
+keep-alive pool, closing a borrowed session keeps the pool open, and reuse /
+time-to-first-byte metrics are recorded against a local stub server
+"""
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ibis.core.http_transport import HttpTransport, read_json
+
+
+async def _server():
+    async def handler(request):
+        return web.json_response({"code": "200000", "data": {"price": "1.5"}})
+
+    app = web.Application()
+    app.router.add_get("/api/v1/ping", handler)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+async def test_components_share_warm_connections():
+    server = await _server()
+    transport = HttpTransport()
+    try:
+        intel = transport.session(headers={"User-Agent": "IBIS-Intelligence/1.0"})
+        notifier = transport.session()
+        url = str(server.make_url("/api/v1/ping"))
+
+        for session in (intel, notifier) * 10:
+            async with session.get(url) as resp:
+                assert (await read_json(resp))["data"]["price"] == "1.5"
+
+        # Closing one component's session must not tear down the pool
+        await intel.close()
+        async with notifier.get(url) as resp:
+            assert resp.status == 200
+
+        stats = transport.get_stats()
+        assert stats["requests"] == 21
+        assert stats["connections_created"] == 1
+        assert stats["connections_reused"] == 20
+        assert stats["reuse_rate"] > 0.9
+        assert stats["ttfb_avg_ms"] > 0
+    finally:
+        await transport.close()
+        await server.close()
+
+
+async def test_close_shuts_every_borrowed_session():
+    transport = HttpTransport()
+    sessions = [transport.session() for _ in range(3)]
+    await transport.close()
+    assert all(s.closed for s in sessions)
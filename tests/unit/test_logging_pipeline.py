@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Logging pipeline tests - records are written by the queue listener in batches,
+DEBUG output is rate limited per call site before a record is built, event
+log lines keep their "[timestamp] message" format, and configure_logging
+routes the root logger through the queue (optionally as compact JSON)
+"""
+
+import json
+import logging
+
+from ibis.core.logging_config import (
+    BatchFileHandler,
+    EventLog,
+    LogPipeline,
+    configure_logging,
+    get_event_log,
+    get_log_pipeline,
+)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_listener_writes_in_batches(tmp_path):
+    pipeline = LogPipeline(batch_size=256, linger=0.05)
+    path = tmp_path / "batched.log"
+    handler = BatchFileHandler(str(path), encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    pipeline.set_routes({"bench": (handler,)})
+    logger = logging.getLogger("test.pipeline.batched")
+    logger.propagate = False
+    logger.addHandler(pipeline.queue_handler("bench"))
+    try:
+        for i in range(1000):
+            logger.warning("line %d", i)
+        assert pipeline.flush()
+        assert path.read_text().splitlines() == [f"line {i}" for i in range(1000)]
+        stats = pipeline.get_stats()
+        assert stats["records"] == 1000 and stats["batches"] < 100 and stats["max_batch"] > 1
+    finally:
+        logger.handlers.clear()
+        pipeline.stop()
+
+
+def test_event_log_rate_limits_debug_per_call_site():
+    pipeline = LogPipeline(debug_interval=60)
+    sink = ListHandler()
+    pipeline.set_routes({"events": (sink,)})
+    logger = logging.getLogger("test.pipeline.events")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    logger.addHandler(pipeline.queue_handler("events", rate_limited=False))
+    log_event = EventLog(logger, pipeline.rate_limit)
+    try:
+        for i in range(50):
+            log_event(f"debug {i}", logging.DEBUG)
+            log_event(f"info {i}", symbol="SOL")
+        log_event("other site", logging.DEBUG)
+        assert pipeline.flush()
+    finally:
+        logger.handlers.clear()
+        pipeline.stop()
+
+    messages = [r.getMessage() for r in sink.records]
+    assert messages.count("debug 0") == 1 and "debug 1" not in messages
+    assert [m for m in messages if m.startswith("info")] == [f"info {i}" for i in range(50)]
+    assert "other site" in messages and pipeline.get_stats()["debug_suppressed"] == 49
+    info = next(r for r in sink.records if r.getMessage() == "info 0")
+    # Attributed to the caller, with structured fields attached
+    assert info.funcName == "test_event_log_rate_limits_debug_per_call_site"
+    assert info.pathname == __file__ and info.fields == {"symbol": "SOL"}
+
+
+def test_event_log_file_format_and_compact_root_logging(tmp_path, capsys):
+    log_event = get_event_log(str(tmp_path / "ibis_true.log"), echo=True)
+    log_event("   🔍 IBIS performing rapid market screening...")
+    configure_logging(log_dir=str(tmp_path), compact=True)
+    try:
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logging.getLogger("test.pipeline.root").exception("boom %s", "here")
+        assert get_log_pipeline().flush()
+
+        (line,) = (tmp_path / "ibis_true.log").read_text().splitlines()
+        assert line.startswith("[20") and line.endswith("] " + "   🔍 IBIS performing rapid market screening...")
+        assert "rapid market screening" in capsys.readouterr().out
+        records = [json.loads(l) for l in (tmp_path / "ibis.log").read_text().splitlines()]
+        boom = next(r for r in records if r["m"] == "boom here")
+        assert boom["l"] == "E" and "ZeroDivisionError" in boom["exc"]
+    finally:
+        configure_logging(log_dir=str(tmp_path))
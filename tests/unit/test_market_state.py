@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Streaming market state tests - pushes land in the client caches, REST only fills gaps
+"""
+
+import asyncio
+import json
+import time
+
+import websockets
+
+from ibis.exchange.kucoin_client import Candle, KuCoinClient, Ticker
+from ibis.exchange.kucoin_websocket import KuCoinWebSocket
+from ibis.exchange.market_state import MarketStateService
+
+
+class CountingClient(KuCoinClient):
+    def __init__(self):
+        super().__init__(paper_trading=True)
+        self.rest_calls = []
+
+    async def get_tickers(self):
+        self.rest_calls.append("allTickers")
+        return [Ticker(symbol="BTC-USDT", price=100.0, volume_24h=5e6, change_24h=2.0)]
+
+    async def _request_with_retry(self, method, path, query="", body=""):
+        self.rest_calls.append(path)
+        raise AssertionError(f"unexpected REST call {path}")
+
+
+def _push(service, topic, data, subject=""):
+    message = {"type": "message", "topic": topic, "subject": subject, "data": data}
+    return service.ws._process_message(json.dumps(message))
+
+
+def _live(service):
+    service.streaming = True
+    service.ws.running = True
+
+
+async def test_ticker_push_serves_get_ticker_from_memory():
+    client = CountingClient()
+    service = MarketStateService(client)
+    await service._refresh_ticker_snapshot()
+    _live(service)
+
+    await _push(
+        service,
+        "/market/ticker:all",
+        {"price": "101.5", "bestBid": "101.4", "bestAsk": "101.6", "time": 1},
+        subject="BTC-USDT",
+    )
+
+    ticker = await client.get_ticker("BTC-USDT")
+    assert ticker.price == 101.5 and ticker.buy == 101.4 and ticker.sell == 101.6
+
+    tickers = await service.get_tickers()
+    assert tickers[0].price == 101.5
+    assert tickers[0].volume_24h == 5e6  # 24h stats kept from the REST snapshot
+    assert client.rest_calls == ["allTickers"]
+
+
+async def test_kline_and_depth_pushes_update_candles_and_orderbook():
+    client = CountingClient()
+    service = MarketStateService(client)
+    _live(service)
+
+    now = int(time.time())
+    seeded = [
+        Candle("ETH-USDT", now - 120, 10, 11, 9, 10, 5, 50),
+        Candle("ETH-USDT", now - 60, 10, 11, 9, 10.5, 5, 50),
+    ]
+    client._candle_store.replace("ETH-USDT", "1min", seeded)
+
+    await _push(
+        service,
+        "/market/candles:ETH-USDT_1min",
+        {"symbol": "ETH-USDT", "candles": [str(now), "10.5", "12", "10", "11.5", "7", "80"]},
+    )
+    await _push(
+        service,
+        "/spotMarket/level2Depth50:ETH-USDT",
+        {"bids": [["10.4", "3"]], "asks": [["10.6", "2"]], "timestamp": 1},
+    )
+
+    candles = await client.get_candles("ETH-USDT", "1min", limit=3)
+    book = await client.get_orderbook("ETH-USDT")
+    assert [c.timestamp for c in candles] == [now - 120, now - 60, now]
+    assert candles[-1].close == 11.5
+    assert book.bids == [[10.4, 3.0]] and book.asks == [[10.6, 2.0]]
+    assert client.rest_calls == []
+
+
+async def test_quiet_stream_falls_back_to_rest():
+    client = CountingClient()
+    service = MarketStateService(client, stale_after_seconds=0.0)
+    _live(service)
+
+    await service.get_tickers()
+    await service.get_tickers()
+
+    assert client.rest_calls == ["allTickers", "allTickers"]
+    assert service.get_stats()["rest_fallbacks"] == 2
+
+
+async def test_reconnect_drops_series_until_rest_reseeds():
+    client = CountingClient()
+    service = MarketStateService(client)
+    _live(service)
+    await service.track_symbols(["ETH-USDT"])
+
+    now = int(time.time())
+    stale = [Candle("ETH-USDT", now - 600, 10, 11, 9, 10, 5, 50)]
+    client._candle_store.replace("ETH-USDT", "1min", stale)
+    await service._on_reconnect()
+
+    await _push(
+        service,
+        "/market/candles:ETH-USDT_1min",
+        {"symbol": "ETH-USDT", "candles": [str(now), "10.5", "12", "10", "11.5", "7", "80"]},
+    )
+
+    # No gapped series is left behind for an incremental fetch to build on
+    assert ("ETH-USDT", "1min") not in client._candle_store
+    assert service.get_stats()["reconnects"] == 1
+
+
+def _tasks(name):
+    return [t for t in asyncio.all_tasks() if t.get_coro().__qualname__ == f"KuCoinWebSocket.{name}"]
+
+
+async def test_reconnect_hands_off_to_one_listener_and_one_ping_loop():
+    frames = []  # (connection number, frame type, topic)
+    connections = []
+
+    async def handler(connection):
+        connections.append(connection)
+        number = len(connections)
+        await connection.send(json.dumps({"id": "welcome", "type": "welcome"}))
+        async for raw in connection:
+            message = json.loads(raw)
+            frames.append((number, message["type"], message.get("topic")))
+            if message["type"] == "subscribe":
+                await connection.send(json.dumps({"id": message["id"], "type": "ack"}))
+                if number == 1:
+                    await connection.close()
+
+    class BulletClient(KuCoinClient):
+        async def _request(self, method, path, query="", body=""):
+            return {"token": "t", "instanceServers": [{"endpoint": url, "pingInterval": 20}]}
+
+    server = await websockets.serve(handler, "127.0.0.1", 0)
+    url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}/endpoint"
+    ws = KuCoinWebSocket(BulletClient(paper_trading=True))
+    ws.reconnect_delay = 0.01
+    try:
+        assert await ws.subscribe_topic(KuCoinWebSocket.ALL_TICKERS_TOPIC)
+        deadline = time.perf_counter() + 3
+        while ws.reconnects < 1 or not any(f[0] == 2 and f[1] == "subscribe" for f in frames):
+            assert time.perf_counter() < deadline, "no reconnect"
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.2)  # several ping intervals on the new socket
+
+        assert len(_tasks("_listen_loop")) == 1 and len(_tasks("_ping_loop")) == 1
+        # The new connection re-subscribes (never unsubscribes) and keeps pinging
+        second = [f for f in frames if f[0] == 2]
+        assert ("subscribe", KuCoinWebSocket.ALL_TICKERS_TOPIC) in [f[1:] for f in second]
+        assert "unsubscribe" not in [f[1] for f in frames]
+        assert sum(1 for f in second if f[1] == "ping") >= 3
+
+        await connections[-1].send(
+            json.dumps({"type": "message", "topic": "/market/ticker:all", "subject": "BTC-USDT",
+                        "data": {"price": "1"}})
+        )
+        received = ws.messages_received
+        deadline = time.perf_counter() + 2
+        while ws.messages_received == received:
+            assert time.perf_counter() < deadline, "listener not reading the new socket"
+            await asyncio.sleep(0.01)
+    finally:
+        await ws.close()
+        server.close()
+        await server.wait_closed()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Memory store tests - trades persist as indexed SQLite rows, the incremental
+pattern / mode aggregates match a full rescan (including after eviction),
+legacy JSON memories migrate exactly once and semantic lookups match context
+"""
+
+import json
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from ibis.memory.memory import EpisodicMemory, IBISMemory, SemanticMemory
+from ibis.memory.store import MemoryStore
+
+MODES = ["SCALPER", "MOMENTUM", "VOLATILITY"]
+REGIMES = ["TRENDING", "RANGING", None]
+
+
+def _trade(i, start=datetime(2026, 1, 1)):
+    rng = random.Random(i)
+    return {
+        "id": f"TRD-{i}",
+        "timestamp": start + timedelta(minutes=i),
+        "symbol": rng.choice(["SOL-USDT", "ETH-USDT", "ADA-USDT"]),
+        "mode": rng.choice(MODES),
+        "regime_during": rng.choice(REGIMES),
+        "pnl_pct": rng.uniform(-1, 1),
+        "pnl_abs": rng.uniform(-5, 5),
+        "duration_seconds": rng.uniform(10, 600),
+        "confidence_entry": rng.uniform(0, 1),
+    }
+
+
+def _rescan_mode_performance(trades):
+    performance = {}
+    for mode in MODES:
+        mode_trades = [t for t in trades if t.mode == mode]
+        if mode_trades:
+            wins = len([t for t in mode_trades if t.outcome == "WIN"])
+            total_pnl = sum(t.pnl_abs for t in mode_trades)
+            performance[mode] = {
+                "total_trades": len(mode_trades),
+                "wins": wins,
+                "total_pnl": total_pnl,
+                "avg_duration": sum(t.duration_seconds for t in mode_trades) / len(mode_trades),
+            }
+    return performance
+
+
+def _rescan_winning_patterns(trades):
+    patterns = defaultdict(lambda: {"count": 0, "total_pnl": 0})
+    for t in trades:
+        if t.outcome == "WIN":
+            patterns[f"{t.mode}_{t.regime_during}"]["count"] += 1
+            patterns[f"{t.mode}_{t.regime_during}"]["total_pnl"] += t.pnl_abs
+    return patterns
+
+
+async def test_recent_trades_use_filters_and_newest_first(tmp_path):
+    memory = EpisodicMemory(str(tmp_path / "none.json"), store=MemoryStore(str(tmp_path / "m.db")))
+    for i in range(40):
+        await memory.store_trade(_trade(i))
+
+    recent = await memory.get_recent_trades(symbol="SOL-USDT", limit=5)
+    assert all(t.symbol == "SOL-USDT" for t in recent)
+    assert [t.timestamp for t in recent] == sorted((t.timestamp for t in recent), reverse=True)
+    assert isinstance(recent[0].timestamp, datetime)
+
+    both = await memory.get_recent_trades(symbol="ETH-USDT", mode="SCALPER", limit=100)
+    expected = [t for t in memory.trades if t.symbol == "ETH-USDT" and t.mode == "SCALPER"]
+    assert sorted(t.id for t in both) == sorted(t.id for t in expected)
+
+
+async def test_aggregates_match_full_rescan_after_eviction(tmp_path):
+    memory = EpisodicMemory(str(tmp_path / "none.json"), store=MemoryStore(str(tmp_path / "m.db")))
+    memory.max_trades = 60
+    for i in range(150):
+        await memory.store_trade(_trade(i))
+
+    trades = memory.trades
+    assert len(trades) == 60 and trades[0].id == "TRD-90"
+
+    performance = await memory.get_mode_performance()
+    for mode, expected in _rescan_mode_performance(trades).items():
+        assert performance[mode]["total_trades"] == expected["total_trades"]
+        assert performance[mode]["wins"] == expected["wins"]
+        assert abs(performance[mode]["total_pnl"] - expected["total_pnl"]) < 1e-9
+        assert abs(performance[mode]["avg_duration"] - expected["avg_duration"]) < 1e-9
+
+    winning = await memory.get_winning_patterns()
+    expected = _rescan_winning_patterns(trades)
+    assert set(winning) == set(expected)
+    for key, entry in expected.items():
+        assert winning[key]["count"] == entry["count"]
+        assert abs(winning[key]["total_pnl"] - entry["total_pnl"]) < 1e-9
+
+    stats = await memory.get_statistics()
+    assert stats["total_trades_stored"] == 60
+    assert stats["wins"] == len([t for t in trades if t.outcome == "WIN"])
+
+
+async def test_legacy_json_migrates_once_and_survives_reopen(tmp_path):
+    legacy = tmp_path / "ibis_memories.json"
+    seeded = EpisodicMemory(str(tmp_path / "none.json"), store=MemoryStore(":memory:"))
+    rows = [await seeded.store_trade(_trade(i)) for i in range(5)]
+    legacy.write_text(
+        json.dumps({"trades": [t.__dict__ for t in rows]}, indent=2, default=str)
+    )
+
+    db = str(tmp_path / "m.db")
+    memory = EpisodicMemory(str(legacy), store=MemoryStore(db))
+    assert [t.id for t in memory.trades] == [f"TRD-{i}" for i in range(5)]
+    await memory.update_reflection("TRD-3", "faded the breakout", ["wait for retest"])
+    await memory._save()
+    memory.store.close()
+
+    reopened = EpisodicMemory(str(legacy), store=MemoryStore(db))
+    assert len(reopened.trades) == 5
+    (trade,) = [t for t in reopened.trades if t.id == "TRD-3"]
+    assert trade.reflection == "faded the breakout" and trade.lessons == ["wait for retest"]
+    assert trade.timestamp == datetime(2026, 1, 1, 0, 3)
+
+
+async def test_separately_configured_memories_do_not_share_a_database(tmp_path):
+    first = EpisodicMemory(str(tmp_path / "a" / "memories.json"))
+    second = EpisodicMemory(str(tmp_path / "b" / "memories.json"))
+    semantic = SemanticMemory(str(tmp_path / "a" / "semantic.json"))
+    assert first.store.db_path == str(tmp_path / "a" / "memories.db")
+    assert len({first.store.db_path, second.store.db_path, semantic.store.db_path}) == 3
+
+    await first.store_trade(_trade(1))
+    assert [t.id for t in first.trades] == ["TRD-1"] and second.trades == []
+    for memory in (first, second, semantic):
+        memory.store.close()
+
+
+async def test_semantic_lookup_matches_context(tmp_path):
+    semantic = SemanticMemory(str(tmp_path / "none.json"), store=MemoryStore(str(tmp_path / "m.db")))
+    await semantic.store_pattern({"id": "P1", "conditions": {"mode": "SCALPER"}, "confidence": 0.4})
+    await semantic.store_pattern(
+        {"id": "P2", "conditions": {"mode": "SCALPER", "regime": "TRENDING"}, "confidence": 0.9}
+    )
+    await semantic.store_pattern({"id": "P3", "conditions": {"mode": "MOMENTUM"}, "confidence": 0.7})
+    await semantic.store_pattern({"id": "P4", "conditions": {}, "confidence": 0.1})
+    await semantic.store_rule({"id": "R1", "context": {"mode": "SCALPER"}})
+    await semantic.store_rule({"id": "R2", "context": {}})
+
+    found = await semantic.get_patterns_for_context({"mode": "SCALPER", "regime": "TRENDING"})
+    assert [p.id for p in found] == ["P2", "P1", "P4"]
+    found = await semantic.get_patterns_for_context({"mode": "SCALPER", "regime": "RANGING"})
+    assert [p.id for p in found] == ["P1", "P4"]
+    rules = await semantic.get_rules_for_context({"mode": "MOMENTUM"})
+    assert [r.id for r in rules] == ["R2"]
+    assert semantic.pattern_count() == 4 and len(semantic.rules) == 2
+
+
+async def test_ibis_memory_shares_one_store(tmp_path):
+    memory = IBISMemory(store=MemoryStore(str(tmp_path / "m.db")))
+    await memory.remember_trade(_trade(1))
+    await memory.store_reflection("TRD-1", {"analysis": "ok", "lessons": ["x"]})
+    stats = await memory.get_statistics()
+    assert stats["episodic"]["total_trades_stored"] == 1
+    assert memory.episodic.trades[0].reflection == "ok"
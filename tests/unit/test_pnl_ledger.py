@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+PnL ledger tests - fills applied incrementally to the FIFO lot ledger give the
+same round-trips and summaries as a full re-match of the history (recorded and
+synthetic), out-of-order fills replay, and rolling windows expire correctly
+"""
+
+import json
+import random
+from dataclasses import replace
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from ibis.pnl_tracker import CalculationError, MatchedTrade, PnLTracker, Trade
+
+RECORDED = Path(__file__).resolve().parents[2] / "data" / "trade_history.json"
+
+
+def _full_rematch(trades):
+    """The pre-ledger match_trades_fifo loop: sort each side, re-match everything"""
+    by_symbol = {}
+    for t in trades:
+        by_symbol.setdefault(t.symbol, {"buy": [], "sell": []})[t.side].append(replace(t))
+    matched = []
+    for sides in by_symbol.values():
+        buys = sorted(sides["buy"], key=lambda x: x.timestamp)
+        sells = sorted(sides["sell"], key=lambda x: x.timestamp)
+        bi = si = 0
+        while bi < len(buys) and si < len(sells):
+            sell = sells[si]
+            remaining = sell.size
+            while remaining > 0.00000001 and bi < len(buys):
+                buy = buys[bi]
+                if buy.size <= 0.00000001:
+                    bi += 1
+                    continue
+                qty = min(buy.size, remaining)
+                gross = (sell.price - buy.price) * qty
+                fees = (buy.fee * (qty / buy.size)) + (sell.fee * (qty / sell.size))
+                matched.append(
+                    MatchedTrade(
+                        buy, sell, qty, buy.price, sell.price, gross, fees, gross - fees,
+                        (sell.price - buy.price) / buy.price * 100,
+                        (sell.timestamp - buy.timestamp) / 1000, buy.executed_at, sell.executed_at,
+                    )
+                )
+                buy.size -= qty
+                remaining -= qty
+                if buy.size <= 0.00000001:
+                    bi += 1
+            if remaining <= 0.00000001:
+                si += 1
+    return matched
+
+
+def _assert_summary(actual, expected):
+    for key, value in expected.items():
+        if key == "trades_detail":
+            assert actual[key] == value
+        else:
+            assert actual[key] == pytest.approx(value, rel=1e-9, abs=1e-9), key
+
+
+def _synthetic(n, end=None, seed=11):
+    rng = random.Random(seed)
+    end = end or datetime.now()
+    start_ms = int((end - timedelta(days=40)).timestamp() * 1000)
+    held, trades = {}, []
+    for i in range(n):
+        symbol = rng.choice(["SOL", "ETH", "ADA", "PEPE"])
+        ts = start_ms + i * 2_500_000
+        side = "sell" if held.get(symbol, 0) > 0 and rng.random() < 0.45 else "buy"
+        size = round(rng.uniform(0.5, 4), 4)
+        if side == "sell":
+            size = max(round(min(size, held[symbol]) * rng.choice([1, 0.5, 1.2]), 4), 0.0001)
+        held[symbol] = held.get(symbol, 0) + (size if side == "buy" else -size)
+        price = round(rng.uniform(5, 15), 4)
+        trades.append(
+            Trade(f"O{i}", symbol, side, price, size, price * size, price * size * 0.001,
+                  "USDT", ts, str(ts))
+        )
+    return trades
+
+
+def _feed_in_pages(tracker, trades, page):
+    """Append fills the way sync does: oldest page first, each page newest-first"""
+    for i in range(0, len(trades), page):
+        for trade in reversed(trades[i : i + page]):
+            tracker._trades.append(trade)
+        tracker.match_trades_fifo(validate=False)
+
+
+def test_recorded_history_matches_full_rematch(tmp_path):
+    if not RECORDED.exists():
+        pytest.skip("no recorded trade history")
+    trades = [Trade(**t) for t in json.loads(RECORDED.read_text())["trades"]]
+    trades = sorted((t for t in trades if not t.validate()), key=lambda t: t.timestamp)
+    assert len(trades) > 100
+
+    tracker = PnLTracker(str(tmp_path / "history.json"))
+    _feed_in_pages(tracker, trades, page=37)
+
+    expected = _full_rematch(tracker._trades)
+    assert [m.to_dict() for m in tracker._matched_trades] == [m.to_dict() for m in expected]
+    _assert_summary(tracker.get_all_time_pnl(), tracker._calculate_pnl_summary(expected))
+    assert tracker._ledger.stats["rebuilds"] == 0
+
+
+def test_periods_match_full_rematch_and_expire(tmp_path):
+    tracker = PnLTracker(str(tmp_path / "history.json"))
+    trades = _synthetic(600)
+    _feed_in_pages(tracker, trades[:500], page=25)
+    # Windows built now must then track the remaining fills incrementally
+    tracker.get_weekly_pnl(), tracker.get_monthly_pnl("SOL"), tracker.get_all_time_pnl()
+    _feed_in_pages(tracker, trades[500:], page=25)
+
+    expected = _full_rematch(tracker._trades)
+    assert [m.to_dict() for m in tracker.match_trades_fifo(validate=False)] == [
+        m.to_dict() for m in expected
+    ]
+    # Oversold sells filled by a later buy are still flagged when validating
+    with pytest.raises(CalculationError, match="Invalid trade order"):
+        tracker.match_trades_fifo()
+
+    for symbol in (None, "SOL"):
+        scoped = [m for m in expected if symbol in (None, m.buy_trade.symbol)]
+        _assert_summary(tracker.get_all_time_pnl(symbol), tracker._calculate_pnl_summary(scoped))
+        for days in (7, 30):
+            start = datetime.now() - timedelta(days=days)
+            in_period = [m for m in scoped if datetime.fromtimestamp(int(m.closed_at) / 1000) >= start]
+            _assert_summary(tracker._get_period_pnl(symbol, days), tracker._calculate_pnl_summary(in_period))
+
+    # Advancing the clock expires round-trips from the left of the window
+    later = datetime.now() + timedelta(days=3)
+    start = later - timedelta(days=7)
+    in_period = [m for m in expected if datetime.fromtimestamp(int(m.closed_at) / 1000) >= start]
+    _assert_summary(tracker._ledger.summary(None, 7, now=later), tracker._calculate_pnl_summary(in_period))
+
+
+def test_out_of_order_fill_replays_and_history_saves_only_on_change(tmp_path):
+    path = tmp_path / "history.json"
+    tracker = PnLTracker(str(path))
+    trades = _synthetic(120, seed=5)
+    late = trades.pop(30)  # an old fill that only shows up on a later sync
+    tracker._trades.extend(trades)
+    tracker.match_trades_fifo(validate=False)
+    saved_at = path.stat().st_mtime_ns
+
+    assert tracker.match_trades_fifo(validate=False) and path.stat().st_mtime_ns == saved_at
+
+    tracker._trades.append(late)
+    matched = tracker.match_trades_fifo(validate=False)
+    assert tracker._ledger.stats["rebuilds"] == 1
+    assert [m.to_dict() for m in matched] == [m.to_dict() for m in _full_rematch(tracker._trades)]
+    assert json.loads(path.read_text())["matched_trades"] == [m.to_dict() for m in matched]
+
+    # Replacing the trade list wholesale (as calculate_realized_pnl_from_fills does) also replays
+    tracker._trades = [replace(t) for t in trades[:40]]
+    assert len(tracker.match_trades_fifo(validate=False)) == len(_full_rematch(tracker._trades))
+    stats = tracker._ledger.get_stats()
+    assert stats["rebuilds"] == 2 and stats["open_lots"] >= 0
+
+
+def test_fills_dedupe_against_history(tmp_path):
+    def fill(i, order, side, ts):
+        return {"tradeId": f"T{i}", "orderId": order, "symbol": "SOL-USDT", "side": side,
+                "price": "10", "size": "1", "funds": "10", "fee": "0.01", "createdAt": ts}
+
+    tracker = PnLTracker(str(tmp_path / "history.json"))
+    # A whole-order trade recorded before fill ingestion existed
+    tracker._trades.append(Trade("B0", "SOL", "buy", 10, 1, 10, 0.01, "USDT", 1_700_000_000_000, "1700000000000"))
+    tracker._trade_ids.add("B0")
+
+    fills = [fill(1, "B0", "buy", 1_700_000_000_000), fill(2, "S1", "sell", 1_700_000_100_000),
+             fill(3, "S1", "sell", 1_700_000_100_001)]
+    assert [t.trade_id for t in tracker.apply_fills(fills)] == ["T2", "T3"]
+    assert tracker.apply_fills(fills) == []
+
+    (matched,) = tracker.match_trades_fifo(validate=False)
+    assert matched.buy_trade.order_id == "B0" and matched.sell_trade.trade_id == "T2"
+    assert matched.quantity == 1 and matched.gross_pnl == 0
+    assert tracker._ledger.get_stats()["pending_sells"] == 1
+    reloaded = PnLTracker(str(tmp_path / "history.json"))
+    assert [t.trade_id for t in reloaded._trades] == ["", "T2", "T3"]
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Position pricing tests - one allTickers snapshot prices every held symbol,
+misses fan out concurrently under the semaphore, and live stream prices are
+used without any REST call
+"""
+
+import asyncio
+import time
+
+from ibis.exchange.kucoin_client import KuCoinClient, Ticker
+from ibis.exchange.position_pricing import PositionPricer
+
+
+class CountingClient(KuCoinClient):
+    """Paper client whose market endpoints are canned, counted and slow."""
+
+    def __init__(self, listed, delay=0.02):
+        super().__init__(paper_trading=True)
+        self.listed = listed
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _request_with_retry(self, method, path, query="", body=""):
+        self.calls.append(path.split("?", 1)[0])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if path == "/api/v1/market/allTickers":
+            rows = [
+                {"symbol": f"{s}-USDT", "last": str(p), "buy": str(p), "sell": str(p)}
+                for s, p in self.listed.items()
+            ]
+            return {"ticker": rows}
+        symbol = path.rsplit("=", 1)[-1].replace("-USDT", "")
+        price = str(self.listed.get(symbol, 1.0))
+        return {"price": price, "bestBid": price, "bestAsk": price}
+
+
+class LiveStream:
+    def is_live(self):
+        return True
+
+
+async def test_one_snapshot_prices_every_position_and_is_shared():
+    held = {f"C{i}": float(i + 1) for i in range(20)}
+    client = CountingClient(held)
+    pricer = PositionPricer(client)
+
+    prices = await pricer.prices(held)
+    assert prices == held
+    assert client.calls == ["/api/v1/market/allTickers"]
+
+    # Later readers in the same cycle (check_positions, reconcile) reuse it
+    await pricer.prices(list(held)[:5])
+    await client.get_ticker("C3-USDT")
+    assert client.calls == ["/api/v1/market/allTickers"]
+    stats = pricer.get_stats()
+    assert stats["snapshot_fetches"] == 1 and stats["snapshot_hits"] == 25
+
+
+async def test_concurrent_callers_share_one_snapshot_request():
+    client = CountingClient({"SOL": 100.0, "ETH": 2000.0, "BTC": 60000.0})
+    pricer = PositionPricer(client)
+    results = await asyncio.gather(*(pricer.prices(["SOL", "ETH", "BTC"]) for _ in range(4)))
+    assert all(r["ETH"] == 2000.0 for r in results)
+    assert client.calls.count("/api/v1/market/allTickers") == 1
+
+
+async def test_misses_fan_out_concurrently_and_bounded():
+    client = CountingClient({"SOL": 100.0}, delay=0.05)
+    pricer = PositionPricer(client, max_concurrency=3)
+    pricer.absorb([Ticker(symbol="SOL-USDT", price=100.0)])
+
+    unlisted = [f"NEW{i}" for i in range(6)]
+    started = time.perf_counter()
+    prices = await pricer.prices(["SOL"] + unlisted)
+    elapsed = time.perf_counter() - started
+
+    assert set(prices) == {"SOL", *unlisted}
+    assert client.calls.count("/api/v1/market/orderbook/level1") == 6
+    assert client.max_in_flight == 3
+    assert elapsed < 6 * 0.05  # two waves of three, not six sequential calls
+
+
+async def test_live_stream_prices_skip_rest():
+    client = CountingClient({"SOL": 100.0, "ETH": 2000.0})
+    now = int(time.time())
+    for sym, price in (("SOL", 101.0), ("ETH", 2001.0)):
+        client._tickers[f"{sym}-USDT"] = Ticker(symbol=f"{sym}-USDT", price=price)
+        client._ticker_cache_time[f"{sym}-USDT"] = now
+    pricer = PositionPricer(client, market_state=LiveStream())
+
+    assert await pricer.prices(["SOL", "ETH"]) == {"SOL": 101.0, "ETH": 2001.0}
+    assert client.calls == [] and pricer.get_stats()["stream_hits"] == 2
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Rate limiter tests - endpoints map to KuCoin weight pools, the trade lane is
+served before queued market reads, a 429 closes the bucket for everyone and
+the AIMD controller grows on fast replies and shrinks on throttling
+"""
+
+import asyncio
+import time
+
+from ibis.exchange.rate_limiter import (
+    AdaptiveConcurrency,
+    RateLimiter,
+    TokenBucket,
+    classify,
+)
+
+
+def test_classify_endpoints():
+    assert classify("POST", "/api/v1/orders") == ("spot", 2, "trade")
+    assert classify("DELETE", "/api/v1/orders/abc") == ("spot", 3, "trade")
+    assert classify("GET", "/api/v1/orders?status=active") == ("spot", 2, "account")
+    assert classify("GET", "/api/v1/market/candles?type=1min&symbol=SOL-USDT") == (
+        "public",
+        3,
+        "market",
+    )
+    assert classify("GET", "/api/v1/market/allTickers")[1] == 15
+
+
+async def test_bucket_refills_at_quota_rate():
+    bucket = TokenBucket(capacity=10, period=0.5)  # 20 weight/s
+    await bucket.acquire(10)
+    started = time.monotonic()
+    await bucket.acquire(2)
+    assert 0.05 <= time.monotonic() - started < 0.5
+
+
+async def test_trade_lane_jumps_the_market_queue():
+    bucket = TokenBucket(capacity=4, period=0.2)  # 20 weight/s
+    await bucket.acquire(4)
+    order = []
+
+    async def take(name, priority):
+        await bucket.acquire(2, priority)
+        order.append(name)
+
+    reads = [asyncio.ensure_future(take(f"candles{i}", 2)) for i in range(4)]
+    await asyncio.sleep(0.01)
+    order_entry = asyncio.ensure_future(take("order", 0))
+    await asyncio.gather(order_entry, *reads)
+    assert order[0] == "order"
+
+
+async def test_throttle_blocks_the_pool():
+    bucket = TokenBucket(capacity=100, period=1.0)
+    bucket.throttle(0.1)
+    started = time.monotonic()
+    await bucket.acquire(1)
+    assert time.monotonic() - started >= 0.1
+
+
+async def test_aimd_grows_on_fast_replies_and_halves_on_429():
+    ctl = AdaptiveConcurrency(initial=10, min_limit=2, max_limit=20, backoff=0.5)
+    for _ in range(10):
+        await ctl.acquire()
+        await ctl.release(latency=0.01)
+    assert 10.5 < ctl.limit < 11.5
+
+    await ctl.acquire()
+    await ctl.release(latency=0.01, throttled=True)
+    assert 5 <= ctl.limit < 6
+    # A second congestion signal right away counts as the same event
+    await ctl.acquire()
+    await ctl.release(latency=10.0)
+    assert 5 <= ctl.limit < 6
+
+
+async def test_slot_throttles_on_rate_limit_error_and_sizes_parallelism():
+    limiter = RateLimiter(initial_concurrency=40)
+    assert limiter.parallelism(requests_per_task=4) == 10
+
+    try:
+        async with limiter.slot("GET", "/api/v1/market/candles"):
+            raise Exception("KuCoin API Error: {'code': '429000'}")
+    except Exception:
+        pass
+
+    stats = limiter.get_stats()
+    assert stats["lanes"]["market"]["throttled"] == 1
+    assert stats["tokens"]["public"] == 0.0
+    assert limiter.parallelism(requests_per_task=4) < 10
+    assert stats["in_flight"] == 0
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Request cache tests - repeated balance/ticker reads inside one cycle cost one
+REST call, concurrent identical reads share a fetch, and our own orders
+invalidate the account side
+"""
+
+import asyncio
+
+from ibis.exchange.kucoin_client import KuCoinClient
+from ibis.exchange.request_cache import RequestCache
+
+
+class CountingClient(KuCoinClient):
+    """Paper client whose REST answers are canned, counted and slow."""
+
+    def __init__(self, delay=0.02):
+        super().__init__(paper_trading=True)
+        self.delay = delay
+        self.calls = []
+        self.usdt = 100.0
+
+    async def _request_with_retry(self, method, path, query="", body=""):
+        self.calls.append(path.split("?", 1)[0])
+        await asyncio.sleep(self.delay)
+        if path == "/api/v1/market/allTickers":
+            return {"ticker": [{"symbol": "SOL-USDT", "last": "100", "buy": "100", "sell": "100"}]}
+        if path == "/api/v1/accounts":
+            return [
+                {"currency": "USDT", "type": "trade", "available": str(self.usdt), "balance": str(self.usdt)},
+                {"currency": "SOL", "type": "trade", "available": "2", "balance": "2"},
+            ]
+        if path == "/api/v1/orders":
+            return {"items": [{"id": "o1", "symbol": "SOL-USDT"}]}
+        return {}
+
+
+async def test_cycle_reads_hit_rest_once():
+    client = CountingClient()
+    client.begin_cycle()
+
+    for _ in range(4):
+        balances = await client.get_all_balances()
+        assert balances["SOL"]["balance"] == 2.0
+    await client.get_tickers()
+    await client.get_open_orders()
+    await client.get_open_orders()
+
+    assert client.calls.count("/api/v1/accounts") == 1
+    assert client.calls.count("/api/v1/market/allTickers") == 1
+    assert client.calls.count("/api/v1/orders") == 1
+    endpoints = client.get_request_cache_stats()["endpoints"]
+    assert endpoints["accounts"]["hits"] == 3 and endpoints["accounts"]["misses"] == 1
+    assert endpoints["tickers"]["hits"] == 4
+
+
+async def test_concurrent_identical_reads_are_coalesced_outside_a_cycle():
+    client = CountingClient()
+    results = await asyncio.gather(*(client.get_accounts() for _ in range(5)))
+    assert all(r[0]["currency"] == "USDT" for r in results)
+    assert client.calls == ["/api/v1/accounts"]
+    assert client.request_cache.stats["accounts"]["coalesced"] == 4
+
+    # Nothing is memoized without an open cycle
+    await client.get_accounts()
+    assert client.calls.count("/api/v1/accounts") == 2
+
+
+async def test_own_orders_invalidate_account_reads_but_not_tickers():
+    client = CountingClient()
+    client.begin_cycle()
+    await client.get_all_balances()
+    client.usdt = 50.0
+
+    await client.create_order("SOL-USDT", "buy", "market", 0, 50)
+    balances = await client.get_all_balances()
+
+    assert balances["USDT"]["balance"] == 50.0
+    assert client.calls.count("/api/v1/accounts") == 2
+    assert client.calls.count("/api/v1/market/allTickers") == 1
+
+
+async def test_callers_cannot_corrupt_the_memo():
+    client = CountingClient()
+    client.begin_cycle()
+    first = await client.get_open_orders()
+    first[0]["symbol"] = "MUTATED"
+    first.clear()
+    second = await client.get_open_orders()
+    assert second == [{"id": "o1", "symbol": "SOL-USDT"}]
+
+
+async def test_fetch_started_before_invalidation_is_not_memoized():
+    cache = RequestCache()
+    cache.begin_cycle()
+    release = asyncio.Event()
+    fetches = []
+
+    async def fetch():
+        fetches.append(1)
+        await release.wait()
+        return len(fetches)
+
+    task = asyncio.ensure_future(cache.get("accounts", None, fetch))
+    await asyncio.sleep(0)
+    cache.invalidate(["accounts"])
+    release.set()
+    assert await task == 1
+
+    assert await cache.get("accounts", None, fetch) == 2
+    assert await cache.get("accounts", None, fetch) == 2
+    assert len(fetches) == 2
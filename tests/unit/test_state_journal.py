@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+State journal tests - saves append records proportional to the change,
+recovery replays the journal tail exactly (torn tails included), and
+compaction folds the journal back into a plain JSON snapshot, and readers
+and writers outside the agent see the journal tail
+"""
+
+import asyncio
+import json
+
+from ibis.state_persistence import (
+    JOURNAL_SEQ_KEY,
+    JournalStore,
+    StateWriter,
+    read_state,
+    write_state,
+)
+
+
+def _state(n_positions=200):
+    return {
+        "positions": {
+            f"SYM{i}": {"quantity": 1.0 + i, "entry_price": 2.0, "stop_loss": 1.9}
+            for i in range(n_positions)
+        },
+        "daily": {"trades": 0, "pnl": 0.0},
+        "liquidity_history": [],
+        "agent_mode": "ADAPTIVE",
+    }
+
+
+def _journal_writer(tmp_path, state, **kwargs):
+    journal = JournalStore(str(tmp_path / "state.json"), **kwargs)
+    journal.load()
+    return journal, StateWriter(journal.path, snapshot=lambda: state, journal=journal)
+
+
+def test_record_size_tracks_the_change_not_the_document(tmp_path):
+    state = _state()
+    journal, writer = _journal_writer(tmp_path, state)
+    writer.flush()
+    full = journal.get_stats()["journal_bytes"]
+
+    state["positions"]["SYM7"]["stop_loss"] = 1.95
+    state["daily"]["trades"] = 1
+    writer.flush()
+    record = journal.get_stats()["journal_bytes"] - full
+
+    assert record < 300 < full
+    lines = (tmp_path / "state.json.journal").read_bytes().splitlines()
+    ops = json.loads(lines[-1])["ops"]
+    assert sorted(op[1] for op in ops) == [["daily", "trades"], ["positions", "SYM7"]]
+
+    writer.flush()  # unchanged state appends nothing
+    assert len((tmp_path / "state.json.journal").read_bytes().splitlines()) == 2
+    writer.close()
+
+
+def test_crash_recovery_replays_tail_exactly_and_ignores_torn_line(tmp_path):
+    state = _state(20)
+    journal, writer = _journal_writer(tmp_path, state)
+    writer.flush()
+    journal.compact()
+
+    state["positions"]["NEW"] = {"quantity": 3.0, "entry_price": 0.5, "stop_loss": 0.45}
+    del state["positions"]["SYM3"]
+    state["agent_mode"] = "HYPER_INTELLIGENT"
+    writer.flush()
+    state["daily"]["pnl"] = 1.25
+    writer.flush()
+    expected = json.loads(json.dumps(state))
+
+    # Simulated crash: no close()/compaction, and a half-written record
+    with open(journal.journal_path, "ab") as f:
+        f.write(b'{"seq":99,"ops":[["set",["agent_mo')
+
+    recovered = JournalStore(journal.path).load()
+    assert recovered == expected
+    assert JOURNAL_SEQ_KEY not in recovered
+
+
+def test_trimmed_histories_journal_as_ext_ops(tmp_path):
+    state = _state(1)
+    state["liquidity_history"] = list(range(20))
+    journal, writer = _journal_writer(tmp_path, state)
+    writer.flush()
+
+    state["liquidity_history"].extend([20, 21, 22])
+    del state["liquidity_history"][:-20]
+    writer.flush()
+
+    last = (tmp_path / "state.json.journal").read_bytes().splitlines()[-1]
+    assert json.loads(last)["ops"] == [["ext", ["liquidity_history"], 3, [20, 21, 22]]]
+    assert JournalStore(journal.path).load()["liquidity_history"] == list(range(3, 23))
+
+
+def test_compaction_rewrites_snapshot_and_truncates_journal(tmp_path):
+    state = _state(10)
+    journal, writer = _journal_writer(tmp_path, state, compact_records=3)
+    for i in range(5):
+        state["daily"]["trades"] = i
+        writer.flush()
+        if journal.should_compact():
+            writer._compact()
+
+    snapshot = json.loads((tmp_path / "state.json").read_text())
+    assert snapshot["daily"]["trades"] == 2 and snapshot[JOURNAL_SEQ_KEY] == 3
+    assert journal.get_stats()["pending_records"] == 2
+
+    writer.close()  # close() compacts what is left
+    snapshot = json.loads((tmp_path / "state.json").read_text())
+    assert snapshot["daily"]["trades"] == 4
+    assert (tmp_path / "state.json.journal").read_bytes() == b""
+    assert JournalStore(journal.path).load()["daily"]["trades"] == 4
+
+
+async def test_queued_records_are_never_dropped_by_immediate_save(tmp_path):
+    state = _state(5)
+    journal = JournalStore(str(tmp_path / "state.json"))
+    writer = StateWriter(journal.path, snapshot=lambda: state, max_latency=0.01, journal=journal)
+
+    state["daily"]["trades"] = 1
+    writer.save()
+    await asyncio.sleep(0.05)  # captured and handed to the writer thread
+    state["positions"]["SYM1"]["stop_loss"] = 1.5
+    writer.save(immediate=True)
+
+    recovered = JournalStore(journal.path).load()
+    assert recovered["daily"]["trades"] == 1
+    assert recovered["positions"]["SYM1"]["stop_loss"] == 1.5
+    writer.close()
+
+
+def test_failed_append_forces_compaction_before_more_records(tmp_path, monkeypatch):
+    import ibis.state_persistence as persistence
+
+    state = {"hist": [1, 2, 3], "a": 0}
+    journal, writer = _journal_writer(tmp_path, state)
+    writer.flush()
+
+    fsync = persistence.os.fsync
+    failures = []
+
+    def failing_fsync(fd):
+        if not failures:
+            failures.append(fd)
+            raise OSError("disk full")
+        fsync(fd)
+
+    monkeypatch.setattr(persistence.os, "fsync", failing_fsync)
+    state.update(hist=[2, 3, 4], a=1)
+    writer.flush()  # this record never reaches the journal
+    assert writer.get_stats()["errors"] == 1
+
+    state.update(hist=[3, 4, 5], a=2)
+    writer.flush()  # diffed against the lost record, so it compacts instead
+
+    assert journal.get_stats()["forced_compactions"] == 1
+    assert JournalStore(journal.path).load() == {"hist": [3, 4, 5], "a": 2}
+
+
+def test_replay_stops_at_a_sequence_gap(tmp_path):
+    state = {"hist": [1], "a": 0}
+    journal, writer = _journal_writer(tmp_path, state)
+    for i in range(1, 4):
+        state["hist"].append(i + 1)
+        state["a"] = i
+        writer.flush()
+
+    lines = (tmp_path / "state.json.journal").read_bytes().splitlines(keepends=True)
+    (tmp_path / "state.json.journal").write_bytes(lines[0] + lines[2])
+
+    recovered = JournalStore(journal.path)
+    assert recovered.load() == {"hist": [1, 2], "a": 1}
+    assert recovered.get_stats()["replay_gaps"] == 1
+
+    # Records past the gap must not come back once new ones reuse their seqs
+    restarted = {"hist": [1, 2], "a": 9}
+    StateWriter(recovered.path, snapshot=lambda: restarted, journal=recovered).flush()
+    assert JournalStore(journal.path).load() == restarted
+
+
+def test_out_of_process_readers_and_writers_see_the_journal_tail(tmp_path):
+    state = _state(2)
+    state["liquidity_history"] = [1, 2, 3]
+    journal, writer = _journal_writer(tmp_path, state)
+    writer.flush()
+    journal.compact()
+
+    state["positions"]["NEW"] = {"quantity": 1.0, "entry_price": 3.0, "stop_loss": 2.9}
+    state["liquidity_history"].append(4)
+    writer.flush()  # journaled only: the snapshot file still lacks NEW
+    assert "NEW" not in json.loads((tmp_path / "state.json").read_text())["positions"]
+
+    external = read_state(journal.path)
+    assert external == json.loads(json.dumps(state))
+
+    # A rewrite from another process must not have the journal replayed onto it
+    del external["positions"]["SYM0"]
+    write_state(journal.path, external)
+    assert JournalStore(journal.path).load() == external
+    assert read_state(journal.path)["liquidity_history"] == [1, 2, 3, 4]
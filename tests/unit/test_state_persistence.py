@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+State persistence tests - saves coalesce into bounded-latency background
+writes, immediate saves are durable at once, and only changed rows are synced
+"""
+
+import asyncio
+import json
+import threading
+
+from ibis.state_persistence import StateWriter
+
+
+def _writer(tmp_path, state, synced=None, **kwargs):
+    def rows():
+        return {sym: (pos["qty"],) for sym, pos in state["positions"].items()}
+
+    def sync_rows(upserts, deletes, reconcile):
+        synced.append((dict(upserts), set(deletes), reconcile, threading.current_thread().name))
+
+    return StateWriter(
+        str(tmp_path / "state.json"),
+        snapshot=lambda: dict(state),
+        rows=rows if synced is not None else None,
+        sync_rows=sync_rows if synced is not None else None,
+        **kwargs,
+    )
+
+
+def _read(tmp_path):
+    return json.loads((tmp_path / "state.json").read_text())
+
+
+async def test_saves_coalesce_into_one_background_write(tmp_path):
+    state = {"positions": {}, "n": 0}
+    writer = _writer(tmp_path, state, max_latency=0.05)
+
+    for i in range(200):
+        state["n"] = i
+        writer.save()
+    assert not (tmp_path / "state.json").exists()  # nothing written on the caller
+
+    await asyncio.sleep(0.3)
+    stats = writer.get_stats()
+    assert _read(tmp_path)["n"] == 199
+    assert stats["writes"] == 1 and stats["coalesced"] == 199
+    assert stats["bytes_written"] > 0 and stats["max_latency_ms"] < 300
+    assert not stats["dirty"]
+    writer.close()
+
+
+async def test_immediate_save_is_durable_and_wins_over_queued_capture(tmp_path):
+    state = {"positions": {}, "n": 1}
+    writer = _writer(tmp_path, state, max_latency=0.01)
+    writer.save()
+    await asyncio.sleep(0)  # not yet captured
+    state["n"] = 2
+    writer.save(immediate=True)
+    assert _read(tmp_path)["n"] == 2
+
+    await asyncio.sleep(0.1)
+    assert _read(tmp_path)["n"] == 2
+    assert writer.get_stats()["immediate_writes"] == 1
+    writer.close()
+
+
+async def test_only_changed_rows_are_synced_off_the_loop(tmp_path):
+    state = {"positions": {"BTC": {"qty": 1.0}, "ETH": {"qty": 2.0}}}
+    synced = []
+    writer = _writer(tmp_path, state, synced, max_latency=0.01, sync_interval=0.05)
+
+    writer.save()
+    await asyncio.sleep(0.2)
+    upserts, deletes, reconcile, thread = synced[-1]
+    assert upserts == {"BTC": (1.0,), "ETH": (2.0,)}
+    assert reconcile == {"BTC", "ETH"} and thread == "ibis-state-writer"
+
+    state["positions"]["ETH"]["qty"] = 3.0
+    del state["positions"]["BTC"]
+    writer.save()
+    await asyncio.sleep(0.2)
+    assert synced[-1][:3] == ({"ETH": (3.0,)}, {"BTC"}, None)
+
+    writer.save()  # nothing changed: file rewritten, no row sync
+    await asyncio.sleep(0.2)
+    assert len(synced) == 2
+    writer.close()
+    assert writer.get_stats()["rows_synced"] == 4
+
+
+def test_close_flushes_without_a_loop(tmp_path):
+    state = {"positions": {"SOL": {"qty": 5.0}}}
+    synced = []
+    writer = _writer(tmp_path, state, synced, sync_interval=60)
+    writer.save()
+    writer.close()
+    assert _read(tmp_path)["positions"] == {"SOL": {"qty": 5.0}}
+    assert synced and synced[-1][0] == {"SOL": (5.0,)}
+
+
+def test_failed_row_sync_is_retried(tmp_path):
+    state = {"positions": {"ADA": {"qty": 1.0}}}
+    calls = []
+
+    def flaky(upserts, deletes, reconcile):
+        calls.append(dict(upserts))
+        if len(calls) == 1:
+            raise OSError("database is locked")
+
+    writer = StateWriter(
+        str(tmp_path / "state.json"),
+        snapshot=lambda: state,
+        rows=lambda: {k: (v["qty"],) for k, v in state["positions"].items()},
+        sync_rows=flaky,
+    )
+    writer.save(immediate=True)
+    writer.close()
+    assert calls == [{"ADA": (1.0,)}, {"ADA": (1.0,)}]
+    assert writer.get_stats()["errors"] == 1
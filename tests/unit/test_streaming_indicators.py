@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Streaming indicator tests - O(1) updates match the batch indicators, forming
+bars are revised not double counted, state survives a snapshot round-trip
+but not a restart gap, and candle analysis scores from the streamed values
+while the feed is live
+"""
+
+import json
+import math
+import random
+import time
+
+import numpy as np
+
+from ibis.exchange.kucoin_client import Candle, KuCoinClient
+from ibis.exchange.market_state import MarketStateService
+from ibis.indicators import columnar
+from ibis.indicators.streaming import NAN, IndicatorSet, RollingStats, StreamingIndicatorHub
+
+
+def _candles(n, seed=5, start_ts=1_700_000_000):
+    rng = random.Random(seed)
+    out, price = [], 20.0
+    for i in range(n):
+        open_ = price
+        price *= 1 + rng.uniform(-0.01, 0.01)
+        out.append(
+            Candle(
+                "ETH-USDT",
+                start_ts + 60 * i,
+                open_,
+                max(open_, price) * 1.002,
+                min(open_, price) * 0.998,
+                price,
+                rng.uniform(1, 50),
+                0.0,
+            )
+        )
+    return out
+
+
+def _assert_matches_batch(values, candles):
+    bars = columnar.to_ohlcv_array(candles)
+    close, high, low, volume = bars["close"], bars["high"], bars["low"], bars["volume"]
+    tr = columnar.true_range(high, low, close)
+    expected = {
+        "ema_fast": columnar.ema(close, 12)[-1],
+        "ema_slow": columnar.ema(close, 26)[-1],
+        "rsi": columnar.rsi(close, 14)[-1],
+        "atr": columnar.atr(high, low, close, 14)[-1],
+        "atr_sma": tr[-14:].mean(),
+        "bb_middle": columnar.bollinger(close)["middle"][-1],
+        "bb_upper": columnar.bollinger(close)["upper"][-1],
+        "vwap": columnar.vwap(high, low, close, volume)[-1],
+        "obv": columnar.obv(close, volume)[-1],
+    }
+    for key, value in expected.items():
+        assert math.isclose(values[key], value, rel_tol=1e-9, abs_tol=1e-9), key
+
+
+def test_bar_by_bar_updates_match_batch_indicators():
+    candles = _candles(200)
+    indicator_set = IndicatorSet()
+    for candle in candles:
+        indicator_set.update(candle)
+
+    assert indicator_set.bars == 200
+    _assert_matches_batch(indicator_set.values(), candles)
+
+
+def test_forming_bar_revisions_are_not_double_counted():
+    candles = _candles(60)
+    indicator_set = IndicatorSet()
+    for candle in candles[:-1]:
+        indicator_set.update(candle)
+
+    last = candles[-1]
+    closed = closes = None
+    for close in (last.close * 0.97, last.close * 1.03, last.close):
+        high, low = last.high * 1.05, last.low * 0.95
+        revision = Candle(last.symbol, last.timestamp, last.open, high, low, close, 1.0, 0.0)
+        indicator_set.update(revision)
+        assert indicator_set.values()["close"] == close
+        if closed is None:  # the first push closed the previous bar
+            closed, closes = indicator_set._state(), indicator_set.closes
+    indicator_set.update(last)
+
+    # Revisions only overwrite the forming bar: closed state is neither
+    # touched nor rebuilt
+    assert indicator_set.closes is closes
+    assert {k: v for k, v in indicator_set._state().items() if k != "forming"} == {
+        k: v for k, v in closed.items() if k != "forming"
+    }
+    assert indicator_set.bars == 60
+    _assert_matches_batch(indicator_set.values(), candles)
+    assert not indicator_set.update(candles[10])  # out-of-order bar is ignored
+
+
+def test_snapshot_round_trip_resumes_identically(tmp_path):
+    candles = _candles(120)
+    hub = StreamingIndicatorHub()
+    hub.seed("ETH-USDT", "1min", candles[:80])
+
+    path = tmp_path / "indicators.json"
+    hub.save(str(path))
+    json.loads(path.read_text())  # plain JSON on disk
+
+    restored = StreamingIndicatorHub()
+    assert restored.load(str(path))
+    for candle in candles[80:]:
+        hub.on_candle("ETH-USDT", "1min", candle)
+        restored.on_candle("ETH-USDT", "1min", candle)
+
+    original = hub.values("ETH-USDT", "1min")
+    resumed = restored.values("ETH-USDT", "1min")
+    assert original.keys() == resumed.keys()
+    for key in original:
+        assert original[key] == resumed[key] or (
+            math.isnan(original[key]) and math.isnan(resumed[key])
+        ), key
+    _assert_matches_batch(resumed, candles)
+
+
+def test_restored_series_reseeds_across_a_restart_gap(tmp_path):
+    candles = _candles(401)
+    hub = StreamingIndicatorHub()
+    hub.seed("ETH-USDT", "1min", candles[:200])
+    path = tmp_path / "indicators.json"
+    hub.save(str(path))
+
+    # 200 bars pass while the agent is down; the store has caught up on start
+    restored = StreamingIndicatorHub(history=lambda symbol, interval: candles[:400])
+    assert restored.load(str(path))
+    restored.on_candle("ETH-USDT", "1min", candles[400])
+
+    assert restored.get_stats()["gaps"] == 1
+    values = restored.values("ETH-USDT", "1min")
+    assert values["bars"] == 401
+    _assert_matches_batch(values, candles)
+
+    # Without history that reaches the push, the stale series is not reused
+    bare = StreamingIndicatorHub(history=lambda symbol, interval: candles[:150])
+    bare.load(str(path))
+    bare.on_candle("ETH-USDT", "1min", candles[400])
+    assert bare.values("ETH-USDT", "1min")["bars"] == 1
+
+
+def test_rolling_stats_stay_accurate_at_large_prices():
+    values = 65_000 + np.random.default_rng(2).normal(0, 0.5, size=500)
+    stats = RollingStats(20)
+    for v in values:
+        stats.update(float(v))
+    assert math.isclose(stats.mean, values[-20:].mean(), rel_tol=1e-12)
+    assert math.isclose(stats.std, values[-20:].std(), rel_tol=1e-6)
+
+
+async def test_hub_plugs_into_market_state_kline_pushes():
+    client = KuCoinClient(paper_trading=True)
+    service = MarketStateService(client)
+    hub = StreamingIndicatorHub(history=client._candle_store.get)
+    hub.attach(service)
+
+    now = int(time.time()) // 60 * 60
+    history = _candles(40, start_ts=now - 60 * 40)
+    client._candle_store.replace("ETH-USDT", "1min", history)
+
+    push = _candles(41, start_ts=now - 60 * 40)[-1]
+    kline = [str(now)] + [str(v) for v in (push.open, push.high, push.low, push.close, push.volume)]
+    message = {
+        "type": "message",
+        "topic": "/market/candles:ETH-USDT_1min",
+        "data": {"symbol": "ETH-USDT", "candles": kline},
+    }
+    await service.ws._process_message(json.dumps(message))
+
+    values = hub.values("ETH-USDT", "1min")
+    assert values["bars"] == 41 and values["timestamp"] == now
+    _assert_matches_batch(values, client._candle_store.get("ETH-USDT", "1min"))
+
+    await service._on_reconnect()
+    for callback in service.ws.reconnect_callbacks[1:]:
+        await callback()
+    assert hub.values("ETH-USDT", "1min") is None
+
+
+def test_candle_analysis_scores_from_streamed_values_while_live():
+    from ibis_true_agent import IBISTrueAgent
+
+    class Live:
+        live = True
+
+        def is_live(self):
+            return self.live
+
+    candles = _candles(200)
+    hub = StreamingIndicatorHub()
+    hub.seed("ETH-USDT", "1min", candles)
+    agent = IBISTrueAgent()
+    agent.indicator_hub, agent.market_state = hub, Live()
+
+    streamed = agent._streaming_indicators("ETH")
+    analysis = agent._analyze_candles(candles[-61:], [], [], streamed=streamed)
+    indicators = analysis["indicators"]
+    close = columnar.to_ohlcv_array(candles)["close"]
+    assert indicators["source"] == "streaming"
+    assert math.isclose(indicators["rsi"]["value"], columnar.rsi(close, 14)[-1], rel_tol=1e-9)
+    assert analysis["composite_score"] == 50 + sum(indicators["breakdown"].values())
+
+    # Feed down or hub not yet warm: the candle path is left untouched
+    agent.market_state.live = False
+    assert agent._streaming_indicators("ETH") is None
+    cold = agent._analyze_candles(candles[-61:], [], [], streamed=hub.values("ETH-USDT", "5min"))
+    assert cold["indicators"] == {} and cold["composite_score"] == 50
+    warming = StreamingIndicatorHub()
+    warming.seed("ETH-USDT", "1min", candles[:10])
+    partial = agent._analyze_candles(candles[:10], [], [], streamed=warming.values("ETH-USDT", "1min"))
+    assert partial["indicators"] == {}
+
+
+def _streamed(close, rsi, ema_fast, ema_slow, bb_middle=100.0, bb_width=5.0):
+    return {
+        "close": close,
+        "rsi": rsi,
+        "ema_fast": ema_fast,
+        "ema_slow": ema_slow,
+        "bb_middle": bb_middle,
+        "bb_upper": bb_middle + bb_width,
+        "bb_lower": bb_middle - bb_width,
+    }
+
+
+def test_streamed_signals_drive_the_indicator_composite():
+    from ibis_true_agent import IBISTrueAgent
+
+    agent = IBISTrueAgent()
+    cases = [
+        # oversold RSI +20, below the lower band +15, falling EMAs -15
+        (_streamed(94.0, 25.0, 96.0, 98.0), {"rsi": 20, "bollinger": 15, "ema_trend": -15}, 70),
+        # overbought RSI -10, above the upper band -15, rising EMAs +15
+        (_streamed(106.0, 75.0, 104.0, 102.0), {"rsi": -10, "bollinger": -15, "ema_trend": 15}, 40),
+        # mid RSI +10, upper half of the bands +10, mixed EMAs 0
+        (_streamed(102.0, 50.0, 103.0, 101.0), {"rsi": 10, "bollinger": 10, "ema_trend": 0}, 70),
+        # weak RSI 0, lower half of the bands -5, falling EMAs -15
+        (_streamed(99.0, 35.0, 99.5, 100.0), {"rsi": 0, "bollinger": -5, "ema_trend": -15}, 30),
+    ]
+    for streamed, breakdown, composite in cases:
+        analysis = agent._analyze_candles([], [], [], streamed=streamed)
+        assert analysis["indicators"]["breakdown"] == breakdown
+        assert analysis["composite_score"] == composite
+
+    # Not warm yet, or switched off: the neutral composite is kept
+    cold = agent._analyze_candles([], [], [], streamed=_streamed(100.0, NAN, 99.0, 98.0))
+    assert cold["composite_score"] == 50 and cold["indicators"] == {}
+    agent.config["streaming_indicator_scoring"] = False
+    off = agent._analyze_candles([], [], [], streamed=cases[0][0])
+    assert off["composite_score"] == 50 and off["indicators"] == {}
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Telemetry event bus tests - the ring keeps the newest max_events with
+since_id reads straight from the slot index, payloads are redacted and
+copied once at emit, push subscribers get bounded queues with drop
+counters, and a lagging stream is backfilled from the ring in id order
+"""
+
+import asyncio
+
+from ibis import telemetry
+from ibis.telemetry import EventBus
+
+
+async def test_ring_overflow_and_since_id():
+    bus = EventBus(max_events=5)
+    for i in range(12):
+        await bus.emit("tick", {"i": i})
+
+    events = await bus.get_events(limit=200)
+    assert [e["id"] for e in events] == [8, 9, 10, 11, 12]
+    assert [e["id"] for e in await bus.get_events(since_id=10)] == [11, 12]
+    assert [e["id"] for e in await bus.get_events(limit=2, since_id=3)] == [11, 12]
+    assert await bus.get_events(since_id=12) == []
+
+    await bus.clear()
+    assert await bus.get_events() == []
+    await bus.emit("tick", {})
+    assert [e["id"] for e in await bus.get_events(since_id=0)] == [13]
+    assert bus.get_stats()["buffered"] == 1
+
+
+async def test_payload_is_redacted_once_at_emit_and_isolated(monkeypatch):
+    calls = []
+    original = telemetry._redact
+
+    def counting(obj):
+        if isinstance(obj, dict) and "api_key" in obj:  # top-level payloads only
+            calls.append(obj)
+        return original(obj)
+
+    monkeypatch.setattr(telemetry, "_redact", counting)
+    bus = EventBus()
+    payload = {"api_key": "k", "nested": {"secret": "s", "ok": 1, "items": [{"key": "x"}]}}
+    await bus.emit("auth", payload)
+    assert len(calls) == 1
+
+    # Later mutations by the emitter, nested ones included, don't leak in
+    payload["api_key"] = "changed"
+    payload["nested"]["ok"] = 2
+    payload["nested"]["secret"] = "plain"
+    payload["nested"]["items"].append({"token": "t"})
+
+    first = (await bus.get_events())[0]
+    second = (await bus.get_events(since_id=0))[0]
+    assert first is second
+    assert first["payload"] == {
+        "api_key": "***REDACTED***",
+        "nested": {"secret": "***REDACTED***", "ok": 1, "items": [{"key": "***REDACTED***"}]},
+    }
+    assert len(calls) == 1
+
+
+async def test_subscribers_get_pushes_and_count_drops():
+    bus = EventBus(max_events=100)
+    fast = bus.subscribe(maxsize=100)
+    slow = bus.subscribe(maxsize=3)
+
+    for i in range(10):
+        await bus.emit("tick", {"i": i})
+
+    batch = await asyncio.wait_for(fast.next_batch(limit=200), 1)
+    assert [e["id"] for e in batch] == list(range(1, 11))
+    assert slow.dropped == 7 and bus.get_stats()["dropped"] == 7
+
+    # A lagging consumer backfills the gap from the ring
+    received = await slow.next_batch()
+    backfill = await bus.get_events(since_id=received[-1]["id"])
+    assert [e["id"] for e in received + backfill] == list(range(1, 11))
+
+    slow.close()
+    await bus.emit("tick", {})
+    assert slow.queue.qsize() == 0 and bus.get_stats()["subscribers"] == 1
+
+
+async def test_idle_subscriber_waits_without_polling():
+    bus = EventBus()
+    async with bus.subscribe() as sub:
+        waiter = asyncio.ensure_future(sub.next_batch())
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        await bus.emit("decision", {"symbol": "SOL-USDT"})
+        batch = await asyncio.wait_for(waiter, 1)
+        assert batch[0]["payload"] == {"symbol": "SOL-USDT"}
+    assert bus.get_stats()["subscribers"] == 0
+
+
+async def test_lagging_stream_is_backfilled_oldest_first():
+    bus = EventBus(max_events=5000)
+    sub = bus.subscribe(maxsize=1000)
+    stream = sub.batches(backlog=0, limit=200)
+
+    for i in range(1500):
+        await bus.emit("tick", {"i": i})
+    assert sub.dropped == 500
+
+    received = []
+    while not received or received[-1] < 1500:
+        batch = await asyncio.wait_for(stream.__anext__(), 1)
+        received.extend(e["id"] for e in batch)
+    assert received == list(range(1, 1501))
+
+    # The stale queue is skipped, and live pushes carry on after the backfill
+    await bus.emit("tick", {})
+    batch = await asyncio.wait_for(stream.__anext__(), 1)
+    assert [e["id"] for e in batch] == [1501]
+    await stream.aclose()
+    sub.close()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-symbol vs vectorized scoring of the priority universe.
+Times the CPU part of analyze_market_intelligence (candle features, technical,
+unified and funnel scores) on synthetic candles at 50/200/800 symbols.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parent.parent
+if str(BASE) not in sys.path:
+    sys.path.insert(0, str(BASE))
+
+
+def _series(symbol, n, rng):
+    from ibis.exchange.kucoin_client import Candle
+
+    candles, price = [], rng.uniform(0.01, 100)
+    for i in range(n):
+        price *= 1 + rng.uniform(-0.01, 0.01)
+        candles.append(
+            Candle(symbol, 60 * i, price, price * 1.003, price * 0.997, price, rng.uniform(1, 100), 0)
+        )
+    return candles
+
+
+def _universe(count, seed=1):
+    rng = random.Random(seed)
+    c1 = [_series(f"S{i}-USDT", 61, rng) for i in range(count)]
+    c5 = [_series(f"S{i}-USDT", 24, rng) for i in range(count)]
+    c15 = [_series(f"S{i}-USDT", 16, rng) for i in range(count)]
+    change = [rng.uniform(-10, 10) for _ in range(count)]
+    volume = [rng.uniform(1e4, 5e6) for _ in range(count)]
+    return c1, c5, c15, change, volume
+
+
+def scalar_pass(agent, scorer, c1, c5, c15, change, volume):
+    out = []
+    for i in range(len(c1)):
+        analysis = agent._analyze_candles(c1[i], c5[i], c15[i])
+        momentum = analysis["momentum_1h"]
+        technical = scorer.calculate_technical_score(momentum, change[i])
+        mtf = max(
+            0,
+            min(
+                100,
+                50
+                + analysis["momentum_5m"] * 6.0
+                + analysis["momentum_15m"] * 8.0
+                + analysis["momentum_1h_raw"] * 4.0,
+            ),
+        )
+        vol_score = max(
+            0,
+            min(
+                100,
+                max(0, min(100, 50 + analysis["volume_momentum"] * 0.4)) * 0.65
+                + agent._calculate_liquidity_score(volume[i]) * 0.35,
+            ),
+        )
+        unified = scorer.calculate_unified_score(
+            technical_score=technical,
+            agi_score=50,
+            mtf_score=mtf,
+            volume_score=vol_score,
+            sentiment_score=50,
+            symbol=f"S{i}",
+        )
+        funnel = scorer.calculate_funnel_score(
+            {
+                "volume_24h": volume[i],
+                "volatility": 0.05,
+                "change_24h": change[i],
+                "change_1h": momentum,
+                "technical_score": technical,
+                "agi_score": 50,
+                "spread": 0.015,
+            }
+        )
+        out.append((unified["score"], funnel))
+    return out
+
+
+def batch_pass(agent, scorer, c1, c5, c15, change, volume):
+    import numpy as np
+
+    from ibis.batch_scoring import (
+        batch_candle_features,
+        batch_funnel_score,
+        batch_liquidity_score,
+        batch_technical_score,
+        batch_unified_score,
+        row,
+    )
+
+    n = len(c1)
+    features = batch_candle_features(c1, c5, c15)
+    # Patterns / support / price action stay per symbol in the agent
+    for i in range(n):
+        agent._analyze_candles(c1[i], c5[i], c15[i], features=row(features, i))
+
+    change = np.asarray(change)
+    volume = np.asarray(volume)
+    momentum = features["momentum_composite"]
+    technical = batch_technical_score(momentum, change)
+    mtf = np.clip(
+        50
+        + features["momentum_5m"] * 6.0
+        + features["momentum_15m"] * 8.0
+        + features["momentum_1h_raw"] * 4.0,
+        0,
+        100,
+    )
+    vol_score = np.clip(
+        np.clip(50 + features["volume_momentum"] * 0.4, 0, 100) * 0.65
+        + batch_liquidity_score(volume) * 0.35,
+        0,
+        100,
+    )
+    agi = np.full(n, 50.0)
+    unified = batch_unified_score(
+        technical, agi, mtf, vol_score, agi, [f"S{i}" for i in range(n)], scorer.regime_config
+    )
+    funnel = batch_funnel_score(
+        volume, np.full(n, 0.05), change, momentum, technical, agi, np.full(n, 0.015)
+    )
+    return list(zip(unified["score"], funnel))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="50,200,800")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    import logging
+
+    from ibis.core.unified_scoring import UnifiedScorer
+    from ibis_true_agent import IBISTrueAgent
+
+    agent = object.__new__(IBISTrueAgent)
+    IBISTrueAgent.logger.setLevel(logging.WARNING)
+    scorer = UnifiedScorer()
+
+    print(f"{'symbols':>8} {'scalar ms':>10} {'batch ms':>10} {'speedup':>8} {'max diff':>9}")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        data = _universe(size)
+        timings = {}
+        results = {}
+        for name, fn in (("scalar", scalar_pass), ("batch", batch_pass)):
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                results[name] = fn(agent, scorer, *data)
+                best = min(best, time.perf_counter() - start)
+            timings[name] = best * 1000
+        diff = max(
+            max(abs(a[0] - b[0]), abs(a[1] - b[1]))
+            for a, b in zip(results["scalar"], results["batch"])
+        )
+        print(
+            f"{size:>8} {timings['scalar']:>10.2f} {timings['batch']:>10.2f} "
+            f"{timings['scalar'] / timings['batch']:>7.1f}x {diff:>9.2e}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark loading the on-disk candle archive.
+Writes synthetic 1min history for N symbols, then times opening every series
+(numpy.memmap) and one full pass over the close column.
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parent.parent
+if str(BASE) not in sys.path:
+    sys.path.insert(0, str(BASE))
+
+
+def _write(root: Path, symbols: int, bars: int):
+    import numpy as np
+
+    from ibis.exchange.candle_archive import COLUMNS
+
+    rng = np.random.default_rng(1)
+    stamps = 1_700_000_000 + 60 * np.arange(bars, dtype=np.int64)
+    for i in range(symbols):
+        path = root / "1min" / f"S{i}-USDT"
+        path.mkdir(parents=True)
+        close = 100 * np.cumprod(1 + rng.normal(0, 0.001, bars))
+        columns = {
+            "timestamp": stamps,
+            "open": close,
+            "high": close * 1.001,
+            "low": close * 0.999,
+            "close": close,
+            "volume": rng.uniform(1, 100, bars),
+            "turnover": close,
+        }
+        for name, dtype in COLUMNS.items():
+            columns[name].astype(dtype).tofile(path / f"{name}.col")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--dir", default=None, help="reuse an existing archive root")
+    args = parser.parse_args()
+
+    from ibis.exchange.candle_archive import CandleArchive
+
+    root = Path(args.dir or tempfile.mkdtemp(prefix="ibis_archive_"))
+    bars = args.days * 1440
+    try:
+        if not (root / "1min").exists():
+            start = time.perf_counter()
+            _write(root, args.symbols, bars)
+            print(f"wrote {args.symbols} x {bars} bars in {time.perf_counter() - start:.1f}s")
+
+        archive = CandleArchive(str(root))
+        start = time.perf_counter()
+        series = archive.open_many(archive.symbols("1min"), "1min")
+        opened = time.perf_counter() - start
+
+        start = time.perf_counter()
+        total = sum(float(s["close"].sum()) for s in series.values())
+        scanned = time.perf_counter() - start
+
+        rows = sum(len(s) for s in series.values())
+        print(f"open {len(series)} series / {rows:,} bars: {opened * 1000:.1f} ms")
+        print(f"scan close column: {scanned * 1000:.1f} ms ({total:.3g})")
+    finally:
+        if not args.dir:
+            shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark decision-to-ack latency of an entry against a simulated exchange.
+
+  legacy    the old open_position round trips: get_ticker (spread filter),
+            get_candles(5min), get_ticker (maker-first spread), create_order
+  fast      open_position with a fresh scan quote (create_order only)
+  stale     open_position with a scan quote past entry_quote_max_age_seconds
+            (one get_ticker, then create_order)
+
+Every simulated REST call sleeps --rtt milliseconds. Latency is measured from
+the open_position call to the create_order ack.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parent.parent
+if str(BASE) not in sys.path:
+    sys.path.insert(0, str(BASE))
+
+
+class SimulatedClient:
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.calls = 0
+
+    async def _round_trip(self):
+        self.calls += 1
+        await asyncio.sleep(self.rtt)
+
+    async def get_ticker(self, symbol):
+        from ibis.exchange.kucoin_client import Ticker
+
+        await self._round_trip()
+        return Ticker(symbol=symbol, price=10.0, buy=9.99, sell=10.0)
+
+    async def get_candles(self, symbol, interval, limit=100):
+        await self._round_trip()
+        return []
+
+    async def create_order(self, symbol, side, type, price, size):
+        await self._round_trip()
+
+        class Resp:
+            order_id = "SIM"
+
+        return Resp()
+
+
+def _agent(client):
+    from ibis_true_agent import IBISTrueAgent
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent = IBISTrueAgent()
+    agent.client = client
+    agent.symbol_rules = {"SOL": {"baseIncrement": 0.01, "baseMinSize": 0.01, "priceIncrement": 0.001}}
+    agent._save_state = lambda immediate=False: None
+
+    async def sizing(strategy, symbol, market_intel):
+        return 50.0
+
+    agent.dynamic_position_sizing = sizing
+    return agent
+
+
+async def _legacy(client) -> float:
+    started = time.perf_counter()
+    await client.get_ticker("SOL-USDT")
+    await client.get_candles("SOL-USDT", "5min", limit=20)
+    await client.get_ticker("SOL-USDT")
+    await client.create_order("SOL-USDT", "buy", "market", 0, 50.0)
+    return time.perf_counter() - started
+
+
+async def _entry(agent, age: float) -> float:
+    from ibis.exchange.kucoin_client import Ticker
+
+    agent.state["capital_awareness"]["buy_orders"] = {}
+    agent.state["capital_awareness"]["open_orders_count"] = 0
+    agent.state["positions"] = {}
+    agent.latest_tickers = {"SOL": Ticker(symbol="SOL-USDT", price=10.0, buy=9.99, sell=10.0)}
+    agent._latest_tickers_ts = time.time() - age
+    strategy = {"available": 200.0, "regime": "NORMAL", "mode": "NORMAL"}
+    before = agent.entry_latency.total_ms
+    with contextlib.redirect_stdout(io.StringIO()):
+        await agent.open_position({"symbol": "SOL", "price": 10.0, "score": 95}, strategy)
+    return (agent.entry_latency.total_ms - before) / 1000
+
+
+async def _run(trades: int, rtt: float) -> dict:
+    results = {}
+    # Built first so the agent's imports stay out of the legacy timings
+    agent = _agent(SimulatedClient(rtt))
+    client = SimulatedClient(rtt)
+    results["legacy"] = ([await _legacy(client) for _ in range(trades)], client.calls / trades)
+
+    max_age = float(agent.config["entry_quote_max_age_seconds"])
+    for mode, age in (("fast", 0.0), ("stale", max_age + 1)):
+        agent.client = SimulatedClient(rtt)
+        latencies = [await _entry(agent, age) for _ in range(trades)]
+        results[mode] = (latencies, agent.client.calls / trades)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trades", type=int, default=20)
+    parser.add_argument("--rtt", type=float, default=40.0, help="simulated REST round trip (ms)")
+    args = parser.parse_args()
+
+    results = asyncio.run(_run(args.trades, args.rtt / 1000))
+    print(f"trades={args.trades} rtt={args.rtt:.0f}ms")
+    for mode, (latencies, calls) in results.items():
+        print(
+            f"{mode:7s} decision->ack mean {statistics.mean(latencies) * 1000:8.2f} ms"
+            f"  max {max(latencies) * 1000:8.2f} ms  REST calls/entry {calls:.0f}"
+        )
+    base = statistics.mean(results["legacy"][0])
+    print(f"fast path x{base / statistics.mean(results['fast'][0]):.1f} lower latency")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
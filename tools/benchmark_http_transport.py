@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark the shared HTTP transport against the session patterns it replaced.
+Starts a local aiohttp stub that serves a KuCoin-shaped allTickers payload in a
+separate process, then times N requests (wall clock and client CPU) for:
+
+  per-request   a new ClientSession per call (dashboard/one-off pattern)
+  default       one default ClientSession + resp.json() (old KuCoinClient)
+  transport     HttpTransport session + read_json (ibis.core.codec backend)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import socket
+import sys
+import time
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parent.parent
+if str(BASE) not in sys.path:
+    sys.path.insert(0, str(BASE))
+
+
+def _payload(rows: int) -> dict:
+    tickers = [
+        {
+            "symbol": f"C{i}-USDT",
+            "last": f"{1 + i * 0.01:.4f}",
+            "buy": f"{1 + i * 0.01:.4f}",
+            "sell": f"{1.001 + i * 0.01:.4f}",
+            "changeRate": "0.0123",
+            "vol": "123456.78",
+            "volValue": "987654.32",
+            "high": "2.0",
+            "low": "0.5",
+        }
+        for i in range(rows)
+    ]
+    return {"code": "200000", "data": {"time": 0, "ticker": tickers}}
+
+
+def _serve(port: int, rows: int) -> None:
+    from aiohttp import web
+
+    body = web.json_response(_payload(rows)).body
+
+    async def handler(request):
+        return web.Response(body=body, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/api/v1/market/allTickers", handler)
+    web.run_app(app, host="127.0.0.1", port=port, print=None, handle_signals=False)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _run(mode: str, url: str, requests: int, concurrency: int) -> tuple:
+    import aiohttp
+
+    from ibis.core.http_transport import HttpTransport, read_json
+
+    transport = HttpTransport(limit_per_host=concurrency)
+    session = None
+    if mode == "default":
+        session = aiohttp.ClientSession()
+    elif mode == "transport":
+        session = transport.session()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            if mode == "per-request":
+                async with aiohttp.ClientSession() as own:
+                    async with own.get(url) as resp:
+                        return len((await resp.json())["data"]["ticker"])
+            async with session.get(url) as resp:
+                if mode == "transport":
+                    return len((await read_json(resp))["data"]["ticker"])
+                return len((await resp.json())["data"]["ticker"])
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    stats = transport.get_stats() if mode == "transport" else {}
+    if session is not None:
+        await session.close()
+    await transport.close()
+    return wall, cpu, stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=800, help="tickers per response")
+    args = parser.parse_args()
+
+    port = _free_port()
+    server = multiprocessing.Process(target=_serve, args=(port, args.rows), daemon=True)
+    server.start()
+    url = f"http://127.0.0.1:{port}/api/v1/market/allTickers"
+    try:
+        for _ in range(50):
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+
+        per_k = 1000 / args.requests
+        for mode in ("per-request", "default", "transport"):
+            wall, cpu, stats = asyncio.run(_run(mode, url, args.requests, args.concurrency))
+            print(
+                f"{mode:12s} wall {wall * per_k * 1000:8.1f} ms/1k  "
+                f"cpu {cpu * per_k * 1000:8.1f} ms/1k"
+            )
+            if stats:
+                print(
+                    f"{'':12s} reuse {stats['reuse_rate']:.2%}  "
+                    f"ttfb avg {stats['ttfb_avg_ms']:.2f} ms  json={stats['json_backend']}"
+                )
+    finally:
+        server.terminate()
+        server.join()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark the JSON codec on the hot REST decode and state encode paths.
+
+  tickers   allTickers body -> list of Ticker
+            stdlib json.loads + Ticker.from_response  vs  decode_all_tickers
+  state     state snapshot -> bytes
+            json.dumps(default=str).encode()           vs  codec.dumps
+
+Pass --fixture with a recorded allTickers response body for real numbers;
+without one a deterministic KuCoin-format payload is synthesized.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parent.parent
+if str(BASE) not in sys.path:
+    sys.path.insert(0, str(BASE))
+
+
+def _synthetic_tickers(rows: int) -> bytes:
+    rng = random.Random(7)
+    tickers = []
+    for i in range(rows):
+        last = rng.uniform(0.0001, 500)
+        tickers.append(
+            {
+                "symbol": f"C{i}-USDT",
+                "symbolName": f"C{i}-USDT",
+                "buy": f"{last * 0.999:.8f}",
+                "bestBidSize": f"{rng.uniform(1, 1e4):.4f}",
+                "sell": f"{last * 1.001:.8f}",
+                "bestAskSize": f"{rng.uniform(1, 1e4):.4f}",
+                "changeRate": f"{rng.uniform(-0.2, 0.2):.4f}",
+                "changePrice": f"{rng.uniform(-5, 5):.8f}",
+                "high": f"{last * 1.05:.8f}",
+                "low": f"{last * 0.95:.8f}",
+                "vol": f"{rng.uniform(1e3, 1e8):.8f}",
+                "volValue": f"{rng.uniform(1e3, 1e8):.8f}",
+                "last": f"{last:.8f}",
+                "averagePrice": f"{last:.8f}",
+                "takerFeeRate": "0.001",
+                "makerFeeRate": "0.001",
+                "takerCoefficient": "1",
+                "makerCoefficient": "1",
+            }
+        )
+    payload = {"code": "200000", "data": {"time": 1700000000000, "ticker": tickers}}
+    return json.dumps(payload).encode()
+
+
+def _synthetic_state(positions: int) -> dict:
+    return {
+        "positions": {
+            f"C{i}-USDT": {
+                "quantity": 1.0 + i,
+                "entry_price": 0.5 + i * 0.01,
+                "current_price": 0.51 + i * 0.01,
+                "opened_at": "2026-01-01T00:00:00",
+                "mode": "ACTIVE",
+                "score": 71.5,
+            }
+            for i in range(positions)
+        },
+        "daily": {"trades": 12, "wins": 8, "pnl": 3.21},
+        "market_intel": {f"C{i}-USDT": {"score": 60 + i % 30, "regime": "NORMAL"} for i in range(400)},
+    }
+
+
+def _time(fn, repeat: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixture", type=Path, help="recorded allTickers response body")
+    parser.add_argument("--rows", type=int, default=1300, help="synthesized tickers")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    from ibis.core import codec
+    from ibis.exchange.kucoin_codec import decode_all_tickers
+    from ibis.exchange.models import Ticker
+
+    body = args.fixture.read_bytes() if args.fixture else _synthetic_tickers(args.rows)
+    state = _synthetic_state(40)
+
+    def stdlib_tickers():
+        rows = json.loads(body)["data"]["ticker"]
+        return [Ticker.from_response({"ticker": t}, t["symbol"]) for t in rows]
+
+    def codec_tickers():
+        return decode_all_tickers(body)["ticker"]
+
+    assert stdlib_tickers() == codec_tickers()
+    rows = len(codec_tickers())
+
+    results = [
+        ("tickers", _time(stdlib_tickers, args.repeat), _time(codec_tickers, args.repeat)),
+        (
+            "state",
+            _time(lambda: json.dumps(state, separators=(",", ":"), default=str).encode(), args.repeat),
+            _time(lambda: codec.dumps(state), args.repeat),
+        ),
+    ]
+
+    print(f"backend={codec.BACKEND} msgspec={codec.MSGSPEC_AVAILABLE} rows={rows} body={len(body) / 1024:.0f} KiB")
+    for name, base, fast in results:
+        print(f"{name:8s} stdlib {base * 1000:8.3f} ms  codec {fast * 1000:8.3f} ms  x{base / fast:5.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark event-loop blocking from the agent's per-cycle event logging.
+
+  inline    the old log_event closures: open ibis_true.log, append one line,
+            close (and print() on the market-intelligence path), per call
+  queued    log_event from get_event_log: enqueue on the loop, format
+            and write in batches on the listener thread
+
+One cycle replays the analyze_market_intelligence lines plus the
+find_all_opportunities lines for --symbols symbols (a per-symbol DEBUG line,
+a rejection or acceptance, and the acceptance breakdown). Blocking is the
+time the coroutine holds the loop while logging; for the queued mode the
+listener is drained between cycles so its backlog is not carried over.
+stdout goes to /dev/null unless --stdout is given.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parent.parent
+if str(BASE) not in sys.path:
+    sys.path.insert(0, str(BASE))
+
+
+def _inline_loggers(log_file: str):
+    def analyze_event(msg, level=logging.INFO):
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            with open(log_file, "a") as f:
+                f.write(f"[{timestamp}] {msg}\n")
+        except:
+            pass
+        print(msg)
+
+    def opportunity_event(msg, level=logging.INFO):
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with open(log_file, "a") as f:
+            f.write(f"[{timestamp}] {msg}\n")
+
+    return analyze_event, opportunity_event
+
+
+def _queued_loggers(log_file: str):
+    from ibis.core.logging_config import get_event_log
+
+    return get_event_log(log_file, echo=True), get_event_log(log_file)
+
+
+def _cycle(analyze_event, opportunity_event, symbols: int) -> None:
+    analyze_event("   🔍 IBIS performing rapid market screening...")
+    analyze_event("   📊 Using REAL-TIME dynamic symbol discovery")
+    analyze_event(f"   🎯 Screening {symbols} symbols for opportunities")
+    opportunity_event(f"   🔍 Screening {symbols} potential trades...")
+    opportunity_event("   📄 DEBUG: config min_score=70", logging.DEBUG)
+    opportunity_event("   📄 Configured fee cap: 0.350%")
+    for i in range(symbols):
+        sym = f"C{i}"
+        score = 40 + (i * 7) % 55
+        opportunity_event(
+            f"   📄 DEBUG: {sym} fee_rate=0.100%, max_fee=0.350%, score={score:.1f}", logging.DEBUG
+        )
+        if score < 70:
+            opportunity_event(f"      ❌ REJECTED: {sym} (Score: {score:.1f} < 70.0)")
+        else:
+            opportunity_event(f"      ✅ {sym}: Score {score:.1f} >= 70 | momentum")
+            opportunity_event("         📊 COMPONENTS: Base technical")
+            opportunity_event(f"         🎯 COMPARISON: Rank #{i}/{symbols} (top 10%)")
+    opportunity_event("   📊 Found 7 valid opportunities this cycle")
+
+
+async def _run(mode: str, log_file: str, cycles: int, symbols: int) -> list:
+    from ibis.core.logging_config import get_log_pipeline
+
+    loggers = _inline_loggers(log_file) if mode == "inline" else _queued_loggers(log_file)
+    blocked = []
+    for _ in range(cycles):
+        started = time.perf_counter()
+        _cycle(*loggers, symbols)
+        blocked.append(time.perf_counter() - started)
+        await asyncio.sleep(0)
+        if mode == "queued":
+            await asyncio.to_thread(get_log_pipeline().flush)
+    return blocked
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=50)
+    parser.add_argument("--symbols", type=int, default=300, help="symbols screened per cycle")
+    parser.add_argument("--stdout", action="store_true", help="keep echoed lines on stdout")
+    args = parser.parse_args()
+
+    from ibis.core.logging_config import get_log_pipeline
+
+    workdir = tempfile.mkdtemp(prefix="ibis-logbench-")
+    results = {}
+    with open(os.devnull, "w") as devnull:
+        redirect = contextlib.nullcontext() if args.stdout else contextlib.redirect_stdout(devnull)
+        with redirect:
+            for mode in ("inline", "queued"):
+                log_file = os.path.join(workdir, f"{mode}.log")
+                results[mode] = asyncio.run(_run(mode, log_file, args.cycles, args.symbols))
+            get_log_pipeline().flush()
+
+    lines = {mode: sum(1 for _ in open(os.path.join(workdir, f"{mode}.log"))) for mode in results}
+    print(f"cycles={args.cycles} symbols={args.symbols} dir={workdir}")
+    for mode, blocked in results.items():
+        ordered = sorted(blocked)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        print(
+            f"{mode:7s} blocked/cycle mean {statistics.mean(blocked) * 1000:8.3f} ms"
+            f"  p99 {p99 * 1000:8.3f} ms  lines written {lines[mode]}"
+        )
+    stats = get_log_pipeline().get_stats()
+    print(
+        f"queued  batches {stats['batches']}  max batch {stats['max_batch']}"
+        f"  debug suppressed {stats['debug_suppressed']}"
+    )
+    base = statistics.mean(results["inline"])
+    fast = statistics.mean(results["queued"])
+    print(f"loop blocking x{base / fast:.1f} lower")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
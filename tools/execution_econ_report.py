@@ -2,12 +2,18 @@
 from __future__ import annotations
 
 import json
+import sys
 from collections import defaultdict
 from datetime import datetime, timezone
 from pathlib import Path
 
 
 BASE = Path(__file__).resolve().parent.parent
+if str(BASE) not in sys.path:
+    sys.path.insert(0, str(BASE))
+
+from ibis.state_persistence import read_state
+
 STATE_PATH = BASE / "data" / "ibis_true_state.json"
 TRADES_PATH = BASE / "data" / "trade_history.json"
 MEMORY_PATH = BASE / "data" / "ibis_true_memory.json"
@@ -48,7 +54,7 @@ def _load_state():
     if not STATE_PATH.exists():
         return {}
     try:
-        return json.loads(STATE_PATH.read_text())
+        return read_state(str(STATE_PATH))
     except Exception:
         return {}
 
@@ -71,7 +77,7 @@ def _load_memory():
     if not MEMORY_PATH.exists():
         return {}
     try:
-        return json.loads(MEMORY_PATH.read_text())
+        return read_state(str(MEMORY_PATH))
     except Exception:
         return {}
 
@@ -83,6 +83,7 @@ def main() -> int:
     base = Path(__file__).resolve().parent.parent
     if str(base) not in sys.path:
         sys.path.insert(0, str(base))
+    from ibis.state_persistence import read_state
 
     state_path = Path(args.state)
     critical: List[str] = []
@@ -94,7 +95,7 @@ def main() -> int:
         return 2
 
     try:
-        state = json.loads(state_path.read_text())
+        state = read_state(str(state_path))
     except Exception as e:
         print(f"CRITICAL: state parse failed: {e}")
         return 2
@@ -2,10 +2,16 @@
 from __future__ import annotations
 
 import json
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
 BASE = Path(__file__).resolve().parent.parent
+if str(BASE) not in sys.path:
+    sys.path.insert(0, str(BASE))
+
+from ibis.state_persistence import read_state
+
 STATE = BASE / "data" / "ibis_true_state.json"
 TRADES = BASE / "data" / "trade_history.json"
 OUT = BASE / "data" / "hourly_kpi.log"
@@ -48,7 +54,7 @@ now = datetime.now(timezone.utc)
 state = {}
 if STATE.exists():
     try:
-        state = json.loads(STATE.read_text())
+        state = read_state(str(STATE))
     except Exception:
         state = {}
 
@@ -4,9 +4,16 @@ Audit recent trades against the latest liquidity signals captured by IBIS.
 """
 
 import json
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
+BASE = Path(__file__).resolve().parent.parent
+if str(BASE) not in sys.path:
+    sys.path.insert(0, str(BASE))
+
+from ibis.state_persistence import read_state
+
 
 def format_trade(entry: dict, matching: dict | None) -> str:
     ts = int(entry.get("timestamp", 0)) / 1000
@@ -45,7 +52,7 @@ def main():
 
     trades_root = json.loads(trade_path.read_text())
     trades = trades_root.get("trades", []) if isinstance(trades_root, dict) else trades_root
-    state = json.loads(state_path.read_text())
+    state = read_state(str(state_path))
     history = state.get("liquidity_history", [])
 
     recent = trades[-10:]
@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 """
-Backfill SQLite trades from data/trade_history.json with order_id deduplication.
+Backfill SQLite trades with order_id deduplication.
+
+Source is the fill store (data/fills.db, written by FillIngestor) rolled up
+per order when it exists, otherwise data/trade_history.json. Pass
+--source history|fills to choose explicitly.
 
 Safety:
 - Does not touch positions.
@@ -18,8 +22,12 @@ from pathlib import Path
 
 BASE = Path(__file__).resolve().parent.parent
 TRADE_HISTORY = BASE / "data" / "trade_history.json"
+FILLS_DB = BASE / "data" / "fills.db"
 DB_PATH = BASE / "data" / "ibis_v8.db"
 
+if str(BASE) not in sys.path:
+    sys.path.insert(0, str(BASE))
+
 
 def _norm_symbol(sym: str) -> str:
     return str(sym or "").replace("-USDT", "").replace("-USDC", "")
@@ -62,6 +70,25 @@ def _load_trades() -> list[dict]:
     return [row for row in data if isinstance(row, dict)]
 
 
+def _load_fill_orders() -> list[dict]:
+    from ibis.exchange.fill_ingest import FillStore
+
+    store = FillStore(str(FILLS_DB))
+    try:
+        return [
+            {**order, "timestamp": order["created_at"], "reason": "fill_sync"}
+            for order in store.orders()
+        ]
+    finally:
+        store.close()
+
+
+def _source() -> str:
+    if "--source" in sys.argv[:-1]:
+        return sys.argv[sys.argv.index("--source") + 1]
+    return "fills" if FILLS_DB.exists() else "history"
+
+
 def _prepare_row(row: dict) -> tuple | None:
     symbol = _norm_symbol(row.get("symbol", ""))
     side = _to_side(row.get("side", ""))
@@ -89,7 +116,11 @@ def _prepare_row(row: dict) -> tuple | None:
 
 def main() -> int:
     apply = "--apply" in sys.argv
-    rows = _load_trades()
+    source = _source()
+    if source not in {"fills", "history"}:
+        print(f"status=error detail=unknown_source:{source}")
+        return 2
+    rows = _load_fill_orders() if source == "fills" else _load_trades()
     prepared = [r for r in (_prepare_row(x) for x in rows) if r is not None]
 
     if not DB_PATH.exists():
@@ -102,6 +133,7 @@ def main() -> int:
         existing = cur.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
 
         if not apply:
+            print(f"source={source}")
             print(f"history_records={len(rows)}")
             print(f"prepared_records={len(prepared)}")
             print(f"db_trades_before={existing}")
@@ -136,6 +168,7 @@ def main() -> int:
 
         con.commit()
         after = cur.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+        print(f"source={source}")
         print(f"history_records={len(rows)}")
         print(f"prepared_records={len(prepared)}")
         print(f"db_trades_before={existing}")
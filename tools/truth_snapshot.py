@@ -107,12 +107,17 @@ def _db_symbols() -> Set[str]:
 
 
 def main() -> int:
+    if str(BASE) not in sys.path:
+        sys.path.insert(0, str(BASE))
+
+    from ibis.state_persistence import read_state
+
     if not STATE_PATH.exists():
         print(json.dumps({'ts': datetime.now(timezone.utc).isoformat(), 'status': 'critical', 'error': 'state_missing'}))
         return 2
 
     try:
-        state = json.loads(STATE_PATH.read_text())
+        state = read_state(str(STATE_PATH))
     except Exception as e:
         print(json.dumps({'ts': datetime.now(timezone.utc).isoformat(), 'status': 'critical', 'error': f'state_parse:{e}'}))
         return 2